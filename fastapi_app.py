@@ -1,19 +1,36 @@
+import asyncio
 import json
+import os
+from contextlib import asynccontextmanager
+from typing import Collection, Set
 import src.shared.context as context
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, HTTPException, Body, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from agno.run.response import RunResponse
-from main import run_agent
+from main import (
+    run_agent_async,
+    run_agent_stream_async,
+    fyuze_agent_pool,
+    response_parse_stats,
+)
+from src.agent.agent_pool import AgentPoolExhaustedError
 from src.shared.utils.storage import memory,storage
 from src.core.website_analysis import analyze_website
 from src.core.basic_search import basic_search
 from src.shared.models.website_summary import WebsiteSummary
+from pydantic import ValidationError as PydanticValidationError
 from src.shared.models.sys_models import (
     FyuzeResponse,
     FyuzeRequest,
     SearchInstaRequest,
     WebsiteUrlRequest,
     BasicSearchRequest,
+    BatchSearchRequest,
+    DiscoveryJobParams,
+    JobRequest,
+    ReportJobParams,
 )
 from src.shared.helpers import (
     get_full_influencer_data,
@@ -25,17 +42,63 @@ from src.shared.helpers import (
     
 )
 from src.core.search_influencers import (
-    search_insta_influencers,
-    search_tiktok_influencers,
+    SEARCH_CACHE,
+    SEARCH_FLIGHTS,
+    search_influencers_cached,
 )
+from src.modules.info_crawler import InfoCrawler
+from src.modules.job_runner import JobQueueFullError
+from src.core.jobs import JOB_RUNNER
+from src.core.batch_search import batch_search_influencers
+from src.core.prefetch import prefetch_stats
+from src.shared.provider_cache import PROVIDER_CACHE
+from src.shared.provider_scheduler import PROVIDER_SCHEDULER
+from src.shared.adaptive_concurrency import concurrency_stats
+from src.shared.circuit_breaker import circuit_stats
+from src.shared.exceptions import CircuitOpenError
+from src.modules.query_scheduler import QUERY_SCHEDULER
+from src.core.crawl_pipeline import crawl_pipeline_stats
+from src.shared.utils.hedging import DISCOVERY_HEDGE
+from src.shared.utils.latency import provider_latency_stats
+from src.shared.utils.retry import retry_stats
+from src.shared.utils.rate_limiter import rate_limit_stats
+from src.shared.utils.tokens import load_token_encoder
+from src.agent.intent_router import router_stats
+from src.agent.parallel_tools import tool_call_stats
+from src.shared.session_summary import session_summary_stats
+from src.shared.tool_output import compaction_stats
+from src.shared.enums import Platform
 from agno.agent import RunResponse
 mock = is_mock()
 
+# Seconds between SSE keep-alive comments while the agent is busy
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+# Upper bound for GET /jobs/{id}?wait=... long-polls
+JOB_MAX_WAIT_SECONDS = float(os.getenv("JOB_MAX_WAIT_SECONDS", "30"))
+
+# Maximum topic/location combos accepted by /search_influencers_batch
+BATCH_SEARCH_MAX_COMBOS = int(os.getenv("BATCH_SEARCH_MAX_COMBOS", "50"))
+
+JOB_PARAM_MODELS = {
+    "discovery": DiscoveryJobParams,
+    "report": ReportJobParams,
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the token encoder before the first request needs it."""
+    load_token_encoder()
+    yield
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Fyuze Influencer API",
     description="API for finding Instagram influencers using AI agents",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -53,11 +116,203 @@ async def health_check():
     return {"status": "healthy", "message": "Fyuze API is running"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime counters for capacity tuning"""
+    return {
+        "agent_pool": fyuze_agent_pool.stats(),
+        "response_parsing": response_parse_stats(),
+        "tool_output": compaction_stats(),
+        "session_summary": session_summary_stats(),
+        "tool_calls": tool_call_stats(),
+        "prefetch": prefetch_stats(),
+        "provider_cache": PROVIDER_CACHE.stats(),
+        "provider_pools": PROVIDER_SCHEDULER.stats(),
+        "adaptive_concurrency": concurrency_stats(),
+        "retries": retry_stats(),
+        "rate_limits": rate_limit_stats(),
+        "circuit_breakers": circuit_stats(),
+        "query_scheduler": QUERY_SCHEDULER.stats(),
+        "crawl_pipeline": crawl_pipeline_stats(),
+        "discovery_hedging": DISCOVERY_HEDGE.stats(),
+        "provider_latency": provider_latency_stats(),
+        "router": router_stats(),
+        "search_cache": SEARCH_CACHE.stats(),
+        "single_flight": {
+            "search": SEARCH_FLIGHTS.stats(),
+            "instagram_crawl": InfoCrawler._instagram_flights.stats(),
+            "tiktok_crawl": InfoCrawler._tiktok_flights.stats(),
+        },
+        "jobs": JOB_RUNNER.stats(),
+    }
+
+
 @app.get("/")
 def root():
     return {"status": "ok"}
 
 
+def _resolve_influencers_data(
+    user_id: str, session_id: str, unique_usernames: list[str], platform: str | None
+) -> list[dict]:
+    """Look up full influencer payloads for the handles the agent returned.
+
+    Tries the session document in Mongo first, then the temp JSON files, and
+    finally refetches the profiles live (Plan C). Blocking; run it off the loop.
+    """
+    influencers_data: list[dict] = []
+    try:
+        influencers_data = get_full_influencer_data_from_db(
+            f"{user_id}_{session_id}", unique_usernames
+        )
+    except Exception as e:
+        print(f"DB lookup ERROR: {e}")
+        influencers_data = []
+
+    if influencers_data:
+        return influencers_data
+
+    if platform == "instagram":
+        file_name = "insta_influencers.json"
+    elif platform == "tiktok":
+        file_name = "tiktok_influencers.json"
+    elif platform in ["combined platforms", "combined_platforms"] or platform is None:
+        file_name = "combined_platforms"
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid platform received from agent: {platform}. Expected 'Instagram', 'TikTok', or combined platforms.",
+        )
+
+    try:
+        influencers_data = get_full_influencer_data(unique_usernames, file=file_name)
+    except FileNotFoundError:
+        print(f"Warning: Could not find influencer data file '{file_name}'.")
+        influencers_data = []
+
+    # if json temp failed, make the refetch (Plan C)
+    if not influencers_data:
+        normalized = [username.lstrip("@") for username in unique_usernames]
+        fallback_data: list[dict] = []
+        try:
+            if platform == "instagram":
+                fallback_data = get_instagram_profiles_by_usernames(normalized)
+            elif platform == "tiktok":
+                fallback_data = get_tiktok_profiles_by_usernames(normalized)
+            else:
+                try:
+                    fallback_data.extend(get_instagram_profiles_by_usernames(normalized))
+                except Exception:
+                    pass
+                try:
+                    fallback_data.extend(get_tiktok_profiles_by_usernames(normalized))
+                except Exception:
+                    pass
+        except Exception as fetch_error:
+            print(
+                "Warning: fallback profile lookup failed for "
+                f"{normalized}: {fetch_error}"
+            )
+        # if fetch worked, use that data
+        if fallback_data:
+            influencers_data = fallback_data
+
+    return influencers_data
+
+
+def _unique_usernames(raw_usernames: list[str]) -> list[str]:
+    """Strip and case-insensitively dedupe handles, preserving order."""
+    unique_usernames: list[str] = []
+    seen_handles: set[str] = set()
+    for handle in raw_usernames:
+        normalized = handle.strip()
+        if not normalized:
+            continue
+        key = normalized.lower()
+        if key not in seen_handles:
+            unique_usernames.append(normalized)
+            seen_handles.add(key)
+    return unique_usernames
+
+
+async def _build_fyuze_response(
+    response, user_id: str, session_id: str, unavailable: Collection[str] = ()
+) -> FyuzeResponse:
+    """Turn the agent's ``FyuzeModel`` into the public ``FyuzeResponse``.
+
+    ``unavailable`` lists the providers whose circuit was open during the run;
+    the response is then flagged as degraded.
+    """
+    influencers_data = []
+    text = response.text
+    role = getattr(response, "role", "assistant")
+    platform = response.platform.value if response.platform else None
+
+    raw_usernames = [u for u in response.influencers_usernames or [] if u]
+    if not raw_usernames:
+        raw_usernames = extract_usernames_from_text(text)
+
+    unique_usernames = _unique_usernames(raw_usernames)
+    if unique_usernames:
+        influencers_data = await run_in_threadpool(
+            _resolve_influencers_data,
+            user_id,
+            session_id,
+            unique_usernames,
+            platform,
+        )
+
+    return FyuzeResponse.model_validate(
+        {
+            "text": text,
+            "role": role,
+            "influencers_found": influencers_data,
+            "degraded": bool(unavailable),
+            "unavailable_providers": sorted(unavailable),
+        }
+    )
+
+
+def _degraded_response(
+    unavailable: Collection[str], partial_results: Collection[dict] = ()
+) -> FyuzeResponse:
+    """Answer for a run that failed while providers were unavailable.
+
+    ``partial_results`` are the profiles found before the run failed.
+    """
+    providers = ", ".join(sorted(unavailable)) or "a data provider"
+    if partial_results:
+        text = (
+            f"Some data sources are temporarily unavailable ({providers}), so "
+            f"this search is incomplete: here are the {len(partial_results)} "
+            "profiles found so far. Please try again in a minute for the rest."
+        )
+    else:
+        text = (
+            f"Some data sources are temporarily unavailable ({providers}), so I "
+            "couldn't complete this search. Please try again in a minute."
+        )
+    return FyuzeResponse(
+        text=text,
+        role="assistant",
+        influencers_found=list(partial_results),
+        degraded=True,
+        unavailable_providers=sorted(unavailable),
+    )
+
+
+def _card_key(card: dict) -> tuple[str, str]:
+    """Identity of an ``influencer`` event's profile, for deduplication."""
+    return card.get("platform"), str(card.get("username")).lower()
+
+
+def _unavailable_after(error: Exception, unavailable: Set[str]) -> Set[str]:
+    """Providers to report when a run failed, or an empty set if none were down."""
+    if isinstance(error, CircuitOpenError):
+        return unavailable | {error.provider}
+    return unavailable
+
+
 @app.post("/find-influencers", response_model=FyuzeResponse)
 async def find_influencers(request: FyuzeRequest):
     """Find Instagram influencers based on user request"""
@@ -66,111 +321,196 @@ async def find_influencers(request: FyuzeRequest):
             status_code=400,
             detail="Missing required parameters: message, user_id, and session_id are required",
         )
-    context.user_id = request.user_id
-    context.session_id = request.session_id
-    
-    
+    context_token = context.set_request_context(request.user_id, request.session_id)
+    # Profiles found while the run goes on, returned if it fails mid-way
+    partial_results: dict[tuple[str, str], dict] = {}
+
+    def sink(event: str, data: dict) -> None:
+        if event == "influencer":
+            partial_results.setdefault(_card_key(data), data["data"])
+
+    sink_token = context.set_event_sink(sink)
+
     try:
-        influencers_data = []
-        response = run_agent(request.message, request.user_id, request.session_id)
-        text = response.text
-        role = getattr(response, "role", "assistant")
-        platform = response.platform.value if response.platform else None
-
-        raw_usernames = [u for u in response.influencers_usernames or [] if u]
-        if not raw_usernames:
-            raw_usernames = extract_usernames_from_text(text)
-
-        unique_usernames: list[str] = []
-        seen_handles: set[str] = set()
-        for handle in raw_usernames:
-            normalized = handle.strip()
-            if not normalized:
-                continue
-            key = normalized.lower()
-            if key not in seen_handles:
-                unique_usernames.append(normalized)
-                seen_handles.add(key)
-        
-        if unique_usernames:
-            
+        with context.track_unavailable_providers() as unavailable:
             try:
-                influencers_data = get_full_influencer_data_from_db(
-                    f"{request.user_id}_{request.session_id}", unique_usernames
+                # The agent run blocks on Groq/Ensemble/Supabase, so it runs on
+                # the agent pool's threads instead of the event loop
+                response = await run_agent_async(
+                    request.message, request.user_id, request.session_id
                 )
+            except AgentPoolExhaustedError:
+                raise
             except Exception as e:
-                print(f"DB lookup ERROR: {e}")
-                influencers_data = []
+                # A provider outage gets a degraded answer, not a 500
+                down = _unavailable_after(e, unavailable)
+                if not down:
+                    raise
+                return _degraded_response(down, list(partial_results.values()))
+        return await _build_fyuze_response(
+            response, request.user_id, request.session_id, unavailable
+        )
 
-        if not influencers_data and unique_usernames:
-            if platform == "instagram":
-                file_name = "insta_influencers.json"
-            elif platform == "tiktok":
-                file_name = "tiktok_influencers.json"
-            elif (
-                platform in ["combined platforms", "combined_platforms"]
-                or platform is None
-            ):
-                file_name = "combined_platforms"
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid platform received from agent: {platform}. Expected 'Instagram', 'TikTok', or combined platforms.",
-                )
+    except AgentPoolExhaustedError as e:
+        raise HTTPException(status_code=503, detail=e.message) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal server error: {str(e)}"
+        ) from e
+    finally:
+        context.reset_event_sink(sink_token)
+        context.reset_request_context(context_token)
 
-            try:
-                influencers_data = get_full_influencer_data(
-                    unique_usernames, file=file_name
+
+def _sse(event: str, data) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.post("/find-influencers/stream")
+async def find_influencers_stream(request: FyuzeRequest):
+    """Streaming variant of ``/find-influencers`` using Server-Sent Events.
+
+    Emits ``token`` events with the assistant's text as it is generated,
+    ``tool_started`` / ``tool_completed`` and pipeline progress events
+    (``queries_issued``, ``profiles_found``, ``profiles_crawled``), an
+    ``influencer`` event per profile card as soon as it is available, and
+    finally a ``done`` event carrying the full ``FyuzeResponse`` (or an
+    ``error`` event). A ``provider_unavailable`` event is sent when a
+    provider's circuit breaker turns calls away; the final response is then
+    flagged as ``degraded``.
+    """
+    if not all([request.message, request.user_id, request.session_id]):
+        raise HTTPException(
+            status_code=400,
+            detail="Missing required parameters: message, user_id, and session_id are required",
+        )
+
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        end = object()
+
+        def sink(event: str, data: dict) -> None:
+            # Called from agent and provider worker threads
+            loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+        context_token = context.set_request_context(request.user_id, request.session_id)
+        sink_token = context.set_event_sink(sink)
+        try:
+            # The task copies the current context, including the sink and the
+            # set collecting unavailable providers
+            with context.track_unavailable_providers() as unavailable:
+                run_task = asyncio.create_task(
+                    run_agent_stream_async(
+                        request.message, request.user_id, request.session_id
+                    )
                 )
-            except FileNotFoundError:
-                print(f"Warning: Could not find influencer data file '{file_name}'.")
-                influencers_data = []
-
-            # if json temp failed, make the refetch (Plan C)
-            if not influencers_data:
-                normalized = [username.lstrip("@") for username in unique_usernames]
-                fallback_data: list[dict] = []
+        finally:
+            context.reset_event_sink(sink_token)
+            context.reset_request_context(context_token)
+        run_task.add_done_callback(lambda _: events.put_nowait(end))
+
+        # Profiles sent so far, also returned if the run fails mid-way
+        sent_cards: dict[tuple[str, str], dict] = {}
+        try:
+            while True:
                 try:
-                    if platform == "instagram":
-                        fallback_data = get_instagram_profiles_by_usernames(normalized)
-                    elif platform == "tiktok":
-                        fallback_data = get_tiktok_profiles_by_usernames(normalized)
-                    else:
-                        try:
-                            fallback_data.extend(
-                                get_instagram_profiles_by_usernames(normalized)
-                            )
-                        except Exception:
-                            pass
-                        try:
-                            fallback_data.extend(
-                                get_tiktok_profiles_by_usernames(normalized)
-                            )
-                        except Exception:
-                            pass
-                except Exception as fetch_error:
-                    print(
-                        "Warning: fallback profile lookup failed for "
-                        f"{normalized}: {fetch_error}"
+                    item = await asyncio.wait_for(
+                        events.get(), timeout=SSE_HEARTBEAT_SECONDS
                     )
-            #if fetch worked, use that data
-                if fallback_data:
-                    influencers_data = fallback_data
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is end:
+                    break
+                event, data = item
+                if event == "influencer":
+                    card_key = _card_key(data)
+                    if card_key in sent_cards:
+                        continue
+                    sent_cards[card_key] = data["data"]
+                yield _sse(event, data)
 
+            response = run_task.result()
+            final_response = await _build_fyuze_response(
+                response, request.user_id, request.session_id, unavailable
+            )
+            yield _sse("done", final_response.model_dump())
+        except AgentPoolExhaustedError as e:
+            yield _sse("error", {"status_code": 503, "detail": e.message})
+        except Exception as e:
+            down = _unavailable_after(e, unavailable)
+            if down:
+                yield _sse(
+                    "done",
+                    _degraded_response(down, list(sent_cards.values())).model_dump(),
+                )
+                return
+            yield _sse(
+                "error",
+                {"status_code": 500, "detail": f"Internal server error: {str(e)}"},
+            )
+        finally:
+            if not run_task.done():
+                # Client disconnected; the agent run finishes on its thread
+                # but nothing is listening any more
+                run_task.cancel()
 
-        final_response = FyuzeResponse.model_validate(
-            {
-                "text": text,
-                "role": role,
-                "influencers_found": influencers_data,
-            }
-        )
-        return final_response
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/jobs", status_code=202)
+def create_job(req: JobRequest = Body(...)):
+    """
+    Enqueue a long-running ``discovery`` or ``report`` job.
+
+    Returns the job document immediately; poll ``GET /jobs/{job_id}`` for
+    progress, partial results and the final result.
+    """
+    try:
+        params = JOB_PARAM_MODELS[req.type].model_validate(req.params)
+    except PydanticValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors()) from e
+
+    try:
+        return JOB_RUNNER.submit(req.type, params.model_dump(), user_id=req.user_id)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=e.message) from e
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    wait: float = Query(
+        0, ge=0, description="Seconds to long-poll for the job to finish"
+    ),
+):
+    """
+    Get a job's status, progress, partial results and result.
+
+    With ``wait`` the request is held until the job finishes or the wait
+    (capped at ``JOB_MAX_WAIT_SECONDS``) elapses.
+    """
+    wait = min(wait, JOB_MAX_WAIT_SECONDS)
+    done = JOB_RUNNER.done_future(job_id) if wait else None
+    if done is not None:
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(done)), timeout=wait
+            )
+        except asyncio.TimeoutError:
+            pass
+
+    job = await run_in_threadpool(JOB_RUNNER.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal server error: {str(e)}"
-        ) from e
 
 @app.post("/analyze_website", response_model=WebsiteSummary)
 def analyze_website_post_endpoint(body: WebsiteUrlRequest = Body(...)):
@@ -184,6 +524,19 @@ def analyze_website_post_endpoint(body: WebsiteUrlRequest = Body(...)):
     summary = analyze_website(str(body.url))
     return summary.model_dump()
 
+def _platform_search_response(platform_data: list[dict], unavailable: list[str]) -> dict:
+    """Body of the direct search endpoints.
+
+    ``degraded`` flags results that are partial, or an expired cache entry,
+    because providers in ``unavailable_providers`` had their circuit open.
+    """
+    return {
+        "platform_data": platform_data,
+        "degraded": bool(unavailable),
+        "unavailable_providers": unavailable,
+    }
+
+
 @app.post("/search_insta_influencers")
 def search_insta_influencers_endpoint(req: SearchInstaRequest = Body(...)):
     """
@@ -193,7 +546,7 @@ def search_insta_influencers_endpoint(req: SearchInstaRequest = Body(...)):
         # Return static data
         with open("fyuze_influencers_infos.json", "r", encoding="utf-8") as f:
             data = json.load(f)
-        return {"platform_data": data}
+        return _platform_search_response(data, [])
     num_results = req.search_results if req.search_results is not None else 10
     if num_results > 10:
         raise HTTPException(
@@ -201,14 +554,14 @@ def search_insta_influencers_endpoint(req: SearchInstaRequest = Body(...)):
         )
     elif num_results < 1:
         num_results = 1
-    ensemble_objs, agent_dicts = search_insta_influencers(
+    ensemble_json, unavailable = search_influencers_cached(
+        platform=Platform.INSTAGRAM,
         topic=req.topic,
         location=req.location,
         keywords=req.keywords,
         search_results=num_results,
     )
-    ensemble_json = [obj.to_dict() for obj in ensemble_objs]
-    return {"platform_data": ensemble_json}
+    return _platform_search_response(ensemble_json, unavailable)
 
 @app.post("/search_tiktok_influencers")
 def search_tiktok_influencers_endpoint(req: SearchInstaRequest = Body(...)):
@@ -219,7 +572,7 @@ def search_tiktok_influencers_endpoint(req: SearchInstaRequest = Body(...)):
         # Return static data
         with open("fyuze_influencers_infos_tiktok.json", "r", encoding="utf-8") as f:
             data = json.load(f)
-        return {"platform_data": data}
+        return _platform_search_response(data, [])
 
     num_results = req.search_results if req.search_results is not None else 10
     if num_results > 10:
@@ -228,14 +581,49 @@ def search_tiktok_influencers_endpoint(req: SearchInstaRequest = Body(...)):
         )
     elif num_results < 1:
         num_results = 1
-    ensemble_objs, agent_dicts = search_tiktok_influencers(
+    ensemble_json, unavailable = search_influencers_cached(
+        platform=Platform.TIKTOK,
         topic=req.topic,
         location=req.location,
         keywords=req.keywords,
         search_results=num_results,
     )
-    ensemble_json = [obj.to_dict() for obj in ensemble_objs]
-    return {"platform_data": ensemble_json}
+    return _platform_search_response(ensemble_json, unavailable)
+
+@app.post("/search_influencers_batch")
+def search_influencers_batch_endpoint(req: BatchSearchRequest = Body(...)):
+    """
+    Search many topic/location combos in one call, streaming NDJSON.
+
+    Queries shared between combos are run once and each username is crawled
+    once. Each line is one combo's result (``index``, ``combo``, ``usernames``,
+    ``profiles``) in completion order; the last line is a ``summary``.
+    """
+    if not req.combos:
+        raise HTTPException(status_code=400, detail="combos must not be empty.")
+    if len(req.combos) > BATCH_SEARCH_MAX_COMBOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BATCH_SEARCH_MAX_COMBOS} combos per batch.",
+        )
+    num_results = req.search_results if req.search_results is not None else 10
+    if num_results > 10:
+        raise HTTPException(
+            status_code=400, detail="search_results must be at most 10."
+        )
+    elif num_results < 1:
+        num_results = 1
+
+    def lines():
+        for item in batch_search_influencers(
+            combos=[combo.model_dump() for combo in req.combos],
+            platform=Platform.from_string(req.platform),
+            search_results=num_results,
+        ):
+            yield json.dumps(item, default=str) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 
 @app.post("/basic_search")
 def basic_search_endpoint(body: BasicSearchRequest = Body(...)):
@@ -247,7 +635,7 @@ def basic_search_endpoint(body: BasicSearchRequest = Body(...)):
             with open("basic_search.json", "r", encoding="utf-8") as f:
                 data = json.load(f)
             return data
-        result = basic_search(body.query, body.gl)
+        result = basic_search(body.query, body.gl, body.pages)
         return result.to_dict()
     except Exception as e:
         raise HTTPException(
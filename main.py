@@ -1,11 +1,297 @@
-from src.agent.fyuze_agent import fyuze_agent
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+
+from agno.run.response import (
+    RunResponseContentEvent,
+    ToolCallCompletedEvent,
+    ToolCallStartedEvent,
+)
+
+from src.agent.agent_pool import AgentPool
+from src.agent.fyuze_agent import build_fyuze_agent, build_fyuze_parser_agent
+from src.agent.intent_router import (
+    build_small_talk_agent,
+    record_route,
+    route_message,
+    run_tokens,
+)
+from src.core.prefetch import is_clarifying_question, schedule_prefetch
+from src.shared.context import emit_event
+from src.shared.enums import ChatRoute
+from src.shared.helpers import extract_usernames_from_text
+from src.shared.models.sys_models import FyuzeModel
+from src.shared.session_summary import (
+    SessionSummary,
+    compact_run_tool_messages,
+    load_session_summary,
+    update_session_summary,
+)
+from src.shared.tool_registry import ToolResultRegistry, tool_result_registry
+from src.shared.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Bounded pool of independent agent instances shared by all requests. Pooled
+# agents skip the parser model; replies are structured from the tool-result
+# registry instead
+fyuze_agent_pool = AgentPool(
+    factory=partial(build_fyuze_agent, structured_output=False)
+)
+
+_parse_lock = threading.Lock()
+_parse_counts = {"registry": 0, "parser_fallback": 0}
+
+
+def _count_parse(kind: str) -> None:
+    with _parse_lock:
+        _parse_counts[kind] += 1
+
+
+def response_parse_stats() -> dict:
+    """How replies were structured: from the tool registry or the parser model."""
+    with _parse_lock:
+        return dict(_parse_counts)
+
+
+def _parse_with_model(text: str) -> FyuzeModel:
+    """Fallback: structure the reply with the small parser model."""
+    try:
+        parsed = build_fyuze_parser_agent().run(text, stream=False).content
+    except Exception as e:
+        logger.warning(f"Parser model fallback failed: {e}")
+        parsed = None
+    if isinstance(parsed, FyuzeModel):
+        # The parser is told to copy the text verbatim; keep the original anyway
+        return parsed.model_copy(update={"text": text})
+    return FyuzeModel(text=text, role="assistant")
+
+
+def _to_fyuze_model(content, registry: ToolResultRegistry) -> FyuzeModel:
+    """Build the structured reply from the run's tool results.
+
+    Falls back to the parser model only when the reply mentions @handles that
+    no tool call of this run returned (e.g. follow-ups about earlier results).
+    """
+    if isinstance(content, FyuzeModel):
+        return content
+
+    text = content if isinstance(content, str) else str(content or "")
+    usernames, platform = registry.resolve(text)
+    if usernames or not extract_usernames_from_text(text):
+        _count_parse("registry")
+        return FyuzeModel(
+            text=text,
+            role="assistant",
+            influencers_usernames=usernames,
+            platform=platform,
+        )
+
+    _count_parse("parser_fallback")
+    return _parse_with_model(text)
+
+
+@contextmanager
+def _summarized_run(agent, session_id: str, summary: SessionSummary | None = None):
+    """Bind a tool-result registry and the session summary for one run.
+
+    The summary of earlier turns is handed to the agent through
+    ``additional_context`` and cleared again, since pooled agents serve
+    other sessions next.
+    """
+    summary = summary or load_session_summary(session_id)
+    agent.additional_context = summary.render() or None
+    try:
+        with tool_result_registry() as registry:
+            yield summary, registry
+    finally:
+        agent.additional_context = None
+
+
+def _finish_turn(
+    agent,
+    summary: SessionSummary,
+    registry: ToolResultRegistry,
+    message: str,
+    reply: FyuzeModel,
+    user_id: str,
+    session_id: str,
+) -> None:
+    """Fold the finished run into the session summary and shrink its tool
+    payloads in the stored history (failures only cost prompt size), then
+    start a speculative prefetch if the reply asks a clarifying question."""
+    asked_question = is_clarifying_question(reply.text, reply.influencers_usernames)
+    try:
+        if compact_run_tool_messages(agent, session_id):
+            agent.write_to_storage(session_id=session_id, user_id=user_id)
+        summary = update_session_summary(
+            session_id,
+            lambda s: s.add_turn(message, reply.text, registry.records, asked_question),
+            user_id,
+            summary,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to update session summary for {session_id}: {e}")
+
+    # While the user answers a clarifying question, warm up the search
+    if asked_question:
+        schedule_prefetch(summary.recent_turns)
+
+
+def _run_with_agent(
+    agent,
+    message: str,
+    user_id: str,
+    session_id: str,
+    summary: SessionSummary | None = None,
+):
+    # Agno remembers the last ``stream`` flag on the instance, so pooled runs
+    # always pass it explicitly
+    started = time.perf_counter()
+    with _summarized_run(agent, session_id, summary) as (summary, registry):
+        response = agent.run(
+            message=message,
+            user_id=user_id,
+            session_id=session_id,
+            stream=False,
+        )
+    record_route(ChatRoute.DISCOVERY, time.perf_counter() - started, run_tokens(response))
+    reply = _to_fyuze_model(response.content, registry)
+    _finish_turn(agent, summary, registry, message, reply, user_id, session_id)
+    return reply
+
+
+def _stream_with_agent(
+    agent,
+    message: str,
+    user_id: str,
+    session_id: str,
+    summary: SessionSummary | None = None,
+):
+    """Run the agent in streaming mode, forwarding tokens and tool calls as events.
+
+    Returns:
+        The ``FyuzeModel`` for the completed reply.
+    """
+    started = time.perf_counter()
+    with _summarized_run(agent, session_id, summary) as (summary, registry):
+        for event in agent.run(
+            message=message,
+            user_id=user_id,
+            session_id=session_id,
+            stream=True,
+            stream_intermediate_steps=True,
+        ):
+            if isinstance(event, RunResponseContentEvent):
+                if isinstance(event.content, str) and event.content:
+                    emit_event("token", {"text": event.content})
+            elif isinstance(event, ToolCallStartedEvent):
+                tool_name = event.tool.tool_name if event.tool else None
+                emit_event("tool_started", {"tool": tool_name})
+            elif isinstance(event, ToolCallCompletedEvent):
+                tool_name = event.tool.tool_name if event.tool else None
+                emit_event("tool_completed", {"tool": tool_name})
+    record_route(
+        ChatRoute.DISCOVERY,
+        time.perf_counter() - started,
+        run_tokens(agent.run_response),
+    )
+    reply = _to_fyuze_model(agent.run_response.content, registry)
+    _finish_turn(agent, summary, registry, message, reply, user_id, session_id)
+    return reply
+
+
+def _route_turn(message: str, session_id: str) -> tuple[ChatRoute, SessionSummary]:
+    """Pick the route for a turn from the message and the session summary."""
+    summary = load_session_summary(session_id)
+    route, decided_by = route_message(
+        message, summary.last_reply, summary.awaiting_answer
+    )
+    logger.info(f"Routed turn of {session_id} to {route} ({decided_by})")
+    return route, summary
+
+
+def _answer_small_talk(
+    message: str, user_id: str, session_id: str, summary: SessionSummary
+) -> FyuzeModel | None:
+    """Answer a small-talk turn with the small model.
+
+    The turn is recorded in the session summary so the agent sees it later.
+
+    Returns:
+        The reply, or None if the small model failed (the caller then falls
+        back to the agent).
+    """
+    prompt = message
+    if summary.recent_turns:
+        last = summary.recent_turns[-1]
+        prompt = (
+            f'Previous exchange - user: "{last["request"]}" / you: "{last["reply"]}"\n'
+            f"User: {message}"
+        )
+
+    started = time.perf_counter()
+    try:
+        response = build_small_talk_agent().run(prompt, stream=False)
+    except Exception as e:
+        logger.warning(f"Small talk model failed, using the agent: {e}")
+        return None
+    text = response.content if isinstance(response.content, str) else ""
+    if not text.strip():
+        return None
+    record_route(ChatRoute.SMALL_TALK, time.perf_counter() - started, run_tokens(response))
+
+    asked_question = is_clarifying_question(text, [])
+    update_session_summary(
+        session_id, lambda s: s.add_turn(message, text, [], asked_question), user_id, summary
+    )
+    return FyuzeModel(text=text, role="assistant")
 
 
 def run_agent(message: str, user_id: str, session_id: str):
-    """Run the Fyuze agent with the given message, user ID, and session ID"""
-    response = fyuze_agent.run(
-        message=message,
-        user_id=user_id,
-        session_id=session_id,
+    """Run the Fyuze agent with the given message, user ID, and session ID.
+
+    Small talk is answered by the fast path (see ``src.agent.intent_router``).
+    """
+    route, summary = _route_turn(message, session_id)
+    if route is ChatRoute.SMALL_TALK:
+        reply = _answer_small_talk(message, user_id, session_id, summary)
+        if reply is not None:
+            return reply
+    return fyuze_agent_pool.run(_run_with_agent, message, user_id, session_id, summary)
+
+
+async def run_agent_async(message: str, user_id: str, session_id: str):
+    """Run the Fyuze agent on the agent pool without blocking the event loop"""
+    route, summary = await asyncio.to_thread(_route_turn, message, session_id)
+    if route is ChatRoute.SMALL_TALK:
+        reply = await asyncio.to_thread(
+            _answer_small_talk, message, user_id, session_id, summary
+        )
+        if reply is not None:
+            return reply
+    return await fyuze_agent_pool.run_async(
+        _run_with_agent, message, user_id, session_id, summary
+    )
+
+
+async def run_agent_stream_async(message: str, user_id: str, session_id: str):
+    """Streaming variant of :func:`run_agent_async`.
+
+    Tokens, tool calls and pipeline progress are delivered to the event sink
+    bound in :mod:`src.shared.context`; the final ``FyuzeModel`` is returned.
+    Small-talk replies arrive as a single ``token`` event.
+    """
+    route, summary = await asyncio.to_thread(_route_turn, message, session_id)
+    if route is ChatRoute.SMALL_TALK:
+        reply = await asyncio.to_thread(
+            _answer_small_talk, message, user_id, session_id, summary
+        )
+        if reply is not None:
+            emit_event("token", {"text": reply.text})
+            return reply
+    return await fyuze_agent_pool.run_async(
+        _stream_with_agent, message, user_id, session_id, summary
     )
-    return response.content
@@ -0,0 +1,185 @@
+"""Benchmark /find-influencers style throughput as concurrent chat sessions grow.
+
+Runs agent turns through ``AgentPool.run_async`` exactly like the API does and
+reports throughput, latency percentiles and event-loop lag for increasing
+numbers of concurrent sessions. A blocking baseline (the agent run called
+directly on the event loop, as ``find_influencers`` used to do) is measured
+for comparison.
+
+By default a synthetic agent that sleeps for ``--latency`` seconds stands in
+for the Groq + Ensemble + Supabase round trip, so the benchmark needs no API
+keys. Pass ``--live`` to drive the real Fyuze agent instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.agent.agent_pool import AgentPool  # noqa: E402
+
+
+class SyntheticAgent:
+    """Blocking stand-in for the Fyuze agent with a fixed run latency."""
+
+    def __init__(self, latency: float):
+        self._latency = latency
+
+    def run(self, message: str, user_id: str, session_id: str):
+        time.sleep(self._latency)
+        return SimpleNamespace(content=f"echo: {message}")
+
+
+def _run_with_agent(agent, message: str, user_id: str, session_id: str):
+    return agent.run(message=message, user_id=user_id, session_id=session_id).content
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Return the worst event-loop scheduling delay observed until ``stop``."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def _session(run_turn, session_index: int, turns: int, latencies: list[float]):
+    for turn in range(turns):
+        started = time.perf_counter()
+        await run_turn(f"turn {turn}", "bench-user", f"bench-session-{session_index}")
+        latencies.append(time.perf_counter() - started)
+
+
+async def _bench(run_turn, sessions: int, turns: int) -> dict:
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(_session(run_turn, i, turns, latencies) for i in range(sessions))
+    )
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    loop_lag = await lag_task
+    latencies.sort()
+    return {
+        "sessions": sessions,
+        "requests": len(latencies),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_s": statistics.median(latencies),
+        "p95_s": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "max_loop_lag_s": loop_lag,
+    }
+
+
+def _print_table(title: str, rows: list[dict]) -> None:
+    print(f"\n{title}")
+    print(
+        f"{'sessions':>8} {'requests':>8} {'elapsed(s)':>10} {'req/s':>8} "
+        f"{'p50(s)':>8} {'p95(s)':>8} {'loop lag(s)':>11}"
+    )
+    for row in rows:
+        print(
+            f"{row['sessions']:>8} {row['requests']:>8} {row['elapsed_s']:>10.2f} "
+            f"{row['throughput_rps']:>8.2f} {row['p50_s']:>8.2f} {row['p95_s']:>8.2f} "
+            f"{row['max_loop_lag_s']:>11.3f}"
+        )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    if args.live:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        from src.agent.fyuze_agent import build_fyuze_agent
+
+        factory = build_fyuze_agent
+    else:
+
+        def factory():
+            return SyntheticAgent(args.latency)
+
+    session_counts = [int(x) for x in args.sessions.split(",") if x.strip()]
+
+    pool = AgentPool(factory=factory, size=args.pool_size, max_queue=10_000)
+
+    async def pooled_turn(message, user_id, session_id):
+        return await pool.run_async(_run_with_agent, message, user_id, session_id)
+
+    pooled_rows = [
+        await _bench(pooled_turn, sessions, args.turns) for sessions in session_counts
+    ]
+    _print_table(f"Agent pool (size={pool.size})", pooled_rows)
+    print(f"Pool stats: {pool.stats()}")
+    pool.shutdown()
+
+    if not args.skip_baseline:
+        baseline_agent = factory()
+
+        async def blocking_turn(message, user_id, session_id):
+            # Mirrors the old handler: a synchronous run inside ``async def``
+            return _run_with_agent(baseline_agent, message, user_id, session_id)
+
+        baseline_rows = [
+            await _bench(blocking_turn, sessions, args.turns)
+            for sessions in session_counts
+        ]
+        _print_table("Blocking baseline (run on the event loop)", baseline_rows)
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sessions",
+        default="1,2,4,8,16,32",
+        help="Comma-separated concurrent session counts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--turns",
+        type=int,
+        default=3,
+        help="Chat turns per session (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=8,
+        help="Agent pool size (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.5,
+        help="Synthetic agent run latency in seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Use the real Fyuze agent (requires API keys and MongoDB)",
+    )
+    parser.add_argument(
+        "--skip-baseline",
+        action="store_true",
+        help="Skip the blocking baseline measurement",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_argument_parser().parse_args(argv)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Check and benchmark profile URL canonicalization.
+
+Every URL of ``scripts/profile_url_corpus.json`` is parsed with its expected
+platform and compared with the expected username (null for URLs that are not
+profiles); mismatches are listed and make the script exit with status 1. The
+corpus is then run through ``canonicalize_profiles`` to report throughput
+with distinct URLs and with repeated URLs (memoized), next to the
+``url.split("/")[-2]`` extraction it replaces.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.shared.enums import Platform  # noqa: E402
+from src.shared.utils import url_canonicalizer  # noqa: E402
+from src.shared.utils.url_canonicalizer import (  # noqa: E402
+    canonicalize_profiles,
+    extract_username,
+)
+
+CORPUS = Path(__file__).resolve().parent / "profile_url_corpus.json"
+
+
+def check_corpus(corpus: list[dict]) -> int:
+    """Print the corpus mismatches and return their count."""
+    failures = 0
+    for case in corpus:
+        got = extract_username(case["url"], Platform(case["platform"]))
+        if got != case["username"]:
+            failures += 1
+            print(f"MISMATCH {case['url']!r}: expected {case['username']!r}, got {got!r}")
+    print(f"corpus: {len(corpus) - failures}/{len(corpus)} URLs as expected")
+    return failures
+
+
+def _time(fn, repeat: int, cold: bool = False) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if cold:
+            url_canonicalizer._parse.cache_clear()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _split_username(url: str) -> str | None:
+    # The extraction search_influencers used before the canonicalizer
+    parts = url.split("/")
+    return parts[-2] if len(parts) > 1 else None
+
+
+def bench(urls: list[str], unique: list[str], repeat: int) -> None:
+    runs = (
+        ("split('/')[-2]", lambda: [_split_username(url) for url in urls], urls, False),
+        ("unique URLs, cold", lambda: canonicalize_profiles(unique), unique, True),
+        ("repeated URLs, cold", lambda: canonicalize_profiles(urls), urls, True),
+        ("repeated URLs, warm", lambda: canonicalize_profiles(urls), urls, False),
+    )
+    for name, fn, batch, cold in runs:
+        elapsed = _time(fn, repeat, cold)
+        print(
+            f"{name:>20}: {len(batch)} URLs in {elapsed * 1000:.2f} ms "
+            f"({len(batch) / (elapsed * 1000):,.0f} URLs/ms)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--urls", type=int, default=100_000, help="URLs per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs (best is reported)")
+    args = parser.parse_args()
+
+    corpus = json.loads(CORPUS.read_text())
+    failures = check_corpus(corpus)
+    urls = [case["url"] for case in corpus]
+    repeated = (urls * (args.urls // len(urls) + 1))[: args.urls]
+    # Distinct URL strings: the corpus with a varying query parameter
+    unique = [
+        f"{url}{'&' if '?' in url else '?'}n={i}"
+        for i in range(args.urls // len(urls) + 1)
+        for url in urls
+    ][: args.urls]
+    bench(repeated, unique, args.repeat)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Bounded pool of agent instances executed off the event loop.
+
+Agno agents keep per-run state on the instance (run id, messages, session
+data), so a single module-level agent must not serve concurrent requests.
+``AgentPool`` lazily builds up to ``size`` independent instances, leases one
+per run, and executes runs on a dedicated thread pool of the same size so the
+FastAPI event loop stays free while Groq, Ensemble and Supabase calls block.
+Runs beyond ``size`` wait in that thread pool's queue, bounded in length by
+``max_queue`` and in time by ``acquire_timeout``.
+"""
+
+import asyncio
+import contextvars
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.shared.exceptions import FyuzeBaseException
+from src.shared.utils import get_logger, FyuzeLogger
+
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_ACQUIRE_TIMEOUT = 120.0
+
+
+class AgentPoolExhaustedError(FyuzeBaseException):
+    """Raised when no agent instance can be leased within the configured limits"""
+
+    pass
+
+
+class AgentPool:
+    """
+    Thread-safe pool of lazily created agent instances.
+
+    Args:
+        factory (Callable[[], Any]): Builds a new agent instance.
+        size (int, optional): Maximum number of instances, which is also the
+            maximum number of concurrent runs. Defaults to ``FYUZE_AGENT_POOL_SIZE``
+            or 8.
+        max_queue (int, optional): Maximum number of runs allowed to wait for a
+            free instance before new runs are rejected. Defaults to
+            ``FYUZE_AGENT_MAX_QUEUE`` or 64.
+        acquire_timeout (float, optional): Seconds a run may wait for a free
+            instance (queued runs included; one that waited longer is
+            rejected instead of started). Defaults to
+            ``FYUZE_AGENT_ACQUIRE_TIMEOUT`` or 120.
+
+    Example:
+        >>> pool = AgentPool(factory=build_fyuze_agent, size=4)
+        >>> pool.run(lambda agent: agent.run("hello").content)
+        >>> await pool.run_async(lambda agent: agent.run("hello").content)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+    ):
+        self._logger: FyuzeLogger = get_logger(__name__)
+        self._factory = factory
+        self._size = size or int(os.getenv("FYUZE_AGENT_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self._max_queue = (
+            max_queue
+            if max_queue is not None
+            else int(os.getenv("FYUZE_AGENT_MAX_QUEUE", DEFAULT_MAX_QUEUE))
+        )
+        self._acquire_timeout = (
+            acquire_timeout
+            if acquire_timeout is not None
+            else float(os.getenv("FYUZE_AGENT_ACQUIRE_TIMEOUT", DEFAULT_ACQUIRE_TIMEOUT))
+        )
+        if self._size <= 0:
+            raise ValueError("Agent pool size must be a positive integer")
+
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._size, thread_name_prefix="fyuze-agent"
+        )
+
+    @property
+    def size(self) -> int:
+        """Maximum number of agent instances (and concurrent runs)"""
+        return self._size
+
+    def _exhausted(self, waited: float) -> AgentPoolExhaustedError:
+        with self._lock:
+            self._rejected += 1
+        return AgentPoolExhaustedError(
+            f"No agent instance became available within {self._acquire_timeout}s "
+            f"(waited {waited:.1f}s)",
+            details=self.stats(),
+        )
+
+    def _checkout(self, timeout: float) -> Any:
+        """Take an idle instance, building a new one while under the size bound."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            should_build = self._created < self._size
+            if should_build:
+                self._created += 1
+
+        if should_build:
+            try:
+                self._logger.info(
+                    f"Building agent instance {self._created}/{self._size}"
+                )
+                return self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise self._exhausted(self._acquire_timeout) from None
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Lease an agent instance for the duration of the ``with`` block.
+
+        Args:
+            timeout: Seconds to wait for a free instance; defaults to the
+                acquire timeout.
+
+        Raises:
+            AgentPoolExhaustedError: If no instance is free within the timeout.
+        """
+        agent = self._checkout(self._acquire_timeout if timeout is None else timeout)
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield agent
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(agent)
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(agent, *args, **kwargs)`` on a leased agent in the calling thread.
+
+        Returns:
+            Whatever ``fn`` returns.
+        """
+        return self._run(None, fn, *args, **kwargs)
+
+    def _run(
+        self, timeout: Optional[float], fn: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        with self.lease(timeout) as agent:
+            try:
+                result = fn(agent, *args, **kwargs)
+            except Exception:
+                with self._lock:
+                    self._failed += 1
+                raise
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def _leave_queue(self, queued: List[bool]) -> None:
+        """Count a queued run out of ``waiting``, exactly once."""
+        with self._lock:
+            if queued[0]:
+                queued[0] = False
+                self._waiting -= 1
+
+    def _run_queued(
+        self, queued: List[bool], queued_at: float, fn: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        self._leave_queue(queued)
+        waited = time.monotonic() - queued_at
+        if waited >= self._acquire_timeout:
+            raise self._exhausted(waited)
+        return self._run(self._acquire_timeout - waited, fn, *args, **kwargs)
+
+    async def run_async(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(agent, *args, **kwargs)`` on the pool's threads without blocking
+        the event loop.
+
+        Raises:
+            AgentPoolExhaustedError: If the wait queue is full, or the run
+                waited longer than the acquire timeout.
+        """
+        with self._lock:
+            if self._waiting >= self._max_queue:
+                self._rejected += 1
+                raise AgentPoolExhaustedError(
+                    f"Agent pool queue is full ({self._max_queue} runs waiting)",
+                    details=self._stats_unlocked(),
+                )
+            self._waiting += 1
+        queued = [True]
+
+        # run_in_executor does not carry contextvars over; copy them explicitly
+        # so the run sees the caller's request context
+        ctx = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor,
+                partial(
+                    ctx.run, self._run_queued, queued, time.monotonic(), fn, *args, **kwargs
+                ),
+            )
+        finally:
+            # A run cancelled while queued (e.g. a client disconnected) never
+            # starts, so it leaves the queue here
+            self._leave_queue(queued)
+
+    def _stats_unlocked(self) -> Dict[str, Any]:
+        return {
+            "size": self._size,
+            "created": self._created,
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool utilisation counters."""
+        with self._lock:
+            return self._stats_unlocked()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting runs and release the worker threads."""
+        self._executor.shutdown(wait=wait)
@@ -1,5 +1,10 @@
+import os
+import threading
+from typing import Any, Optional
+
 from agno.agent import Agent
-from agno.models.groq import Groq
+from src.shared.groq_model import RateLimitedGroq
+from src.agent.parallel_tools import ParallelToolGroq
 from src.shared.helpers import (
     search_instagram_influencers,
     search_tiktoks_influencers,
@@ -12,15 +17,7 @@ from src.shared.models.sys_models import FyuzeModel
 from src.shared.utils.storage import storage
 
 
-# Single unified Fyuze Agent with all capabilities
-fyuze_agent = Agent(
-    name="Fyuze Marketing Assistant",
-    agent_id="FYUZE-UNIFIED-v2.0",
-    model=Groq(
-        id="openai/gpt-oss-120b",
-        temperature=0.05,
-    ),
-    system_message="""
+FYUZE_SYSTEM_MESSAGE = """
     ### System
 You are Fyuze, the friendly interactive influencer discovery assistant for Instagram and TikTok and expert in marketing and branding.
 
@@ -86,31 +83,9 @@ Mission
 - If the user asks about a specific website and it turns out to contain nsfw content, politely inform them that you cannot analyze such websites and ask if they have another site in mind.
 - Use the off-topic reminder ("I specialize in finding influencers on Instagram and TikTok...") only when the conversation clearly moves away from influencer discovery or marketing goals.
 
-""",
-    tools=[
-        analyze_website,
-        search_instagram_influencers,
-        search_tiktoks_influencers,
-        search_tiktok_and_instagram_influencers,
-        get_instagram_profiles_by_usernames,
-        get_tiktok_profiles_by_usernames,
-    ],
-    add_history_to_messages=True,
-    num_history_runs=10,
-    debug_mode=True,  #! to be turned off
-    retries=3,
-    delay_between_retries=2,
-    exponential_backoff=True,
-    storage=storage,
-    add_datetime_to_instructions=True,
-    enable_user_memories=False,
-    add_memory_references=False,
-    response_model=FyuzeModel,
-    parser_model=Groq(
-        id="openai/gpt-oss-20b",
-        temperature=0.5,
-    ),
-    parser_model_prompt="""
+"""
+
+FYUZE_PARSER_PROMPT = """
 ### System
 You are a non-interactive parser. The input is exactly one assistant message generated by the Fyuze agent. Do not respond to the agent or the user—only return structured data.
 
@@ -131,5 +106,121 @@ Output a single JSON object with these fields:
 {"text": "I'm happy to help you find influencers!", "role": "assistant", "influencers_usernames": [], "platform": null}
 {"text": "Here are 3 fitness influencers: 1. @user1...", "role": "assistant", "influencers_usernames": ["user1", "user2", "user3"], "platform": "instagram"}
 {"text": "You might want to check out @user1 and @user2", "role": "assistant", "influencers_usernames": ["user1","user2"], "platform": null}
-""",
-)
+"""
+
+# Past runs replayed in full on each turn; older turns reach the agent through
+# the rolling session summary (see src.shared.session_summary)
+FYUZE_AGENT_HISTORY_RUNS = int(os.getenv("FYUZE_AGENT_HISTORY_RUNS", "2"))
+
+# Website crawls are the slowest tool; searches use AGENT_TOOL_TIMEOUT_SECONDS
+FYUZE_TOOL_TIMEOUTS = {
+    "analyze_website": float(os.getenv("AGENT_WEBSITE_TOOL_TIMEOUT_SECONDS", "60")),
+}
+
+
+def _fyuze_system_message(agent: Agent) -> str:
+    """System prompt plus the per-run ``additional_context`` (session summary).
+
+    Agno ignores ``additional_context`` when ``system_message`` is given, so
+    the pooled agents append it here.
+    """
+    if agent.additional_context:
+        return f"{FYUZE_SYSTEM_MESSAGE}\n{agent.additional_context}\n"
+    return FYUZE_SYSTEM_MESSAGE
+
+
+def build_fyuze_agent(structured_output: bool = True) -> Agent:
+    """Build a new, independent instance of the unified Fyuze agent.
+
+    Each instance owns its own model clients and run state, so instances can be
+    pooled and used concurrently (see :mod:`src.agent.agent_pool`).
+
+    Args:
+        structured_output: Parse every reply into ``FyuzeModel`` with the
+            parser model. The API passes False and builds ``FyuzeModel`` from
+            the tool-result registry instead (see :mod:`src.shared.tool_registry`),
+            saving an LLM round trip per reply.
+    """
+    structured_kwargs = (
+        dict(
+            response_model=FyuzeModel,
+            parser_model=RateLimitedGroq(
+                id="openai/gpt-oss-20b",
+                temperature=0.5,
+            ),
+            parser_model_prompt=FYUZE_PARSER_PROMPT,
+        )
+        if structured_output
+        else {}
+    )
+    return Agent(
+        name="Fyuze Marketing Assistant",
+        agent_id="FYUZE-UNIFIED-v2.0",
+        # Independent tool calls of one turn run concurrently
+        model=ParallelToolGroq(
+            id="openai/gpt-oss-120b",
+            temperature=0.05,
+            tool_timeouts=FYUZE_TOOL_TIMEOUTS,
+        ),
+        system_message=_fyuze_system_message,
+        tools=[
+            analyze_website,
+            search_instagram_influencers,
+            search_tiktoks_influencers,
+            search_tiktok_and_instagram_influencers,
+            get_instagram_profiles_by_usernames,
+            get_tiktok_profiles_by_usernames,
+        ],
+        add_history_to_messages=True,
+        num_history_runs=FYUZE_AGENT_HISTORY_RUNS,
+        debug_mode=True,  #! to be turned off
+        retries=3,
+        delay_between_retries=2,
+        exponential_backoff=True,
+        storage=storage,
+        add_datetime_to_instructions=True,
+        enable_user_memories=False,
+        add_memory_references=False,
+        **structured_kwargs,
+    )
+
+
+def build_fyuze_parser_agent() -> Agent:
+    """Build a standalone parser that turns one Fyuze reply into ``FyuzeModel``.
+
+    Used as a fallback when a reply mentions handles that no tool call of the
+    current run produced.
+    """
+    return Agent(
+        name="Fyuze Reply Parser",
+        model=RateLimitedGroq(
+            id="openai/gpt-oss-20b",
+            temperature=0.5,
+        ),
+        system_message=FYUZE_PARSER_PROMPT,
+        response_model=FyuzeModel,
+        retries=2,
+    )
+
+
+_shared_agent: Optional[Agent] = None
+_shared_agent_lock = threading.Lock()
+
+
+def get_fyuze_agent() -> Agent:
+    """Single unified Fyuze Agent for scripts and notebooks, built on first use.
+
+    The API serves requests from the agent pool in main.py and never builds it.
+    """
+    global _shared_agent
+    with _shared_agent_lock:
+        if _shared_agent is None:
+            _shared_agent = build_fyuze_agent()
+        return _shared_agent
+
+
+def __getattr__(name: str) -> Any:
+    # ``from src.agent.fyuze_agent import fyuze_agent`` builds the agent lazily
+    if name == "fyuze_agent":
+        return get_fyuze_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
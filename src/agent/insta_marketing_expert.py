@@ -1,16 +1,9 @@
 from agno.agent import Agent
-from agno.models.groq import Groq
+from src.shared.groq_model import RateLimitedGroq
 from src.shared.models.marketing_insights_report import MarketingInsightsReport
 
-# Single unified Fyuze Agent with all capabilities
-insta_marketing_expert = Agent(
-    name="Insta Marketing Expert",
-    agent_id="insta_marketing_expert_v1",
-    model=Groq(
-        id="openai/gpt-oss-120b",
-        temperature=0.6,
-    ),
-    system_message="""
+
+INSTA_MARKETING_EXPERT_SYSTEM_MESSAGE = """
     You are a senior marketing strategist and audience intelligence expert with over 10 years of experience in digital growth, brand positioning, and social analytics.
 
     You are given:
@@ -62,11 +55,32 @@ insta_marketing_expert = Agent(
     OUTPUT FORMAT
 
     Produce a valid instance of the following Pydantic model (JSON-compatible).
-""",
-    debug_mode=True,  #! to be turned off
-    retries=3,
-    delay_between_retries=2,
-    exponential_backoff=True,
-    add_datetime_to_instructions=True,
-    response_model=MarketingInsightsReport,
-)
+"""
+
+
+def build_insta_marketing_expert() -> Agent:
+    """Build a new marketing expert agent.
+
+    Agno agents keep per-run state on the instance, so concurrent report
+    generation (e.g. background jobs) needs one instance per run.
+    """
+    return Agent(
+        name="Insta Marketing Expert",
+        agent_id="insta_marketing_expert_v1",
+        model=RateLimitedGroq(
+            id="openai/gpt-oss-120b",
+            temperature=0.6,
+        ),
+        system_message=INSTA_MARKETING_EXPERT_SYSTEM_MESSAGE,
+        debug_mode=True,  #! to be turned off
+        retries=3,
+        delay_between_retries=2,
+        exponential_backoff=True,
+        add_datetime_to_instructions=True,
+        response_model=MarketingInsightsReport,
+    )
+
+
+# Shared marketing expert for scripts; concurrent report generation builds
+# its own instance with build_insta_marketing_expert()
+insta_marketing_expert = build_insta_marketing_expert()
@@ -0,0 +1,37 @@
+from agno.agent import Agent
+from src.shared.groq_model import RateLimitedGroq
+from src.shared.models.sys_models import DiscoveryIntent
+
+
+INTENT_EXTRACTOR_SYSTEM_MESSAGE = """
+### System
+You extract influencer discovery parameters from a conversation between a user and Fyuze, an influencer discovery assistant. Do not reply to the conversation—only return structured data.
+
+### Instructions
+Return a single JSON object with these fields:
+- "topic": the niche or topic of the creators the user wants, in a few words as the user phrased it (e.g. "fitness", "vegan food"). null if not stated.
+- "location": the target location, as "City, Country" or "Country" (e.g. "Dubai, UAE"). null if not stated.
+- "platform": "instagram", "tiktok", or "both" if the user asked for both. null if not stated.
+
+### Rules
+- Use only what the user said; never guess missing values.
+- Later messages override earlier ones.
+"""
+
+
+def build_intent_extractor() -> Agent:
+    """Build a small-model agent that reads discovery parameters from a chat.
+
+    Used by the speculative prefetch stage (see :mod:`src.core.prefetch`);
+    one instance per call, since agno agents keep per-run state.
+    """
+    return Agent(
+        name="Fyuze Intent Extractor",
+        model=RateLimitedGroq(
+            id="openai/gpt-oss-20b",
+            temperature=0,
+        ),
+        system_message=INTENT_EXTRACTOR_SYSTEM_MESSAGE,
+        response_model=DiscoveryIntent,
+        retries=1,
+    )
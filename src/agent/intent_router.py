@@ -0,0 +1,307 @@
+"""
+Fast-path router in front of the Fyuze agent.
+
+Greetings, thanks and casual chatter do not need ``gpt-oss-120b``, the tools
+or the replayed history. :func:`route_message` decides where a turn goes:
+rules settle the clear cases (pure greetings/thanks go to small talk; URLs,
+handles and discovery vocabulary go to the agent, as does any answer to a
+clarifying question), and only the remaining short, ambiguous messages are
+classified by a small model. Small talk is answered by a ``gpt-oss-20b``
+agent with a short prompt. Latency and tokens are recorded per route.
+"""
+
+import itertools
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from agno.agent import Agent
+from src.shared.groq_model import RateLimitedGroq
+
+from src.shared.enums import ChatRoute
+from src.shared.models.sys_models import RouteDecision
+from src.shared.utils import get_logger, FyuzeLogger
+
+logger: FyuzeLogger = get_logger(__name__)
+
+FAST_PATH_ROUTER = os.getenv("FAST_PATH_ROUTER", "1") == "1"
+
+# Messages longer than this always go to the agent
+_MAX_SMALL_TALK_WORDS = 12
+
+
+
+def _phrases(*parts: str) -> Set[Tuple[str, ...]]:
+    """Word tuples of a phrase; each part lists alternatives (``""`` = optional)."""
+    return {
+        tuple(word for word in words if word)
+        for words in itertools.product(*(part.split("|") for part in parts))
+    }
+
+
+# Small talk is a sequence of these phrases, each optionally followed by fillers.
+# Matching words against sets (instead of one nested regex) keeps it linear.
+_SMALL_TALK_PHRASES: Set[Tuple[str, ...]] = set().union(
+    _phrases(
+        "hi|hello|hey|heya|yo|sup|hola|salam|marhaba|gm|good|fine|great|awesome|"
+        "cool|nice|ok|okay|k|thanks|thank|thx|ty|bye|goodbye|cheers|lol|haha"
+    ),
+    _phrases("good", "morning|afternoon|evening|night"),
+    _phrases("how", "are", "you|u", "|doing", "|today"),
+    _phrases("hows|how", "it|is|its", "going"),
+    _phrases("whats|wats|what", "up|new"),
+    _phrases("im|i", "|am", "good|fine|great|ok|okay"),
+    _phrases("all", "good"),
+    _phrases("thanks|thank", "a|so", "lot|much"),
+    _phrases("thank", "you|u", "|so", "|much"),
+    _phrases("see", "you|ya"),
+)
+_SMALL_TALK_FILLERS: Set[Tuple[str, ...]] = set().union(
+    _phrases("fyuze|there|buddy|friend|man|bro|again|too|you"),
+    _phrases("and", "you"),
+)
+_LONGEST_SMALL_TALK_PHRASE = max(map(len, _SMALL_TALK_PHRASES | _SMALL_TALK_FILLERS))
+
+# Drawn-out words: "heyyy", "hiii", "hahaha"
+_ELONGATED_WORDS = (
+    (re.compile(r"hey+"), "hey"),
+    (re.compile(r"hii+"), "hi"),
+    (re.compile(r"ha(?:ha)+h?"), "haha"),
+)
+_NOT_SMALL_TALK_CHARS = re.compile(r"[^a-z\s!?.,:)('’]")
+_WORD = re.compile(r"[a-z]+")
+
+
+def _small_talk_word(word: str) -> str:
+    for pattern, canonical in _ELONGATED_WORDS:
+        if pattern.fullmatch(word):
+            return canonical
+    return word
+
+
+def is_small_talk(text: str) -> bool:
+    """
+    Whether a message is only greetings, thanks and pleasantries.
+
+    Example:
+        >>> is_small_talk("hey there, how's it going?")
+        True
+        >>> is_small_talk("hey, any vegan chefs?")
+        False
+    """
+    text = text.lower()
+    if _NOT_SMALL_TALK_CHARS.search(text):
+        return False
+    words = [
+        _small_talk_word(word)
+        for word in _WORD.findall(text.replace("'", "").replace("’", ""))
+    ]
+    # Positions reachable by a sequence of phrases (fillers only after a phrase)
+    reachable = {0}
+    for start in range(len(words)):
+        if start not in reachable:
+            continue
+        for length in range(1, _LONGEST_SMALL_TALK_PHRASE + 1):
+            chunk = tuple(words[start : start + length])
+            if len(chunk) < length:
+                break
+            if chunk in _SMALL_TALK_PHRASES or (start and chunk in _SMALL_TALK_FILLERS):
+                reachable.add(start + length)
+    return bool(words) and len(words) in reachable
+
+
+_DISCOVERY_PATTERN = re.compile(
+    r"https?://|www\.|\.(?:com|net|org|io|co|ae|sa)\b|@\w|#\w|"
+    r"\b(?:influencers?|creators?|bloggers?|vloggers?|instagram|insta|ig|tiktok|tik\s+tok|"
+    r"followers?|engagement|campaigns?|brands?|marketing|niche|audience|collab\w*|"
+    r"find|search|look(?:ing)?\s+for|recommend\w*|suggest\w*|profiles?|accounts?|"
+    r"website|business|products?|shop|store|report|analy[sz]e)\b",
+    re.IGNORECASE,
+)
+
+ROUTER_SYSTEM_MESSAGE = """
+You route messages sent to Fyuze, an influencer discovery assistant for Instagram and TikTok.
+Answer "small_talk" only for greetings, thanks, compliments and casual chat that need no data.
+Answer "discovery" for anything that could relate to finding influencers, marketing, brands, websites, or that answers the assistant's previous question.
+When unsure, answer "discovery".
+"""
+
+SMALL_TALK_SYSTEM_MESSAGE = """
+You are Fyuze, a warm, playful influencer discovery assistant and marketing buddy for Instagram and TikTok.
+Reply to the user's casual message in 1-2 short, natural sentences, like a kind friend (one emoji is fine).
+On a first greeting, ask one small friendly question back. If the chat has already been casual for a bit, gently mention that you can find the right Instagram or TikTok creators for their brand.
+Never invent influencer data, never mention tools or internal details, and vary your wording.
+"""
+
+_stats_lock = threading.Lock()
+_route_stats: Dict[str, Dict[str, float]] = {
+    route.value: {"turns": 0, "seconds": 0.0, "tokens": 0} for route in ChatRoute
+}
+_decision_stats = {"rule": 0, "model": 0, "fallback": 0, "disabled": 0}
+_classifier_stats = {"calls": 0, "seconds": 0.0, "tokens": 0}
+
+
+def run_tokens(run_response: Any) -> int:
+    """Total model tokens of an agno run (0 when metrics are unavailable)."""
+    metrics = getattr(run_response, "metrics", None) or {}
+    total = metrics.get("total_tokens") if isinstance(metrics, dict) else None
+    if isinstance(total, list):
+        return int(sum(total))
+    return int(total or 0)
+
+
+def build_router_agent() -> Agent:
+    """Small-model classifier for messages the rules cannot settle."""
+    return Agent(
+        name="Fyuze Intent Router",
+        model=RateLimitedGroq(
+            id="openai/gpt-oss-20b",
+            temperature=0,
+        ),
+        system_message=ROUTER_SYSTEM_MESSAGE,
+        response_model=RouteDecision,
+        retries=1,
+    )
+
+
+def build_small_talk_agent() -> Agent:
+    """Small-model agent answering greetings and casual chat (no tools, no storage)."""
+    return Agent(
+        name="Fyuze Small Talk",
+        model=RateLimitedGroq(
+            id="openai/gpt-oss-20b",
+            temperature=0.7,
+        ),
+        system_message=SMALL_TALK_SYSTEM_MESSAGE,
+        retries=2,
+    )
+
+
+def _classify_with_model(message: str, last_reply: Optional[str]) -> Optional[ChatRoute]:
+    prompt = (
+        f"Assistant's previous message: {last_reply or '(none)'}\n"
+        f"User message: {message}"
+    )
+    started = time.perf_counter()
+    try:
+        response = build_router_agent().run(prompt, stream=False)
+    except Exception as e:
+        logger.warning(f"Router model failed: {e}")
+        return None
+    finally:
+        elapsed = time.perf_counter() - started
+        with _stats_lock:
+            _classifier_stats["calls"] += 1
+            _classifier_stats["seconds"] += elapsed
+    with _stats_lock:
+        _classifier_stats["tokens"] += run_tokens(response)
+    decision = response.content
+    if isinstance(decision, RouteDecision):
+        return ChatRoute(decision.route)
+    return None
+
+
+def route_message(
+    message: str, last_reply: Optional[str] = None, awaiting_answer: bool = False
+) -> Tuple[ChatRoute, str]:
+    """
+    Decide whether a chat turn needs the full agent.
+
+    Args:
+        message: The user's message.
+        last_reply: The assistant's previous reply, if any.
+        awaiting_answer: The previous reply asked the user a question.
+
+    Returns:
+        ``(route, decided_by)`` where ``decided_by`` is ``rule``, ``model``,
+        ``fallback`` (classifier failed) or ``disabled``.
+
+    Example:
+        >>> route_message("hey there!")
+        (<ChatRoute.SMALL_TALK: 'small_talk'>, 'rule')
+        >>> route_message("ok", last_reply="Search Dubai food creators?", awaiting_answer=True)
+        (<ChatRoute.DISCOVERY: 'discovery'>, 'rule')
+    """
+    route, decided_by = _route(message, last_reply, awaiting_answer)
+    with _stats_lock:
+        _decision_stats[decided_by] += 1
+    return route, decided_by
+
+
+def _route(
+    message: str, last_reply: Optional[str], awaiting_answer: bool
+) -> Tuple[ChatRoute, str]:
+    if not FAST_PATH_ROUTER:
+        return ChatRoute.DISCOVERY, "disabled"
+
+    text = (message or "").strip()
+    if not text:
+        return ChatRoute.DISCOVERY, "rule"
+    # "ok" / "great" answering a clarifying question confirms the search
+    if awaiting_answer or _DISCOVERY_PATTERN.search(text):
+        return ChatRoute.DISCOVERY, "rule"
+    if len(text.split()) > _MAX_SMALL_TALK_WORDS:
+        return ChatRoute.DISCOVERY, "rule"
+    if is_small_talk(text):
+        return ChatRoute.SMALL_TALK, "rule"
+
+    route = _classify_with_model(text, last_reply)
+    if route is None:
+        return ChatRoute.DISCOVERY, "fallback"
+    return route, "model"
+
+
+def record_route(route: ChatRoute, seconds: float, tokens: int) -> None:
+    """Record the latency and model tokens of one answered turn."""
+    with _stats_lock:
+        stats = _route_stats[route.value]
+        stats["turns"] += 1
+        stats["seconds"] += seconds
+        stats["tokens"] += tokens
+
+
+def router_stats() -> Dict[str, Any]:
+    """
+    Per-route turns, average latency and tokens, and the estimated savings of
+    answering small talk without the agent.
+    """
+    with _stats_lock:
+        routes = {name: dict(values) for name, values in _route_stats.items()}
+        decisions = dict(_decision_stats)
+        classifier = dict(_classifier_stats)
+
+    def averaged(values: Dict[str, float]) -> Dict[str, Any]:
+        turns = values["turns"] or 0
+        return {
+            "turns": int(turns),
+            "avg_latency_ms": round(1000 * values["seconds"] / turns, 1) if turns else None,
+            "avg_tokens": round(values["tokens"] / turns) if turns else None,
+        }
+
+    result: Dict[str, Any] = {name: averaged(values) for name, values in routes.items()}
+    small_talk = result[ChatRoute.SMALL_TALK.value]
+    discovery = result[ChatRoute.DISCOVERY.value]
+    if small_talk["turns"] and discovery["turns"]:
+        result["estimated_savings"] = {
+            "seconds": round(
+                small_talk["turns"]
+                * (discovery["avg_latency_ms"] - small_talk["avg_latency_ms"])
+                / 1000,
+                1,
+            ),
+            "tokens": small_talk["turns"]
+            * (discovery["avg_tokens"] - small_talk["avg_tokens"]),
+        }
+    result["decided_by"] = decisions
+    result["classifier"] = {
+        "calls": int(classifier["calls"]),
+        "avg_latency_ms": (
+            round(1000 * classifier["seconds"] / classifier["calls"], 1)
+            if classifier["calls"]
+            else None
+        ),
+        "tokens": int(classifier["tokens"]),
+    }
+    return result
@@ -0,0 +1,291 @@
+"""
+Concurrent execution of the tool calls of one model turn.
+
+Agno's synchronous ``Model.run_function_calls`` executes the tool calls of a
+turn one after another, so a turn that analyzes a website and searches both
+platforms takes the sum of all three. :class:`ParallelToolCallsMixin` replaces
+it for models used by the Fyuze agent: independent calls of the same turn run
+on a shared executor (with the request context propagated) and the turn takes
+as long as its slowest tool. A tool that exceeds its timeout is reported to
+the model as a failed call, and the results of the other tools are kept. The
+timed-out call is cancelled if it has not started; otherwise it runs to the
+end under a set cancellation event (see ``src.shared.context``), so its
+registry records, stored influencer data and progress events are dropped.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Iterator as IteratorABC
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from agno.exceptions import AgentRunException
+from agno.models.message import Message
+from agno.models.response import ModelResponse, ModelResponseEvent, ToolExecution
+from agno.run.response import RunResponseContentEvent
+from agno.tools.function import FunctionCall
+from agno.utils.timer import Timer
+
+from src.shared.context import ContextThreadPoolExecutor, cancellation_scope
+from src.shared.groq_model import RateLimitedGroq
+from src.shared.utils import get_logger, FyuzeLogger
+
+logger: FyuzeLogger = get_logger(__name__)
+
+# Threads shared by the tool calls of all agent runs in the process
+AGENT_TOOL_WORKERS = int(os.getenv("AGENT_TOOL_WORKERS", "16"))
+# Seconds a tool may run before the turn continues without its result
+AGENT_TOOL_TIMEOUT_SECONDS = float(os.getenv("AGENT_TOOL_TIMEOUT_SECONDS", "120"))
+
+TOOL_EXECUTOR = ContextThreadPoolExecutor(
+    max_workers=AGENT_TOOL_WORKERS, thread_name_prefix="fyuze-tool"
+)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "turns": 0,
+    "parallel_turns": 0,
+    "tool_calls": 0,
+    "timeouts": 0,
+    "tool_seconds": 0.0,
+    "wall_seconds": 0.0,
+}
+
+
+def _needs_sequential(function_call: FunctionCall) -> bool:
+    """Calls that pause the run for the user are left to agno."""
+    function = function_call.function
+    return bool(
+        function.requires_confirmation
+        or function.requires_user_input
+        or function.external_execution
+        or function.name == "get_user_input"
+    )
+
+
+def _execute(
+    function_call: FunctionCall, cancelled: threading.Event
+) -> tuple[bool, str, Optional[AgentRunException]]:
+    """Run one call in a worker thread and render its output as agno would."""
+    agent_exception = None
+    try:
+        with cancellation_scope(cancelled):
+            success = function_call.execute().status == "success"
+    except AgentRunException as exc:
+        success, agent_exception = False, exc
+
+    result = function_call.result
+    if isinstance(result, IteratorABC) and not isinstance(result, (str, bytes)):
+        # Generator tools are drained here; only their content is kept
+        output = ""
+        for item in result:
+            if isinstance(item, RunResponseContentEvent):
+                output += str(item.content or "")
+            else:
+                output += str(item)
+    else:
+        output = str(result)
+    return success, output, agent_exception
+
+
+def _agent_exception_messages(exc: AgentRunException) -> List[Message]:
+    """Messages an ``AgentRunException`` adds to the conversation, as agno does."""
+    messages: List[Message] = []
+    for role, content in (("user", exc.user_message), ("assistant", exc.agent_message)):
+        if content is not None:
+            messages.append(
+                Message(role=role, content=content) if isinstance(content, str) else content
+            )
+    for message in exc.messages or []:
+        if isinstance(message, Message):
+            messages.append(message)
+        elif isinstance(message, dict):
+            try:
+                messages.append(Message(**message))
+            except Exception as e:
+                logger.warning(f"Failed to convert dict to Message: {e}")
+    if exc.stop_execution:
+        for message in messages:
+            message.stop_after_tool_call = True
+    return messages
+
+
+class ParallelToolCallsMixin:
+    """
+    Run the tool calls of one model turn concurrently.
+
+    Mix in before an agno model class. ``tool_timeouts`` maps tool names to
+    timeouts in seconds; other tools use ``AGENT_TOOL_TIMEOUT_SECONDS``.
+    Turns containing calls that pause the run (confirmation, user input,
+    external execution) fall back to agno's sequential implementation.
+
+    Example:
+        >>> model = ParallelToolGroq(id="openai/gpt-oss-120b", tool_timeouts={"analyze_website": 60})
+    """
+
+    tool_timeouts: Optional[Dict[str, float]] = None
+
+    def _tool_timeout(self, name: str) -> float:
+        return (self.tool_timeouts or {}).get(name, AGENT_TOOL_TIMEOUT_SECONDS)
+
+    def run_function_calls(
+        self,
+        function_calls: List[FunctionCall],
+        function_call_results: List[Message],
+        additional_messages: Optional[List[Message]] = None,
+        current_function_call_count: int = 0,
+        function_call_limit: Optional[int] = None,
+    ) -> Iterator[Any]:
+        if any(_needs_sequential(fc) for fc in function_calls):
+            yield from super().run_function_calls(  # type: ignore[misc]
+                function_calls=function_calls,
+                function_call_results=function_call_results,
+                additional_messages=additional_messages,
+                current_function_call_count=current_function_call_count,
+                function_call_limit=function_call_limit,
+            )
+            return
+
+        if additional_messages is None:
+            additional_messages = []
+
+        # Calls beyond the tool call limit are answered with agno's error result
+        runnable: List[FunctionCall] = []
+        results: Dict[str, Message] = {}
+        for fc in function_calls:
+            if function_call_limit is not None:
+                current_function_call_count += 1
+                if current_function_call_count > function_call_limit:
+                    results[fc.call_id] = self.create_tool_call_limit_error_result(fc)  # type: ignore[attr-defined]
+                    continue
+            runnable.append(fc)
+
+        turn_started = time.perf_counter()
+        futures: Dict[Future, FunctionCall] = {}
+        timers: Dict[Future, Timer] = {}
+        deadlines: Dict[Future, float] = {}
+        cancel_events: Dict[Future, threading.Event] = {}
+        for fc in runnable:
+            yield ModelResponse(
+                content=fc.get_call_str(),
+                tool_executions=[
+                    ToolExecution(
+                        tool_call_id=fc.call_id,
+                        tool_name=fc.function.name,
+                        tool_args=fc.arguments,
+                    )
+                ],
+                event=ModelResponseEvent.tool_call_started.value,
+            )
+            timer = Timer()
+            timer.start()
+            cancelled = threading.Event()
+            future = TOOL_EXECUTOR.submit(_execute, fc, cancelled)
+            futures[future] = fc
+            cancel_events[future] = cancelled
+            timers[future] = timer
+            deadlines[future] = time.monotonic() + self._tool_timeout(fc.function.name)
+
+        pending = set(futures)
+        tool_seconds = 0.0
+        timeouts = 0
+        while pending:
+            timeout = max(0.0, min(deadlines[f] for f in pending) - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            expired = {f for f in pending if deadlines[f] <= time.monotonic()}
+            pending -= expired
+            for future in expired:
+                fc = futures[future]
+                # Not started: free its slot; running: drop its late results
+                cancel_events[future].set()
+                future.cancel()
+                limit = self._tool_timeout(fc.function.name)
+                logger.warning(f"Tool {fc.function.name} timed out after {limit:.0f}s")
+                fc.error = (
+                    f"Tool {fc.function.name} timed out after {limit:.0f} seconds. "
+                    "Continue with the results of the other tools and tell the user "
+                    "this part is unavailable right now."
+                )
+                timeouts += 1
+                timers[future].stop()
+                tool_seconds += timers[future].elapsed
+                yield from self._complete_call(fc, False, "", timers[future], results)
+
+            for future in done:
+                fc = futures[future]
+                try:
+                    success, output, agent_exception = future.result()
+                except Exception as e:
+                    # Matches agno: unexpected tool errors abort the run
+                    logger.error(f"Error executing function {fc.function.name}: {e}")
+                    raise
+                if agent_exception is not None:
+                    additional_messages.extend(_agent_exception_messages(agent_exception))
+                timers[future].stop()
+                tool_seconds += timers[future].elapsed
+                if fc.function.show_result:
+                    yield ModelResponse(content=output)
+                yield from self._complete_call(fc, success, output, timers[future], results)
+
+        # Keep the model's call order in the conversation
+        function_call_results.extend(
+            results[fc.call_id] for fc in function_calls if fc.call_id in results
+        )
+        if additional_messages:
+            function_call_results.extend(additional_messages)
+
+        with _stats_lock:
+            _stats["turns"] += 1
+            _stats["parallel_turns"] += len(runnable) > 1
+            _stats["tool_calls"] += len(runnable)
+            _stats["timeouts"] += timeouts
+            _stats["tool_seconds"] += tool_seconds
+            _stats["wall_seconds"] += time.perf_counter() - turn_started
+
+    def _complete_call(
+        self,
+        fc: FunctionCall,
+        success: bool,
+        output: str,
+        timer: Timer,
+        results: Dict[str, Message],
+    ) -> Iterator[ModelResponse]:
+        result = self.create_function_call_result(  # type: ignore[attr-defined]
+            fc, success=success, output=output, timer=timer
+        )
+        results[fc.call_id] = result
+        yield ModelResponse(
+            content=f"{fc.get_call_str()} completed in {timer.elapsed:.4f}s.",
+            tool_executions=[
+                ToolExecution(
+                    tool_call_id=result.tool_call_id,
+                    tool_name=result.tool_name,
+                    tool_args=result.tool_args,
+                    tool_call_error=result.tool_call_error,
+                    result=str(result.content),
+                    stop_after_tool_call=result.stop_after_tool_call,
+                    metrics=result.metrics,
+                )
+            ],
+            event=ModelResponseEvent.tool_call_completed.value,
+        )
+
+
+@dataclass
+class ParallelToolGroq(ParallelToolCallsMixin, RateLimitedGroq):
+    """Groq chat model that runs the tool calls of a turn concurrently."""
+
+    tool_timeouts: Optional[Dict[str, float]] = None
+
+
+def tool_call_stats() -> Dict[str, Any]:
+    """Tool turns, timeouts and time saved by running calls concurrently."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["seconds_saved"] = round(stats["tool_seconds"] - stats["wall_seconds"], 3)
+    stats["tool_seconds"] = round(stats["tool_seconds"], 3)
+    stats["wall_seconds"] = round(stats["wall_seconds"], 3)
+    return stats
@@ -23,12 +23,14 @@ SEARCH_ENGINE = SearchEngine()
 def basic_search(
     query: str,
     gl: str | None = None,
+    pages: int = 1,
 ) -> BasicSearchResult:
     """Perform a basic Google Custom Search and return structured results.
 
     Args:
         query: The search query string.
         gl: Optional geographic location code (e.g., "us", "lb"). Defaults to None.
+        pages: Number of 10-result pages, fetched concurrently. Defaults to 1.
 
     Returns:
         A BasicSearchResult object containing the search outcome, including
@@ -39,5 +41,5 @@ def basic_search(
         >>> print(result.success)  # => True
         >>> print(len(result.response or []))  # => 10
     """
-    result: BasicSearchResult = SEARCH_ENGINE.basic_search(query, gl)
+    result: BasicSearchResult = SEARCH_ENGINE.basic_search(query, gl, pages)
     return result
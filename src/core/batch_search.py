@@ -0,0 +1,219 @@
+"""Batch influencer discovery across many topic/location combos.
+
+Campaign briefs come with dozens of (topic, location) pairs whose generated
+queries and resulting handles overlap heavily. The batch search plans every
+query up front, runs each distinct query string once, crawls each distinct
+username once, and yields one result per combo as soon as that combo's
+queries and crawls have finished.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Iterator
+
+from src.core.search_influencers import INFO_CRAWLER, SEARCH_ENGINE
+from src.shared.context import ContextThreadPoolExecutor
+from src.shared.enums import Platform
+from src.shared.utils import get_logger, FyuzeLogger
+from src.shared.utils.url_canonicalizer import canonicalize_profiles
+
+logger: FyuzeLogger = get_logger(__name__)
+
+# Size of the single pool shared by all queries and crawls of a batch
+BATCH_SEARCH_MAX_WORKERS = int(os.getenv("BATCH_SEARCH_MAX_WORKERS", "8"))
+
+
+def _run_query(query: str, platform: Platform) -> list[Any]:
+    if platform == Platform.TIKTOK:
+        return SEARCH_ENGINE.search_tiktok_query(query)
+    return SEARCH_ENGINE.search_single_query(query, platform)
+
+
+def _rank_usernames(
+    query_results: list[list[Any]], platform: Platform, search_results: int
+) -> list[tuple[str, Any]]:
+    """Rank a combo's results by cross-query frequency, like the single searches.
+
+    Returns:
+        ``(username, item)`` pairs, where item is the TikTok account to crawl
+        (None for Instagram).
+    """
+    if platform == Platform.TIKTOK:
+        scores: dict[str, int] = {}
+        accounts: dict[str, Any] = {}
+        for results in query_results:
+            for account in results:
+                scores[account.unique_id] = scores.get(account.unique_id, 0) + 1
+                accounts.setdefault(account.unique_id, account)
+        ranked = sorted(accounts, key=lambda uid: scores[uid], reverse=True)
+        return [(uid, accounts[uid]) for uid in ranked[:search_results]]
+
+    flat = [result for results in query_results for result in results]
+    ranked = SEARCH_ENGINE.rank_results(flat)
+    handles = canonicalize_profiles((result.url for result, _ in ranked), platform)
+    return [(handle.username, None) for handle in handles[:search_results]]
+
+
+def _crawl(platform: Platform, items: list[tuple[str, Any]]) -> dict[str, Any]:
+    """Crawl usernames and return the accounts keyed by lowercased username."""
+    if platform == Platform.TIKTOK:
+        accounts = INFO_CRAWLER.crawl_tiktok_accounts(
+            accounts=[account for _, account in items]
+        )
+        return {account.unique_id.lower(): account for account in accounts}
+
+    accounts = INFO_CRAWLER.crawl_instagram_usernames(
+        usernames=[username for username, _ in items]
+    )
+    return {account.username.lower(): account for account in accounts}
+
+
+def batch_search_influencers(
+    combos: list[dict[str, Any]],
+    platform: Platform,
+    search_results: int = 10,
+    max_workers: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Search many (topic, location, keywords) combos with shared work.
+
+    Every distinct query string and every distinct username is fetched once,
+    on a single bounded pool, no matter how many combos need it.
+
+    Args:
+        combos: Dicts with ``topic``, ``location`` and optional ``keywords``.
+        platform: ``Platform.INSTAGRAM`` or ``Platform.TIKTOK``.
+        search_results: Max ranked profiles per combo.
+        max_workers: Pool size (defaults to ``BATCH_SEARCH_MAX_WORKERS``).
+
+    Yields:
+        One dict per combo (in completion order) with its ``index``, the
+        ``combo``, ``usernames`` and serialized ``profiles``, followed by a
+        final ``{"summary": ...}`` dict with deduplication counts.
+
+    Example:
+        >>> for line in batch_search_influencers(
+        ...     [{"topic": "food", "location": "Dubai"},
+        ...      {"topic": "food", "location": "Abu Dhabi"}],
+        ...     Platform.INSTAGRAM,
+        ... ):
+        ...     print(line)
+    """
+    if platform not in (Platform.INSTAGRAM, Platform.TIKTOK):
+        raise ValueError(f"Unsupported platform for batch search: {platform}")
+
+    # Plan every combo's queries and index which combos share each query
+    combo_queries: list[list[str]] = []
+    query_combos: dict[str, list[int]] = {}
+    for index, combo in enumerate(combos):
+        queries = SEARCH_ENGINE.plan_queries(
+            combo["topic"], combo["location"], combo.get("keywords") or [], platform
+        )
+        combo_queries.append(queries)
+        for query in queries:
+            query_combos.setdefault(query, []).append(index)
+
+    planned = sum(len(queries) for queries in combo_queries)
+    logger.info(
+        f"Batch search: {len(combos)} combos, {planned} planned queries, "
+        f"{len(query_combos)} unique"
+    )
+
+    query_results: dict[str, list[Any]] = {}
+    pending_queries = {
+        index: set(queries) for index, queries in enumerate(combo_queries)
+    }
+    crawl_futures: dict[str, Future] = {}
+    combo_usernames: dict[int, list[str]] = {}
+    combo_waits: dict[int, set[Future]] = {}
+    usernames_crawled = 0
+
+    with ContextThreadPoolExecutor(
+        max_workers=max_workers or BATCH_SEARCH_MAX_WORKERS
+    ) as executor:
+        query_futures = {
+            executor.submit(_run_query, query, platform): query
+            for query in query_combos
+        }
+        inflight: set[Future] = set(query_futures)
+
+        def combo_result(index: int) -> dict[str, Any]:
+            profiles = []
+            for username in combo_usernames[index]:
+                future = crawl_futures[username.lower()]
+                accounts = future.result() if not future.exception() else {}
+                account = accounts.get(username.lower())
+                if account is not None:
+                    profiles.append(account.to_dict())
+            return {
+                "index": index,
+                "combo": combos[index],
+                "usernames": combo_usernames[index],
+                "profiles": profiles,
+            }
+
+        def schedule_crawl(index: int) -> None:
+            nonlocal usernames_crawled
+            ranked = _rank_usernames(
+                [query_results[query] for query in combo_queries[index]],
+                platform,
+                search_results,
+            )
+            combo_usernames[index] = [username for username, _ in ranked]
+            new_items = [
+                (username, item)
+                for username, item in ranked
+                if username.lower() not in crawl_futures
+            ]
+            usernames_crawled += len(new_items)
+            if new_items:
+                future = executor.submit(_crawl, platform, new_items)
+                inflight.add(future)
+                for username, _ in new_items:
+                    crawl_futures[username.lower()] = future
+            combo_waits[index] = {
+                crawl_futures[username.lower()] for username, _ in ranked
+            }
+
+        # Combos that produced no queries have nothing to wait for
+        for index, queries in pending_queries.items():
+            if not queries:
+                schedule_crawl(index)
+
+        while inflight:
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            inflight -= done
+
+            for future in done:
+                query = query_futures.get(future)
+                if query is None:
+                    continue
+                try:
+                    query_results[query] = future.result()
+                except Exception as e:
+                    logger.warning(f"Batch query failed ({query}): {e}")
+                    query_results[query] = []
+                for index in query_combos[query]:
+                    pending_queries[index].discard(query)
+                    if not pending_queries[index]:
+                        schedule_crawl(index)
+
+            for index in list(combo_waits):
+                if all(future.done() for future in combo_waits[index]):
+                    del combo_waits[index]
+                    yield combo_result(index)
+
+        # Combos without any usernames to wait on are complete as well
+        for index in list(combo_waits):
+            yield combo_result(index)
+
+    crawl_batches = len({id(future) for future in crawl_futures.values()})
+    yield {
+        "summary": {
+            "combos": len(combos),
+            "queries_planned": planned,
+            "queries_executed": len(query_combos),
+            "usernames_ranked": sum(len(names) for names in combo_usernames.values()),
+            "usernames_crawled": usernames_crawled,
+            "crawl_batches": crawl_batches,
+        }
+    }
@@ -0,0 +1,170 @@
+"""Overlap Instagram profile crawling with the search that finds the profiles.
+
+``search_insta_influencers`` used to wait for the whole ``SearchEngine.search``
+before crawling anything. :class:`InstagramCrawlPipeline` receives each Exa
+query's validated profiles as the query completes and starts crawling new
+usernames right away (Supabase cache lookup, then Ensemble fetch), within a
+crawl budget. When the search finishes, the final ranking picks the top-N,
+any of them not crawled yet are crawled, and the accounts are returned in
+ranking order. Speculative crawls that miss the top-N are still saved to
+Supabase, so they serve as cache for later searches.
+"""
+
+import math
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+from src.modules.info_crawler import InfoCrawler
+from src.shared.context import (
+    ContextThreadPoolExecutor,
+    emit_event,
+    get_event_sink,
+    reset_event_sink,
+    set_event_sink,
+)
+from src.shared.models.ensemble_insta_account import EnsembleInstaAccount
+from src.shared.utils import get_logger, FyuzeLogger
+
+logger: FyuzeLogger = get_logger(__name__)
+
+CRAWL_PIPELINE = os.getenv("CRAWL_PIPELINE", "1") == "1"
+# Profiles crawled while the search runs, as a multiple of the requested count
+CRAWL_BUDGET_FACTOR = float(os.getenv("CRAWL_BUDGET_FACTOR", "1.5"))
+# Crawl batches in flight across all searches; each batch waits on Ensemble's pool
+CRAWL_PIPELINE_WORKERS = int(os.getenv("CRAWL_PIPELINE_WORKERS", "16"))
+
+# Shared by every pipeline instead of one executor per search
+_CRAWL_EXECUTOR = ContextThreadPoolExecutor(
+    max_workers=CRAWL_PIPELINE_WORKERS, thread_name_prefix="fyuze-crawl"
+)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "pipelines": 0,
+    "speculative_crawls": 0,
+    "late_crawls": 0,
+    "returned": 0,
+    "unused_crawls": 0,
+}
+
+
+class InstagramCrawlPipeline:
+    """
+    Crawl Instagram profiles while their search is still running.
+
+    Pass :meth:`offer` as the ``on_results`` callback of ``SearchEngine.search``
+    and call :meth:`finish` with the ranked usernames once it returns.
+    ``influencer`` cards of speculative crawls are held back and emitted for
+    the final picks only, in ranking order.
+
+    Args:
+        crawler: Crawler used for every batch.
+        username_of: Extracts the username from a search result.
+        max_results: Profiles the caller will return.
+
+    Example:
+        >>> pipeline = InstagramCrawlPipeline(INFO_CRAWLER, username_of, max_results=10)
+        >>> ranked = SEARCH_ENGINE.search(..., max_results=10, on_results=pipeline.offer)
+        >>> accounts = pipeline.finish([username_of(r) for r, _ in ranked])
+    """
+
+    def __init__(
+        self,
+        crawler: InfoCrawler,
+        username_of: Callable[[Any], str],
+        max_results: int,
+    ):
+        self._crawler = crawler
+        self._username_of = username_of
+        self._budget = math.ceil(max_results * CRAWL_BUDGET_FACTOR)
+        self._lock = threading.Lock()
+        self._offered: Dict[str, Future] = {}
+        self._cards: Dict[str, Dict[str, Any]] = {}
+        with _stats_lock:
+            _stats["pipelines"] += 1
+
+    def offer(self, results: List[Any]) -> None:
+        """Start crawling the new usernames of one query's results (within budget)."""
+        with self._lock:
+            batch: List[str] = []
+            for result in results:
+                username = self._username_of(result)
+                key = (username or "").lower()
+                if not key or key in self._offered or any(u.lower() == key for u in batch):
+                    continue
+                if len(self._offered) + len(batch) >= self._budget:
+                    break
+                batch.append(username)
+            if not batch:
+                return
+            future = _CRAWL_EXECUTOR.submit(self._crawl, batch)
+            for username in batch:
+                self._offered[username.lower()] = future
+        with _stats_lock:
+            _stats["speculative_crawls"] += len(batch)
+
+    def finish(self, usernames: List[str]) -> List[EnsembleInstaAccount]:
+        """
+        Return the crawled accounts of the final ranking.
+
+        Args:
+            usernames: Ranked usernames, already cut to the requested count.
+
+        Returns:
+            Accounts in ranking order (usernames that could not be crawled are
+            left out).
+        """
+        # Unused speculative crawls finish in the background and are cached
+        with self._lock:
+            missing = [u for u in usernames if u.lower() not in self._offered]
+            if missing:
+                future = _CRAWL_EXECUTOR.submit(self._crawl, missing)
+                for username in missing:
+                    self._offered[username.lower()] = future
+        with _stats_lock:
+            _stats["late_crawls"] += len(missing)
+
+        accounts: Dict[str, EnsembleInstaAccount] = {}
+        for future in {self._offered[u.lower()] for u in usernames}:
+            try:
+                for account in future.result():
+                    accounts[account.username.lower()] = account
+            except Exception as e:
+                logger.warning(f"Instagram crawl batch failed: {e}")
+
+        picked = [accounts[u.lower()] for u in usernames if u.lower() in accounts]
+        for account in picked:
+            card = self._cards.get(account.username.lower())
+            if card is not None:
+                emit_event("influencer", card)
+        with _stats_lock:
+            _stats["returned"] += len(picked)
+            _stats["unused_crawls"] += len(self._offered) - len(
+                {u.lower() for u in usernames}
+            )
+        return picked
+
+    def _crawl(self, usernames: List[str]) -> List[EnsembleInstaAccount]:
+        """Crawl one batch, holding back its profile cards."""
+        forward = get_event_sink()
+
+        def sink(event: str, data: Dict[str, Any]) -> None:
+            if event == "influencer":
+                with self._lock:
+                    self._cards[str(data.get("username", "")).lower()] = data
+            elif forward is not None:
+                forward(event, data)
+
+        token = set_event_sink(sink)
+        try:
+            return self._crawler.crawl_instagram_usernames(usernames=usernames)
+        finally:
+            reset_event_sink(token)
+
+
+def crawl_pipeline_stats() -> Dict[str, int]:
+    """Profiles crawled ahead of ranking, crawled late, and crawled but unused."""
+    with _stats_lock:
+        return dict(_stats)
@@ -8,7 +8,7 @@ generate a comprehensive insights report.
 from dotenv import load_dotenv
 from src.modules.info_crawler import InfoCrawler
 from src.shared.services.rapid_service import RapidService
-from src.agent.insta_marketing_expert import insta_marketing_expert
+from src.agent.insta_marketing_expert import build_insta_marketing_expert
 from src.shared.models.marketing_insights_report import MarketingInsightsReport
 
 # Load environment variables
@@ -55,7 +55,7 @@ def get_insta_report(username: str) -> MarketingInsightsReport:
 
     # Step 3: Combine data and generate insights report
     combined_input = f"{ensemble_summary}\n\n{rapid_summary}"
-    report = insta_marketing_expert.run(combined_input)
+    report = build_insta_marketing_expert().run(combined_input)
 
     return report.content
 
@@ -82,6 +82,6 @@ def get_insta_report_ensemble_only(username: str) -> MarketingInsightsReport:
     ensemble_summary = ensemble_account.get_agent_summary()
 
     # Generate insights report from profile data only
-    report = insta_marketing_expert.run(ensemble_summary)
+    report = build_insta_marketing_expert().run(ensemble_summary)
 
     return report.content
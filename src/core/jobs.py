@@ -0,0 +1,78 @@
+"""Background job handlers for long-running discovery and report generation.
+
+Registers the ``discovery`` and ``report`` job types on a shared JobRunner so
+the API can enqueue them and return immediately.
+"""
+
+from typing import Any
+
+from src.core.get_insta_report import (
+    get_insta_report,
+    get_insta_report_ensemble_only,
+)
+from src.core.search_influencers import (
+    search_insta_influencers,
+    search_tiktok_and_instagram,
+    search_tiktok_influencers,
+)
+from src.modules.job_runner import JobRunner
+from src.shared.utils.storage import jobs_collection
+
+
+def run_discovery_job(params: dict[str, Any]) -> dict[str, list[dict]]:
+    """Search one or both platforms and crawl the profiles found.
+
+    Args:
+        params: ``topic``, ``location``, ``keywords``, ``search_results`` and
+            ``platform`` (``"instagram"``, ``"tiktok"`` or ``"both"``).
+
+    Returns:
+        Serialized profiles keyed by platform.
+    """
+    search_kwargs = {
+        "topic": params["topic"],
+        "location": params["location"],
+        "keywords": params.get("keywords") or [],
+        "search_results": params.get("search_results") or 10,
+    }
+    platform = params.get("platform", "both")
+
+    if platform == "instagram":
+        profiles, _ = search_insta_influencers(**search_kwargs)
+        return {"instagram": [profile.to_dict() for profile in profiles]}
+    if platform == "tiktok":
+        profiles, _ = search_tiktok_influencers(**search_kwargs)
+        return {"tiktok": [profile.to_dict() for profile in profiles]}
+
+    results = search_tiktok_and_instagram(**search_kwargs)
+    return {
+        name: [profile.to_dict() for profile in results[name]["profiles"]]
+        for name in ("instagram", "tiktok")
+    }
+
+
+def run_report_job(params: dict[str, Any]) -> dict[str, Any]:
+    """Generate a marketing insights report for an Instagram profile.
+
+    Args:
+        params: ``username`` and ``include_audience`` (fetch audience
+            demographics from RapidAPI, default True).
+
+    Returns:
+        The ``MarketingInsightsReport`` as a dict.
+    """
+    username = params["username"].strip().lstrip("@")
+    if params.get("include_audience", True):
+        report = get_insta_report(username)
+    else:
+        report = get_insta_report_ensemble_only(username)
+    return report.model_dump()
+
+
+JOB_RUNNER = JobRunner(
+    handlers={
+        "discovery": run_discovery_job,
+        "report": run_report_job,
+    },
+    collection=jobs_collection,
+)
@@ -0,0 +1,188 @@
+"""Speculative discovery prefetch while the agent asks a clarifying question.
+
+The agent asks for a missing location or platform before it searches, and the
+user's answer typically arrives seconds to minutes later. When a turn ends in
+such a question, the parameters stated so far are extracted with a small model
+and, if the topic and location are known, the cheap part of discovery (query
+formulation, Exa bulk search, TikTok keyword search; no profile crawling) runs
+in the background for every platform still in question. Provider results are
+kept in the session-scoped :data:`PREFETCH_CACHE`, so the search that follows
+the user's answer starts warm.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import Future
+from typing import Any, Optional
+
+import src.shared.context as context
+from src.agent.intent_extractor import build_intent_extractor
+from src.core.search_influencers import SEARCH_ENGINE
+from src.shared.context import ContextThreadPoolExecutor
+from src.shared.enums import Platform
+from src.shared.models.sys_models import DiscoveryIntent
+from src.shared.prefetch_cache import PREFETCH_CACHE
+from src.shared.utils import get_logger, FyuzeLogger
+
+logger: FyuzeLogger = get_logger(__name__)
+
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "1") == "1"
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "2"))
+# Prefetches allowed to wait for a worker; further ones are skipped
+PREFETCH_MAX_PENDING = PREFETCH_WORKERS * 4
+
+_executor = ContextThreadPoolExecutor(
+    max_workers=PREFETCH_WORKERS, thread_name_prefix="fyuze-prefetch"
+)
+_lock = threading.Lock()
+_pending = 0
+_stats = {"scheduled": 0, "completed": 0, "skipped": 0, "failed": 0}
+
+# Same result count the agent tools search for (the query scheduler runs a
+# superset of the queries needed for the per-platform half of combined searches)
+_MAX_RESULTS = 10
+_QUESTION_TAIL_CHARS = 300
+
+# A clarifying question asks for a search parameter...
+_CLARIFYING_SUBJECT = re.compile(
+    r"\b(?:influencers?|creators?|bloggers?|instagram|insta|tiktok|platforms?|"
+    r"city|country|location|area|region|where|niche|topic|industry|categor(?:y|ies)|"
+    r"audience|budget|followers?|brand|business|products?|campaign|goals?|"
+    r"find|search|look(?:ing)?\s+for|keywords?|website|handles?|usernames?|"
+    r"profiles?|accounts?)\b",
+    re.IGNORECASE,
+)
+# ...unlike closing offers and small talk ("Anything else I can help with?")
+_CLOSING_QUESTION = re.compile(
+    r"anything\s+else|(?:can|could|may)\s+i\s+(?:help|assist)|"
+    r"any\s+(?:other|more)\s+questions|what\s+do\s+you\s+think|"
+    r"how\s+does\s+(?:that|this)\s+sound|sounds?\s+good|how(?:'s|\s+is|\s+are)\s+(?:you|your)",
+    re.IGNORECASE,
+)
+_QUESTION_SENTENCE = re.compile(r"[^.!?\n]*\?")
+
+
+def _count(name: str) -> None:
+    with _lock:
+        _stats[name] += 1
+
+
+def is_clarifying_question(text: Optional[str], usernames: list[str]) -> bool:
+    """
+    A reply that returned no influencers and ends by asking for a search
+    parameter (location, platform, niche, budget, ...).
+
+    Closing offers ("Anything else I can help with?") and small-talk or
+    rhetorical questions are not clarifying questions: the router sends the
+    answer to a clarifying question to the agent.
+
+    Example:
+        >>> is_clarifying_question("Great pick! Which city should I focus on?", [])
+        True
+        >>> is_clarifying_question("Done! Anything else I can help with? 😊", [])
+        False
+    """
+    if usernames or not text:
+        return False
+    # The question is the last thing the agent says (emojis may follow it)
+    questions = _QUESTION_SENTENCE.findall(text.strip()[-_QUESTION_TAIL_CHARS:])
+    if not questions:
+        return False
+    question = questions[-1]
+    return bool(_CLARIFYING_SUBJECT.search(question)) and not _CLOSING_QUESTION.search(
+        question
+    )
+
+
+def _transcript(turns: list[dict[str, Any]]) -> str:
+    lines = []
+    for turn in turns:
+        lines.append(f"User: {turn.get('request', '')}")
+        if turn.get("reply"):
+            lines.append(f"Fyuze: {turn['reply']}")
+    return "\n".join(lines)
+
+
+def _platforms(intent: DiscoveryIntent) -> list[Platform]:
+    if intent.platform == "instagram":
+        return [Platform.INSTAGRAM]
+    if intent.platform == "tiktok":
+        return [Platform.TIKTOK]
+    return [Platform.INSTAGRAM, Platform.TIKTOK]
+
+
+def _prefetch(session_key: str, transcript: str) -> Optional[DiscoveryIntent]:
+    global _pending
+    try:
+        intent = build_intent_extractor().run(transcript, stream=False).content
+        if not isinstance(intent, DiscoveryIntent) or not intent.topic or not intent.location:
+            logger.info(f"Prefetch skipped for {session_key}: topic or location unknown")
+            _count("skipped")
+            return None
+
+        logger.info(
+            f"Prefetching {intent.topic!r} in {intent.location!r} "
+            f"({intent.platform or 'both'}) for {session_key}"
+        )
+        with PREFETCH_CACHE.recording(session_key):
+            for platform in _platforms(intent):
+                if platform == Platform.TIKTOK:
+                    SEARCH_ENGINE.search_tiktok_accounts(
+                        topic=intent.topic,
+                        location=intent.location,
+                        keywords=[],
+                        target_results=_MAX_RESULTS,
+                    )
+                else:
+                    SEARCH_ENGINE.search(
+                        topic=intent.topic,
+                        location=intent.location,
+                        keywords=[],
+                        platform=Platform.INSTAGRAM,
+                        max_results=_MAX_RESULTS,
+                    )
+        _count("completed")
+        return intent
+    except Exception as e:
+        logger.warning(f"Prefetch failed for {session_key}: {e}")
+        _count("failed")
+        return None
+    finally:
+        with _lock:
+            _pending -= 1
+
+
+def schedule_prefetch(turns: list[dict[str, Any]]) -> Optional[Future]:
+    """
+    Start a background prefetch for the current session.
+
+    Args:
+        turns: The session's recent ``{"request", "reply"}`` turns, newest last
+            (see :class:`src.shared.session_summary.SessionSummary`).
+
+    Returns:
+        Future resolving to the extracted :class:`DiscoveryIntent` (None when
+        nothing was prefetched), or None if prefetching is disabled or busy.
+
+    Example:
+        >>> if is_clarifying_question(reply.text, reply.influencers_usernames):
+        ...     schedule_prefetch(summary.recent_turns)
+    """
+    global _pending
+    if not SPECULATIVE_PREFETCH or not turns:
+        return None
+    with _lock:
+        if _pending >= PREFETCH_MAX_PENDING:
+            _stats["skipped"] += 1
+            return None
+        _pending += 1
+        _stats["scheduled"] += 1
+    return _executor.submit(_prefetch, context.get_doc_id(), _transcript(turns))
+
+
+def prefetch_stats() -> dict[str, Any]:
+    """Prefetch scheduling counters plus cache usage by later searches."""
+    with _lock:
+        stats = {**_stats, "pending": _pending}
+    return {**stats, "cache": PREFETCH_CACHE.stats()}
@@ -4,15 +4,25 @@ Uses the SearchEngine to find candidate profile URLs and InfoCrawler to
 retrieve structured profile data for a list of usernames.
 """
 
-import concurrent.futures
 import math
+import os
 
 from dotenv import load_dotenv
 from src.protected.search_engine import SearchEngine
 from src.shared.enums import Platform
+from src.shared.context import (
+    ContextThreadPoolExecutor,
+    emit_event,
+    mark_provider_unavailable,
+    track_unavailable_providers,
+)
 from src.modules.info_crawler import InfoCrawler
+from src.shared.exceptions import CircuitOpenError
+from src.core.crawl_pipeline import CRAWL_PIPELINE, InstagramCrawlPipeline
 from src.shared.models.ensemble_insta_account import EnsembleInstaAccount
 from src.shared.models.ensemble_tiktok_account import EnsembleTiktokAccount
+from src.shared.utils import SingleFlight, SWRCache
+from src.shared.utils.url_canonicalizer import canonicalize_profiles, extract_username
 
 # Load environment variables
 load_dotenv()
@@ -21,6 +31,16 @@ load_dotenv()
 SEARCH_ENGINE = SearchEngine()
 INFO_CRAWLER = InfoCrawler()
 
+# Response cache for the direct search endpoints, keyed on the canonical request
+SEARCH_CACHE = SWRCache(
+    ttl=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "900")),
+    stale_ttl=float(os.getenv("SEARCH_CACHE_STALE_SECONDS", "3600")),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "256")),
+)
+
+# Identical searches running concurrently share one SearchEngine call
+SEARCH_FLIGHTS = SingleFlight()
+
 
 def search_insta_influencers(
     topic: str,
@@ -40,39 +60,77 @@ def search_insta_influencers(
         A list of EnsembleInstaAccount objects and their simplified dicts.
     """
 
+    flight_key = (
+        "search",
+        search_cache_key(Platform.INSTAGRAM, topic, location, keywords, search_results),
+    )
+    max_results = search_results
+
+    # Profiles are crawled as search queries return them (see crawl_pipeline)
+    pipeline = (
+        InstagramCrawlPipeline(INFO_CRAWLER, _instagram_username, max_results)
+        if CRAWL_PIPELINE
+        else None
+    )
+    on_results = pipeline.offer if pipeline else None
+
     # Search for profile URLs
-    search_results = SEARCH_ENGINE.search(
+    search_results = SEARCH_FLIGHTS.do(
+        flight_key,
+        SEARCH_ENGINE.search,
         topic=topic,
         location=location,
         keywords=keywords,
         platform=Platform.INSTAGRAM,
-        max_results=search_results,
+        max_results=max_results,
+        on_results=on_results,
     )
 
-    # if search_results is empty, retry
+    # Nothing found: try the relaxed query tier rather than the same queries again
     if not search_results:
-        search_results = SEARCH_ENGINE.search(
+        search_results = SEARCH_FLIGHTS.do(
+            ("search_relaxed", flight_key[1]),
+            SEARCH_ENGINE.search_relaxed,
             topic=topic,
             location=location,
             keywords=keywords,
             platform=Platform.INSTAGRAM,
-            max_results=search_results,
+            max_results=max_results,
+            on_results=on_results,
         )
 
-    # Extract usernames from profile URLs
-    usernames = [result[0].url.split("/")[-2] for result in search_results]
-
-    # Fetch profile details (and optionally related profiles)
-    info = INFO_CRAWLER.crawl_instagram_usernames(
-        usernames=usernames,
+    # Final ranking: the top results' usernames (URL variants of one profile
+    # and non-profile URLs dropped)
+    usernames = [
+        handle.username
+        for handle in canonicalize_profiles(
+            (result.url for result, _ in search_results), Platform.INSTAGRAM
+        )
+    ]
+    emit_event(
+        "profiles_found",
+        {"platform": "instagram", "count": len(usernames), "usernames": usernames},
     )
 
+    # Fetch profile details, reusing the crawls started during the search
+    if pipeline:
+        info = pipeline.finish(usernames)
+    else:
+        info = INFO_CRAWLER.crawl_instagram_usernames(
+            usernames=usernames,
+        )
+
     # Convert to simplified dicts for downstream agents
     agents_info = [i.to_agent_dict() for i in info]
 
     return info, agents_info
 
 
+def _instagram_username(result) -> str | None:
+    """Username of an Instagram profile search result (None if not a profile)."""
+    return extract_username(result.url, Platform.INSTAGRAM)
+
+
 def search_tiktok_influencers(
     topic: str,
     location: str,
@@ -91,17 +149,27 @@ def search_tiktok_influencers(
         A list of EnsembleTiktokAccount objects and their simplified dicts.
     """
 
-    # Search for profile URLs
-    results = SEARCH_ENGINE.search_tiktok_accounts(
+    # Search for profile URLs; the query scheduler stops issuing queries once
+    # enough accounts for search_results were found
+    results = SEARCH_FLIGHTS.do(
+        (
+            "search_tiktok_accounts",
+            search_cache_key(Platform.TIKTOK, topic, location, keywords, search_results),
+        ),
+        SEARCH_ENGINE.search_tiktok_accounts,
         topic=topic,
         location=location,
         keywords=keywords,
-        max_workers=10,
+        target_results=search_results,
     )
 
     # Extract usernames from profile URLs
     usernames = [r.unique_id for r in results[:search_results]]
     results = results[:search_results]
+    emit_event(
+        "profiles_found",
+        {"platform": "tiktok", "count": len(usernames), "usernames": usernames},
+    )
 
     # Fetch profile details (and optionally related profiles)
     info = INFO_CRAWLER.crawl_tiktok_accounts(
@@ -135,8 +203,9 @@ def search_tiktok_and_instagram(
     # Split search results evenly between platforms
     results_per_platform = math.ceil(search_results / 2)
 
-    # Run both searches in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+    # Run both searches in parallel; workers inherit the request context so
+    # results are saved to the caller's session
+    with ContextThreadPoolExecutor(max_workers=2) as executor:
         # Submit both tasks
         instagram_future = executor.submit(
             search_insta_influencers,
@@ -212,3 +281,94 @@ def search_tiktok_by_usernames(
     agents_info = [i.to_agent_dict() for i in info]
 
     return info, agents_info
+
+
+def _normalize_term(term: str) -> str:
+    return " ".join((term or "").split()).casefold()
+
+
+def search_cache_key(
+    platform: Platform,
+    topic: str,
+    location: str,
+    keywords: list[str],
+    search_results: int,
+) -> tuple:
+    """Canonical cache key for a topic/location/keywords search.
+
+    Terms are case-folded and whitespace-trimmed, the location is split on
+    commas the same way ``SearchEngine._formulate_queries`` splits it, and
+    keywords are deduplicated and sorted, so requests that produce the same
+    queries share an entry.
+    """
+    location_parts = tuple(
+        part
+        for part in (_normalize_term(p) for p in (location or "").split(","))
+        if part
+    )
+    keyword_terms = tuple(
+        sorted({term for term in map(_normalize_term, keywords or []) if term})
+    )
+    return (
+        platform.value,
+        _normalize_term(topic),
+        location_parts,
+        keyword_terms,
+        search_results,
+    )
+
+
+def search_influencers_cached(
+    platform: Platform,
+    topic: str,
+    location: str,
+    keywords: list[str],
+    search_results: int = 10,
+) -> tuple[list[dict], list[str]]:
+    """Search one platform and return serialized profiles through ``SEARCH_CACHE``.
+
+    Fresh entries are returned directly; stale ones are returned immediately
+    while a background refresh reruns the search. Empty results are not cached.
+    When the search comes back empty (or fails) because a provider's circuit
+    is open, an expired entry of the same search is returned instead.
+
+    Args:
+        platform: ``Platform.INSTAGRAM`` or ``Platform.TIKTOK``.
+        topic: Niche to search (e.g., "fitness").
+        location: Target location (e.g., "London").
+        keywords: Extra terms to refine the search.
+        search_results: Max ranked search results to keep.
+
+    Returns:
+        Tuple of (``to_dict()`` payloads of the found accounts, providers
+        found unavailable during the search). Results are partial or come
+        from an expired entry when the second list is not empty.
+    """
+    if platform == Platform.INSTAGRAM:
+        search_fn = search_insta_influencers
+    elif platform == Platform.TIKTOK:
+        search_fn = search_tiktok_influencers
+    else:
+        raise ValueError(f"Unsupported platform for cached search: {platform}")
+
+    def compute() -> list[dict]:
+        accounts, _ = search_fn(
+            topic=topic,
+            location=location,
+            keywords=keywords,
+            search_results=search_results,
+        )
+        return [account.to_dict() for account in accounts]
+
+    key = search_cache_key(platform, topic, location, keywords, search_results)
+    # Bound here so the direct search endpoints see outages too
+    with track_unavailable_providers() as unavailable:
+        try:
+            results = SEARCH_CACHE.get_or_compute(key, compute, cacheable=bool)
+        except CircuitOpenError as error:
+            mark_provider_unavailable(error.provider)
+            results = []
+        down = sorted(unavailable)
+    if not results and down:
+        return SEARCH_CACHE.peek(key) or results, down
+    return results, down
@@ -5,15 +5,16 @@ This module exposes a small API to fetch profiles for Instagram and TikTok
 usernames, with optional related-profile discovery for Instagram.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, Hashable, List, Optional
 import json
 
+from src.shared.context import emit_event
 from src.shared.enums import Platform
 from src.shared.services import EnsembleService
 from src.shared.services.rapid_service import RapidService
 from src.shared.services.supabase_service import SupabaseService
 
-from src.shared.utils import get_logger, FyuzeLogger
+from src.shared.utils import get_logger, FyuzeLogger, SingleFlight
 from src.shared.models import (
     EnsembleInstaAccount,
     TikTokInfluencer,
@@ -31,8 +32,13 @@ class InfoCrawler:
     - Crawl TikTok accounts and fetch their videos
     - Handle database caching and synchronization
     - Support both parallel and sequential processing
+    - Share in-flight crawls of the same username between concurrent callers
     """
 
+    # In-flight crawls are shared by every crawler instance in the process
+    _instagram_flights = SingleFlight()
+    _tiktok_flights = SingleFlight()
+
     def __init__(self, enable_sync: bool = True) -> None:
         """
         Initialize the InfoCrawler.
@@ -75,6 +81,19 @@ class InfoCrawler:
         if not base_usernames:
             return []
 
+        return self._crawl_coalesced(
+            flights=self._instagram_flights,
+            items=base_usernames,
+            key_of=lambda username: username.lower(),
+            result_key_of=lambda account: account.username.lower(),
+            crawl=self._crawl_instagram_usernames,
+            on_joined=self._emit_instagram_card,
+        )
+
+    def _crawl_instagram_usernames(
+        self, base_usernames: List[str]
+    ) -> List[EnsembleInstaAccount]:
+        """Crawl normalized Instagram usernames through the Supabase sync layer."""
         self._logger.info(
             f"Processing {len(base_usernames)} Instagram usernames ({base_usernames})"
         )
@@ -84,8 +103,9 @@ class InfoCrawler:
             self._logger.info("Sync disabled - crawling all usernames")
             accounts = self._ensemble.scrape_instagram_profiles_parallel(
                 usernames=base_usernames,
-                max_workers=5,
+                on_result=self._emit_instagram_card,
             )
+            self._emit_crawl_summary("instagram", cached=0, crawled=len(accounts))
             return accounts
         # Sync layer: check existing data first
         existing_accounts = []
@@ -132,6 +152,7 @@ class InfoCrawler:
                     if raw_data:
                         account = EnsembleInstaAccount.from_dict(raw_data)
                         existing_accounts.append(account)
+                        self._emit_instagram_card(account)
                         self._logger.info(
                             f"Using cached data for Instagram user: {username}"
                         )
@@ -151,7 +172,7 @@ class InfoCrawler:
             )
             new_accounts = self._ensemble.scrape_instagram_profiles_parallel(
                 usernames=usernames_to_crawl,
-                max_workers=5,
+                on_result=self._emit_instagram_card,
             )
 
             # Save newly crawled accounts to database
@@ -227,6 +248,9 @@ class InfoCrawler:
         self._logger.info(
             f"Returning {len(all_accounts)} Instagram accounts ({len(existing_accounts)} cached, {len(new_accounts)} newly crawled)"
         )
+        self._emit_crawl_summary(
+            "instagram", cached=len(existing_accounts), crawled=len(new_accounts)
+        )
 
         return all_accounts
 
@@ -234,7 +258,7 @@ class InfoCrawler:
         self,
         usernames: List[str],
         parallel: bool = True,
-        max_workers: int = 5,
+        max_workers: Optional[int] = None,
     ) -> Dict[str, AudienceSnapshot]:
         """Fetch Instagram audience demographic statistics for multiple profiles.
 
@@ -245,7 +269,8 @@ class InfoCrawler:
         Args:
             usernames: Instagram handles (with or without leading @)
             parallel: Whether to fetch statistics in parallel (default: True)
-            max_workers: Maximum number of concurrent requests if parallel=True (default: 5)
+            max_workers: Maximum number of concurrent requests if parallel=True
+                (default: RapidAPI's adaptive concurrency limit)
 
         Returns:
             Dictionary mapping Instagram URLs to AudienceSnapshot objects.
@@ -324,7 +349,6 @@ class InfoCrawler:
         try:
             fetched_accounts = self._ensemble.get_tiktok_by_username_parallel(
                 usernames=base_usernames,
-                max_workers=min(5, len(base_usernames)),
             )
         except Exception as exc:
             print(f"Failed to fetch TikTok accounts via Ensemble: {exc}")
@@ -369,12 +393,36 @@ class InfoCrawler:
         if not accounts:
             return []
 
+        def key_of(account: EnsembleTiktokAccount) -> Optional[Hashable]:
+            return (account.unique_id.lower(), depth) if account.unique_id else None
+
+        return self._crawl_coalesced(
+            flights=self._tiktok_flights,
+            items=accounts,
+            key_of=key_of,
+            result_key_of=key_of,
+            crawl=lambda pending: self._crawl_tiktok_accounts(pending, depth),
+            on_joined=self._emit_tiktok_card,
+        )
+
+    def _crawl_tiktok_accounts(
+        self,
+        accounts: List[EnsembleTiktokAccount],
+        depth: int = 1,
+    ) -> List[EnsembleTiktokAccount]:
+        """Fetch videos for TikTok accounts through the Supabase sync layer."""
         self._logger.info(f"Processing {len(accounts)} TikTok accounts for video data")
 
         # If sync is disabled, fetch videos for all accounts without database interaction
         if not self._enable_sync:
             self._logger.info("Sync disabled - fetching videos for all accounts")
-            return self._fetch_videos_for_accounts(accounts, depth)
+            processed_accounts = self._fetch_videos_for_accounts(accounts, depth)
+            for account in processed_accounts:
+                self._emit_tiktok_card(account)
+            self._emit_crawl_summary(
+                "tiktok", cached=0, crawled=len(processed_accounts)
+            )
+            return processed_accounts
 
         # Sync layer: check existing data first
         existing_accounts: List[EnsembleTiktokAccount] = []
@@ -436,6 +484,7 @@ class InfoCrawler:
                             raw_data, videos_data.get("videos", [])
                         )
                         existing_accounts.append(cached_account)
+                        self._emit_tiktok_card(cached_account)
                         self._logger.info(
                             f"Using cached TikTok data for user: {account.unique_id} "
                             f"({videos_data.get('count', 0)} videos)"
@@ -457,6 +506,8 @@ class InfoCrawler:
             processed_accounts = self._fetch_videos_for_accounts(
                 accounts_to_process, depth
             )
+            for account in processed_accounts:
+                self._emit_tiktok_card(account)
 
             # Save processed accounts to database
             save_payload = [
@@ -540,9 +591,113 @@ class InfoCrawler:
             f"Returning {len(all_accounts)} TikTok accounts "
             f"({len(existing_accounts)} cached, {len(processed_accounts)} newly processed)"
         )
+        self._emit_crawl_summary(
+            "tiktok", cached=len(existing_accounts), crawled=len(processed_accounts)
+        )
 
         return all_accounts
 
+    def _crawl_coalesced(
+        self,
+        flights: SingleFlight,
+        items: List[Any],
+        key_of: Callable[[Any], Optional[Hashable]],
+        result_key_of: Callable[[Any], Hashable],
+        crawl: Callable[[List[Any]], List[Any]],
+        on_joined: Callable[[Any], None],
+    ) -> List[Any]:
+        """
+        Crawl ``items`` while sharing in-flight work with concurrent callers.
+
+        Items whose key is already being crawled by another request are not
+        crawled again; this call waits for that crawl instead. Items without a
+        key are always crawled.
+
+        Args:
+            flights: Per-platform SingleFlight registry
+            items: Usernames or accounts to crawl
+            key_of: Coalescing key of an item (None to opt out)
+            result_key_of: Key of a crawled account, matching ``key_of``
+            crawl: Crawls a list of items and returns the accounts found
+            on_joined: Called with each account received from another caller
+
+        Returns:
+            Accounts crawled here followed by accounts joined from other callers
+        """
+        owned, pending = flights.claim(
+            key for key in (key_of(item) for item in items) if key is not None
+        )
+
+        to_crawl = []
+        claimed = set()
+        for item in items:
+            key = key_of(item)
+            if key is None:
+                to_crawl.append(item)
+            elif key in owned and key not in claimed:
+                claimed.add(key)
+                to_crawl.append(item)
+
+        try:
+            with flights.leading(owned):
+                crawled = crawl(to_crawl) if to_crawl else []
+        except BaseException as exc:
+            for key in owned:
+                flights.fail(key, exc)
+            raise
+
+        crawled_map = {result_key_of(account): account for account in crawled}
+        for key in owned:
+            flights.resolve(key, crawled_map.get(key))
+
+        joined = []
+        if pending:
+            self._logger.info(
+                f"Waiting on {len(pending)} profiles already being crawled by other requests"
+            )
+        for key, future in pending.items():
+            try:
+                account = flights.wait(future)
+            except Exception as exc:
+                self._logger.warning(f"Shared crawl for {key} failed: {exc}")
+                continue
+            if account is not None:
+                joined.append(account)
+                on_joined(account)
+
+        return crawled + joined
+
+    def _emit_instagram_card(self, account: EnsembleInstaAccount) -> None:
+        """Stream a crawled Instagram profile to the request's event sink."""
+        emit_event(
+            "influencer",
+            {
+                "platform": "instagram",
+                "username": account.username,
+                "data": account.to_dict(),
+            },
+        )
+
+    def _emit_tiktok_card(self, account: EnsembleTiktokAccount) -> None:
+        """Stream a crawled TikTok account to the request's event sink."""
+        if not account.unique_id:
+            return
+        emit_event(
+            "influencer",
+            {
+                "platform": "tiktok",
+                "username": account.unique_id,
+                "data": account.to_dict(),
+            },
+        )
+
+    def _emit_crawl_summary(self, platform: str, cached: int, crawled: int) -> None:
+        """Report how many profiles came from the cache versus a fresh crawl."""
+        emit_event(
+            "profiles_crawled",
+            {"platform": platform, "cached": cached, "crawled": crawled},
+        )
+
     def _fetch_videos_for_accounts(
         self, accounts: List[EnsembleTiktokAccount], depth: int = 1
     ) -> List[EnsembleTiktokAccount]:
@@ -568,9 +723,6 @@ class InfoCrawler:
                 usernames=usernames,
                 depth=depth,
                 parallel=True,
-                max_workers=min(
-                    5, len(usernames)
-                ),  # Limit workers based on account count
             )
 
             # Create mapping of username to videos
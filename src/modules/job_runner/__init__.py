@@ -0,0 +1 @@
+from src.modules.job_runner.job_runner import JobQueueFullError, JobRunner
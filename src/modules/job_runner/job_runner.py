@@ -0,0 +1,327 @@
+"""
+In-process background job runner.
+
+Long-running work (multi-platform discovery, marketing reports) is submitted
+as a job and executed on a bounded worker pool instead of inside the HTTP
+request. Job state, progress events and partial results are kept in memory for
+fast long-polling and persisted to Mongo so any API worker can report on them.
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from src.shared.context import (
+    request_context,
+    reset_event_sink,
+    set_event_sink,
+)
+from src.shared.enums import JobStatus
+from src.shared.exceptions import FyuzeBaseException, ValidationError
+from src.shared.utils import get_logger, FyuzeLogger
+
+
+DEFAULT_JOB_WORKERS = 4
+DEFAULT_JOB_MAX_QUEUE = 100
+MAX_PROGRESS_EVENTS = 100
+# Profile cards kept while a job runs; the final result holds them all
+MAX_PARTIAL_RESULTS = 200
+MAX_JOBS_IN_MEMORY = 1000
+
+# Token-level events are too chatty to persist as job progress
+_IGNORED_EVENTS = {"token"}
+
+
+class JobQueueFullError(FyuzeBaseException):
+    """Raised when too many jobs are already waiting for a worker"""
+
+    pass
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobRunner:
+    """
+    Execute registered job handlers on a bounded worker pool.
+
+    Each handler receives the job's ``params`` dict and returns a
+    JSON-serializable result. Progress reported through
+    :func:`src.shared.context.emit_event` while the handler runs is recorded on
+    the job, and ``influencer`` events are collected as partial results.
+
+    Args:
+        handlers (Dict[str, Callable[[Dict[str, Any]], Any]]): Job type to handler.
+        workers (int, optional): Concurrent jobs. Defaults to ``JOB_WORKERS`` or 4.
+        max_queue (int, optional): Jobs allowed to wait for a worker before new
+            submissions are rejected. Defaults to ``JOB_MAX_QUEUE`` or 100.
+        collection (optional): Mongo collection used to persist jobs. Persistence
+            is skipped when None.
+
+    Example:
+        >>> runner = JobRunner(handlers={"echo": lambda params: params})
+        >>> job = runner.submit("echo", {"x": 1})
+        >>> runner.wait(job["job_id"], timeout=5)["result"]
+        {'x': 1}
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[[Dict[str, Any]], Any]],
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        collection: Any = None,
+    ):
+        self._logger: FyuzeLogger = get_logger(__name__)
+        self._handlers = dict(handlers)
+        self._workers = workers or int(os.getenv("JOB_WORKERS", DEFAULT_JOB_WORKERS))
+        self._max_queue = (
+            max_queue
+            if max_queue is not None
+            else int(os.getenv("JOB_MAX_QUEUE", DEFAULT_JOB_MAX_QUEUE))
+        )
+        self._collection = collection
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._done: Dict[str, Future] = {}
+        self._queued = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._workers, thread_name_prefix="fyuze-job"
+        )
+
+    @property
+    def job_types(self) -> list[str]:
+        """Registered job types"""
+        return list(self._handlers)
+
+    def submit(
+        self,
+        job_type: str,
+        params: Dict[str, Any],
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Enqueue a job.
+
+        Returns:
+            The job document (status ``queued``).
+
+        Raises:
+            ValidationError: If ``job_type`` is not registered.
+            JobQueueFullError: If the wait queue is full.
+        """
+        if job_type not in self._handlers:
+            raise ValidationError(
+                f"Unknown job type: {job_type}",
+                details={"job_types": self.job_types},
+            )
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "type": job_type,
+            "user_id": user_id,
+            "params": params,
+            "status": JobStatus.QUEUED.value,
+            "created_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "progress": [],
+            "partial_results": [],
+            "result": None,
+            "error": None,
+        }
+
+        with self._lock:
+            if self._queued >= self._max_queue:
+                raise JobQueueFullError(
+                    f"Job queue is full ({self._max_queue} jobs waiting)"
+                )
+            self._queued += 1
+            self._jobs[job_id] = job
+            self._done[job_id] = Future()
+            self._evict_finished()
+
+        self._persist_insert(job)
+        snapshot = self._snapshot(job)
+        self._logger.info(f"Queued {job_type} job {job_id}")
+        self._executor.submit(self._execute, job_id)
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current job document, from memory or Mongo; None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self._snapshot(job)
+        return self._load(job_id)
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Block up to ``timeout`` seconds for the job to finish.
+
+        Jobs run by another process are not tracked in memory; for those the
+        persisted document is returned as is.
+        """
+        with self._lock:
+            done = self._done.get(job_id)
+        if done is not None:
+            try:
+                done.result(timeout=timeout)
+            except Exception:
+                pass
+        return self.get(job_id)
+
+    def done_future(self, job_id: str) -> Optional[Future]:
+        """Future completed when an in-process job finishes (for async waiting)."""
+        with self._lock:
+            return self._done.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of job counts by status."""
+        with self._lock:
+            counts = {status.value: 0 for status in JobStatus}
+            for job in self._jobs.values():
+                counts[job["status"]] += 1
+            return {"workers": self._workers, **counts}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and release the worker threads."""
+        self._executor.shutdown(wait=wait)
+
+    def _execute(self, job_id: str) -> None:
+        with self._lock:
+            self._queued -= 1
+            job = self._jobs[job_id]
+            job["status"] = JobStatus.RUNNING.value
+            job["started_at"] = _now()
+        self._persist_update(
+            job_id, {"status": job["status"], "started_at": job["started_at"]}
+        )
+
+        def sink(event: str, data: Dict[str, Any]) -> None:
+            self._record_event(job_id, event, data)
+
+        sink_token = set_event_sink(sink)
+        try:
+            with request_context(job["user_id"], f"job-{job_id}"):
+                result = self._handlers[job["type"]](job["params"])
+        except Exception as exc:
+            self._logger.error(f"Job {job_id} failed: {exc}")
+            self._finish(job_id, JobStatus.FAILED, error=str(exc))
+        else:
+            self._finish(job_id, JobStatus.SUCCEEDED, result=result)
+        finally:
+            reset_event_sink(sink_token)
+
+    def _record_event(self, job_id: str, event: str, data: Dict[str, Any]) -> None:
+        if event in _IGNORED_EVENTS:
+            return
+        entry = {"event": event, "at": _now()}
+        partial_result = None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if event == "influencer":
+                if len(job["partial_results"]) < MAX_PARTIAL_RESULTS:
+                    job["partial_results"].append(data)
+                    partial_result = data
+                entry["data"] = {
+                    "platform": data.get("platform"),
+                    "username": data.get("username"),
+                }
+            else:
+                entry["data"] = data
+            job["progress"].append(entry)
+            del job["progress"][:-MAX_PROGRESS_EVENTS]
+
+        push: Dict[str, Any] = {
+            "progress": {"$each": [entry], "$slice": -MAX_PROGRESS_EVENTS}
+        }
+        if partial_result is not None:
+            push["partial_results"] = partial_result
+        self._persist({"$push": push}, job_id)
+
+    def _finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Any = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = status.value
+            job["finished_at"] = _now()
+            job["result"] = result
+            job["error"] = error
+            if status is JobStatus.SUCCEEDED:
+                # Superseded by the result; failed jobs keep what they found
+                job["partial_results"] = []
+            done = self._done.pop(job_id, None)
+        self._persist_update(
+            job_id,
+            {
+                "status": status.value,
+                "finished_at": job["finished_at"],
+                "result": result,
+                "error": error,
+                "partial_results": job["partial_results"],
+            },
+        )
+        if done is not None:
+            done.set_result(status)
+        self._logger.info(f"Job {job_id} {status.value}")
+
+    def _evict_finished(self) -> None:
+        # Called with the lock held; finished jobs stay available from Mongo
+        while len(self._jobs) > MAX_JOBS_IN_MEMORY:
+            evicted = False
+            for job_id, job in self._jobs.items():
+                if JobStatus(job["status"]).is_terminal:
+                    del self._jobs[job_id]
+                    evicted = True
+                    break
+            if not evicted:
+                break
+
+    @staticmethod
+    def _snapshot(job: Dict[str, Any]) -> Dict[str, Any]:
+        snapshot = dict(job)
+        snapshot["progress"] = list(job["progress"])
+        snapshot["partial_results"] = list(job["partial_results"])
+        return snapshot
+
+    def _persist_insert(self, job: Dict[str, Any]) -> None:
+        if self._collection is None:
+            return
+        try:
+            self._collection.insert_one(dict(job))
+        except Exception as e:
+            self._logger.warning(f"Failed to persist job {job['job_id']}: {e}")
+
+    def _persist_update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        self._persist({"$set": fields}, job_id)
+
+    def _persist(self, update: Dict[str, Any], job_id: str) -> None:
+        if self._collection is None:
+            return
+        try:
+            self._collection.update_one({"job_id": job_id}, update)
+        except Exception as e:
+            self._logger.warning(f"Failed to update job {job_id}: {e}")
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if self._collection is None:
+            return None
+        try:
+            return self._collection.find_one({"job_id": job_id}, {"_id": 0})
+        except Exception as e:
+            self._logger.warning(f"Failed to load job {job_id}: {e}")
+            return None
@@ -0,0 +1,5 @@
+from src.modules.query_scheduler.query_scheduler import (
+    QUERY_SCHEDULER,
+    QueryScheduler,
+    query_template,
+)
@@ -0,0 +1,295 @@
+"""
+Adaptive scheduling of discovery queries with early termination.
+
+``SearchEngine`` formulates about ten queries per search, and used to issue
+all of them and wait for the slowest before ranking, even when the first few
+already produced far more profiles than were asked for. :class:`QueryScheduler`
+issues the queries of a search highest-yield first (yield is learned per query
+*template*, i.e. the query with the search's own terms blanked out), keeps a
+bounded number in flight, consumes results as they complete and stops once
+enough unique valid profiles have been found. Queries run on the provider's
+shared pool (``PROVIDER_SCHEDULER``); on an early stop the ones still queued
+there are cancelled, and the ones already running finish in the background
+and still fill the provider cache.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from src.shared.adaptive_concurrency import concurrency_limit
+from src.shared.context import emit_event
+from src.shared.provider_scheduler import PROVIDER_SCHEDULER
+from src.shared.utils import get_logger, FyuzeLogger
+
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MIN_QUERIES = 3
+DEFAULT_EARLY_STOP_FACTOR = 2.0
+# Weight of the newest observation in a template's yield average
+YIELD_SMOOTHING = 0.3
+
+
+def query_template(query: str, terms: Sequence[str]) -> str:
+    """
+    Blank the search's own terms out of a query.
+
+    Terms are matched case-insensitively, longest first, both as written and
+    squashed into a hashtag form (``"vegan food"`` -> ``"veganfood"``).
+
+    Example:
+        >>> query_template("#dubai #fitness #dubaicreator", ["fitness", "Dubai"])
+        '#{} #{} #{}creator'
+    """
+    variants = set()
+    for term in terms:
+        term = (term or "").strip()
+        if not term:
+            continue
+        variants.add(term)
+        squashed = "".join(ch for ch in term if ch.isalnum())
+        if squashed:
+            variants.add(squashed)
+    template = query
+    for variant in sorted(variants, key=len, reverse=True):
+        template = re.sub(re.escape(variant), "{}", template, flags=re.IGNORECASE)
+    return template
+
+
+def _display(template: str) -> str:
+    # The URL exclusions are shared by every Instagram query
+    return re.sub(r"(?:\s*-inurl:\S+)+", " -inurl:…", template)
+
+
+class QueryScheduler:
+    """
+    Run the queries of one search in yield order and stop when enough is found.
+
+    Args:
+        concurrency (int, optional): Queries in flight per search. Defaults to
+            ``QUERY_SCHEDULER_CONCURRENCY`` or 4.
+        min_queries (int, optional): Queries that must complete before an early
+            stop, so frequency ranking still sees overlap. Defaults to
+            ``QUERY_SCHEDULER_MIN_QUERIES`` or 3.
+        early_stop_factor (float, optional): Stop once unique results reach
+            this multiple of the requested count. Defaults to
+            ``QUERY_EARLY_STOP_FACTOR`` or 2.
+
+    Example:
+        >>> scheduler = QueryScheduler()
+        >>> completed = scheduler.run(
+        ...     "instagram",
+        ...     queries,
+        ...     run_query=lambda q: valid_results(exa.search(q)),
+        ...     result_key=lambda r: r.url,
+        ...     target=10,
+        ...     terms=["fitness", "Dubai, UAE"],
+        ... )
+        >>> ranked = engine.rank_results([r for _, results in completed for r in results])
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        min_queries: Optional[int] = None,
+        early_stop_factor: Optional[float] = None,
+    ):
+        self._logger: FyuzeLogger = get_logger(__name__)
+        self._concurrency = concurrency or int(
+            os.getenv("QUERY_SCHEDULER_CONCURRENCY", DEFAULT_CONCURRENCY)
+        )
+        self._min_queries = (
+            min_queries
+            if min_queries is not None
+            else int(os.getenv("QUERY_SCHEDULER_MIN_QUERIES", DEFAULT_MIN_QUERIES))
+        )
+        self._early_stop_factor = early_stop_factor or float(
+            os.getenv("QUERY_EARLY_STOP_FACTOR", DEFAULT_EARLY_STOP_FACTOR)
+        )
+        self._lock = threading.Lock()
+        # (platform, template) -> smoothed count of valid results per query
+        self._yields: Dict[Tuple[str, str], float] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def order(self, platform: str, queries: Sequence[str], terms: Sequence[str]) -> List[str]:
+        """
+        Queries sorted by learned yield, highest first.
+
+        Templates never run before come first (their yield is unknown);
+        ties keep the formulation order.
+        """
+        with self._lock:
+            scores = [
+                self._yields.get((platform, query_template(q, terms))) for q in queries
+            ]
+        ranked = sorted(
+            range(len(queries)),
+            key=lambda i: (scores[i] is not None, -(scores[i] or 0.0), i),
+        )
+        return [queries[i] for i in ranked]
+
+    def run(
+        self,
+        platform: str,
+        queries: Sequence[str],
+        run_query: Callable[[str], List[Any]],
+        result_key: Callable[[Any], Hashable],
+        *,
+        target: Optional[int] = None,
+        terms: Sequence[str] = (),
+        provider: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[str, List[Any]], None]] = None,
+    ) -> List[Tuple[str, List[Any]]]:
+        """
+        Run the queries of one search until enough unique results are found.
+
+        Args:
+            platform: Platform name; yields are learned per platform.
+            queries: Formulated queries, in formulation order.
+            run_query: Runs one query and returns its *valid* results. Errors
+                are logged and count as an empty result.
+            result_key: Identity of a result for uniqueness (URL, username).
+            target: Results requested by the caller; None runs every query.
+            terms: Topic, location and keywords of the search (see
+                :func:`query_template`).
+            provider: Pool the queries run on (``PROVIDER_SCHEDULER``), also
+                reported in the ``queries_issued`` progress event. Defaults to
+                the platform name.
+            max_workers: Upper bound on queries in flight. Defaults to the
+                provider's adaptive concurrency limit (when ``provider`` is set).
+            on_result: Called with ``(query, results)`` as each query
+                completes, so later stages can start before the search ends.
+
+        Returns:
+            ``(query, results)`` for every completed query, in completion order.
+        """
+        queries = list(dict.fromkeys(q for q in queries if q))
+        if not queries:
+            return []
+        ordered = self.order(platform, queries, terms)
+        if max_workers is None and provider is not None:
+            max_workers = concurrency_limit(provider).limit
+        concurrency = max(1, min(self._concurrency, max_workers or self._concurrency))
+        stop_at = (
+            max(target, int(target * self._early_stop_factor)) if target else None
+        )
+
+        completed: List[Tuple[str, List[Any]]] = []
+        seen: set = set()
+        failed = 0
+        issued = 0
+        stopped_early = False
+        pool = provider or platform
+        in_flight: Dict[Future, str] = {}
+
+        def issue(count: int) -> None:
+            nonlocal issued
+            batch = ordered[issued : issued + count]
+            for query in batch:
+                in_flight[PROVIDER_SCHEDULER.submit(pool, run_query, query)] = query
+            issued += len(batch)
+            if batch:
+                emit_event(
+                    "queries_issued",
+                    {"provider": pool, "count": len(batch)},
+                )
+
+        try:
+            issue(concurrency)
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    query = in_flight.pop(future)
+                    try:
+                        results = list(future.result() or [])
+                    except Exception as e:
+                        self._logger.warning(f"Query failed ({platform}): {query}: {e}")
+                        results = []
+                        failed += 1
+                    self._record_yield(platform, query_template(query, terms), len(results))
+                    completed.append((query, results))
+                    seen.update(result_key(r) for r in results)
+                    if on_result is not None and results:
+                        try:
+                            on_result(query, results)
+                        except Exception as e:
+                            self._logger.warning(f"Result callback failed for {query}: {e}")
+
+                if (
+                    stop_at is not None
+                    and len(seen) >= stop_at
+                    and len(completed) >= min(self._min_queries, len(ordered))
+                ):
+                    stopped_early = issued < len(ordered) or bool(in_flight)
+                    break
+                issue(len(done))
+        finally:
+            # Running queries finish in the background (and fill the provider
+            # cache); queued ones are dropped
+            for future in in_flight:
+                future.cancel()
+
+        self._count(
+            platform,
+            searches=1,
+            queries_planned=len(ordered),
+            queries_issued=issued,
+            queries_completed=len(completed),
+            queries_failed=failed,
+            early_stops=int(stopped_early),
+        )
+        if stopped_early:
+            self._logger.info(
+                f"Early stop ({platform}): {len(seen)} unique results after "
+                f"{len(completed)}/{len(ordered)} queries"
+            )
+        return completed
+
+    def _record_yield(self, platform: str, template: str, count: int) -> None:
+        key = (platform, template)
+        with self._lock:
+            previous = self._yields.get(key)
+            self._yields[key] = (
+                float(count)
+                if previous is None
+                else previous + YIELD_SMOOTHING * (count - previous)
+            )
+
+    def _count(self, platform: str, **counters: int) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(platform, {})
+            for name, value in counters.items():
+                stats[name] = stats.get(name, 0) + value
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-platform query counts, early stops and the best templates."""
+        with self._lock:
+            result: Dict[str, Any] = {}
+            for platform, values in self._stats.items():
+                planned = values.get("queries_planned", 0)
+                issued = values.get("queries_issued", 0)
+                top = sorted(
+                    (
+                        (template, round(score, 1))
+                        for (p, template), score in self._yields.items()
+                        if p == platform
+                    ),
+                    key=lambda item: item[1],
+                    reverse=True,
+                )[:5]
+                result[platform] = {
+                    **values,
+                    "queries_skipped": planned - issued,
+                    "skip_ratio": round((planned - issued) / planned, 3) if planned else 0.0,
+                    "top_templates": [
+                        {"template": _display(template), "avg_results": score}
+                        for template, score in top
+                    ],
+                }
+            return result
+
+
+QUERY_SCHEDULER = QueryScheduler()
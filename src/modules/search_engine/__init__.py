@@ -0,0 +1,4 @@
+from src.modules.search_engine._url_parser import URLParser
+from src.modules.search_engine.search_engine import SearchEngine
+
+__all__ = ["SearchEngine", "URLParser"]
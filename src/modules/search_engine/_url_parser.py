@@ -0,0 +1,25 @@
+from typing import Optional
+
+from src.shared.enums import Platform
+from src.shared.utils.url_canonicalizer import parse_profile_url
+
+
+class URLParser:
+    """
+    Profile URL validation for search results, built on the URL canonicalizer.
+
+    Example:
+        >>> parser = URLParser()
+        >>> parser.is_profile_url("https://www.instagram.com/nike/", Platform.INSTAGRAM)
+        True
+        >>> parser.extract_username("https://www.instagram.com/p/C1a2b3/", Platform.INSTAGRAM)
+    """
+
+    def is_profile_url(self, url: str, platform: Platform) -> bool:
+        """Whether ``url`` is a profile page of ``platform`` (not a post, reel or section)."""
+        return parse_profile_url(url, platform) is not None
+
+    def extract_username(self, url: str, platform: Platform) -> Optional[str]:
+        """Handle of a profile URL of ``platform``, or None for other URLs."""
+        handle = parse_profile_url(url, platform)
+        return handle.username if handle else None
@@ -1,24 +1,32 @@
 from threading import local
-from typing import List, Dict, Any, Tuple, Optional
+from typing import Callable, List, Dict, Any, Tuple, Optional
 from collections import defaultdict
-import os
 from datetime import datetime
 
 from exa_py.api import SearchResponse
-from googleapiclient.discovery import build
 
 
 from src.shared.enums import Platform
-from src.shared.services import ExaSearchService, EnsembleService
+from src.shared.services import ExaSearchService, EnsembleService, GoogleCSEService
 from src.shared.models import (
     EnsembleTiktokAccount,
     BasicSearchResult,
     BasicSearchResultItem,
+    ProfileSearchHit,
 )
 
 from src.shared.utils import get_logger, FyuzeLogger
+from src.shared.utils.hedging import DISCOVERY_HEDGE, DISCOVERY_HEDGE_MODE
+from src.shared.utils.url_canonicalizer import parse_profile_url
+from src.modules.query_scheduler import QUERY_SCHEDULER
 
-from src.protected.search_engine import URLParser
+from src.modules.search_engine._url_parser import URLParser
+
+
+def _profile_key(result: Any) -> str:
+    """Identity of a profile search result: its canonical profile URL."""
+    handle = parse_profile_url(result.url)
+    return handle.url if handle else result.url
 
 
 class SearchEngine:
@@ -37,6 +45,8 @@ class SearchEngine:
         self._url_parser = URLParser()
         # Ensemble service for TikTok custom search
         self._ensemble_service = EnsembleService()
+        # Google Custom Search client for basic_search (built once, on first use)
+        self._cse_service = GoogleCSEService()
 
     def search_tiktok_accounts(
         self,
@@ -46,19 +56,27 @@ class SearchEngine:
         *,
         period: str = "180",
         max_results_per_keyword: Optional[int] = None,
-        max_workers: int = 5,
+        max_workers: Optional[int] = None,
+        target_results: Optional[int] = None,
     ) -> List[EnsembleTiktokAccount]:
         """
         Custom TikTok search that builds creator-focused queries and fetches
         real accounts using Ensemble Data.
 
+        Queries run highest-yield first through ``QUERY_SCHEDULER``; with
+        ``target_results`` set, the remaining queries are skipped once enough
+        unique accounts were found.
+
         Args:
             topic: Main topic/niche (e.g., "Food")
             location: City/Region focus (e.g., "Tripoli, Lebanon")
             keywords: Optional extra keywords to refine queries
             period: Ensemble search period (default: "90")
             max_results_per_keyword: Limit results per query (optional)
-            max_workers: Parallelism for Ensemble calls
+            max_workers: Parallelism for Ensemble calls (default: Ensemble's
+                adaptive concurrency limit)
+            target_results: Accounts the caller needs (optional; None runs
+                every query)
 
         Returns:
             A list of unique `EnsembleTiktokAccount` objects sorted by relevance.
@@ -79,20 +97,32 @@ class SearchEngine:
 
         # self._logger.debug(f"Executing {len(queries)} TikTok queries via Ensemble Data")
 
-        # Use EnsembleService parallel search; it returns unique, relevance-sorted accounts
-        accounts = self._ensemble_service.search_tiktok_parallel(
-            keywords=queries,
-            period=period,
-            max_results_per_keyword=max_results_per_keyword,
+        completed = QUERY_SCHEDULER.run(
+            Platform.TIKTOK.value,
+            queries,
+            lambda query: self.search_tiktok_query(
+                query, period=period, max_results=max_results_per_keyword
+            ),
+            result_key=lambda account: account.unique_id,
+            target=target_results,
+            terms=[topic, location, *location.split(","), *kw],
+            provider="ensemble",
             max_workers=max_workers,
         )
 
-        # As an extra safeguard, ensure uniqueness by unique_id via set semantics
-        unique_accounts = list(set(accounts))
-
-        # Preserve the original relevance order where possible
-        uid_order = {acc.unique_id: idx for idx, acc in enumerate(accounts)}
-        unique_accounts.sort(key=lambda a: uid_order.get(a.unique_id, 1_000_000))
+        # Score accounts by how many queries returned them (first occurrence kept)
+        account_scores: Dict[str, int] = defaultdict(int)
+        account_objects: Dict[str, EnsembleTiktokAccount] = {}
+        for _, accounts in completed:
+            for account in accounts:
+                account_scores[account.unique_id] += 1
+                account_objects.setdefault(account.unique_id, account)
+
+        unique_accounts = sorted(
+            account_objects.values(),
+            key=lambda a: account_scores[a.unique_id],
+            reverse=True,
+        )
 
         # self._logger.info(
         #     f"TikTok custom search complete: {len(unique_accounts)} unique accounts returned"
@@ -106,16 +136,23 @@ class SearchEngine:
         keywords: List[str],
         platform: Platform,
         max_results: int = 50,
+        on_results: Optional[Callable[[List[Any]], None]] = None,
     ) -> List[Tuple[Any, int]]:
         """
         Search for influencers and content creators on a specific platform.
 
+        Queries run highest-yield first through ``QUERY_SCHEDULER`` and the
+        remaining ones are skipped once enough unique profiles were found
+        for ``max_results``.
+
         Args:
             topic: The main topic or niche to search for (e.g., "fitness", "cooking")
             location: Geographic location to focus the search (e.g., "New York", "London")
             keywords: List of related keywords to enhance search (e.g., ["yoga", "wellness"])
             platform: The social media platform to search on
             max_results: Maximum number of results to return (default: 50)
+            on_results: Optional callback receiving the valid profile results
+                of each query as soon as it completes (before ranking)
 
         Returns:
             List of tuples containing (search_result, frequency_score) sorted by relevance
@@ -139,36 +176,9 @@ class SearchEngine:
         # Generate search queries
         queries = self._formulate_queries(topic, location, keywords, platform)
 
-        # Prepare queries for bulk search
-        query_dict = {f"query_{i}": query for i, query in enumerate(queries)}
-
-        # Perform bulk search using EXA service
-        try:
-            search_results = self._exa_service.bulk_search(query_dict)
-            # self._logger.info(
-            #     f"Bulk search completed with {len(search_results)} query results"
-            # )
-        except Exception as e:
-            # self._logger.error(f"Error during bulk search: {e}")
-            raise
-
-        # Collect and filter results
-        all_results = []
-        for query_id, query_response in search_results.items():
-            if isinstance(query_response, SearchResponse):
-                # Filter results to only include valid profile URLs
-                valid_results = [
-                    result
-                    for result in query_response.results
-                    if self._url_parser.is_profile_url(result.url, platform)
-                ]
-                all_results.extend(valid_results)
-                # self._logger.debug(
-                #     f"Query {query_id}: {len(valid_results)} valid profiles found"
-                # )
-
-        # Rank results by frequency and relevance
-        ranked_results = self._rank_results(all_results)
+        ranked_results = self._run_profile_queries(
+            queries, topic, location, keywords, platform, max_results, on_results
+        )
 
         # Limit results to max_results
         final_results = ranked_results[:max_results]
@@ -180,6 +190,113 @@ class SearchEngine:
 
         return final_results
 
+    def search_relaxed(
+        self,
+        topic: str,
+        location: str,
+        keywords: List[str],
+        platform: Platform,
+        max_results: int = 50,
+        on_results: Optional[Callable[[List[Any]], None]] = None,
+    ) -> List[Tuple[Any, int]]:
+        """
+        Broader fallback for a ``search`` that found no profiles.
+
+        Runs a relaxed query tier (unquoted terms, single location parts, no
+        URL exclusions) instead of repeating the same queries.
+
+        Args:
+            topic: The main topic or niche to search for
+            location: Geographic location to focus the search
+            keywords: List of related keywords
+            platform: The social media platform to search on
+            max_results: Maximum number of results to return (default: 50)
+            on_results: Optional callback, as for ``search``
+
+        Returns:
+            List of tuples containing (search_result, frequency_score) sorted by relevance
+
+        Example:
+            >>> engine = SearchEngine()
+            >>> results = engine.search("vegan bakery", "Tripoli, Lebanon", [], Platform.INSTAGRAM)
+            >>> if not results:
+            ...     results = engine.search_relaxed("vegan bakery", "Tripoli, Lebanon", [], Platform.INSTAGRAM)
+        """
+        strict = set(self._formulate_queries(topic, location, keywords, platform))
+        queries = [
+            q
+            for q in self._formulate_relaxed_queries(topic, location, keywords, platform)
+            if q not in strict
+        ]
+        ranked_results = self._run_profile_queries(
+            queries, topic, location, keywords, platform, max_results, on_results
+        )
+        return ranked_results[:max_results]
+
+    def _run_profile_queries(
+        self,
+        queries: List[str],
+        topic: str,
+        location: str,
+        keywords: List[str],
+        platform: Platform,
+        max_results: int,
+        on_results: Optional[Callable[[List[Any]], None]] = None,
+    ) -> List[Tuple[Any, int]]:
+        """
+        Run the queries through the scheduler and rank the valid profiles.
+
+        Each query goes to Exa; depending on ``DISCOVERY_HEDGE_MODE`` the same
+        query (its ``site:`` token included) is also sent to Google CSE, and
+        the profiles of both providers are ranked together.
+        """
+        use_cse = (
+            DISCOVERY_HEDGE_MODE in ("hedge", "federated")
+            and GoogleCSEService.is_configured()
+        )
+
+        def exa_profiles(query: str) -> List[Any]:
+            response = self._exa_service.search(query)
+            if not isinstance(response, SearchResponse):
+                return []
+            return response.results
+
+        def cse_profiles(query: str) -> List[Any]:
+            return [
+                ProfileSearchHit.from_cse_item(item)
+                for item in self._cse_service.search_page(query)
+            ]
+
+        def valid_profiles(query: str) -> List[Any]:
+            completed = DISCOVERY_HEDGE.run(
+                lambda: exa_profiles(query),
+                (lambda: cse_profiles(query)) if use_cse else None,
+                federated=DISCOVERY_HEDGE_MODE == "federated",
+            )
+            # Filter results to only include valid profile URLs
+            return [
+                result
+                for _, results in completed
+                for result in results
+                if self._url_parser.is_profile_url(result.url, platform)
+            ]
+
+        completed = QUERY_SCHEDULER.run(
+            platform.value,
+            queries,
+            valid_profiles,
+            result_key=_profile_key,
+            target=max_results,
+            terms=[topic, location, *location.split(","), *(keywords or [])],
+            provider="exa",
+            on_result=(lambda _, results: on_results(results)) if on_results else None,
+        )
+
+        # Rank results by frequency and relevance
+        return self._rank_results(
+            [result for _, results in completed for result in results]
+        )
+
     def search_single_query(
         self, query: str, platform: Platform, filter_profiles: bool = True
     ) -> List[Any]:
@@ -221,6 +338,59 @@ class SearchEngine:
             # self._logger.error(f"Error during single query search: {e}")
             raise
 
+    def plan_queries(
+        self,
+        topic: str,
+        location: str,
+        keywords: List[str] | None,
+        platform: Platform,
+    ) -> List[str]:
+        """
+        Return the queries ``search`` (or ``search_tiktok_accounts`` for TikTok)
+        would issue, without running them.
+
+        Lets batch callers plan many searches up front and deduplicate query
+        strings shared between them.
+
+        Example:
+            >>> engine = SearchEngine()
+            >>> queries = engine.plan_queries(
+            ...     "food", "Dubai, UAE", ["street food"], Platform.INSTAGRAM
+            ... )
+            >>> for query in queries:
+            ...     print(query)
+        """
+        if platform == Platform.TIKTOK:
+            return self._formulate_tiktok_queries(
+                topic=topic, location=location, keywords=keywords or []
+            )
+        return self._formulate_queries(topic, location, keywords or [], platform)
+
+    def search_tiktok_query(
+        self,
+        query: str,
+        *,
+        period: str = "180",
+        max_results: Optional[int] = None,
+    ) -> List[EnsembleTiktokAccount]:
+        """
+        Run a single TikTok keyword query through Ensemble Data.
+
+        Args:
+            query: One query from ``plan_queries(..., Platform.TIKTOK)``
+            period: Ensemble search period (same default as ``search_tiktok_accounts``)
+            max_results: Limit results for the query (optional)
+
+        Returns:
+            Accounts returned for the query, in Ensemble's order.
+        """
+        return self._ensemble_service.search_tiktok(
+            [query],
+            period=period,
+            max_results_per_keyword=max_results,
+            parallel=False,
+        )
+
     def rank_results(self, results: List[Any]) -> List[Tuple[Any, int]]:
         """
         Public method to rank a list of results based on repetition frequency.
@@ -573,6 +743,43 @@ class SearchEngine:
         )
         return queries
 
+    def _formulate_relaxed_queries(
+        self,
+        topic: str,
+        location: str,
+        keywords: List[str],
+        platform: Platform,
+    ) -> List[str]:
+        """
+        Broader queries for searches whose strict queries found nothing:
+        unquoted terms, one location part at a time, no URL exclusions
+        (``URLParser`` still validates every result).
+        """
+        site_token = f"site:{platform.domain}"
+        topic = (topic or "").strip()
+        location_parts = [p.strip() for p in (location or "").split(",") if p.strip()]
+        city = location_parts[0] if location_parts else ""
+        country = location_parts[-1] if location_parts else ""
+        kws = [k.strip() for k in (keywords or []) if k and k.strip()]
+
+        queries: List[str] = []
+
+        def add(*parts: str):
+            q = " ".join(p for p in parts if p).strip()
+            if q and q != site_token and q not in queries:
+                queries.append(q)
+
+        add(site_token, topic, city)
+        add(site_token, topic, "influencer", city)
+        add(site_token, topic, "blogger", city)
+        if country and country != city:
+            add(site_token, topic, country)
+            add(site_token, topic, "influencer", country)
+        for kw in kws[:2]:
+            add(site_token, kw, city)
+        add(site_token, f'"{topic}"', "(creator OR influencer OR blogger)", country)
+        return queries
+
     def _formulate_tiktok_queries(
         self,
         topic: str,
@@ -727,8 +934,11 @@ class SearchEngine:
         url_to_result = {}
 
         for result in results:
-            # Use URL as primary identifier, fallback to ID if URL is None
-            identifier = getattr(result, "url", None) or getattr(result, "id", None)
+            # Use the canonical profile URL as primary identifier (so URL
+            # variants of one profile add up), then the raw URL, then the ID
+            url = getattr(result, "url", None)
+            handle = parse_profile_url(url) if url else None
+            identifier = (handle.url if handle else url) or getattr(result, "id", None)
 
             if identifier:
                 url_counts[identifier] += 1
@@ -786,13 +996,19 @@ class SearchEngine:
 
         return None
 
-    def basic_search(self, query: str, gl: str | None) -> BasicSearchResult:
+    def basic_search(
+        self, query: str, gl: str | None, pages: int = 1
+    ) -> BasicSearchResult:
         """
         Perform a basic Google Custom Search (using CSE) and return structured results.
 
+        Several pages are fetched concurrently and merged, so 30-50 results
+        take about as long as one page.
+
         Args:
             query: The search query string
             gl: Optional geographic location code (e.g., "us", "lb")
+            pages: Number of 10-result pages to fetch (default: 1, max: 10)
 
         Returns:
             BasicSearchResult containing the search outcome
@@ -803,27 +1019,7 @@ class SearchEngine:
         response = None
 
         try:
-            api_key = os.getenv("GOOGLE_API_KEY")
-            search_engine_id = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
-
-            if not api_key or not search_engine_id:
-                raise ValueError(
-                    "GOOGLE_API_KEY and GOOGLE_SEARCH_ENGINE_ID must be set in environment variables"
-                )
-
-            service = build("customsearch", "v1", developerKey=api_key)
-            result = (
-                service.cse()
-                .list(
-                    q=query,
-                    cx=search_engine_id,
-                    gl=gl,  #! should be country code (e.g: "us", "lb")
-                    num=10,  #! max 10
-                )
-                .execute()
-            )
-
-            items = result.get("items", [])
+            items = self._cse_service.search(query, gl=gl, pages=pages)
             response = [BasicSearchResultItem.from_dict(item) for item in items]
             success = True
 
@@ -1,4 +1,9 @@
-"""Loader that exposes the protected ``src.modules.search_engine`` package."""
+"""Loader that exposes the protected ``src.modules.search_engine`` package.
+
+The compiled bundle in ``dist/protected/search_engine`` is used when it has
+been built (``scripts/build_protected_search_engine.py``, run by the Docker
+build); otherwise the package is imported from its source.
+"""
 
 from __future__ import annotations
 
@@ -24,12 +29,6 @@ __all__ = [
 
 def _import_protected_package() -> ModuleType:
     """Load the compiled package into ``sys.modules`` under its original name."""
-    if not _INIT_FILE.exists():
-        raise ImportError(
-            f"Protected package entry point '{_INIT_FILE}' not found. "
-            "Run scripts/build_protected_search_engine.py to regenerate it."
-        )
-
     # Ensure the parent namespace package exists
     importlib.import_module("src.modules")
 
@@ -37,6 +36,10 @@ def _import_protected_package() -> ModuleType:
     if existing is not None:
         return existing
 
+    if not _INIT_FILE.exists():
+        # Not built: run from source
+        return importlib.import_module(_PACKAGE_NAME)
+
     loader = importlib.machinery.SourcelessFileLoader(_PACKAGE_NAME, str(_INIT_FILE))
     spec = importlib.util.spec_from_loader(_PACKAGE_NAME, loader, is_package=True)
     if spec is None:
@@ -0,0 +1,275 @@
+"""
+Adaptive (AIMD) concurrency limits per provider.
+
+Fixed worker counts (``max_workers=5`` per fan-out) are too low while a
+provider is healthy and too high while it throttles us. Each provider
+instead gets an :class:`AdaptiveConcurrencyLimit` on the number of requests
+in flight. While requests succeed at normal latency and the limit is in use,
+it grows by one per round of ``limit`` requests (additive increase). A 429,
+a 5xx, a transport timeout or recent latency above
+``CONCURRENCY_LATENCY_FACTOR`` × the request type's baseline multiplies it by
+``CONCURRENCY_DECREASE`` (multiplicative decrease), at most once per cooldown
+so one burst of failures counts once.
+
+Provider requests take a permit with :func:`concurrency_limited`; fan-outs
+without an explicit ``max_workers`` keep the provider's current limit in
+flight (see ``ProviderScheduler.map_unordered``). Limits stay between
+``CONCURRENCY_MIN_<PROVIDER>`` and the provider's pool size.
+"""
+
+from collections.abc import Callable
+from contextlib import contextmanager
+from functools import wraps
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+import requests
+
+from src.shared.provider_scheduler import PROVIDER_SCHEDULER
+from src.shared.utils.logging import get_logger, FyuzeLogger
+from src.shared.utils.retry import error_status
+
+# Limits before any feedback (the former hard-coded max_workers)
+DEFAULT_INITIAL_CONCURRENCY: Dict[str, int] = {
+    "ensemble": 5,
+    "exa": 5,
+    "google_cse": 5,
+    "rapid": 5,
+    "apify": 3,
+}
+DEFAULT_OTHER_INITIAL_CONCURRENCY = 4
+DEFAULT_CONCURRENCY_DECREASE = 0.5
+DEFAULT_CONCURRENCY_LATENCY_FACTOR = 2.0
+# Weights of each new latency in the recent (fast) and baseline (slow) EWMAs
+_RECENT_WEIGHT = 0.3
+_BASELINE_WEIGHT = 0.05
+_MIN_COOLDOWN_SECONDS = 0.5
+
+# Statuses that mean the provider is overloaded or throttling us
+_OVERLOAD_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """429/5xx answers and timeouts; other errors say nothing about load."""
+    status = error_status(error)
+    if status is not None:
+        return status in _OVERLOAD_STATUSES or status >= 500
+    return isinstance(error, (TimeoutError, httpx.TimeoutException, requests.Timeout))
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    AIMD limit on one provider's requests in flight.
+
+    Args:
+        provider (str): Provider name, for logs and stats.
+        initial (int): Starting limit.
+        min_limit (int): Lowest limit after decreases.
+        max_limit (int): Highest limit (the provider's pool size).
+        decrease (float): Factor applied on overload. Defaults to
+            ``CONCURRENCY_DECREASE`` or 0.5.
+        latency_factor (float): Recent latency above this multiple of the
+            baseline counts as overload. Defaults to ``CONCURRENCY_LATENCY_FACTOR`` or 2.
+
+    Example:
+        >>> limit = AdaptiveConcurrencyLimit("rapid", initial=5, min_limit=1, max_limit=8)
+        >>> with limit.permit():
+        ...     fetch_snapshot(url)
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        decrease: Optional[float] = None,
+        latency_factor: Optional[float] = None,
+    ):
+        self._logger: FyuzeLogger = get_logger(__name__)
+        self.provider = provider
+        self._min = max(1, min_limit)
+        self._max = max(self._min, max_limit)
+        self._limit = float(min(self._max, max(self._min, initial)))
+        self._decrease = decrease or float(
+            os.getenv("CONCURRENCY_DECREASE", DEFAULT_CONCURRENCY_DECREASE)
+        )
+        self._latency_factor = latency_factor or float(
+            os.getenv("CONCURRENCY_LATENCY_FACTOR", DEFAULT_CONCURRENCY_LATENCY_FACTOR)
+        )
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        # operation -> [recent, baseline] latency EWMAs; each decorated
+        # request has its own (a keyword search is slower than a profile)
+        self._latency: Dict[str, List[float]] = {}
+        self._last_decrease = 0.0
+        self._stats = {"acquired": 0, "increases": 0, "decreases": 0, "overloads": 0}
+
+    @property
+    def limit(self) -> int:
+        """Current limit on requests in flight."""
+        return int(self._limit)
+
+    def acquire(self) -> int:
+        """
+        Block until a request may start.
+
+        Returns:
+            Requests in flight when this one started (passed to :meth:`release`).
+        """
+        with self._cond:
+            self._waiting += 1
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._waiting -= 1
+            self._in_flight += 1
+            self._stats["acquired"] += 1
+            return self._in_flight
+
+    def release(
+        self,
+        in_flight: int,
+        latency: float,
+        error: Optional[BaseException] = None,
+        operation: str = "default",
+    ) -> None:
+        """
+        End a request and adjust the limit on its outcome.
+
+        Args:
+            in_flight: Value returned by :meth:`acquire`.
+            latency: Duration of the request in seconds.
+            error: The request's error, if it failed.
+            operation: Request type whose latency baseline applies.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            overloaded = error is not None and is_overload_error(error)
+            if error is None:
+                ewma = self._latency.setdefault(operation, [latency, latency])
+                ewma[0] += _RECENT_WEIGHT * (latency - ewma[0])
+                ewma[1] += _BASELINE_WEIGHT * (latency - ewma[1])
+                overloaded = ewma[0] > self._latency_factor * ewma[1]
+            if overloaded:
+                self._stats["overloads"] += 1
+                self._decrease_limit(operation)
+            elif error is None and in_flight * 2 >= self._limit:
+                # Grow only while the limit is what bounds the traffic
+                previous = int(self._limit)
+                self._limit = min(self._max, self._limit + 1 / self._limit)
+                if int(self._limit) > previous:
+                    self._stats["increases"] += 1
+            self._cond.notify_all()
+
+    def _decrease_limit(self, operation: str) -> None:
+        now = time.monotonic()
+        baseline = self._latency.get(operation, [0.0, 0.0])[1]
+        cooldown = max(_MIN_COOLDOWN_SECONDS, baseline)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        previous = int(self._limit)
+        self._limit = max(self._min, self._limit * self._decrease)
+        if int(self._limit) < previous:
+            self._stats["decreases"] += 1
+            self._logger.warning(
+                f"{self.provider} concurrency limit lowered {previous} -> {int(self._limit)}"
+            )
+
+    @contextmanager
+    def permit(self, operation: str = "default") -> Iterator[None]:
+        """Hold a permit for the duration of one request, reporting its outcome."""
+        in_flight = self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.release(in_flight, time.perf_counter() - started, e, operation)
+            raise
+        self.release(in_flight, time.perf_counter() - started, None, operation)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(
+                {
+                    "limit": int(self._limit),
+                    "min_limit": self._min,
+                    "max_limit": self._max,
+                    "in_flight": self._in_flight,
+                    "waiting": self._waiting,
+                    "baseline_latency_ms": {
+                        operation: round(ewma[1] * 1000, 1)
+                        for operation, ewma in self._latency.items()
+                    },
+                }
+            )
+        return stats
+
+
+_limits: Dict[str, AdaptiveConcurrencyLimit] = {}
+_limits_lock = threading.Lock()
+
+
+def concurrency_limit(provider: str) -> AdaptiveConcurrencyLimit:
+    """
+    The adaptive concurrency limit of a provider, created on first use.
+
+    Configured by ``CONCURRENCY_INITIAL_<PROVIDER>`` and
+    ``CONCURRENCY_MIN_<PROVIDER>``; the maximum is the provider's pool size
+    (``PROVIDER_WORKERS_<PROVIDER>``).
+    """
+    with _limits_lock:
+        limit = _limits.get(provider)
+        if limit is None:
+            suffix = provider.upper()
+            limit = _limits[provider] = AdaptiveConcurrencyLimit(
+                provider,
+                initial=int(
+                    os.getenv(
+                        f"CONCURRENCY_INITIAL_{suffix}",
+                        DEFAULT_INITIAL_CONCURRENCY.get(
+                            provider, DEFAULT_OTHER_INITIAL_CONCURRENCY
+                        ),
+                    )
+                ),
+                min_limit=int(os.getenv(f"CONCURRENCY_MIN_{suffix}", 1)),
+                max_limit=PROVIDER_SCHEDULER.workers(provider),
+            )
+        return limit
+
+
+def concurrency_limited(provider: str):
+    """
+    Decorator holding a permit of the provider's limit for each call.
+
+    Place it directly on the request (below ``@retry`` and ``@rate_limited``)
+    so its latency excludes rate-limit and backoff waits.
+
+    Example:
+        >>> @retry(provider="exa")
+        ... @rate_limited("exa")
+        ... @concurrency_limited("exa")
+        ... def _search(self, query): ...
+    """
+
+    def decorator(func: Callable):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with concurrency_limit(provider).permit(func.__qualname__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-provider current limit, requests in flight and AIMD adjustments."""
+    with _limits_lock:
+        limits = dict(_limits)
+    return {provider: limit.stats() for provider, limit in limits.items()}
@@ -0,0 +1,235 @@
+"""
+Per-provider circuit breakers.
+
+When a provider is down, every call used to wait through its retries and
+timeouts before failing. A :class:`CircuitBreaker` counts consecutive
+provider failures (429s, 5xx answers, timeouts and connection errors; a 404
+is an answer, not a failure). After ``CIRCUIT_FAILURE_THRESHOLD_<PROVIDER>``
+of them the circuit *opens*: for ``CIRCUIT_OPEN_SECONDS_<PROVIDER>`` calls
+raise :class:`~src.shared.exceptions.CircuitOpenError` at once, without
+touching the network. Then the circuit goes *half-open* and lets
+``CIRCUIT_HALF_OPEN_CALLS`` trial calls through: a success closes it, a
+failure opens it again.
+
+Rejected calls mark the provider unavailable for the current request
+(:func:`src.shared.context.mark_provider_unavailable`), and the API flags
+its response as degraded instead of failing.
+"""
+
+from collections.abc import Callable
+from functools import wraps
+import os
+import threading
+import time
+from typing import Any, Dict
+
+import httpx
+
+from src.shared.context import mark_provider_unavailable
+from src.shared.enums import CircuitState
+from src.shared.exceptions import CircuitOpenError
+from src.shared.utils.logging import get_logger, FyuzeLogger
+from src.shared.utils.retry import error_status
+
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_OPEN_SECONDS = 30.0
+DEFAULT_CIRCUIT_HALF_OPEN_CALLS = 1
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """Whether an error says the provider is unhealthy (429, 5xx, transport)."""
+    status = error_status(error)
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    # requests' ConnectionError/Timeout derive from OSError
+    return isinstance(error, (httpx.TransportError, TimeoutError, OSError))
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker of one provider.
+
+    Args:
+        provider (str): Provider name, for errors, logs and stats.
+        failure_threshold (int): Consecutive failures that open the circuit.
+        open_seconds (float): Time calls are rejected before a trial call.
+        half_open_calls (int): Trial calls let through while half-open.
+        is_failure (Callable, optional): Which errors count as failures.
+            Defaults to :func:`is_provider_failure`.
+
+    Example:
+        >>> breaker = CircuitBreaker("rapid", failure_threshold=5, open_seconds=30)
+        >>> breaker.call(requests.get, url, timeout=30)
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        failure_threshold: int,
+        open_seconds: float,
+        half_open_calls: int = DEFAULT_CIRCUIT_HALF_OPEN_CALLS,
+        is_failure: Callable[[BaseException], bool] = is_provider_failure,
+    ):
+        self._logger: FyuzeLogger = get_logger(__name__)
+        self.provider = provider
+        self._threshold = max(1, failure_threshold)
+        self._open_seconds = open_seconds
+        self._half_open_calls = max(1, half_open_calls)
+        self._is_failure = is_failure
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._stats = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and now - self._opened_at >= self._open_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        Let a call through or reject it.
+
+        Raises:
+            CircuitOpenError: While the circuit is open, or half-open with
+                its trial calls already in flight.
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state is CircuitState.HALF_OPEN and self._trials < self._half_open_calls:
+                self._trials += 1
+                state = CircuitState.CLOSED
+            if state is not CircuitState.CLOSED:
+                self._stats["rejected"] += 1
+                retry_in = max(0.0, self._opened_at + self._open_seconds - now)
+            else:
+                self._stats["calls"] += 1
+                return
+        mark_provider_unavailable(self.provider)
+        raise CircuitOpenError(self.provider, retry_in)
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._logger.info(f"{self.provider} circuit closed")
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+
+    def on_error(self, error: BaseException) -> None:
+        if not self._is_failure(error):
+            # The provider answered (e.g. not found): it is up
+            self.on_success()
+            return
+        with self._lock:
+            self._stats["failures"] += 1
+            self._failures += 1
+            if self._state is CircuitState.HALF_OPEN or self._failures >= self._threshold:
+                if self._state is not CircuitState.OPEN:
+                    self._stats["opened"] += 1
+                    self._logger.warning(
+                        f"{self.provider} circuit opened for {self._open_seconds:.0f}s "
+                        f"after {self._failures} failure(s): {error}"
+                    )
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn`` through the breaker."""
+        self.before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.on_error(e)
+            raise
+        self.on_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            stats = dict(self._stats)
+            stats["state"] = self._current_state(now).value
+            stats["consecutive_failures"] = self._failures
+            if self._state is CircuitState.OPEN:
+                stats["retry_in_seconds"] = round(
+                    max(0.0, self._opened_at + self._open_seconds - now), 1
+                )
+        return stats
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(provider: str) -> CircuitBreaker:
+    """
+    The circuit breaker of a provider, created from the environment on first use.
+
+    Configured by ``CIRCUIT_FAILURE_THRESHOLD_<PROVIDER>`` and
+    ``CIRCUIT_OPEN_SECONDS_<PROVIDER>`` (falling back to
+    ``CIRCUIT_FAILURE_THRESHOLD`` / ``CIRCUIT_OPEN_SECONDS``) and
+    ``CIRCUIT_HALF_OPEN_CALLS``.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            suffix = provider.upper()
+            threshold = os.getenv(
+                "CIRCUIT_FAILURE_THRESHOLD", DEFAULT_CIRCUIT_FAILURE_THRESHOLD
+            )
+            open_seconds = os.getenv("CIRCUIT_OPEN_SECONDS", DEFAULT_CIRCUIT_OPEN_SECONDS)
+            breaker = _breakers[provider] = CircuitBreaker(
+                provider,
+                failure_threshold=int(
+                    os.getenv(f"CIRCUIT_FAILURE_THRESHOLD_{suffix}", threshold)
+                ),
+                open_seconds=float(os.getenv(f"CIRCUIT_OPEN_SECONDS_{suffix}", open_seconds)),
+                half_open_calls=int(
+                    os.getenv("CIRCUIT_HALF_OPEN_CALLS", DEFAULT_CIRCUIT_HALF_OPEN_CALLS)
+                ),
+            )
+        return breaker
+
+
+def circuit_protected(provider: str):
+    """
+    Decorator running each call through the provider's circuit breaker.
+
+    Place it below ``@retry`` (an open circuit is not retried) and above
+    ``@rate_limited`` / ``@concurrency_limited`` (a rejected call takes no
+    permit).
+
+    Example:
+        >>> @retry(provider="rapid")
+        ... @circuit_protected("rapid")
+        ... @rate_limited("rapid")
+        ... def _request_audience_snapshot(self, url): ...
+    """
+
+    def decorator(func: Callable):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return circuit_breaker(provider).call(func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def circuit_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-provider circuit state, failures and rejected calls."""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {provider: breaker.stats() for provider, breaker in breakers.items()}
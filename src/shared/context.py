@@ -1,2 +1,257 @@
-user_id= None
-session_id= None
+"""
+Request-scoped context for the Fyuze API.
+
+``user_id`` / ``session_id`` used to be module globals written by the HTTP
+handler, so concurrent requests overwrote each other and tool results landed
+in another user's session document. They now live in ``contextvars``: each
+request (asyncio task) gets its own copy, and
+:class:`ContextThreadPoolExecutor` carries that copy into worker threads.
+
+Reading ``context.user_id`` / ``context.session_id`` keeps working and returns
+the value for the current request.
+
+A request may also bind an event sink (see :func:`set_event_sink`); pipeline
+stages report progress through :func:`emit_event`, which is a no-op when
+nobody is listening.
+
+:func:`cancellation_scope` marks work whose result nobody waits for any more
+(e.g. a tool call that timed out); side effects check :func:`is_cancelled`
+and are dropped.
+
+:func:`track_unavailable_providers` collects the providers whose circuit
+breaker turned calls away during the request, so the response can be flagged
+as degraded instead of failing. Work shared between requests (see
+:class:`~src.shared.utils.SingleFlight`) collects them with
+:func:`share_unavailable_providers` and hands them to every waiting request
+through :func:`report_unavailable_providers`.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+_user_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "fyuze_user_id", default=None
+)
+_session_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "fyuze_session_id", default=None
+)
+
+_event_sink: contextvars.ContextVar[Optional[Callable[[str, Dict[str, Any]], None]]] = (
+    contextvars.ContextVar("fyuze_event_sink", default=None)
+)
+
+_unavailable: contextvars.ContextVar[Optional[Set[str]]] = contextvars.ContextVar(
+    "fyuze_unavailable_providers", default=None
+)
+
+# Sets of the shared calls (innermost last) the current work runs for
+_shared_unavailable: contextvars.ContextVar[Tuple[Set[str], ...]] = contextvars.ContextVar(
+    "fyuze_shared_unavailable_providers", default=()
+)
+
+_cancelled: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "fyuze_cancelled", default=None
+)
+
+ContextToken = Tuple[contextvars.Token, contextvars.Token]
+
+
+def set_request_context(user_id: Optional[str], session_id: Optional[str]) -> ContextToken:
+    """
+    Bind ``user_id`` and ``session_id`` to the current context.
+
+    Returns:
+        Tokens to pass to :func:`reset_request_context`.
+    """
+    return _user_id.set(user_id), _session_id.set(session_id)
+
+
+def reset_request_context(token: ContextToken) -> None:
+    """Restore the values that were bound before :func:`set_request_context`."""
+    user_token, session_token = token
+    _session_id.reset(session_token)
+    _user_id.reset(user_token)
+
+
+@contextmanager
+def request_context(user_id: Optional[str], session_id: Optional[str]) -> Iterator[None]:
+    """
+    Bind the request identity for the duration of the ``with`` block.
+
+    Example:
+        >>> with request_context("user-1", "session-1"):
+        ...     get_doc_id()
+        'user-1_session-1'
+    """
+    token = set_request_context(user_id, session_id)
+    try:
+        yield
+    finally:
+        reset_request_context(token)
+
+
+def get_user_id() -> Optional[str]:
+    """User id of the current request, or None outside a request."""
+    return _user_id.get()
+
+
+def get_session_id() -> Optional[str]:
+    """Session id of the current request, or None outside a request."""
+    return _session_id.get()
+
+
+def get_doc_id() -> str:
+    """Mongo ``doc_id`` of the current request's session document."""
+    return f"{_user_id.get()}_{_session_id.get()}"
+
+
+def set_event_sink(
+    sink: Optional[Callable[[str, Dict[str, Any]], None]]
+) -> contextvars.Token:
+    """
+    Bind a callable that receives ``(event, data)`` progress events.
+
+    The sink is called from whichever thread emits the event, so it must be
+    thread-safe (e.g. ``loop.call_soon_threadsafe`` onto an asyncio queue).
+
+    Returns:
+        Token to pass to :func:`reset_event_sink`.
+    """
+    return _event_sink.set(sink)
+
+
+def get_event_sink() -> Optional[Callable[[str, Dict[str, Any]], None]]:
+    """The sink bound for the current request, if any (e.g. to wrap it)."""
+    return _event_sink.get()
+
+
+def reset_event_sink(token: contextvars.Token) -> None:
+    """Restore the sink that was bound before :func:`set_event_sink`."""
+    _event_sink.reset(token)
+
+
+def emit_event(event: str, data: Dict[str, Any]) -> None:
+    """
+    Report a progress event to the current request's sink, if any.
+
+    Sink failures are swallowed: progress reporting must never break the
+    pipeline that emits it.
+
+    Example:
+        >>> emit_event("profiles_found", {"platform": "instagram", "count": 8})
+    """
+    sink = _event_sink.get()
+    if sink is None or is_cancelled():
+        return
+    try:
+        sink(event, data)
+    except Exception:
+        pass
+
+
+@contextmanager
+def cancellation_scope(cancelled: threading.Event) -> Iterator[None]:
+    """
+    Run the ``with`` block, and the work it hands to other threads, under
+    ``cancelled``: once the event is set, :func:`is_cancelled` is True there.
+
+    Example:
+        >>> cancelled = threading.Event()
+        >>> with cancellation_scope(cancelled):
+        ...     run_tool()  # cancelled.set() by the caller after a timeout
+    """
+    token = _cancelled.set(cancelled)
+    try:
+        yield
+    finally:
+        _cancelled.reset(token)
+
+
+def is_cancelled() -> bool:
+    """Whether the current work was abandoned; its results must not be written."""
+    cancelled = _cancelled.get()
+    return cancelled is not None and cancelled.is_set()
+
+
+@contextmanager
+def track_unavailable_providers() -> Iterator[Set[str]]:
+    """
+    Collect the providers found unavailable during the ``with`` block.
+
+    Bind it before work is handed to other threads: the set is shared by the
+    context copies that :class:`ContextThreadPoolExecutor` makes. Inside an
+    enclosing block the request's set is reused.
+
+    Example:
+        >>> with track_unavailable_providers() as unavailable:
+        ...     run_agent(message, user_id, session_id)
+        >>> sorted(unavailable)
+        ['ensemble']
+    """
+    providers = _unavailable.get()
+    if providers is not None:
+        yield providers
+        return
+    providers = set()
+    token = _unavailable.set(providers)
+    try:
+        yield providers
+    finally:
+        _unavailable.reset(token)
+
+
+@contextmanager
+def share_unavailable_providers(*shared: Set[str]) -> Iterator[None]:
+    """
+    Also collect the providers found unavailable in the ``with`` block into ``shared``.
+
+    Used by the caller doing work on behalf of others, who then learn about
+    the outage with :func:`report_unavailable_providers`.
+    """
+    token = _shared_unavailable.set(_shared_unavailable.get() + shared)
+    try:
+        yield
+    finally:
+        _shared_unavailable.reset(token)
+
+
+def mark_provider_unavailable(provider: str) -> None:
+    """Record that a provider turned calls away; reported once per request."""
+    for shared in _shared_unavailable.get():
+        shared.add(provider)
+    providers = _unavailable.get()
+    if providers is None or provider in providers:
+        return
+    providers.add(provider)
+    emit_event("provider_unavailable", {"provider": provider})
+
+
+def report_unavailable_providers(providers: Iterable[str]) -> None:
+    """Record providers another caller found unavailable while working for this one."""
+    for provider in sorted(providers):
+        mark_provider_unavailable(provider)
+
+
+def unavailable_providers() -> List[str]:
+    """Providers found unavailable so far in the current request."""
+    return sorted(_unavailable.get() or ())
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """``ThreadPoolExecutor`` whose tasks inherit the submitter's context."""
+
+    def submit(self, fn: Callable[..., Any], /, *args, **kwargs) -> Future:
+        ctx = contextvars.copy_context()
+        return super().submit(ctx.run, fn, *args, **kwargs)
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards compatible read access: ``context.user_id`` / ``context.session_id``
+    if name == "user_id":
+        return _user_id.get()
+    if name == "session_id":
+        return _session_id.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,8 @@
+from src.shared.enums.chat_route import ChatRoute
+from src.shared.enums.circuit_state import CircuitState
+from src.shared.enums.failure_kind import FailureKind
+from src.shared.enums.job_status import JobStatus
 from src.shared.enums.platform import Platform
 
 
-__all__ = ["Platform"]
+__all__ = ["ChatRoute", "CircuitState", "FailureKind", "JobStatus", "Platform"]
@@ -0,0 +1,15 @@
+"""
+Chat route enumeration for the intent router
+"""
+
+from enum import Enum
+
+
+class ChatRoute(Enum):
+    """Where a chat turn is answered"""
+
+    SMALL_TALK = "small_talk"
+    DISCOVERY = "discovery"
+
+    def __str__(self) -> str:
+        return self.value
@@ -0,0 +1,16 @@
+"""
+Circuit state enumeration for provider circuit breakers
+"""
+
+from enum import Enum
+
+
+class CircuitState(Enum):
+    """States of a provider's circuit breaker"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __str__(self) -> str:
+        return self.value
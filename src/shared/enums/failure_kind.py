@@ -0,0 +1,25 @@
+"""
+Failure kind enumeration for items of provider batches
+"""
+
+from enum import Enum
+
+
+class FailureKind(Enum):
+    """Why a provider could not return one item of a batch"""
+
+    NOT_FOUND = "not_found"
+    PRIVATE = "private"
+    RATE_LIMITED = "rate_limited"
+    TRANSIENT = "transient"
+    PERMANENT = "permanent"
+    # The provider's circuit breaker is open; no request was made
+    UNAVAILABLE = "unavailable"
+
+    def __str__(self) -> str:
+        return self.value
+
+    @property
+    def is_retryable(self) -> bool:
+        """Whether asking again later can succeed"""
+        return self in (FailureKind.RATE_LIMITED, FailureKind.TRANSIENT)
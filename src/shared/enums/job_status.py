@@ -0,0 +1,22 @@
+"""
+Job status enumeration for background jobs
+"""
+
+from enum import Enum
+
+
+class JobStatus(Enum):
+    """Lifecycle states of a background job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __str__(self) -> str:
+        return self.value
+
+    @property
+    def is_terminal(self) -> bool:
+        """Whether the job has finished (successfully or not)"""
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED)
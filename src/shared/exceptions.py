@@ -4,6 +4,8 @@ Custom shared exceptions for Fyuze Core
 
 from typing import Any, Dict, Optional
 
+from src.shared.enums.failure_kind import FailureKind
+
 
 class FyuzeBaseException(Exception):
     """Base exception for all Fyuze Core exceptions"""
@@ -34,3 +36,28 @@ class ValidationError(FyuzeBaseException):
     """Raised when validation fails"""
 
     pass
+
+
+class ProviderItemError(FyuzeBaseException):
+    """Raised when a provider cannot return one item of a batch"""
+
+    def __init__(
+        self,
+        message: str,
+        kind: FailureKind,
+        details: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(message, details={"kind": kind.value, **(details or {})})
+        self.kind = kind
+
+
+class CircuitOpenError(FyuzeBaseException):
+    """Raised instead of calling a provider whose circuit breaker is open"""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(
+            f"{provider} is temporarily unavailable (circuit open, retry in {retry_in:.0f}s)",
+            details={"provider": provider, "retry_in_seconds": round(retry_in, 1)},
+        )
+        self.provider = provider
+        self.retry_in = retry_in
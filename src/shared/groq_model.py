@@ -0,0 +1,36 @@
+"""
+Groq chat model that stays under the Groq request quota.
+
+Every agent and parser of the app shares one Groq quota, so each completion
+request first takes a permit of the ``"groq"`` rate limiter
+(``RATE_LIMIT_*_GROQ``, see :mod:`src.shared.utils.rate_limiter`).
+"""
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from agno.models.groq import Groq
+
+from src.shared.utils.rate_limiter import rate_limiter
+
+
+@dataclass
+class RateLimitedGroq(Groq):
+    """Groq chat model taking a ``"groq"`` rate-limit permit per request."""
+
+    def invoke(self, *args, **kwargs) -> Any:
+        rate_limiter("groq").acquire()
+        return super().invoke(*args, **kwargs)
+
+    async def ainvoke(self, *args, **kwargs) -> Any:
+        await rate_limiter("groq").acquire_async()
+        return await super().ainvoke(*args, **kwargs)
+
+    def invoke_stream(self, *args, **kwargs) -> Any:
+        rate_limiter("groq").acquire()
+        return super().invoke_stream(*args, **kwargs)
+
+    async def ainvoke_stream(self, *args, **kwargs) -> AsyncIterator[Any]:
+        await rate_limiter("groq").acquire_async()
+        async for chunk in super().ainvoke_stream(*args, **kwargs):
+            yield chunk
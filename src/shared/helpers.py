@@ -8,8 +8,15 @@ from src.core.search_influencers import (
     search_instagram_by_usernames,
     search_tiktok_by_usernames,
 )
+from src.shared.enums import Platform
 from src.shared.models.ensemble_insta_account import EnsembleInstaAccount
 from src.shared.models.ensemble_tiktok_account import EnsembleTiktokAccount
+from src.shared.tool_output import (
+    AGENT_TOOL_TOKEN_BUDGET,
+    compact_profiles,
+    profile_metrics,
+)
+from src.shared.tool_registry import current_tool_registry, record_tool_result
 
 
 def cleanup_temp_json_files():
@@ -40,6 +47,58 @@ def is_mock():
 mock_data = is_mock()
 import src.shared.context as context
 
+
+def _append_session_influencer_data(influencer_data: list[dict]) -> None:
+    """
+    Stack influencer payloads onto the current request's session document.
+
+    The document is keyed by the request-scoped ``doc_id`` and updated with an
+    atomic ``$push`` so concurrent tool calls in the same session do not
+    overwrite each other's results. Tool calls abandoned after a timeout
+    store nothing.
+    """
+    from src.shared.utils.storage import collection
+
+    if context.is_cancelled():
+        return
+
+    collection.update_one(
+        {"doc_id": context.get_doc_id()},
+        {"$push": {"influencer_data": {"$each": influencer_data}}},
+        upsert=True,
+    )
+
+
+def _agent_payload(
+    tool: str,
+    platform: Platform,
+    dicts: list[dict],
+    min_followers: int | None = None,
+    budget: int | None = None,
+) -> list[dict]:
+    """
+    Prepare a tool result for the agent.
+
+    Inside an agent run the profiles are compacted to the tool-output token
+    budget (see ``tool_output``) and their handles are recorded on the run's
+    tool-result registry (see ``tool_registry``). Outside a run (e.g. the
+    Plan C fallback in the API) the dicts are returned untouched.
+    """
+    if current_tool_registry() is None:
+        return dicts
+    dicts, _ = compact_profiles(
+        dicts, tool=tool, budget=budget, min_followers=min_followers
+    )
+    usernames = [d.get("username") or d.get("unique_id") for d in dicts]
+    metrics = {
+        username.lstrip("@"): profile_metrics(d)
+        for username, d in zip(usernames, dicts)
+        if username
+    }
+    record_tool_result(tool, platform, usernames, metrics)
+    return dicts
+
+
 _HANDLE_PATTERN = re.compile(r"@([a-zA-Z0-9_.]{2,})")
 
 
@@ -89,10 +148,30 @@ def search_tiktok_and_instagram_influencers(
         agent_data = []
 
         # Add Instagram influencers list with platform field
-        agent_data.append({"data": instagram_agent_data, "platform": "instagram"})
+        agent_data.append(
+            {
+                "data": _agent_payload(
+                    "search_tiktok_and_instagram_influencers",
+                    Platform.INSTAGRAM,
+                    instagram_agent_data,
+                    budget=AGENT_TOOL_TOKEN_BUDGET // 2,
+                ),
+                "platform": "instagram",
+            }
+        )
 
         # Add TikTok influencers list with platform field
-        agent_data.append({"data": tiktok_agent_data, "platform": "tiktok"})
+        agent_data.append(
+            {
+                "data": _agent_payload(
+                    "search_tiktok_and_instagram_influencers",
+                    Platform.TIKTOK,
+                    tiktok_agent_data,
+                    budget=AGENT_TOOL_TOKEN_BUDGET // 2,
+                ),
+                "platform": "tiktok",
+            }
+        )
         return agent_data
 
     # from src.core.search_influencers import search_tiktok_and_instagram
@@ -126,38 +205,34 @@ def search_tiktok_and_instagram_influencers(
     # with open(tiktok_path, "w", encoding="utf-8") as f:
     #     json.dump(tiktok_influencers_complete, f, ensure_ascii=False, indent=2)
     # Save profiles to MongoDB in one document per user/session
-    from src.shared.utils.storage import collection
-
-    # You must pass user_id and session_id to this function, or retrieve from context
-    # For demonstration, using global context (replace with your context logic)
-    try:
-        import src.shared.context as context
-
-        user_id = context.user_id
-        session_id = context.session_id
-    except ImportError:
-        user_id = None
-        session_id = None
-    doc_id = f"{user_id}_{session_id}"
-    # Merge both platforms' data
-    # Stack influencer data instead of replacing
-    new_data = instagram_influencers_complete + tiktok_influencers_complete
-    doc = collection.find_one({"doc_id": doc_id})
-    if doc and "influencer_data" in doc:
-        merged_data = doc["influencer_data"] + new_data
-    else:
-        merged_data = new_data
-    collection.update_one(
-        {"doc_id": doc_id}, {"$set": {"influencer_data": merged_data}}, upsert=True
+    _append_session_influencer_data(
+        instagram_influencers_complete + tiktok_influencers_complete
     )
 
-    # Return agents grouped by platform, matching mock format
+    # Return agents grouped by platform, matching mock format; each platform
+    # gets half of the tool-output token budget
     agent_data = []
     agent_data.append(
-        {"data": combined_results["instagram"]["agents"], "platform": "instagram"}
+        {
+            "data": _agent_payload(
+                "search_tiktok_and_instagram_influencers",
+                Platform.INSTAGRAM,
+                combined_results["instagram"]["agents"],
+                budget=AGENT_TOOL_TOKEN_BUDGET // 2,
+            ),
+            "platform": "instagram",
+        }
     )
     agent_data.append(
-        {"data": combined_results["tiktok"]["agents"], "platform": "tiktok"}
+        {
+            "data": _agent_payload(
+                "search_tiktok_and_instagram_influencers",
+                Platform.TIKTOK,
+                combined_results["tiktok"]["agents"],
+                budget=AGENT_TOOL_TOKEN_BUDGET // 2,
+            ),
+            "platform": "tiktok",
+        }
     )
     return agent_data
 
@@ -175,28 +250,8 @@ def search_instagram_influencers(
             influencers_infos = json.load(f)
 
         # Save to MongoDB in one document per user/session with stacking
-        from src.shared.utils.storage import collection
-
-        try:
-            import src.shared.context as context
-
-            user_id = context.user_id
-            session_id = context.session_id
-        except ImportError:
-            user_id = None
-            session_id = None
-        doc_id = f"{user_id}_{session_id}"
-
-        # Stack influencer data instead of replacing
-        doc = collection.find_one({"doc_id": doc_id})
-        if doc and "influencer_data" in doc:
-            merged_data = doc["influencer_data"] + influencers_infos
-        else:
-            merged_data = influencers_infos
-        collection.update_one(
-            {"doc_id": doc_id}, {"$set": {"influencer_data": merged_data}}, upsert=True
-        )
-        return dicts
+        _append_session_influencer_data(influencers_infos)
+        return _agent_payload("search_instagram_influencers", Platform.INSTAGRAM, dicts)
     full_infos, dicts = search_insta_influencers(
         topic=topic,
         location=location,
@@ -214,27 +269,8 @@ def search_instagram_influencers(
     # with open(json_path, "w", encoding="utf-8") as tmpfile:
     #     json.dump(influencers_infos, tmpfile, ensure_ascii=False, indent=2)
     # Save to MongoDB in one document per user/session
-    from src.shared.utils.storage import collection
-
-    try:
-        import src.shared.context as context
-
-        user_id = context.user_id
-        session_id = context.session_id
-    except ImportError:
-        user_id = None
-        session_id = None
-    doc_id = f"{user_id}_{session_id}"
-    # Stack influencer data instead of replacing
-    doc = collection.find_one({"doc_id": doc_id})
-    if doc and "influencer_data" in doc:
-        merged_data = doc["influencer_data"] + influencers_infos
-    else:
-        merged_data = influencers_infos
-    collection.update_one(
-        {"doc_id": doc_id}, {"$set": {"influencer_data": merged_data}}, upsert=True
-    )
-    return dicts
+    _append_session_influencer_data(influencers_infos)
+    return _agent_payload("search_instagram_influencers", Platform.INSTAGRAM, dicts)
 
 
 def search_tiktoks_influencers(
@@ -246,7 +282,7 @@ def search_tiktoks_influencers(
     if mock_data:
         with open("dicts_tiktok.json", "r", encoding="utf-8") as f:
             dicts = json.load(f)
-        return dicts
+        return _agent_payload("search_tiktoks_influencers", Platform.TIKTOK, dicts)
     full_infos, dicts = search_tiktok_influencers(
         topic=topic,
         location=location,
@@ -264,27 +300,8 @@ def search_tiktoks_influencers(
     # with open(json_path, "w", encoding="utf-8") as tmpfile:
     #     json.dump(influencers_infos, tmpfile, ensure_ascii=False, indent=2)
     # Save to MongoDB in one document per user/session
-    from src.shared.utils.storage import collection
-
-    try:
-        import src.shared.context as context
-
-        user_id = context.user_id
-        session_id = context.session_id
-    except ImportError:
-        user_id = None
-        session_id = None
-    doc_id = f"{user_id}_{session_id}"
-    # Stack influencer data instead of replacing
-    doc = collection.find_one({"doc_id": doc_id})
-    if doc and "influencer_data" in doc:
-        merged_data = doc["influencer_data"] + influencers_infos
-    else:
-        merged_data = influencers_infos
-    collection.update_one(
-        {"doc_id": doc_id}, {"$set": {"influencer_data": merged_data}}, upsert=True
-    )
-    return dicts
+    _append_session_influencer_data(influencers_infos)
+    return _agent_payload("search_tiktoks_influencers", Platform.TIKTOK, dicts)
 
 
 def get_full_influencer_data(usernames: list[str], file: str):
@@ -400,7 +417,13 @@ def get_instagram_profiles_by_usernames(usernames: list[str]):
         filtered = [
             d for d in dicts if d.get("username", "").lower() in usernames_lower
         ]
-        return filtered
+        # Explicitly requested handles are never filtered by follower count
+        return _agent_payload(
+            "get_instagram_profiles_by_usernames",
+            Platform.INSTAGRAM,
+            filtered,
+            min_followers=0,
+        )
 
     # Fetch profiles directly by usernames
     full_infos, dicts = search_instagram_by_usernames(usernames=usernames)
@@ -416,7 +439,12 @@ def get_instagram_profiles_by_usernames(usernames: list[str]):
     with open(json_path, "w", encoding="utf-8") as tmpfile:
         json.dump(influencers_infos, tmpfile, ensure_ascii=False, indent=2)
 
-    return dicts
+    return _agent_payload(
+        "get_instagram_profiles_by_usernames",
+        Platform.INSTAGRAM,
+        dicts,
+        min_followers=0,
+    )
 
 
 def get_tiktok_profiles_by_usernames(usernames: list[str]):
@@ -454,7 +482,12 @@ def get_tiktok_profiles_by_usernames(usernames: list[str]):
     with open(json_path, "w", encoding="utf-8") as tmpfile:
         json.dump(influencers_infos, tmpfile, ensure_ascii=False, indent=2)
 
-    return dicts
+    return _agent_payload(
+        "get_tiktok_profiles_by_usernames",
+        Platform.TIKTOK,
+        dicts,
+        min_followers=0,
+    )
 
 
 def get_full_influencer_data_from_db(doc_id: str, usernames: list[str]):
@@ -18,3 +18,7 @@ from src.shared.models.basic_search_result import (
 from src.shared.models.rapid_audience_snapshot import AudienceSnapshot
 
 from src.shared.models.rapid_feed_snapshot import FeedSnapshot
+
+from src.shared.models.profile_search_hit import ProfileSearchHit
+
+from src.shared.models.batch_result import BatchResult, ItemFailure
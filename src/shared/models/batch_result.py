@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
+from src.shared.enums import FailureKind
+
+T = TypeVar("T")
+
+
+@dataclass
+class ItemFailure:
+    """One batch item the provider could not return."""
+
+    item: Any
+    kind: FailureKind
+    message: str
+    attempts: int = 1
+
+    def to_dict(self) -> dict:
+        """Convert ItemFailure to a dictionary."""
+        return {
+            "item": self.item,
+            "kind": self.kind.value,
+            "message": self.message,
+            "attempts": self.attempts,
+        }
+
+
+@dataclass
+class BatchResult(Generic[T]):
+    """Results of a provider batch, with the failed items reported by kind."""
+
+    successes: List[T] = field(default_factory=list)
+    failures: List[ItemFailure] = field(default_factory=list)
+
+    def failed_items(self, kind: Optional[FailureKind] = None) -> List[Any]:
+        """Items that failed, optionally only those of one kind."""
+        return [f.item for f in self.failures if kind is None or f.kind is kind]
+
+    def failure_counts(self) -> Dict[str, int]:
+        """Number of failed items per failure kind."""
+        counts: Dict[str, int] = {}
+        for failure in self.failures:
+            counts[failure.kind.value] = counts.get(failure.kind.value, 0) + 1
+        return counts
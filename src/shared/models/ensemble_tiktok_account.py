@@ -68,6 +68,11 @@ class TikTokVideo:
             music_author=music.get("author") if music else None,
         )
 
+    @classmethod
+    def from_stored_dict(cls, data: dict) -> "TikTokVideo":
+        """Rebuild a TikTokVideo from its to_dict() output"""
+        return cls(**data)
+
     def to_dict(self) -> dict:
         return {
             "aweme_id": self.aweme_id,
@@ -112,6 +117,14 @@ class TikTokVideos:
         videos = [TikTokVideo.from_dict(video_data) for video_data in data]
         return cls(videos=videos, count=len(videos))
 
+    @classmethod
+    def from_stored_dict(cls, data: dict) -> "TikTokVideos":
+        """Rebuild TikTokVideos from its to_dict() output"""
+        return cls(
+            videos=[TikTokVideo.from_stored_dict(video) for video in data["videos"]],
+            count=data["count"],
+        )
+
     def to_dict(self) -> dict:
         return {
             "count": self.count,
@@ -264,6 +277,18 @@ class EnsembleTiktokAccount:
         account.raw_data = payload
         return account
 
+    @classmethod
+    def from_stored_dict(cls, data: dict) -> "EnsembleTiktokAccount":
+        """
+        Rebuild an account from its to_dict() output.
+
+        Unlike from_dict, which parses TikTok API JSON, this is the inverse of
+        to_dict, used to read accounts back from JSON storage.
+        """
+        fields = {key: value for key, value in data.items() if key != "engagementRate"}
+        fields["videos"] = TikTokVideos.from_stored_dict(data["videos"])
+        return cls(**fields)
+
     def to_dict(self) -> dict:
         return {
             "uid": self.uid,
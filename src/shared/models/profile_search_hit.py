@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass
+class ProfileSearchHit:
+    """
+    A profile URL found by a provider other than Exa.
+
+    Mirrors the ``url``/``id``/``title`` attributes of an Exa result, so hits
+    from both providers rank together.
+    """
+
+    url: str
+    id: str
+    title: str
+    source: str
+
+    @classmethod
+    def from_cse_item(cls, item: Dict[str, Any]) -> "ProfileSearchHit":
+        """Create a ProfileSearchHit from a raw Google CSE item."""
+        link = item.get("link", "")
+        return cls(url=link, id=link, title=item.get("title", ""), source="google_cse")
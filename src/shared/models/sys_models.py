@@ -6,6 +6,7 @@ from src.shared.enums.platform import Platform
 class BasicSearchRequest(BaseModel):
     query: str
     gl: str | None = None
+    pages: int = Field(1, ge=1, le=10, description="10-result pages to fetch concurrently.")
 
 
 class FyuzeRequest(BaseModel):
@@ -47,6 +48,14 @@ class FyuzeResponse(BaseModel):
         default=None,
         description="A list of influencers found based on the user's request.",
     )  # type: ignore
+    degraded: bool = Field(
+        False,
+        description="True when some data providers were unavailable and the results are partial or cached.",
+    )
+    unavailable_providers: List[str] = Field(
+        default_factory=list,
+        description="Providers whose circuit breaker was open during the request.",
+    )
 
 
 class FyuzeModel(BaseModel):
@@ -83,3 +92,64 @@ class SearchInstaRequest(BaseModel):
 
 class WebsiteUrlRequest(BaseModel):
     url: HttpUrl
+
+
+class DiscoveryJobParams(SearchInstaRequest):
+    platform: Literal["instagram", "tiktok", "both"] = Field(
+        "both", description="Platform(s) to search"
+    )
+
+
+class ReportJobParams(BaseModel):
+    username: str = Field(..., description="Instagram username to analyze")
+    include_audience: bool = Field(
+        True, description="Fetch audience demographics for the report"
+    )
+
+
+class JobRequest(BaseModel):
+    type: Literal["discovery", "report"] = Field(..., description="Job type")
+    params: dict = Field(default_factory=dict, description="Job type parameters")
+    user_id: Optional[str] = None
+
+
+class BatchSearchCombo(BaseModel):
+    topic: str
+    location: str
+    keywords: List[str] = Field(default_factory=list)
+
+
+class BatchSearchRequest(BaseModel):
+    platform: Literal["instagram", "tiktok"] = Field(
+        "instagram", description="Platform to search"
+    )
+    combos: List[BatchSearchCombo] = Field(
+        ..., description="Topic/location/keywords combinations to search"
+    )
+    search_results: Optional[int] = Field(
+        10, description="Number of search results per combo (max 10)"
+    )
+
+
+class DiscoveryIntent(BaseModel):
+    """Discovery parameters stated so far in a conversation."""
+
+    topic: Optional[str] = Field(
+        None, description="Niche or topic of the creators wanted (e.g. 'fitness'), or null"
+    )
+    location: Optional[str] = Field(
+        None, description="Target location as 'City, Country' or 'Country', or null"
+    )
+    platform: Optional[Literal["instagram", "tiktok", "both"]] = Field(
+        None, description="Requested platform(s), or null if not stated"
+    )
+
+
+class RouteDecision(BaseModel):
+    """Router verdict for one chat message."""
+
+    route: Literal["small_talk", "discovery"] = Field(
+        ...,
+        description="'small_talk' for greetings, thanks and casual chat; "
+        "'discovery' for anything about influencers, marketing, brands or websites",
+    )
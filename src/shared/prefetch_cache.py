@@ -0,0 +1,165 @@
+"""
+Session-scoped cache of speculatively prefetched provider calls.
+
+While the agent waits for the user to answer a clarifying question, the
+prefetch stage (:mod:`src.core.prefetch`) runs the cheap part of discovery
+(Exa queries, TikTok keyword searches) inside :meth:`PrefetchCache.recording`.
+Provider calls made there are stored as futures under the session's
+``doc_id``. When the real search of that session issues the same call, it
+reuses the stored result, or waits for it if the prefetch is still running.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+import src.shared.context as context
+
+PREFETCH_TTL_SECONDS = float(os.getenv("PREFETCH_TTL_SECONDS", "900"))
+PREFETCH_MAX_SESSIONS = int(os.getenv("PREFETCH_MAX_SESSIONS", "256"))
+# Seconds a search waits for a matching prefetch that is still running
+PREFETCH_WAIT_SECONDS = float(os.getenv("PREFETCH_WAIT_SECONDS", "30"))
+
+# doc_id of the session whose prefetch is running in the current context
+_recording: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "fyuze_prefetch_recording", default=None
+)
+
+
+def _normalize(key: Hashable) -> Hashable:
+    if isinstance(key, str):
+        return " ".join(key.lower().split())
+    if isinstance(key, tuple):
+        return tuple(_normalize(part) for part in key)
+    return key
+
+
+class PrefetchCache:
+    """
+    Per-session store of provider call results, filled ahead of time.
+
+    Args:
+        ttl: Seconds a session's prefetched results stay usable.
+        max_sessions: Sessions kept (least recently prefetched are evicted).
+
+    Example:
+        >>> with PREFETCH_CACHE.recording("user_session"):
+        ...     exa.search('site:instagram.com "fitness" "Dubai"')
+        >>> # later, in a request of the same session:
+        >>> exa.search('site:instagram.com "fitness" "Dubai"')  # served from the prefetch
+    """
+
+    def __init__(self, ttl: float = PREFETCH_TTL_SECONDS, max_sessions: int = PREFETCH_MAX_SESSIONS):
+        self._ttl = ttl
+        self._max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, Tuple[float, Dict[Hashable, Future]]]" = OrderedDict()
+        self._stats = {"prefetched_calls": 0, "hits": 0, "waited": 0, "misses": 0}
+
+    @contextmanager
+    def recording(self, session_key: str) -> Iterator[None]:
+        """Record provider calls made in this context for ``session_key``."""
+        with self._lock:
+            self._sessions[session_key] = (time.monotonic(), {})
+            self._sessions.move_to_end(session_key)
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        token = _recording.set(session_key)
+        try:
+            yield
+        finally:
+            _recording.reset(token)
+
+    def fetch(
+        self,
+        provider: str,
+        key: Hashable,
+        compute: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Run a provider call through the cache.
+
+        Inside :meth:`recording` the result is stored for the session. Otherwise
+        a stored result of the current session is reused (waiting up to
+        ``PREFETCH_WAIT_SECONDS`` for a prefetch in flight), and ``compute``
+        runs when there is none or it is not ``cacheable``.
+        """
+        cache_key = (provider, _normalize(key))
+        recording_session = _recording.get()
+        if recording_session is not None:
+            return self._record(recording_session, cache_key, compute)
+
+        has_prefetch, future = self._lookup(context.get_doc_id(), cache_key)
+        if future is None:
+            if has_prefetch:
+                self._count("misses")
+            return compute()
+
+        waited = not future.done()
+        try:
+            value = future.result(timeout=PREFETCH_WAIT_SECONDS)
+        except FutureTimeoutError:
+            value, future = None, None
+        except Exception:
+            future = None
+        if future is None or (cacheable is not None and not cacheable(value)):
+            self._count("misses")
+            return compute()
+        self._count("waited" if waited else "hits")
+        return value
+
+    def _record(self, session_key: str, cache_key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._sessions.get(session_key)
+            if entry is None:
+                return compute()
+            future = entry[1].get(cache_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                entry[1][cache_key] = future
+                self._stats["prefetched_calls"] += 1
+        if not owner:
+            return future.result()
+        try:
+            value = compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        future.set_result(value)
+        return value
+
+    def _lookup(self, session_key: str, cache_key: Hashable) -> Tuple[bool, Optional[Future]]:
+        """``(session has a prefetch, future for the key)``."""
+        with self._lock:
+            entry = self._sessions.get(session_key)
+            if entry is None:
+                return False, None
+            created, futures = entry
+            if time.monotonic() - created > self._ttl:
+                del self._sessions[session_key]
+                return False, None
+            return True, futures.get(cache_key)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def discard(self, session_key: str) -> None:
+        """Drop a session's prefetched results."""
+        with self._lock:
+            self._sessions.pop(session_key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Prefetched calls and how later searches used them."""
+        with self._lock:
+            return {"sessions": len(self._sessions), **self._stats}
+
+
+PREFETCH_CACHE = PrefetchCache()
@@ -0,0 +1,384 @@
+"""
+Shared cache of search provider responses (Exa, Ensemble, Google CSE).
+
+Query formulation is deterministic, so popular niches send the same query
+strings to the providers over and over, across users and across restarts.
+:class:`ProviderCache` keys responses by ``(provider, endpoint, normalized
+params)`` and keeps them for a per-provider TTL in two tiers: an in-process
+LRU and a pluggable on-disk tier (:class:`SQLiteCacheBackend` by default)
+that survives restarts and is shared by the worker processes of one host.
+Identical concurrent misses are coalesced into one provider call.
+
+The persistent tier stores JSON only (never pickles): anyone able to write
+the cache file must not be able to run code in the API. Responses that are
+not plain JSON pass a :class:`JSONCodec` built on their models'
+``to_dict``/``from_dict``.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Protocol, Tuple
+
+from src.shared.utils import SingleFlight, get_logger, FyuzeLogger
+
+logger: FyuzeLogger = get_logger(__name__)
+
+PROVIDER_CACHE_ENABLED = os.getenv("PROVIDER_CACHE", "1") == "1"
+# "sqlite" keeps responses across restarts, "memory" only in-process
+PROVIDER_CACHE_BACKEND = os.getenv("PROVIDER_CACHE_BACKEND", "sqlite")
+PROVIDER_CACHE_PATH = os.getenv("PROVIDER_CACHE_PATH", ".cache/provider_cache.sqlite3")
+PROVIDER_CACHE_MAX_ENTRIES = int(os.getenv("PROVIDER_CACHE_MAX_ENTRIES", "2048"))
+
+# Seconds a response stays usable, per provider
+PROVIDER_CACHE_TTLS: Dict[str, float] = {
+    "exa": float(os.getenv("PROVIDER_CACHE_TTL_EXA", "86400")),
+    "ensemble_tiktok": float(os.getenv("PROVIDER_CACHE_TTL_ENSEMBLE_TIKTOK", "21600")),
+    "google_cse": float(os.getenv("PROVIDER_CACHE_TTL_GOOGLE_CSE", "86400")),
+}
+_DEFAULT_TTL = 3600.0
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize query params so equivalent requests share an entry."""
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(provider: str, endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    Stable key for a provider request.
+
+    Example:
+        >>> cache_key("exa", "search", {"query": "Fitness  Dubai"}) == \\
+        ...     cache_key("exa", "search", {"query": "fitness dubai"})
+        True
+    """
+    payload = json.dumps(_normalize(params), sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{provider}:{endpoint}:{digest}"
+
+
+class JSONCodec(NamedTuple):
+    """Converts a provider response to JSON-compatible data and back."""
+
+    encode: Callable[[Any], Any]
+    decode: Callable[[Any], Any]
+
+
+# Responses that already are JSON (dicts, lists, strings, numbers)
+PLAIN_JSON = JSONCodec(encode=lambda value: value, decode=lambda data: data)
+
+
+class CacheBackend(Protocol):
+    """Persistent tier of :class:`ProviderCache`."""
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """``(value, expires_at)`` for a live entry, else None."""
+
+    def set(self, key: str, provider: str, value: bytes, expires_at: float) -> None:
+        """Store an entry until ``expires_at`` (epoch seconds)."""
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+
+
+class SQLiteCacheBackend:
+    """
+    SQLite tier with an index on the expiry time.
+
+    WAL mode lets several worker processes share the file; one connection is
+    used per process, serialized by a lock. Values are UTF-8 JSON.
+
+    Args:
+        path: Database file (parent directories are created).
+    """
+
+    def __init__(self, path: str = PROVIDER_CACHE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Pickled entries of earlier versions are never read
+            self._conn.execute("DROP TABLE IF EXISTS provider_cache")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS provider_responses ("
+                "key TEXT PRIMARY KEY, provider TEXT NOT NULL, "
+                "value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS provider_responses_expires_at "
+                "ON provider_responses (expires_at)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM provider_responses "
+                "WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, provider: str, value: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO provider_responses (key, provider, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, provider, sqlite3.Binary(value), expires_at),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM provider_responses WHERE expires_at <= ?", (time.time(),)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+
+class ProviderCache:
+    """
+    Two-tier TTL cache for provider responses.
+
+    Lookups check the in-process LRU, then the backend (promoting hits into
+    the LRU); misses call the provider once per key even when several
+    threads ask at the same time. Values are stored in the backend as JSON
+    through each request's :class:`JSONCodec`.
+
+    Args:
+        backend: Persistent tier, or None for an in-process cache only.
+        max_entries: LRU size bound.
+        ttls: Seconds an entry stays usable, per provider.
+
+    Example:
+        >>> PROVIDER_CACHE.fetch("exa", "search", {"query": q}, lambda: exa.search(query=q))
+        >>> PROVIDER_CACHE.stats()["exa"]
+        {'memory_hits': 3, 'disk_hits': 1, 'misses': 2, 'stores': 2, 'hit_ratio': 0.667, ...}
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        max_entries: int = PROVIDER_CACHE_MAX_ENTRIES,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        self._backend = backend
+        self._max_entries = max_entries
+        self._ttls = dict(PROVIDER_CACHE_TTLS if ttls is None else ttls)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._flights = SingleFlight()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._evictions = 0
+        self._backend_errors = 0
+
+    def ttl(self, provider: str) -> float:
+        return self._ttls.get(provider, _DEFAULT_TTL)
+
+    def fetch(
+        self,
+        provider: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+        codec: JSONCodec = PLAIN_JSON,
+    ) -> Any:
+        """
+        Return the cached response for a provider request, calling it on a miss.
+
+        Args:
+            provider: Provider name (selects the TTL), e.g. ``"exa"``.
+            endpoint: Provider operation, e.g. ``"search"``.
+            params: Request parameters that determine the response.
+            compute: Zero-argument callable performing the request.
+            cacheable: Optional predicate; responses for which it returns
+                False (errors, empty results) are returned but not stored.
+            codec: Conversion of the response to JSON for the backend.
+                Defaults to :data:`PLAIN_JSON`.
+
+        Returns:
+            The cached or freshly fetched response.
+        """
+        key = cache_key(provider, endpoint, params)
+        found, value = self._get(provider, key, codec)
+        if found:
+            return value
+
+        def load() -> Any:
+            # Another caller may have stored it while this one waited
+            found, value = self._get(provider, key, codec, count=False)
+            if found:
+                return value
+            self._count(provider, "misses")
+            value = compute()
+            if cacheable is None or cacheable(value):
+                self._set(provider, key, value, codec)
+            return value
+
+        return self._flights.do(key, load)
+
+    def _get(
+        self, provider: str, key: str, codec: JSONCodec, count: bool = True
+    ) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    if count:
+                        self._count_locked(provider, "memory_hits")
+                    return True, entry[0]
+                del self._entries[key]
+
+        if self._backend is None:
+            return False, None
+        try:
+            row = self._backend.get(key)
+            if row is None:
+                return False, None
+            value = codec.decode(json.loads(row[0]))
+        except Exception as e:
+            logger.warning(f"Provider cache read failed for {key}: {e}")
+            self._count_backend_error()
+            return False, None
+        with self._lock:
+            self._remember(key, value, row[1])
+            if count:
+                self._count_locked(provider, "disk_hits")
+        return True, value
+
+    def _set(self, provider: str, key: str, value: Any, codec: JSONCodec) -> None:
+        expires_at = time.time() + self.ttl(provider)
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self._count_locked(provider, "stores")
+        if self._backend is None:
+            return
+        try:
+            data = json.dumps(codec.encode(value), ensure_ascii=False)
+            self._backend.set(key, provider, data.encode("utf-8"), expires_at)
+        except Exception as e:
+            logger.warning(f"Provider cache write failed for {key}: {e}")
+            self._count_backend_error()
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _count(self, provider: str, name: str) -> None:
+        with self._lock:
+            self._count_locked(provider, name)
+
+    def _count_locked(self, provider: str, name: str) -> None:
+        stats = self._stats.setdefault(
+            provider, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        )
+        stats[name] += 1
+
+    def _count_backend_error(self) -> None:
+        with self._lock:
+            self._backend_errors += 1
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from both tiers."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+        removed = len(expired)
+        if self._backend is not None:
+            try:
+                removed += self._backend.purge_expired()
+            except Exception as e:
+                logger.warning(f"Provider cache purge failed: {e}")
+                self._count_backend_error()
+        return removed
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the backend is kept; counters too)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider hit ratios plus tier sizes, for TTL tuning."""
+        with self._lock:
+            providers = {name: dict(values) for name, values in self._stats.items()}
+            result: Dict[str, Any] = {
+                "enabled": True,
+                "backend": type(self._backend).__name__ if self._backend else None,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "evictions": self._evictions,
+                "backend_errors": self._backend_errors,
+            }
+        for name, values in providers.items():
+            lookups = values["memory_hits"] + values["disk_hits"] + values["misses"]
+            hits = values["memory_hits"] + values["disk_hits"]
+            values["hit_ratio"] = round(hits / lookups, 3) if lookups else 0.0
+            values["ttl_seconds"] = self.ttl(name)
+            result[name] = values
+        return result
+
+
+class _DisabledProviderCache:
+    """Stand-in used when ``PROVIDER_CACHE=0``: every call goes to the provider."""
+
+    def fetch(
+        self,
+        provider: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+        codec: JSONCodec = PLAIN_JSON,
+    ) -> Any:
+        return compute()
+
+    def purge_expired(self) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+
+def _build_provider_cache():
+    if not PROVIDER_CACHE_ENABLED:
+        return _DisabledProviderCache()
+    backend = None
+    if PROVIDER_CACHE_BACKEND == "sqlite":
+        try:
+            backend = SQLiteCacheBackend(PROVIDER_CACHE_PATH)
+            backend.purge_expired()
+        except Exception as e:
+            logger.warning(
+                f"Provider cache file {PROVIDER_CACHE_PATH} unavailable, "
+                f"caching in memory only: {e}"
+            )
+    return ProviderCache(backend=backend)
+
+
+PROVIDER_CACHE = _build_provider_cache()
@@ -0,0 +1,248 @@
+"""
+Process-wide, bounded thread pools for provider calls.
+
+Every ``*_parallel`` / ``bulk_*`` service method used to create and tear down
+its own ``ThreadPoolExecutor``, and the pools nested (two outer threads in
+``search_tiktok_and_instagram``, five inner threads each, per concurrent
+request), so the thread count grew with traffic. :data:`PROVIDER_SCHEDULER`
+keeps one long-lived pool per provider instead. Pool sizes come from
+``PROVIDER_WORKERS_<PROVIDER>``, and their sum is capped by
+``PROVIDER_MAX_THREADS``, so the number of provider threads stays flat under
+load. Extra work waits in the provider's queue. Queue depth and time spent
+queued are reported per provider.
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.shared.context import ContextThreadPoolExecutor
+from src.shared.utils.latency import LatencyTracker
+from src.shared.utils.logging import get_logger, FyuzeLogger
+
+# Default pool size per provider (PROVIDER_WORKERS_<PROVIDER> overrides)
+DEFAULT_PROVIDER_WORKERS: Dict[str, int] = {
+    "ensemble": 16,
+    "exa": 8,
+    "google_cse": 8,
+    "rapid": 8,
+    "supabase": 8,
+    "apify": 4,
+}
+DEFAULT_MAX_THREADS = 64
+# Pool size of providers missing from DEFAULT_PROVIDER_WORKERS
+DEFAULT_OTHER_WORKERS = 4
+
+_local = threading.local()
+
+
+class _ProviderPool:
+    """One provider's executor and its queue counters."""
+
+    def __init__(self, provider: str, workers: int):
+        self.provider = provider
+        self.workers = workers
+        self.executor = ContextThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"provider-{provider}"
+        )
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.max_queued = 0
+        self.submitted = 0
+        self.completed = 0
+        self.inline = 0
+        self.cancelled = 0
+        self.queue_wait = LatencyTracker()
+
+    def on_done(self, future: Future) -> None:
+        # Cancelled while queued: run() never started
+        if future.cancelled():
+            with self.lock:
+                self.queued -= 1
+                self.cancelled += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = {
+                "workers": self.workers,
+                "active": self.active,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "inline": self.inline,
+                "cancelled": self.cancelled,
+            }
+        wait_stats = self.queue_wait.stats()
+        stats.update(
+            {
+                "queue_wait_p50_ms": wait_stats["p50_ms"],
+                "queue_wait_p90_ms": wait_stats["p90_ms"],
+                "queue_wait_p99_ms": wait_stats["p99_ms"],
+            }
+        )
+        return stats
+
+
+class ProviderScheduler:
+    """
+    Run provider calls on shared, bounded, per-provider thread pools.
+
+    A call submitted from a thread of the same provider's pool runs inline,
+    so nested fan-out cannot deadlock a saturated pool.
+
+    Args:
+        max_threads (int, optional): Cap on the threads of the provider pools
+            in ``DEFAULT_PROVIDER_WORKERS`` together; their sizes are scaled
+            down proportionally when they add up to more.
+            Defaults to ``PROVIDER_MAX_THREADS`` or 64.
+
+    Example:
+        >>> for username, future in PROVIDER_SCHEDULER.map_unordered(
+        ...     "ensemble", fetch_profile, usernames, max_in_flight=5
+        ... ):
+        ...     profile = future.result()
+    """
+
+    def __init__(self, max_threads: Optional[int] = None):
+        self._logger: FyuzeLogger = get_logger(__name__)
+        self._max_threads = max_threads or int(
+            os.getenv("PROVIDER_MAX_THREADS", DEFAULT_MAX_THREADS)
+        )
+        sizes = {
+            provider: self._configured_workers(provider)
+            for provider in DEFAULT_PROVIDER_WORKERS
+        }
+        total = sum(sizes.values())
+        if total > self._max_threads:
+            sizes = {
+                provider: max(1, math.floor(size * self._max_threads / total))
+                for provider, size in sizes.items()
+            }
+        self._sizes = sizes
+        self._pools: Dict[str, _ProviderPool] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _configured_workers(provider: str) -> int:
+        default = DEFAULT_PROVIDER_WORKERS.get(provider, DEFAULT_OTHER_WORKERS)
+        return max(1, int(os.getenv(f"PROVIDER_WORKERS_{provider.upper()}", default)))
+
+    def workers(self, provider: str) -> int:
+        """Pool size of a provider."""
+        return self._sizes.get(provider) or self._configured_workers(provider)
+
+    def _pool(self, provider: str) -> _ProviderPool:
+        with self._lock:
+            pool = self._pools.get(provider)
+            if pool is None:
+                pool = self._pools[provider] = _ProviderPool(provider, self.workers(provider))
+            return pool
+
+    def submit(self, provider: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue one call on the provider's pool.
+
+        Args:
+            provider: Provider name (``"ensemble"``, ``"exa"``, ...).
+            fn: The call; it inherits the submitter's context.
+
+        Returns:
+            A future of the call's result.
+        """
+        pool = self._pool(provider)
+        if getattr(_local, "provider", None) == provider:
+            # Already on this provider's pool: waiting for a queued task could
+            # deadlock once every worker does the same
+            with pool.lock:
+                pool.inline += 1
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        queued_at = time.perf_counter()
+
+        def run() -> Any:
+            pool.queue_wait.record(time.perf_counter() - queued_at)
+            with pool.lock:
+                pool.queued -= 1
+                pool.active += 1
+            _local.provider = provider
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _local.provider = None
+                with pool.lock:
+                    pool.active -= 1
+                    pool.completed += 1
+
+        with pool.lock:
+            pool.queued += 1
+            pool.submitted += 1
+            pool.max_queued = max(pool.max_queued, pool.queued)
+        future = pool.executor.submit(run)
+        future.add_done_callback(pool.on_done)
+        return future
+
+    def map_unordered(
+        self,
+        provider: str,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[Tuple[Any, Future]]:
+        """
+        Run ``fn(item)`` for every item, yielding completed calls as they finish.
+
+        Args:
+            provider: Provider name.
+            fn: Called once per item.
+            items: Inputs of the calls.
+            max_in_flight: Calls of this batch queued or running at once;
+                None follows the provider's adaptive concurrency limit.
+
+        Yields:
+            ``(item, future)`` per completed call, in completion order.
+        """
+        # Imported here: adaptive_concurrency sizes its limits from this module
+        from src.shared.adaptive_concurrency import concurrency_limit
+
+        remaining = iter(items)
+        pending: Dict[Future, Any] = {}
+
+        def fill() -> None:
+            while len(pending) < max(
+                1, max_in_flight or concurrency_limit(provider).limit
+            ):
+                try:
+                    item = next(remaining)
+                except StopIteration:
+                    return
+                pending[self.submit(provider, fn, item)] = item
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future
+            fill()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider pool size, queue depth and queue wait percentiles."""
+        with self._lock:
+            pools = dict(self._pools)
+        return {
+            "max_threads": self._max_threads,
+            "workers": sum(pool.workers for pool in pools.values()),
+            "providers": {name: pool.stats() for name, pool in pools.items()},
+        }
+
+
+PROVIDER_SCHEDULER = ProviderScheduler()
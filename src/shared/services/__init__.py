@@ -1,5 +1,6 @@
 from src.shared.services.apify_service import ApifyService
 from src.shared.services.exa_service import ExaSearchService
 from src.shared.services.ensemble_service import EnsembleService
+from src.shared.services.google_cse_service import GoogleCSEService
 
-__all__ = ["ApifyService", "ExaSearchService", "EnsembleService"]
+__all__ = ["ApifyService", "ExaSearchService", "EnsembleService", "GoogleCSEService"]
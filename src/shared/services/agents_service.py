@@ -1,5 +1,5 @@
 from agno.agent import Agent
-from agno.models.groq import Groq
+from src.shared.groq_model import RateLimitedGroq
 from pydantic import BaseModel
 from typing import Type
 
@@ -28,7 +28,7 @@ class AgentService:
         Returns:
             Agent: The configured agent.
         """
-        model = Groq(id=model_id, temperature=temperature)
+        model = RateLimitedGroq(id=model_id, temperature=temperature)
         agent = Agent(
             model=model,
             instructions=instructions,
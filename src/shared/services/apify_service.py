@@ -1,5 +1,4 @@
 from os import environ
-import concurrent.futures
 from typing import List, Dict, Any, Optional
 
 from apify_client import ApifyClient
@@ -7,6 +6,9 @@ from apify_client import ApifyClient
 
 from src.shared.utils import get_logger, FyuzeLogger, retry
 from src.shared.exceptions import ConfigurationError
+from src.shared.adaptive_concurrency import concurrency_limited
+from src.shared.circuit_breaker import circuit_protected
+from src.shared.provider_scheduler import PROVIDER_SCHEDULER
 from src.shared.models import (
     ApifyInstaAccount,
     TikTokInfluencer,
@@ -31,7 +33,9 @@ class ApifyService:
                 "APIFY_API_TOKEN not found in environment variables."
             )
 
-    @retry(max_attempts=3, delay=1)
+    @retry(provider="apify")
+    @circuit_protected("apify")
+    @concurrency_limited("apify")
     def run_actor(
         self, actor_id: str, run_input: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
@@ -63,7 +67,7 @@ class ApifyService:
             raise
 
     def bulk_run_actors(
-        self, actor_jobs: Dict[str, Dict[str, Any]], max_workers: int = 3
+        self, actor_jobs: Dict[str, Dict[str, Any]], max_workers: Optional[int] = None
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Run multiple Apify actors in parallel using multithreading.
@@ -71,7 +75,8 @@ class ApifyService:
         Args:
             actor_jobs: Dictionary mapping job IDs to actor configurations
                     Each configuration should have 'actor_id' and 'run_input' keys
-            max_workers: Maximum number of threads to use
+            max_workers: Maximum number of calls in flight on the shared pool
+                (default: Apify's adaptive concurrency limit)
 
         Returns:
             Dictionary mapping job IDs to actor results
@@ -94,7 +99,7 @@ class ApifyService:
             self._init_client()
 
         self._logger.info(
-            f"Running bulk actors with {len(actor_jobs)} jobs using {max_workers} workers"
+            f"Running bulk actors with {len(actor_jobs)} jobs using {max_workers or 'adaptive'} workers"
         )
 
         results = {}
@@ -103,14 +108,11 @@ class ApifyService:
             for job_id, config in actor_jobs.items()
         ]
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_job = {
-                executor.submit(self._actor_worker, ad): ad[0] for ad in actor_data
-            }
-
-            for future in concurrent.futures.as_completed(future_to_job):
-                job_id, job_results = future.result()
-                results[job_id] = job_results
+        for _, future in PROVIDER_SCHEDULER.map_unordered(
+            "apify", self._actor_worker, actor_data, max_in_flight=max_workers
+        ):
+            job_id, job_results = future.result()
+            results[job_id] = job_results
 
         self._logger.info(f"Bulk actor run completed with {len(results)} results")
         return results
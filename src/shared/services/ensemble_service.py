@@ -1,13 +1,89 @@
+from dataclasses import replace
 from os import environ
-import concurrent.futures
-from typing import List, Optional, Tuple
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+import httpx
+from ensembledata.api import EDClient, EDError
+
+from src.shared.enums import FailureKind
+from src.shared.utils import (
+    FyuzeLogger,
+    get_logger,
+    rate_limited,
+    retry_call,
+    retry_policy,
+)
+from src.shared.exceptions import (
+    CircuitOpenError,
+    ConfigurationError,
+    ProviderItemError,
+)
+from src.shared.adaptive_concurrency import concurrency_limited
+from src.shared.circuit_breaker import circuit_protected
+from src.shared.context import emit_event
+from src.shared.prefetch_cache import PREFETCH_CACHE
+from src.shared.provider_cache import PROVIDER_CACHE, JSONCodec
+from src.shared.provider_scheduler import PROVIDER_SCHEDULER
+from src.shared.models import (
+    BatchResult,
+    EnsembleInstaAccount,
+    EnsembleTiktokAccount,
+    ItemFailure,
+)
+from src.shared.models.ensemble_tiktok_account import TikTokVideos
 
-from ensembledata.api import EDClient
+T = TypeVar("T")
+
+# Ensemble Data status codes (see ensembledata.api.errors)
+_NOT_FOUND_STATUSES = {404, 463, 473, 474}
+_PRIVATE_STATUSES = {471, 472}
+_RATE_LIMITED_STATUSES = {429}
+_PERMANENT_STATUSES = {422, 462, 464, 465, 466, 469, 491, 492, 493, 495, 520}
+
+# (keyword, accounts) of a TikTok keyword search as stored in the provider cache
+KEYWORD_SEARCH_CODEC = JSONCodec(
+    encode=lambda result: [result[0], [account.to_dict() for account in result[1]]],
+    decode=lambda data: (
+        data[0],
+        [EnsembleTiktokAccount.from_stored_dict(account) for account in data[1]],
+    ),
+)
 
-from src.shared.utils import get_logger, FyuzeLogger, retry
-from src.shared.exceptions import ConfigurationError
-from src.shared.models import EnsembleInstaAccount, EnsembleTiktokAccount
-from src.shared.models.ensemble_tiktok_account import TikTokVideos
+
+def classify_ensemble_error(error: Exception) -> FailureKind:
+    """
+    Classify an error of an Ensemble Data request.
+
+    Example:
+        >>> classify_ensemble_error(EDError(473, "User not found", 0))
+        <FailureKind.NOT_FOUND: 'not_found'>
+    """
+    if isinstance(error, ProviderItemError):
+        return error.kind
+    if isinstance(error, CircuitOpenError):
+        return FailureKind.UNAVAILABLE
+    if isinstance(error, EDError):
+        if error.status_code in _NOT_FOUND_STATUSES:
+            return FailureKind.NOT_FOUND
+        if error.status_code in _PRIVATE_STATUSES:
+            return FailureKind.PRIVATE
+        if error.status_code in _RATE_LIMITED_STATUSES:
+            return FailureKind.RATE_LIMITED
+        if error.status_code in _PERMANENT_STATUSES:
+            return FailureKind.PERMANENT
+        return FailureKind.TRANSIENT if error.status_code >= 500 else FailureKind.PERMANENT
+    if isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return FailureKind.TRANSIENT
+    # Malformed payloads and programming errors do not improve on retry
+    return FailureKind.PERMANENT
+
+
+# Per-username/keyword retries: the "ensemble" policy and budget
+# (RETRY_MAX_ATTEMPTS_ENSEMBLE, ...), retrying only rate-limited and transient errors
+ENSEMBLE_RETRY_POLICY = replace(
+    retry_policy("ensemble"),
+    retryable=lambda e: classify_ensemble_error(e).is_retryable,
+)
 
 
 class EnsembleService:
@@ -43,38 +119,83 @@ class EnsembleService:
                 "ENSEMBLE_API_KEY not found in environment variables."
             )
 
-    def _fetch_single_profile(
-        self, username: str
-    ) -> Tuple[str, Optional[EnsembleInstaAccount]]:
+    def _fetch_item(
+        self, what: str, item: Any, request: Callable[[], T]
+    ) -> Tuple[Optional[T], Optional[ItemFailure]]:
         """
-        Fetch a single Instagram profile. Helper method for parallel processing.
+        Run one item's request, retrying only rate-limited and transient errors.
 
         Args:
-            username: Instagram username to scrape
+            what: What is fetched, for logs ("profile", "TikTok videos", ...)
+            item: The username or keyword
+            request: Performs the request; raises on failure
 
         Returns:
-            Tuple of (username, profile) where profile is None if failed
+            ``(value, None)`` on success, ``(None, failure)`` otherwise
         """
-        try:
-            self._logger.info(f"Fetching profile data for username: {username}")
+        attempts = 0
 
-            # Get detailed user information from Ensemble Data API
-            result = self._client.instagram.user_detailed_info(username=username)
+        def attempt() -> T:
+            nonlocal attempts
+            attempts += 1
+            return request()
 
-            # Log API usage
-            self._logger.info(
-                f"API units charged for {username}: {result.units_charged}"
+        def log_retry(attempt_no: int, error: Exception) -> None:
+            self._logger.warning(
+                f"Retrying {what} for {item} after attempt {attempt_no} "
+                f"({classify_ensemble_error(error).value}): {error}"
             )
 
-            # Convert API response to EnsembleInstaAccount object
-            profile = EnsembleInstaAccount.from_dict(result.data)
+        try:
+            value = retry_call(attempt, ENSEMBLE_RETRY_POLICY, on_retry=log_retry)
+            return value, None
+        except Exception as e:
+            kind = classify_ensemble_error(e)
+            self._logger.error(
+                f"Error fetching {what} for {item} ({kind.value}, "
+                f"{attempts} attempt(s)): {e}"
+            )
+            message = (
+                f"{e.status_code}: {e.detail}" if isinstance(e, EDError) else str(e)
+            )
+            return None, ItemFailure(
+                item=item, kind=kind, message=message, attempts=attempts
+            )
 
-            self._logger.info(f"Successfully scraped profile for {username}")
-            return username, profile
+    @circuit_protected("ensemble")
+    @rate_limited("ensemble")
+    @concurrency_limited("ensemble")
+    def _request_profile(self, username: str) -> EnsembleInstaAccount:
+        self._logger.info(f"Fetching profile data for username: {username}")
 
-        except Exception as e:
-            self._logger.error(f"Error scraping profile for {username}: {e}")
-            return username, None
+        # Get detailed user information from Ensemble Data API
+        result = self._client.instagram.user_detailed_info(username=username)
+
+        # Log API usage
+        self._logger.info(f"API units charged for {username}: {result.units_charged}")
+
+        # Convert API response to EnsembleInstaAccount object
+        profile = EnsembleInstaAccount.from_dict(result.data)
+
+        self._logger.info(f"Successfully scraped profile for {username}")
+        return profile
+
+    def _fetch_single_profile(
+        self, username: str
+    ) -> Tuple[str, Optional[EnsembleInstaAccount]]:
+        """
+        Fetch a single Instagram profile. Helper method for sequential processing.
+
+        Args:
+            username: Instagram username to scrape
+
+        Returns:
+            Tuple of (username, profile) where profile is None if failed
+        """
+        profile, _ = self._fetch_item(
+            "profile", username, lambda: self._request_profile(username)
+        )
+        return username, profile
 
     def _search_single_tiktok_keyword(
         self,
@@ -83,7 +204,7 @@ class EnsembleService:
         max_results: Optional[int] = None,
     ) -> Tuple[str, List[EnsembleTiktokAccount]]:
         """
-        Search TikTok for a single keyword. Helper method for parallel processing.
+        Search TikTok for a single keyword. Helper method for sequential processing.
 
         Args:
             keyword: Search keyword/phrase
@@ -93,67 +214,135 @@ class EnsembleService:
         Returns:
             Tuple of (keyword, accounts) where accounts is empty list if failed
         """
-        try:
-            self._logger.info(f"Searching TikTok for keyword: '{keyword}'")
+        accounts, _ = self._search_tiktok_keyword_item(keyword, period, max_results)
+        return keyword, accounts or []
 
-            # Search TikTok using Ensemble Data API
-            result = self._client.tiktok.keyword_search(
-                keyword=keyword,
-                period=period,
-            )
+    def _search_tiktok_keyword_item(
+        self,
+        keyword: str,
+        period: str,
+        max_results: Optional[int],
+    ) -> Tuple[Optional[List[EnsembleTiktokAccount]], Optional[ItemFailure]]:
+        """
+        Search TikTok for a single keyword, reporting a failure instead of raising.
 
-            # Log API usage
-            self._logger.info(
-                f"TikTok search API units charged for '{keyword}': {result.units_charged}"
-            )
+        A speculative prefetch of the same keyword search in this session is
+        reused when available (see ``src.shared.prefetch_cache``), then
+        results cached for any user (see ``src.shared.provider_cache``). Only
+        the network request is retried; failures are never cached.
+        """
+        # Empty searches are not cached
+        def has_accounts(result: Tuple[str, List[EnsembleTiktokAccount]]) -> bool:
+            return bool(result[1])
+
+        result, failure = self._fetch_item(
+            "TikTok keyword search",
+            keyword,
+            lambda: PREFETCH_CACHE.fetch(
+                "ensemble_tiktok",
+                (keyword, period, max_results),
+                lambda: PROVIDER_CACHE.fetch(
+                    "ensemble_tiktok",
+                    "keyword_search",
+                    {"keyword": keyword, "period": period, "max_results": max_results},
+                    lambda: self._request_tiktok_keyword_search(
+                        keyword, period, max_results
+                    ),
+                    cacheable=has_accounts,
+                    codec=KEYWORD_SEARCH_CODEC,
+                ),
+                cacheable=has_accounts,
+            ),
+        )
+        return (result[1] if result else None), failure
 
-            # Extract data and convert to our models
-            accounts = []
-            if result.data and "data" in result.data:
-                search_results = result.data["data"]
-
-                # Apply max_results limit if specified
-                if max_results:
-                    search_results = search_results[:max_results]
-
-                for item in search_results:
-                    try:
-                        # Extract author/account data and video data
-                        aweme_info = item.get("aweme_info", {})
-                        author_data = aweme_info.get("author", {})
-
-                        # Create account with the single video from search result
-                        videos_data = [aweme_info] if aweme_info else []
-
-                        account = EnsembleTiktokAccount.from_dict(
-                            author_data, videos_data
-                        )
-                        accounts.append(account)
-
-                        self._logger.debug(
-                            f"Successfully parsed TikTok account: @{account.unique_id}"
-                        )
-
-                    except Exception as e:
-                        self._logger.warning(
-                            f"Failed to parse TikTok account data: {e}"
-                        )
-                        continue
-
-            self._logger.info(
-                f"Successfully found {len(accounts)} TikTok accounts for keyword: '{keyword}'"
-            )
-            return keyword, accounts
+    @circuit_protected("ensemble")
+    @rate_limited("ensemble")
+    @concurrency_limited("ensemble")
+    def _request_tiktok_keyword_search(
+        self,
+        keyword: str,
+        period: str,
+        max_results: Optional[int],
+    ) -> Tuple[str, List[EnsembleTiktokAccount]]:
+        self._logger.info(f"Searching TikTok for keyword: '{keyword}'")
 
-        except Exception as e:
-            self._logger.error(f"Error searching TikTok for keyword '{keyword}': {e}")
-            return keyword, []
+        # Search TikTok using Ensemble Data API
+        result = self._client.tiktok.keyword_search(
+            keyword=keyword,
+            period=period,
+        )
+
+        # Log API usage
+        self._logger.info(
+            f"TikTok search API units charged for '{keyword}': {result.units_charged}"
+        )
+
+        # Extract data and convert to our models
+        accounts = []
+        if result.data and "data" in result.data:
+            search_results = result.data["data"]
+
+            # Apply max_results limit if specified
+            if max_results:
+                search_results = search_results[:max_results]
+
+            for item in search_results:
+                try:
+                    # Extract author/account data and video data
+                    aweme_info = item.get("aweme_info", {})
+                    author_data = aweme_info.get("author", {})
+
+                    # Create account with the single video from search result
+                    videos_data = [aweme_info] if aweme_info else []
+
+                    account = EnsembleTiktokAccount.from_dict(author_data, videos_data)
+                    accounts.append(account)
+
+                    self._logger.debug(
+                        f"Successfully parsed TikTok account: @{account.unique_id}"
+                    )
+
+                except Exception as e:
+                    self._logger.warning(f"Failed to parse TikTok account data: {e}")
+                    continue
+
+        self._logger.info(
+            f"Successfully found {len(accounts)} TikTok accounts for keyword: '{keyword}'"
+        )
+        return keyword, accounts
+
+    @circuit_protected("ensemble")
+    @rate_limited("ensemble")
+    @concurrency_limited("ensemble")
+    def _request_tiktok_user_videos(self, username: str, depth: int) -> TikTokVideos:
+        self._logger.info(f"Fetching TikTok videos for username: {username}")
+
+        # Get user posts from Ensemble Data API
+        result = self._client.tiktok.user_posts_from_username(
+            username=username,
+            depth=depth,
+        )
+
+        # Log API usage
+        self._logger.info(
+            f"TikTok user videos API units charged for {username}: {result.units_charged}"
+        )
+
+        # Extract videos data
+        if not (result.data and "data" in result.data):
+            raise ProviderItemError(
+                f"No video data found for @{username}", FailureKind.NOT_FOUND
+            )
+        videos = TikTokVideos.from_dict(result.data["data"])
+        self._logger.info(f"Successfully fetched {videos.count} videos for @{username}")
+        return videos
 
     def _fetch_single_tiktok_user_videos(
         self, username: str, depth: int = 1
     ) -> Tuple[str, Optional[TikTokVideos]]:
         """
-        Fetch videos from a single TikTok user. Helper method for parallel processing.
+        Fetch videos from a single TikTok user. Helper method for sequential processing.
 
         Args:
             username: TikTok username to fetch videos from
@@ -162,43 +351,43 @@ class EnsembleService:
         Returns:
             Tuple of (username, videos) where videos is None if failed
         """
-        try:
-            self._logger.info(f"Fetching TikTok videos for username: {username}")
-
-            # Get user posts from Ensemble Data API
-            result = self._client.tiktok.user_posts_from_username(
-                username=username,
-                depth=depth,
-            )
+        videos, _ = self._fetch_item(
+            "TikTok videos",
+            username,
+            lambda: self._request_tiktok_user_videos(username, depth),
+        )
+        return username, videos
 
-            # Log API usage
-            self._logger.info(
-                f"TikTok user videos API units charged for {username}: {result.units_charged}"
-            )
+    @circuit_protected("ensemble")
+    @rate_limited("ensemble")
+    @concurrency_limited("ensemble")
+    def _request_tiktok_user_info(self, username: str) -> EnsembleTiktokAccount:
+        self._logger.info(f"Fetching TikTok user info for username: {username}")
 
-            # Extract videos data
-            videos = None
-            if result.data and "data" in result.data:
-                videos_data = result.data["data"]
-                videos = TikTokVideos.from_dict(videos_data)
-                self._logger.info(
-                    f"Successfully fetched {videos.count} videos for @{username}"
-                )
-            else:
-                self._logger.warning(f"No video data found for @{username}")
-                print(f"No video data found for @{username}")
+        # Get user info from Ensemble Data API
+        result = self._client.tiktok.user_info_from_username(
+            username=username,
+        )
 
-            return username, videos
+        # Log API usage
+        self._logger.info(
+            f"TikTok user info API units charged for {username}: {result.units_charged}"
+        )
 
-        except Exception as e:
-            self._logger.error(f"Error fetching TikTok videos for {username}: {e}")
-            return username, None
+        # Convert API response to EnsembleTiktokAccount object
+        if not result.data:
+            raise ProviderItemError(
+                f"No user info found for @{username}", FailureKind.NOT_FOUND
+            )
+        account = EnsembleTiktokAccount.from_direct_dict(result.data, [])
+        self._logger.info(f"Successfully fetched user info for @{username}")
+        return account
 
     def _fetch_single_tiktok_user_info(
         self, username: str
     ) -> Tuple[str, Optional[EnsembleTiktokAccount]]:
         """
-        Fetch TikTok user info from a single username. Helper method for parallel processing.
+        Fetch TikTok user info from a single username. Helper method for sequential processing.
 
         Args:
             username: TikTok username to fetch info from (without @ symbol)
@@ -206,111 +395,146 @@ class EnsembleService:
         Returns:
             Tuple of (username, account) where account is None if failed
         """
-        try:
-            self._logger.info(f"Fetching TikTok user info for username: {username}")
-
-            # Get user info from Ensemble Data API
-            result = self._client.tiktok.user_info_from_username(
-                username=username,
-            )
-
-            # Log API usage
-            self._logger.info(
-                f"TikTok user info API units charged for {username}: {result.units_charged}"
-            )
-
-            # Convert API response to EnsembleTiktokAccount object
-            account = None
-            if result.data:
-                account = EnsembleTiktokAccount.from_direct_dict(result.data, [])
-                self._logger.info(f"Successfully fetched user info for @{username}")
+        account, _ = self._fetch_item(
+            "TikTok user info", username, lambda: self._request_tiktok_user_info(username)
+        )
+        return username, account
 
-            return username, account
+    def _fetch_batch(
+        self,
+        what: str,
+        items: List[Any],
+        request: Callable[[Any], T],
+        max_workers: Optional[int],
+        on_result: Optional[Callable[[T], None]] = None,
+    ) -> BatchResult[T]:
+        """Fetch every item on the shared Ensemble pool, isolating failures per item."""
+        batch: BatchResult[T] = BatchResult()
+        for item, future in PROVIDER_SCHEDULER.map_unordered(
+            "ensemble",
+            lambda item: self._fetch_item(what, item, lambda: request(item)),
+            items,
+            max_in_flight=max_workers,
+        ):
+            value, failure = future.result()
+            if failure is not None:
+                batch.failures.append(failure)
+                continue
+            batch.successes.append(value)
+            if on_result:
+                on_result(value)
 
-        except Exception as e:
-            self._logger.error(f"Error fetching TikTok user info for {username}: {e}")
-            return username, None
+        self._logger.info(
+            f"Fetched {what} for {len(batch.successes)} out of {len(items)} items"
+            + (f" (failures: {batch.failure_counts()})" if batch.failures else "")
+        )
+        return batch
 
-    @retry(max_attempts=3, delay=1)
-    def scrape_instagram_profiles_parallel(
+    def scrape_instagram_profiles_batch(
         self,
         usernames: List[str],
-        max_workers: int = 5,
-    ) -> List[EnsembleInstaAccount]:
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[EnsembleInstaAccount], None]] = None,
+    ) -> BatchResult[EnsembleInstaAccount]:
         """
-        Scrape Instagram profiles in parallel for faster processing.
+        Scrape Instagram profiles in parallel, reporting failed usernames by kind.
 
-        This method uses ThreadPoolExecutor to fetch multiple profiles concurrently,
-        significantly reducing total execution time for large lists of usernames.
+        Each username is retried on its own when it is rate-limited or hits a
+        transient error; not-found, private and other permanent failures are
+        not retried. A failed username never causes the others to be fetched
+        again.
 
         Args:
             usernames: List of Instagram usernames to scrape (without @ symbol)
-            max_workers: Maximum number of concurrent threads (default: 5)
+            max_workers: Maximum number of calls in flight on the shared pool
+                (default: Ensemble's adaptive concurrency limit)
+            on_result: Optional callback invoked with each profile as soon as it
+                is scraped, before the whole batch completes
 
         Returns:
-            List of EnsembleInstaAccount objects containing profile data
+            BatchResult with the scraped profiles and the failed usernames
 
         Raises:
             ConfigurationError: If API client is not properly configured
 
         Example:
             >>> ensemble_service = EnsembleService()
-            >>> profiles = ensemble_service.scrape_instagram_profiles_parallel(
-            ...     ["user1", "user2", "user3"], max_workers=3
-            ... )
-            >>> print(f"Scraped {len(profiles)} profiles")
+            >>> batch = ensemble_service.scrape_instagram_profiles_batch(["nike", "ghost_user"])
+            >>> batch.failed_items(FailureKind.NOT_FOUND)
+            ['ghost_user']
         """
         if not self._client:
             self._init_client()
 
-        self._logger.info(
-            #     f"Scraping Instagram profiles in parallel for {len(usernames)} usernames "
-            f"using {max_workers} workers"
+        return self._fetch_batch(
+            "profile", usernames, self._request_profile, max_workers, on_result
         )
 
-        profiles = []
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all profile fetch tasks
-            future_to_username = {
-                executor.submit(self._fetch_single_profile, username): username
-                for username in usernames
-            }
+    def scrape_instagram_profiles_parallel(
+        self,
+        usernames: List[str],
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[EnsembleInstaAccount], None]] = None,
+    ) -> List[EnsembleInstaAccount]:
+        """
+        Scrape Instagram profiles in parallel for faster processing.
 
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_username):
-                username, profile = future.result()
-                if profile:
-                    profiles.append(profile)
+        Same as :meth:`scrape_instagram_profiles_batch`, returning only the
+        profiles that were scraped.
 
-        self._logger.info(
-            f"Successfully scraped {len(profiles)} out of {len(usernames)} profiles in parallel"
-        )
-        return profiles
+        Example:
+            >>> ensemble_service = EnsembleService()
+            >>> profiles = ensemble_service.scrape_instagram_profiles_parallel(
+            ...     ["user1", "user2", "user3"], max_workers=3
+            ... )
+            >>> print(f"Scraped {len(profiles)} profiles")
+        """
+        return self.scrape_instagram_profiles_batch(
+            usernames, max_workers, on_result
+        ).successes
 
-    @retry(max_attempts=3, delay=1)
-    def fetch_tiktok_user_videos_parallel(
+    def fetch_tiktok_user_videos_batch(
         self,
         usernames: List[str],
         depth: int = 1,
-        max_workers: int = 5,
-    ) -> List[TikTokVideos]:
+        max_workers: Optional[int] = None,
+    ) -> BatchResult[TikTokVideos]:
         """
-        Fetch TikTok user videos in parallel for faster processing.
-
-        This method uses ThreadPoolExecutor to fetch videos from multiple users concurrently,
-        significantly reducing total execution time for large lists of usernames.
+        Fetch TikTok user videos in parallel, reporting failed usernames by kind.
 
         Args:
             usernames: List of TikTok usernames to fetch videos from (without @ symbol)
             depth: Number of pages to fetch per user (default: 1)
-            max_workers: Maximum number of concurrent threads (default: 5)
+            max_workers: Maximum number of calls in flight on the shared pool
+                (default: Ensemble's adaptive concurrency limit)
 
         Returns:
-            List of TikTokVideos objects containing video data
+            BatchResult with the fetched videos and the failed usernames
 
         Raises:
             ConfigurationError: If API client is not properly configured
+        """
+        if not self._client:
+            self._init_client()
+
+        return self._fetch_batch(
+            "TikTok videos",
+            usernames,
+            lambda username: self._request_tiktok_user_videos(username, depth),
+            max_workers,
+        )
+
+    def fetch_tiktok_user_videos_parallel(
+        self,
+        usernames: List[str],
+        depth: int = 1,
+        max_workers: Optional[int] = None,
+    ) -> List[TikTokVideos]:
+        """
+        Fetch TikTok user videos in parallel for faster processing.
+
+        Same as :meth:`fetch_tiktok_user_videos_batch`, returning only the
+        videos that were fetched.
 
         Example:
             >>> ensemble_service = EnsembleService()
@@ -319,58 +543,44 @@ class EnsembleService:
             ... )
             >>> print(f"Fetched videos from {len(videos_list)} users")
         """
-        if not self._client:
-            self._init_client()
+        return self.fetch_tiktok_user_videos_batch(usernames, depth, max_workers).successes
 
-        self._logger.info(
-            #     f"Fetching TikTok videos in parallel for {len(usernames)} usernames "
-            f"using {max_workers} workers with depth={depth}"
-        )
+    def get_tiktok_by_username_batch(
+        self,
+        usernames: List[str],
+        max_workers: Optional[int] = None,
+    ) -> BatchResult[EnsembleTiktokAccount]:
+        """
+        Get TikTok user information in parallel, reporting failed usernames by kind.
 
-        videos_list = []
+        Args:
+            usernames: List of TikTok usernames to fetch info from (without @ symbol)
+            max_workers: Maximum number of calls in flight on the shared pool
+                (default: Ensemble's adaptive concurrency limit)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all video fetch tasks
-            future_to_username = {
-                executor.submit(
-                    self._fetch_single_tiktok_user_videos, username, depth
-                ): username
-                for username in usernames
-            }
-
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_username):
-                username, videos = future.result()
-                if videos:
-                    videos_list.append(videos)
+        Returns:
+            BatchResult with the fetched accounts and the failed usernames
 
-        self._logger.info(
-            f"Successfully fetched videos from {len(videos_list)} out of {len(usernames)} users in parallel"
+        Raises:
+            ConfigurationError: If API client is not properly configured
+        """
+        if not self._client:
+            self._init_client()
+
+        return self._fetch_batch(
+            "TikTok user info", usernames, self._request_tiktok_user_info, max_workers
         )
-        return videos_list
 
-    @retry(max_attempts=3, delay=1)
     def get_tiktok_by_username_parallel(
         self,
         usernames: List[str],
-        max_workers: int = 5,
+        max_workers: Optional[int] = None,
     ) -> List[EnsembleTiktokAccount]:
         """
         Get TikTok user information by username in parallel for faster processing.
 
-        This method uses ThreadPoolExecutor to fetch user info from multiple TikTok
-        accounts concurrently, significantly reducing total execution time for large
-        lists of usernames.
-
-        Args:
-            usernames: List of TikTok usernames to fetch info from (without @ symbol)
-            max_workers: Maximum number of concurrent threads (default: 5)
-
-        Returns:
-            List of EnsembleTiktokAccount objects containing user information
-
-        Raises:
-            ConfigurationError: If API client is not properly configured
+        Same as :meth:`get_tiktok_by_username_batch`, returning only the
+        accounts that were fetched.
 
         Example:
             >>> ensemble_service = EnsembleService()
@@ -380,105 +590,77 @@ class EnsembleService:
             >>> for account in accounts:
             ...     print(f"@{account.unique_id}: {account.follower_count} followers")
         """
-        if not self._client:
-            self._init_client()
-
-        self._logger.info(
-            #     f"Fetching TikTok user info in parallel for {len(usernames)} usernames "
-            f"using {max_workers} workers"
-        )
-
-        accounts = []
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all user info fetch tasks
-            future_to_username = {
-                executor.submit(self._fetch_single_tiktok_user_info, username): username
-                for username in usernames
-            }
-
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_username):
-                username, account = future.result()
-                if account:
-                    accounts.append(account)
-
-        # Get
+        return self.get_tiktok_by_username_batch(usernames, max_workers).successes
 
-        self._logger.info(
-            f"Successfully fetched user info for {len(accounts)} out of {len(usernames)} accounts in parallel"
-        )
-        return accounts
-
-    @retry(max_attempts=3, delay=1)
-    def search_tiktok_parallel(
+    def search_tiktok_batch(
         self,
         keywords: List[str],
         period: str = "90",
         max_results_per_keyword: Optional[int] = None,
-        max_workers: int = 5,
-    ) -> List[EnsembleTiktokAccount]:
+        max_workers: Optional[int] = None,
+    ) -> BatchResult[EnsembleTiktokAccount]:
         """
-        Search TikTok for multiple keywords in parallel for faster processing.
+        Search TikTok for multiple keywords in parallel, reporting failed keywords by kind.
 
-        This method uses ThreadPoolExecutor to search multiple keywords concurrently,
-        significantly reducing total execution time for large lists of keywords.
-        Accounts are scored based on frequency across searches and returned in order.
+        Accounts are scored based on frequency across the keyword searches and
+        returned in order; each keyword is retried on its own.
 
         Args:
             keywords: List of search keywords/phrases
             period: Search period - "1" for recent, other values may be supported
             max_results_per_keyword: Maximum number of results per keyword (optional)
-            max_workers: Maximum number of concurrent threads (default: 5)
+            max_workers: Maximum number of calls in flight on the shared pool
+                (default: Ensemble's adaptive concurrency limit)
 
         Returns:
-            List of EnsembleTiktokAccount objects sorted by relevance score (highest first)
+            BatchResult with the accounts sorted by relevance score (highest
+            first) and the failed keywords
 
         Raises:
             ConfigurationError: If API client is not properly configured
 
         Example:
             >>> ensemble_service = EnsembleService()
-            >>> accounts = ensemble_service.search_tiktok_parallel(
+            >>> batch = ensemble_service.search_tiktok_batch(
             ...     ["Lebanese Food", "Tripoli Restaurant", "Food Blog"],
             ...     max_workers=3
             ... )
-            >>> print(f"Found {len(accounts)} accounts across all keywords")
+            >>> print(f"Found {len(batch.successes)} accounts, {len(batch.failures)} keywords failed")
         """
         if not self._client:
             self._init_client()
 
         self._logger.info(
             #     f"Searching TikTok in parallel for {len(keywords)} keywords "
-            f"using {max_workers} workers"
+            f"using {max_workers or 'adaptive'} workers"
         )
 
+        emit_event("queries_issued", {"provider": "ensemble", "count": len(keywords)})
+
         account_scores = {}  # Track accounts and their scores
         account_objects = {}  # Store the actual account objects
+        failures: List[ItemFailure] = []
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all keyword search tasks
-            future_to_keyword = {
-                executor.submit(
-                    self._search_single_tiktok_keyword,
-                    keyword,
-                    period,
-                    max_results_per_keyword,
-                ): keyword
-                for keyword in keywords
-            }
-
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_keyword):
-                keyword, accounts = future.result()
-                if accounts:
-                    for account in accounts:
-                        uid = account.unique_id
-                        # Increment score for each appearance
-                        account_scores[uid] = account_scores.get(uid, 0) + 1
-                        # Store the account object (first occurrence)
-                        if uid not in account_objects:
-                            account_objects[uid] = account
+        # Search on the shared Ensemble pool, collecting results as they complete
+        for _, future in PROVIDER_SCHEDULER.map_unordered(
+            "ensemble",
+            lambda keyword: self._search_tiktok_keyword_item(
+                keyword, period, max_results_per_keyword
+            ),
+            keywords,
+            max_in_flight=max_workers,
+        ):
+            accounts, failure = future.result()
+            if failure is not None:
+                failures.append(failure)
+            if accounts:
+                for account in accounts:
+                    uid = account.unique_id
+                    # Increment score for each appearance
+                    account_scores[uid] = account_scores.get(uid, 0) + 1
+                    # Store the account object (first occurrence)
+                    if uid not in account_objects:
+                        account_objects[uid] = account
 
         self._logger.info(
             #     f"Aggregated results from {len(keywords)} keywords, "
@@ -501,11 +683,34 @@ class EnsembleService:
             #     f"from {len(keywords)} keywords in parallel "
             f"(total results before deduplication: {total_results}, sorted by relevance)"
         )
-        return unique_accounts
+        return BatchResult(successes=unique_accounts, failures=failures)
+
+    def search_tiktok_parallel(
+        self,
+        keywords: List[str],
+        period: str = "90",
+        max_results_per_keyword: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[EnsembleTiktokAccount]:
+        """
+        Search TikTok for multiple keywords in parallel for faster processing.
+
+        Same as :meth:`search_tiktok_batch`, returning only the accounts.
+
+        Example:
+            >>> ensemble_service = EnsembleService()
+            >>> accounts = ensemble_service.search_tiktok_parallel(
+            ...     ["Lebanese Food", "Tripoli Restaurant", "Food Blog"],
+            ...     max_workers=3
+            ... )
+            >>> print(f"Found {len(accounts)} accounts across all keywords")
+        """
+        return self.search_tiktok_batch(
+            keywords, period, max_results_per_keyword, max_workers
+        ).successes
 
-    @retry(max_attempts=3, delay=1)
     def scrape_instagram_profiles(
-        self, usernames: List[str], parallel: bool = True, max_workers: int = 5
+        self, usernames: List[str], parallel: bool = True, max_workers: Optional[int] = None
     ) -> List[EnsembleInstaAccount]:
         """
         Scrape Instagram profiles for given usernames using Ensemble Data API.
@@ -516,7 +721,8 @@ class EnsembleService:
         Args:
             usernames: List of Instagram usernames to scrape (without @ symbol)
             parallel: Whether to use parallel processing (default: True)
-            max_workers: Maximum number of concurrent threads when parallel=True (default: 5)
+            max_workers: Maximum number of calls in flight when parallel=True
+                (default: Ensemble's adaptive concurrency limit)
 
         Returns:
             List of EnsembleInstaAccount objects containing profile data
@@ -595,14 +801,13 @@ class EnsembleService:
         accounts = self.get_tiktok_by_username_parallel([username])
         return accounts[0] if accounts else None
 
-    @retry(max_attempts=3, delay=1)
     def search_tiktok(
         self,
         keywords: List[str],
         period: str = "1",
         max_results_per_keyword: Optional[int] = None,
         parallel: bool = True,
-        max_workers: int = 5,
+        max_workers: Optional[int] = None,
     ) -> List[EnsembleTiktokAccount]:
         """
         Search TikTok for content creators and influencers using keywords.
@@ -616,7 +821,8 @@ class EnsembleService:
             period: Search period - "1" for recent, other values may be supported
             max_results_per_keyword: Maximum number of results per keyword (optional)
             parallel: Whether to use parallel processing (default: True)
-            max_workers: Maximum number of concurrent threads when parallel=True (default: 5)
+            max_workers: Maximum number of calls in flight when parallel=True
+                (default: Ensemble's adaptive concurrency limit)
 
         Returns:
             List of EnsembleTiktokAccount objects containing account data
@@ -669,13 +875,12 @@ class EnsembleService:
         )
         return unique_accounts
 
-    @retry(max_attempts=3, delay=1)
     def fetch_tiktok_user_videos(
         self,
         usernames: List[str],
         depth: int = 1,
         parallel: bool = True,
-        max_workers: int = 5,
+        max_workers: Optional[int] = None,
     ) -> List[TikTokVideos]:
         """
         Fetch TikTok user videos for given usernames using Ensemble Data API.
@@ -687,7 +892,8 @@ class EnsembleService:
             usernames: List of TikTok usernames to fetch videos from (without @ symbol)
             depth: Number of pages to fetch per user (default: 1)
             parallel: Whether to use parallel processing (default: True)
-            max_workers: Maximum number of concurrent threads when parallel=True (default: 5)
+            max_workers: Maximum number of calls in flight when parallel=True
+                (default: Ensemble's adaptive concurrency limit)
 
         Returns:
             List of TikTokVideos objects containing video data
@@ -1,13 +1,55 @@
+import dataclasses
 from os import environ
-import concurrent.futures
-from typing import List, Dict, Any
+import time
+from typing import Any, Dict, List, Optional
 
 from exa_py import Exa
-from exa_py.api import SearchResponse
+from exa_py.api import Result, SearchResponse
 
 from src.shared.utils.logging import get_logger, FyuzeLogger
 from src.shared.utils.retry import retry
+from src.shared.utils.rate_limiter import rate_limited
+from src.shared.utils.latency import provider_latency
 from src.shared.exceptions import ConfigurationError
+from src.shared.adaptive_concurrency import concurrency_limited
+from src.shared.circuit_breaker import circuit_protected
+from src.shared.context import emit_event
+from src.shared.provider_scheduler import PROVIDER_SCHEDULER
+from src.shared.prefetch_cache import PREFETCH_CACHE
+from src.shared.provider_cache import PROVIDER_CACHE, JSONCodec
+
+
+def _search_response_to_dict(response: SearchResponse) -> Dict[str, Any]:
+    return {
+        "results": [
+            {
+                field.name: getattr(result, field.name)
+                for field in dataclasses.fields(result)
+                if field.init and field.name != "subpages"
+            }
+            for result in response.results
+        ],
+        "autoprompt_string": response.autoprompt_string,
+        "resolved_search_type": response.resolved_search_type,
+        "auto_date": response.auto_date,
+        "context": response.context,
+    }
+
+
+def _search_response_from_dict(data: Dict[str, Any]) -> SearchResponse:
+    return SearchResponse(
+        results=[Result(**result) for result in data["results"]],
+        autoprompt_string=data.get("autoprompt_string"),
+        resolved_search_type=data.get("resolved_search_type"),
+        auto_date=data.get("auto_date"),
+        context=data.get("context"),
+    )
+
+
+# Exa responses as stored in the provider cache
+SEARCH_RESPONSE_CODEC = JSONCodec(
+    encode=_search_response_to_dict, decode=_search_response_from_dict
+)
 
 
 class ExaSearchService:
@@ -25,12 +67,33 @@ class ExaSearchService:
             self._logger.error("EXA_API_KEY not found in environment variables.")
             raise ConfigurationError("EXA_API_KEY not found in environment variables.")
 
-    @retry(max_attempts=3, delay=1)
     def search(self, query: str) -> SearchResponse:
+        # Reuses a speculative prefetch of the same query in this session,
+        # then responses cached for any user (see src.shared.provider_cache)
+        return PREFETCH_CACHE.fetch(
+            "exa",
+            query,
+            lambda: PROVIDER_CACHE.fetch(
+                "exa",
+                "search",
+                {"query": query},
+                lambda: self._search(query),
+                # Empty searches are not cached
+                cacheable=lambda response: bool(response.results),
+                codec=SEARCH_RESPONSE_CODEC,
+            ),
+        )
+
+    @retry(provider="exa")
+    @circuit_protected("exa")
+    @rate_limited("exa")
+    @concurrency_limited("exa")
+    def _search(self, query: str) -> SearchResponse:
         if not self._exa:
             self._init_client()
 
         self._logger.info(f"Performing search with query: {query}")
+        started = time.perf_counter()
         try:
             results: SearchResponse = self._exa.search(
                 query=query,
@@ -43,6 +106,9 @@ class ExaSearchService:
         except Exception as e:
             self._logger.error(f"Error during EXA search: {e}")
             raise
+        finally:
+            # Network latency only; feeds the Exa -> CSE hedging threshold
+            provider_latency("exa").record(time.perf_counter() - started)
 
     def _search_worker(self, query_data: tuple) -> tuple[str, SearchResponse]:
         """
@@ -63,14 +129,15 @@ class ExaSearchService:
             return query_id, []
 
     def bulk_search(
-        self, queries: Dict[str, str], max_workers: int = 5
+        self, queries: Dict[str, str], max_workers: Optional[int] = None
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Perform multiple searches in parallel using multithreading.
 
         Args:
             queries: Dictionary mapping query IDs to query strings
-            max_workers: Maximum number of threads to use
+            max_workers: Maximum number of calls in flight on the shared pool
+                (default: Exa's adaptive concurrency limit)
 
         Returns:
             Dictionary mapping query IDs to search results
@@ -87,22 +154,20 @@ class ExaSearchService:
             self._init_client()
 
         self._logger.info(
-            f"Performing bulk search with {len(queries)} queries using {max_workers} workers"
+            f"Performing bulk search with {len(queries)} queries using {max_workers or 'adaptive'} workers"
         )
+        emit_event("queries_issued", {"provider": "exa", "count": len(queries)})
 
         results = {}
         query_data = [
             (query_id, query_text) for query_id, query_text in queries.items()
         ]
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_query = {
-                executor.submit(self._search_worker, qd): qd[0] for qd in query_data
-            }
-
-            for future in concurrent.futures.as_completed(future_to_query):
-                query_id, query_results = future.result()
-                results[query_id] = query_results
+        for _, future in PROVIDER_SCHEDULER.map_unordered(
+            "exa", self._search_worker, query_data, max_in_flight=max_workers
+        ):
+            query_id, query_results = future.result()
+            results[query_id] = query_results
 
         self._logger.info(f"Bulk search completed with {len(results)} results")
         return results
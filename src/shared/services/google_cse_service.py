@@ -0,0 +1,184 @@
+from os import environ
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httplib2
+from googleapiclient.discovery import Resource, build
+
+from src.shared.utils.logging import get_logger, FyuzeLogger
+from src.shared.utils.retry import retry
+from src.shared.utils.rate_limiter import rate_limited
+from src.shared.utils.latency import provider_latency
+from src.shared.exceptions import ConfigurationError
+from src.shared.adaptive_concurrency import concurrency_limited
+from src.shared.circuit_breaker import circuit_protected
+from src.shared.provider_cache import PROVIDER_CACHE
+from src.shared.provider_scheduler import PROVIDER_SCHEDULER
+
+# Google Custom Search returns at most 10 results per page and 100 per query
+CSE_PAGE_SIZE = 10
+CSE_MAX_PAGES = 10
+
+
+class GoogleCSEService:
+    """
+    Long-lived Google Custom Search client.
+
+    The ``customsearch`` resource is built once from the discovery document
+    bundled with ``google-api-python-client`` (no discovery request per
+    search). ``httplib2.Http`` is not thread-safe, so each thread executes
+    requests with its own connection. Pages are cached per
+    ``(query, gl, start)`` in ``PROVIDER_CACHE``.
+
+    Example:
+        >>> cse = GoogleCSEService()
+        >>> items = cse.search("food restaurants Tripoli Lebanon", gl="lb", pages=3)
+        >>> len(items)
+        30
+    """
+
+    def __init__(self):
+        self._logger: FyuzeLogger = get_logger(__name__)
+        self._service: Resource | None = None
+        self._search_engine_id: str | None = None
+        self._init_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _init_client(self):
+        with self._init_lock:
+            if self._service:
+                return
+            api_key = environ.get("GOOGLE_API_KEY")
+            search_engine_id = environ.get("GOOGLE_SEARCH_ENGINE_ID")
+            if not api_key or not search_engine_id:
+                self._logger.error(
+                    "GOOGLE_API_KEY or GOOGLE_SEARCH_ENGINE_ID not found in environment variables."
+                )
+                raise ConfigurationError(
+                    "GOOGLE_API_KEY and GOOGLE_SEARCH_ENGINE_ID must be set in environment variables"
+                )
+            self._logger.info("Initializing Google Custom Search client.")
+            self._search_engine_id = search_engine_id
+            self._service = build(
+                "customsearch",
+                "v1",
+                developerKey=api_key,
+                static_discovery=True,
+                cache_discovery=False,
+            )
+            self._logger.info("Google Custom Search client initialized successfully.")
+
+    @staticmethod
+    def is_configured() -> bool:
+        """Whether the CSE credentials are set (optional callers skip CSE otherwise)."""
+        return bool(
+            environ.get("GOOGLE_API_KEY") and environ.get("GOOGLE_SEARCH_ENGINE_ID")
+        )
+
+    def _http(self) -> httplib2.Http:
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = httplib2.Http(timeout=30)
+        return http
+
+    def search_page(
+        self, query: str, gl: Optional[str] = None, start: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch one result page.
+
+        Args:
+            query: The search query string
+            gl: Optional geographic location code (e.g., "us", "lb")
+            start: 1-based index of the first result (1, 11, 21, ...)
+
+        Returns:
+            Raw CSE items of the page (empty past the last result)
+        """
+        if not self._service:
+            self._init_client()
+        return PROVIDER_CACHE.fetch(
+            "google_cse",
+            "list",
+            {
+                "q": query,
+                "cx": self._search_engine_id,
+                "gl": gl,
+                "num": CSE_PAGE_SIZE,
+                "start": start,
+            },
+            lambda: self._list(query, gl, start),
+        )
+
+    @retry(provider="google_cse")
+    @circuit_protected("google_cse")
+    @rate_limited("google_cse")
+    @concurrency_limited("google_cse")
+    def _list(self, query: str, gl: Optional[str], start: int) -> List[Dict[str, Any]]:
+        self._logger.info(f"Performing CSE search (start={start}) with query: {query}")
+        started = time.perf_counter()
+        try:
+            result = (
+                self._service.cse()
+                .list(
+                    q=query,
+                    cx=self._search_engine_id,
+                    gl=gl,  #! should be country code (e.g: "us", "lb")
+                    num=CSE_PAGE_SIZE,  #! max 10
+                    start=start,
+                )
+                .execute(http=self._http())
+            )
+        finally:
+            provider_latency("google_cse").record(time.perf_counter() - started)
+        return result.get("items", [])
+
+    def search(
+        self, query: str, gl: Optional[str] = None, pages: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch ``pages`` result pages concurrently and merge them in page order.
+
+        A failing first page raises; later pages that fail are logged and
+        skipped, so the caller still gets the results of the others.
+
+        Args:
+            query: The search query string
+            gl: Optional geographic location code (e.g., "us", "lb")
+            pages: Number of 10-result pages (1-10)
+
+        Returns:
+            Raw CSE items, deduplicated by link
+        """
+        if not self._service:
+            self._init_client()
+        pages = max(1, min(pages, CSE_MAX_PAGES))
+        starts = [1 + CSE_PAGE_SIZE * page for page in range(pages)]
+        if pages == 1:
+            page_items = [self.search_page(query, gl, 1)]
+        else:
+            futures = [
+                PROVIDER_SCHEDULER.submit("google_cse", self.search_page, query, gl, start)
+                for start in starts
+            ]
+            page_items = []
+            for start, future in zip(starts, futures):
+                try:
+                    page_items.append(future.result())
+                except Exception as e:
+                    if start == 1:
+                        raise
+                    self._logger.warning(f"CSE page start={start} failed: {e}")
+                    page_items.append([])
+
+        items: List[Dict[str, Any]] = []
+        seen = set()
+        for page in page_items:
+            for item in page:
+                link = item.get("link")
+                if link in seen:
+                    continue
+                seen.add(link)
+                items.append(item)
+        return items
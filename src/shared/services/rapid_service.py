@@ -1,11 +1,13 @@
 from os import environ
-import concurrent.futures
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
-from src.shared.utils import get_logger, FyuzeLogger, retry
+from src.shared.utils import get_logger, FyuzeLogger, rate_limited, retry
 from src.shared.exceptions import ConfigurationError
+from src.shared.adaptive_concurrency import concurrency_limited
+from src.shared.circuit_breaker import circuit_protected
+from src.shared.provider_scheduler import PROVIDER_SCHEDULER
 from src.shared.models import AudienceSnapshot
 
 
@@ -48,6 +50,26 @@ class RapidService:
         }
         self._logger.info("RapidAPI headers initialized successfully.")
 
+    @retry(provider="rapid")
+    @circuit_protected("rapid")
+    @rate_limited("rapid")
+    @concurrency_limited("rapid")
+    def _request_audience_snapshot(self, instagram_url: str) -> Dict[str, Any]:
+        """
+        Request the raw demographics of one profile.
+
+        Retried per the "rapid" retry policy: 429s wait out RapidAPI's
+        ``Retry-After``, other 4xx answers are raised at once.
+        """
+        response = requests.get(
+            self.DEMOGRAPHIC_ENDPOINT,
+            headers=self._headers,
+            params={"url": instagram_url},
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.json()
+
     def _fetch_single_audience_snapshot(
         self, instagram_url: str
     ) -> Tuple[str, Optional[AudienceSnapshot]]:
@@ -66,16 +88,7 @@ class RapidService:
 
             self._logger.info(f"Fetching audience snapshot for: {instagram_url}")
 
-            params = {"url": instagram_url}
-            response = requests.get(
-                self.DEMOGRAPHIC_ENDPOINT,
-                headers=self._headers,
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-
-            raw_data = response.json()
+            raw_data = self._request_audience_snapshot(instagram_url)
 
             # Convert API response to AudienceSnapshot object
             snapshot = AudienceSnapshot.from_raw(raw_data)
@@ -94,7 +107,6 @@ class RapidService:
             )
             return instagram_url, None
 
-    @retry(max_attempts=3, delay=1)
     def get_audience_snapshot(self, instagram_url: str) -> Optional[AudienceSnapshot]:
         """
         Get audience snapshot for a single Instagram profile.
@@ -118,21 +130,21 @@ class RapidService:
         _, snapshot = self._fetch_single_audience_snapshot(instagram_url)
         return snapshot
 
-    @retry(max_attempts=3, delay=1)
     def get_audience_snapshots_parallel(
         self,
         instagram_urls: List[str],
-        max_workers: int = 5,
+        max_workers: Optional[int] = None,
     ) -> List[AudienceSnapshot]:
         """
         Fetch audience snapshots for multiple Instagram profiles in parallel.
 
-        This method uses ThreadPoolExecutor to fetch multiple audience snapshots
+        This method uses the shared Rapid pool to fetch multiple audience snapshots
         concurrently, significantly reducing total execution time for large lists.
 
         Args:
             instagram_urls: List of Instagram profile URLs to fetch snapshots for
-            max_workers: Maximum number of concurrent threads (default: 5)
+            max_workers: Maximum number of calls in flight on the shared pool
+                (default: Rapid's adaptive concurrency limit)
 
         Returns:
             List of AudienceSnapshot objects containing demographic data
@@ -156,41 +168,37 @@ class RapidService:
 
         self._logger.info(
             f"Fetching {len(instagram_urls)} audience snapshots in parallel "
-            f"using {max_workers} workers"
+            f"using {max_workers or 'adaptive'} workers"
         )
 
         snapshots = []
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all snapshot fetch tasks
-            future_to_url = {
-                executor.submit(self._fetch_single_audience_snapshot, url): url
-                for url in instagram_urls
-            }
-
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    _, snapshot = future.result()
-                    if snapshot:
-                        snapshots.append(snapshot)
-                except Exception as e:
-                    self._logger.error(
-                        f"Error retrieving snapshot for {url} from executor: {e}"
-                    )
+        # Fetch on the shared Rapid pool, collecting results as they complete
+        for url, future in PROVIDER_SCHEDULER.map_unordered(
+            "rapid",
+            self._fetch_single_audience_snapshot,
+            instagram_urls,
+            max_in_flight=max_workers,
+        ):
+            try:
+                _, snapshot = future.result()
+                if snapshot:
+                    snapshots.append(snapshot)
+            except Exception as e:
+                self._logger.error(
+                    f"Error retrieving snapshot for {url} from executor: {e}"
+                )
 
         self._logger.info(
             f"Successfully fetched {len(snapshots)} out of {len(instagram_urls)} audience snapshots in parallel"
         )
         return snapshots
 
-    @retry(max_attempts=3, delay=1)
     def get_audience_snapshots(
         self,
         instagram_urls: List[str],
         parallel: bool = True,
-        max_workers: int = 5,
+        max_workers: Optional[int] = None,
     ) -> List[AudienceSnapshot]:
         """
         Get audience snapshots for multiple Instagram profiles.
@@ -201,7 +209,8 @@ class RapidService:
         Args:
             instagram_urls: List of Instagram profile URLs to fetch snapshots for
             parallel: Whether to fetch in parallel (default: True)
-            max_workers: Maximum number of concurrent threads if parallel=True (default: 5)
+            max_workers: Maximum number of calls in flight if parallel=True
+                (default: Rapid's adaptive concurrency limit)
 
         Returns:
             List of AudienceSnapshot objects containing demographic data
@@ -1,11 +1,14 @@
 import os
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Sequence, Tuple
 from supabase import create_client, Client
 
+from src.shared.circuit_breaker import circuit_breaker
+from src.shared.exceptions import CircuitOpenError
+from src.shared.provider_scheduler import PROVIDER_SCHEDULER
+
 
 # logger = logging.getLogger(__name__)
 
@@ -130,18 +133,22 @@ class SupabaseService:
             # logger.info(f"Saving creator: {username} on {platform}")
 
             # Execute the SQL function
-            result = self.client.rpc(
-                "insert_creator_from_payload",
-                {
-                    "p_username": username.strip(),
-                    "p_platform": platform.strip().lower(),
-                    "p_data": data_json,
-                },
-            ).execute()
+            result = circuit_breaker("supabase").call(
+                self.client.rpc(
+                    "insert_creator_from_payload",
+                    {
+                        "p_username": username.strip(),
+                        "p_platform": platform.strip().lower(),
+                        "p_data": data_json,
+                    },
+                ).execute
+            )
 
             # logger.info(f"Successfully saved creator: {username}")
             return result.data
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             error_msg = f"Failed to save creator {username} on {platform}: {str(e)}"
             # logger.error(error_msg)
@@ -203,7 +210,7 @@ class SupabaseService:
             # )
 
             # Query the creators table
-            result = (
+            result = circuit_breaker("supabase").call(
                 self.client.table("creators")
                 .select("*")
                 .eq("username", username.strip())
@@ -211,7 +218,7 @@ class SupabaseService:
                 .gte("updated_at", cutoff_iso)  # Only get records updated after cutoff
                 .order("updated_at", desc=True)  # Get the most recent if multiple exist
                 .limit(1)
-                .execute()
+                .execute
             )
 
             if result.data and len(result.data) > 0:
@@ -222,6 +229,8 @@ class SupabaseService:
                 # logger.info(f"No fresh creator data found for {username} on {platform}")
                 return None
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             error_msg = f"Failed to get creator {username} on {platform}: {str(e)}"
             # logger.error(error_msg)
@@ -237,7 +246,7 @@ class SupabaseService:
 
         Args:
             requests: Iterable of ``(username, platform)`` tuples.
-            max_workers: Maximum number of worker threads to use.
+            max_workers: Maximum number of calls in flight on the shared pool.
             max_age_days: Optional override passed to :meth:`get_creator`.
 
         Returns:
@@ -278,38 +287,29 @@ class SupabaseService:
         results: list[Dict[str, Any]] = []
         errors: list[Dict[str, Any]] = []
 
-        with ThreadPoolExecutor(
-            max_workers=min(max_workers, len(cleaned_requests))
-        ) as executor:
-            future_map = {
-                executor.submit(
-                    self.get_creator,
-                    username,
-                    platform,
-                    max_age_days,
-                ): (username, platform)
-                for username, platform in cleaned_requests
-            }
-
-            for future in as_completed(future_map):
-                username, platform = future_map[future]
-                try:
-                    creator = future.result()
-                    results.append(
-                        {
-                            "username": username,
-                            "platform": platform,
-                            "creator": creator,
-                        }
-                    )
-                except Exception as exc:  # pragma: no cover - defensive
-                    errors.append(
-                        {
-                            "username": username,
-                            "platform": platform,
-                            "error": str(exc),
-                        }
-                    )
+        for (username, platform), future in PROVIDER_SCHEDULER.map_unordered(
+            "supabase",
+            lambda request: self.get_creator(request[0], request[1], max_age_days),
+            cleaned_requests,
+            max_in_flight=max_workers,
+        ):
+            try:
+                creator = future.result()
+                results.append(
+                    {
+                        "username": username,
+                        "platform": platform,
+                        "creator": creator,
+                    }
+                )
+            except Exception as exc:  # pragma: no cover - defensive
+                errors.append(
+                    {
+                        "username": username,
+                        "platform": platform,
+                        "error": str(exc),
+                    }
+                )
 
         return {"results": results, "errors": errors}
 
@@ -323,7 +323,7 @@ class SupabaseService:
         Args:
             creators: Iterable of dictionaries containing ``username``, ``platform``
                 and ``data`` keys (same payload accepted by :meth:`save_creator`).
-            max_workers: Maximum number of worker threads to use.
+            max_workers: Maximum number of calls in flight on the shared pool.
 
         Returns:
             Dictionary with two keys:
@@ -374,38 +374,31 @@ class SupabaseService:
         saved: list[Dict[str, Any]] = []
         errors: list[Dict[str, Any]] = []
 
-        with ThreadPoolExecutor(
-            max_workers=min(max_workers, len(sanitized_creators))
-        ) as executor:
-            future_map = {
-                executor.submit(
-                    self.save_creator,
-                    entry["username"],
-                    entry["platform"],
-                    entry["data"],
-                ): entry
-                for entry in sanitized_creators
-            }
-
-            for future in as_completed(future_map):
-                entry = future_map[future]
-                try:
-                    result = future.result()
-                    saved.append(
-                        {
-                            "username": entry["username"],
-                            "platform": entry["platform"],
-                            "result": result,
-                        }
-                    )
-                except Exception as exc:  # pragma: no cover - defensive
-                    errors.append(
-                        {
-                            "username": entry["username"],
-                            "platform": entry["platform"],
-                            "error": str(exc),
-                        }
-                    )
+        for entry, future in PROVIDER_SCHEDULER.map_unordered(
+            "supabase",
+            lambda entry: self.save_creator(
+                entry["username"], entry["platform"], entry["data"]
+            ),
+            sanitized_creators,
+            max_in_flight=max_workers,
+        ):
+            try:
+                result = future.result()
+                saved.append(
+                    {
+                        "username": entry["username"],
+                        "platform": entry["platform"],
+                        "result": result,
+                    }
+                )
+            except Exception as exc:  # pragma: no cover - defensive
+                errors.append(
+                    {
+                        "username": entry["username"],
+                        "platform": entry["platform"],
+                        "error": str(exc),
+                    }
+                )
 
         return {"saved": saved, "errors": errors}
 
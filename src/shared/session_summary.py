@@ -0,0 +1,368 @@
+"""
+Rolling, deterministic summary of a Fyuze chat session.
+
+With ``add_history_to_messages`` every turn used to replay the last ten runs
+from ``MongoDbStorage``, tool outputs included, so the prompt grew with every
+search in the conversation. Instead, the agent now replays only the last
+``FYUZE_AGENT_HISTORY_RUNS`` runs and gets everything older from this summary:
+the user's recent requests and compact references (platform, handle, key
+metrics) to every influencer a tool returned.
+
+The summary is updated incrementally after each run from the tool-result
+registry (no LLM call), bounded in size, and stored on the agent's session
+document in Mongo. Updates are versioned (see :func:`update_session_summary`),
+so concurrent turns of one session do not overwrite each other. Tool payloads of finished runs are replaced by the same
+compact references before the session is written back, so replayed history
+stays small as well.
+"""
+
+import ast
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from src.shared.tool_registry import ToolCallRecord
+from src.shared.utils import count_tokens, get_logger, FyuzeLogger
+
+logger: FyuzeLogger = get_logger(__name__)
+
+# Older turns kept as request/reply snippets in the summary
+SESSION_SUMMARY_MAX_TURNS = int(os.getenv("SESSION_SUMMARY_MAX_TURNS", "8"))
+# Influencer references kept in the summary (oldest tool calls go first)
+SESSION_SUMMARY_MAX_PROFILES = int(os.getenv("SESSION_SUMMARY_MAX_PROFILES", "40"))
+
+# Field on the agno session document that holds the summary
+SUMMARY_FIELD = "fyuze_summary"
+# Reload-and-reapply rounds when a concurrent turn saved the summary first
+SUMMARY_UPDATE_ATTEMPTS = 5
+
+_REQUEST_SNIPPET = 200
+_REPLY_SNIPPET = 160
+# Tool outputs without profiles (e.g. website analysis) are cut to this length
+_TOOL_TEXT_SNIPPET = 600
+
+_stats_lock = threading.Lock()
+_stats = {
+    "updates": 0,
+    "update_conflicts": 0,
+    "tool_messages_compacted": 0,
+    "tokens_removed": 0,
+}
+
+
+def _snippet(text: Optional[str], limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def _format_count(value: Optional[int]) -> str:
+    if not value:
+        return "?"
+    for divisor, suffix in ((1_000_000, "M"), (1_000, "k")):
+        if value >= divisor:
+            return f"{value / divisor:.1f}".rstrip("0").rstrip(".") + suffix
+    return str(value)
+
+
+def _format_profile(profile: Dict[str, Any]) -> str:
+    details = [f"{_format_count(profile.get('followers'))} followers"]
+    if profile.get("engagement_rate") is not None:
+        details.append(f"ER {profile['engagement_rate']}%")
+    if profile.get("is_verified"):
+        details.append("verified")
+    return f"@{profile['username']} ({', '.join(details)})"
+
+
+def _parse_tool_output(content: str) -> Any:
+    # Agno stores tool results as ``str(result)``, i.e. a Python repr
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            return parse(content)
+        except (TypeError, ValueError, SyntaxError, MemoryError, RecursionError):
+            continue
+    return None
+
+
+@dataclass
+class SessionSummary:
+    """
+    Compact state of one chat session.
+
+    Attributes:
+        session_id: Agno session id.
+        turns: Number of completed runs.
+        recent_turns: ``{"turn", "request", "reply"}`` snippets, newest last.
+        results: One entry per tool call that returned influencers:
+            ``{"turn", "tool", "platform", "profiles": [{"username", ...}]}``.
+        awaiting_answer: The last reply asked the user a question.
+        version: Number of saves; a save only succeeds on the version it
+            was loaded at.
+
+    Example:
+        >>> summary = SessionSummary(session_id="abc")
+        >>> summary.add_turn("fitness creators in Dubai", reply_text, registry.records)
+        >>> print(summary.render())
+    """
+
+    session_id: str
+    turns: int = 0
+    recent_turns: List[Dict[str, Any]] = field(default_factory=list)
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    awaiting_answer: bool = False
+    version: int = 0
+
+    def add_turn(
+        self,
+        request: str,
+        reply: Optional[str],
+        records: List[ToolCallRecord],
+        asked_question: bool = False,
+    ) -> None:
+        """Fold one finished run into the summary."""
+        self.turns += 1
+        self.awaiting_answer = asked_question
+        self.recent_turns.append(
+            {
+                "turn": self.turns,
+                "request": _snippet(request, _REQUEST_SNIPPET),
+                "reply": _snippet(reply, _REPLY_SNIPPET),
+            }
+        )
+        del self.recent_turns[:-SESSION_SUMMARY_MAX_TURNS]
+
+        for record in records:
+            if not record.usernames:
+                continue
+            self.results.append(
+                {
+                    "turn": self.turns,
+                    "tool": record.tool,
+                    "platform": record.platform.value,
+                    "profiles": [
+                        {"username": username, **record.metrics.get(username, {})}
+                        for username in record.usernames
+                    ],
+                }
+            )
+        self._trim_results()
+
+    def _trim_results(self) -> None:
+        total = sum(len(result["profiles"]) for result in self.results)
+        while len(self.results) > 1 and total > SESSION_SUMMARY_MAX_PROFILES:
+            total -= len(self.results.pop(0)["profiles"])
+        if self.results and total > SESSION_SUMMARY_MAX_PROFILES:
+            self.results[0]["profiles"] = self.results[0]["profiles"][
+                :SESSION_SUMMARY_MAX_PROFILES
+            ]
+
+    def render(self) -> str:
+        """Prompt section for the agent; empty for a new session."""
+        if not self.turns:
+            return ""
+
+        lines = [
+            "### Conversation Summary",
+            f"This conversation has {self.turns} earlier turn(s). Only the most "
+            "recent ones are replayed in full; use this summary for anything older "
+            "and do not search again for influencers listed here unless the user "
+            "asks for new or different results.",
+        ]
+        if self.recent_turns:
+            lines.append("Earlier requests:")
+            for turn in self.recent_turns:
+                line = f'- Turn {turn["turn"]}: user: "{turn["request"]}"'
+                if turn["reply"]:
+                    line += f' / you: "{turn["reply"]}"'
+                lines.append(line)
+        if self.results:
+            lines.append("Influencers already returned by tools:")
+            for result in self.results:
+                profiles = ", ".join(_format_profile(p) for p in result["profiles"])
+                lines.append(
+                    f"- Turn {result['turn']}, {result['platform']} "
+                    f"({result['tool']}): {profiles}"
+                )
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, session_id: str, data: Optional[Dict[str, Any]]) -> "SessionSummary":
+        data = data or {}
+        return cls(
+            session_id=session_id,
+            turns=int(data.get("turns") or 0),
+            recent_turns=list(data.get("recent_turns") or []),
+            results=list(data.get("results") or []),
+            awaiting_answer=bool(data.get("awaiting_answer")),
+            version=int(data.get("version") or 0),
+        )
+
+    @property
+    def last_reply(self) -> Optional[str]:
+        """Snippet of the previous reply, if any."""
+        return self.recent_turns[-1]["reply"] if self.recent_turns else None
+
+
+def _session_collection():
+    from src.shared.utils.storage import storage
+
+    return storage.collection
+
+
+def load_session_summary(session_id: str) -> SessionSummary:
+    """Summary stored on the session document (empty if none or on errors)."""
+    try:
+        doc = _session_collection().find_one(
+            {"session_id": session_id}, {SUMMARY_FIELD: 1}
+        )
+    except Exception as e:
+        logger.warning(f"Failed to load session summary for {session_id}: {e}")
+        doc = None
+    return SessionSummary.from_dict(session_id, (doc or {}).get(SUMMARY_FIELD))
+
+
+def update_session_summary(
+    session_id: str,
+    apply: Callable[[SessionSummary], None],
+    user_id: Optional[str] = None,
+    summary: Optional[SessionSummary] = None,
+) -> SessionSummary:
+    """
+    Apply ``apply`` to the session's summary and store it (best effort).
+
+    The save is conditional on the version the summary was loaded at. When a
+    concurrent turn of the same session saved first, the summary is reloaded
+    and ``apply`` runs again on the fresh copy, so neither turn is lost. The
+    session document is created when missing (e.g. a conversation that so far
+    only had small talk, see ``src.agent.intent_router``); agno fills in its
+    own fields on the first agent run.
+
+    Args:
+        session_id: Agno session id.
+        apply: Mutates the summary, e.g. ``lambda s: s.add_turn(...)``; may
+            run more than once.
+        user_id: Owner recorded when the session document is created.
+        summary: Summary already loaded for this turn (saves a round trip).
+
+    Returns:
+        The updated summary.
+
+    Example:
+        >>> summary = update_session_summary(
+        ...     session_id, lambda s: s.add_turn(message, reply, records), user_id
+        ... )
+    """
+    summary = summary or load_session_summary(session_id)
+    try:
+        _ensure_session_document(session_id, user_id)
+        for _ in range(SUMMARY_UPDATE_ATTEMPTS):
+            loaded_version = summary.version
+            apply(summary)
+            summary.version = loaded_version + 1
+            # Documents written before versioning have no version field
+            expected = loaded_version if loaded_version else {"$in": [0, None]}
+            result = _session_collection().update_one(
+                {"session_id": session_id, f"{SUMMARY_FIELD}.version": expected},
+                {"$set": {SUMMARY_FIELD: summary.to_dict()}},
+            )
+            if result.matched_count:
+                with _stats_lock:
+                    _stats["updates"] += 1
+                return summary
+            with _stats_lock:
+                _stats["update_conflicts"] += 1
+            summary = load_session_summary(session_id)
+        logger.warning(f"Gave up saving session summary for {session_id}: concurrent updates")
+    except Exception as e:
+        logger.warning(f"Failed to save session summary for {session_id}: {e}")
+    return summary
+
+
+def _ensure_session_document(session_id: str, user_id: Optional[str]) -> None:
+    # Agno only sets created_at when it inserts the document itself
+    on_insert: Dict[str, Any] = {"created_at": int(time.time())}
+    if user_id is not None:
+        on_insert["user_id"] = user_id
+    _session_collection().update_one(
+        {"session_id": session_id}, {"$setOnInsert": on_insert}, upsert=True
+    )
+
+
+def _tool_output_reference(content: Any) -> Optional[str]:
+    """Compact stand-in for a tool message's content, or None to keep it."""
+    if not isinstance(content, str) or content.startswith("[compacted]"):
+        return None
+    payload = _parse_tool_output(content)
+    handles: List[str] = []
+
+    def collect(value: Any) -> None:
+        if isinstance(value, list):
+            for item in value:
+                collect(item)
+        elif isinstance(value, dict):
+            username = value.get("username") or value.get("unique_id")
+            if username and "followers" in value:
+                handles.append(
+                    _format_profile(
+                        {
+                            "username": username,
+                            "followers": value.get("followers"),
+                            "engagement_rate": value.get("engagementRate"),
+                            "is_verified": value.get("is_verified"),
+                        }
+                    )
+                )
+            else:
+                for item in value.values():
+                    collect(item)
+
+    collect(payload)
+    if handles:
+        return "[compacted] Tool returned: " + ", ".join(handles)
+    if len(content) > _TOOL_TEXT_SNIPPET:
+        return "[compacted] " + _snippet(content, _TOOL_TEXT_SNIPPET)
+    return None
+
+
+def compact_run_tool_messages(agent: Any, session_id: str) -> int:
+    """
+    Replace the tool payloads of the agent's last run in ``session_id`` with
+    compact references, so later turns replay them cheaply.
+
+    Returns:
+        Number of tool messages rewritten; the caller persists the session
+        (``agent.write_to_storage``) when it is non-zero.
+    """
+    runs = getattr(getattr(agent, "memory", None), "runs", None)
+    if not isinstance(runs, dict) or not runs.get(session_id):
+        return 0
+
+    run_response = runs[session_id][-1]
+    rewritten = 0
+    tokens_removed = 0
+    for message in getattr(run_response, "messages", None) or []:
+        if message.role != "tool":
+            continue
+        reference = _tool_output_reference(message.content)
+        if reference is None:
+            continue
+        tokens_removed += count_tokens(message.content) - count_tokens(reference)
+        message.content = reference
+        rewritten += 1
+
+    if rewritten:
+        with _stats_lock:
+            _stats["tool_messages_compacted"] += rewritten
+            _stats["tokens_removed"] += tokens_removed
+    return rewritten
+
+
+def session_summary_stats() -> Dict[str, int]:
+    """Counters for summary updates and compacted history tool messages."""
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,203 @@
+"""
+Token-budgeted compaction of profile lists handed to the Fyuze agent.
+
+``to_agent_dict()`` keeps six posts with long captions per profile, so a
+ten-profile tool result can cost tens of thousands of prompt tokens on the
+120b model. Before a tool result reaches the agent it is filtered and sorted
+in code (minimum followers, highest followers first, as the system prompt
+asks) and then shrunk step by step until it fits ``AGENT_TOOL_TOKEN_BUDGET``:
+captions are shortened, posts are replaced by engagement averages, bios are
+trimmed, and only as a last resort the smallest profiles are dropped.
+"""
+
+import copy
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.shared.context import emit_event
+from src.shared.utils import count_tokens, get_logger, FyuzeLogger
+
+logger: FyuzeLogger = get_logger(__name__)
+
+AGENT_TOOL_TOKEN_BUDGET = int(os.getenv("AGENT_TOOL_TOKEN_BUDGET", "6000"))
+AGENT_MIN_FOLLOWERS = int(os.getenv("AGENT_MIN_FOLLOWERS", "1000"))
+
+# Progressive reductions, tried in order until the payload fits the budget
+_CAPTION_LIMITS = (240, 120, 60)
+_POST_LIMITS = (3, 1, 0)
+_BIO_LIMIT = 160
+
+_stats_lock = threading.Lock()
+_stats = {"calls": 0, "tokens_before": 0, "tokens_after": 0, "profiles_dropped": 0}
+
+
+@dataclass
+class CompactionReport:
+    """What one compaction did to a tool result."""
+
+    tool: str
+    tokens_before: int
+    tokens_after: int
+    profiles_in: int
+    profiles_out: int
+    budget: int
+    steps: List[str] = field(default_factory=list)
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "tokens_saved": self.tokens_saved}
+
+
+def _followers(profile: Dict[str, Any]) -> int:
+    try:
+        return int(profile.get("followers") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _truncate(text: Optional[str], limit: int) -> Optional[str]:
+    if not text or len(text) <= limit:
+        return text
+    return text[: max(0, limit - 1)].rstrip() + "…"
+
+
+def _average(posts: List[Dict[str, Any]], key: str) -> Optional[int]:
+    values = [p.get(key) for p in posts if isinstance(p.get(key), (int, float))]
+    return round(sum(values) / len(values)) if values else None
+
+
+def _summarize_posts(profile: Dict[str, Any]) -> None:
+    """Attach engagement averages so dropping posts keeps their signal."""
+    posts = profile.get("posts") or []
+    if not posts or "posts_summary" in profile:
+        return
+    profile["posts_summary"] = {
+        "sampled_posts": len(posts),
+        "avg_like_count": _average(posts, "like_count"),
+        "avg_comment_count": _average(posts, "comment_count"),
+        "avg_view_count": _average(posts, "video_view_count"),
+    }
+
+
+def profile_metrics(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Key metrics of one agent profile dict, used as a compact reference to it.
+
+    Example:
+        >>> profile_metrics({"username": "chef.dxb", "followers": 120000, ...})
+        {'followers': 120000, 'engagement_rate': 2.4, 'is_verified': False}
+    """
+    return {
+        "followers": _followers(profile),
+        "engagement_rate": profile.get("engagementRate"),
+        "is_verified": bool(profile.get("is_verified")),
+    }
+
+
+def compact_profiles(
+    profiles: List[Dict[str, Any]],
+    tool: str,
+    budget: Optional[int] = None,
+    min_followers: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], CompactionReport]:
+    """
+    Filter, sort and shrink agent profile dicts to fit a token budget.
+
+    Args:
+        profiles: ``to_agent_dict()`` payloads (not modified).
+        tool: Tool name, for reporting.
+        budget: Token budget; defaults to ``AGENT_TOOL_TOKEN_BUDGET``.
+        min_followers: Drop profiles below this follower count, unless that
+            would drop all of them. Defaults to ``AGENT_MIN_FOLLOWERS``; pass 0
+            when the user asked for specific handles.
+
+    Returns:
+        The compacted profiles (highest followers first) and a report.
+
+    Example:
+        >>> compacted, report = compact_profiles(dicts, "search_instagram_influencers")
+        >>> report.tokens_saved
+        18234
+    """
+    budget = AGENT_TOOL_TOKEN_BUDGET if budget is None else budget
+    min_followers = AGENT_MIN_FOLLOWERS if min_followers is None else min_followers
+    tokens_before = count_tokens(profiles)
+    report = CompactionReport(
+        tool=tool,
+        tokens_before=tokens_before,
+        tokens_after=tokens_before,
+        profiles_in=len(profiles),
+        profiles_out=len(profiles),
+        budget=budget,
+    )
+
+    result = copy.deepcopy([p for p in profiles if isinstance(p, dict)])
+    if min_followers > 0:
+        kept = [p for p in result if _followers(p) >= min_followers]
+        if kept and len(kept) < len(result):
+            report.steps.append(f"min_followers={min_followers}")
+            result = kept
+    result.sort(key=_followers, reverse=True)
+
+    def fits() -> bool:
+        return count_tokens(result) <= budget
+
+    for limit in _CAPTION_LIMITS:
+        if fits():
+            break
+        for profile in result:
+            for post in profile.get("posts") or []:
+                post["caption"] = _truncate(post.get("caption"), limit)
+        report.steps.append(f"captions<={limit}")
+
+    for limit in _POST_LIMITS:
+        if fits():
+            break
+        for profile in result:
+            _summarize_posts(profile)
+            profile["posts"] = (profile.get("posts") or [])[:limit]
+        report.steps.append(f"posts<={limit}")
+
+    if not fits():
+        for profile in result:
+            profile["bio"] = _truncate(profile.get("bio"), _BIO_LIMIT)
+            profile.pop("links", None)
+        report.steps.append(f"bio<={_BIO_LIMIT}")
+
+    dropped = 0
+    while len(result) > 1 and not fits():
+        result.pop()
+        dropped += 1
+    if dropped:
+        report.steps.append(f"dropped={dropped}")
+
+    report.tokens_after = count_tokens(result)
+    report.profiles_out = len(result)
+
+    with _stats_lock:
+        _stats["calls"] += 1
+        _stats["tokens_before"] += report.tokens_before
+        _stats["tokens_after"] += report.tokens_after
+        _stats["profiles_dropped"] += report.profiles_in - report.profiles_out
+
+    logger.info(
+        f"{tool}: tool output {report.tokens_before} -> {report.tokens_after} tokens "
+        f"({report.profiles_in} -> {report.profiles_out} profiles; "
+        f"{', '.join(report.steps) or 'unchanged'})"
+    )
+    emit_event("tool_output_compacted", report.to_dict())
+    return result, report
+
+
+def compaction_stats() -> Dict[str, int]:
+    """Cumulative token savings across all compacted tool outputs."""
+    with _stats_lock:
+        return {
+            **_stats,
+            "tokens_saved": _stats["tokens_before"] - _stats["tokens_after"],
+        }
@@ -0,0 +1,150 @@
+"""
+Per-run registry of the influencer handles returned by agent tools.
+
+The Fyuze agent used to send every reply through a second LLM call (the
+parser model) only to recover which usernames were shown and from which
+platform. The tool functions already know both, so they record them here and
+the final ``FyuzeModel`` is assembled deterministically from the registry.
+
+The registry is bound to a ``contextvars`` variable for the duration of one
+agent run; :func:`record_tool_result` is a no-op outside a run.
+"""
+
+import contextvars
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.shared.context import is_cancelled
+from src.shared.enums import Platform
+
+
+@dataclass
+class ToolCallRecord:
+    """Handles returned by one tool call, with their key metrics."""
+
+    tool: str
+    platform: Platform
+    usernames: List[str] = field(default_factory=list)
+    metrics: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class ToolResultRegistry:
+    """Collects :class:`ToolCallRecord` entries for one agent run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._records: List[ToolCallRecord] = []
+
+    def record(
+        self,
+        tool: str,
+        platform: Platform,
+        usernames: Iterable[str],
+        metrics: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Record the handles a tool returned (leading ``@`` is stripped).
+
+        Args:
+            metrics: Optional key metrics per username (e.g. followers), kept
+                for the session summary (see :mod:`src.shared.session_summary`).
+        """
+        cleaned = [u.strip().lstrip("@") for u in usernames if u and u.strip()]
+        with self._lock:
+            self._records.append(
+                ToolCallRecord(tool, platform, cleaned, dict(metrics or {}))
+            )
+
+    @property
+    def records(self) -> List[ToolCallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def resolve(self, text: Optional[str]) -> Tuple[List[str], Optional[Platform]]:
+        """
+        Pick the handles and platform to report for the reply ``text``.
+
+        Only handles the reply mentions are reported (in registry order): a
+        refusal, a clarifying question or a reply rejecting every candidate
+        recommends none of them. The platform is the single platform of the
+        selected handles, or ``COMBINED_PLATFORMS`` when they span several.
+
+        Returns:
+            ``(usernames, platform)``; ``([], None)`` when the reply mentions
+            none of the handles the tools produced.
+        """
+        handle_platforms: dict[str, Tuple[str, Platform]] = {}
+        for record in self.records:
+            for username in record.usernames:
+                handle_platforms.setdefault(username.lower(), (username, record.platform))
+
+        if not handle_platforms:
+            return [], None
+
+        selected = [
+            key
+            for key in handle_platforms
+            if text and _mentions(text, handle_platforms[key][0])
+        ]
+        if not selected:
+            return [], None
+
+        platforms = {handle_platforms[key][1] for key in selected}
+        platform = (
+            platforms.pop() if len(platforms) == 1 else Platform.COMBINED_PLATFORMS
+        )
+        return [handle_platforms[key][0] for key in selected], platform
+
+
+def _mentions(text: str, username: str) -> bool:
+    pattern = rf"(?<![\w.]){re.escape(username)}(?![\w])"
+    return re.search(pattern, text, re.IGNORECASE) is not None
+
+
+_registry: contextvars.ContextVar[Optional[ToolResultRegistry]] = contextvars.ContextVar(
+    "fyuze_tool_result_registry", default=None
+)
+
+
+@contextmanager
+def tool_result_registry() -> Iterator[ToolResultRegistry]:
+    """
+    Bind a fresh registry for the duration of one agent run.
+
+    Example:
+        >>> with tool_result_registry() as registry:
+        ...     agent.run(message)
+        >>> registry.resolve(agent.run_response.content)
+        (['user1', 'user2'], <Platform.INSTAGRAM: 'instagram'>)
+    """
+    registry = ToolResultRegistry()
+    token = _registry.set(registry)
+    try:
+        yield registry
+    finally:
+        _registry.reset(token)
+
+
+def current_tool_registry() -> Optional[ToolResultRegistry]:
+    """Registry of the agent run in progress, or None outside a run."""
+    return _registry.get()
+
+
+def record_tool_result(
+    tool: str,
+    platform: Platform,
+    usernames: Iterable[str],
+    metrics: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> None:
+    """
+    Record a tool's handles on the current run's registry, if any.
+
+    Calls abandoned after a timeout (see :func:`src.shared.context.is_cancelled`)
+    record nothing: the turn has already replied without them.
+    """
+    registry = _registry.get()
+    if registry is not None and not is_cancelled():
+        registry.record(tool, platform, usernames, metrics)
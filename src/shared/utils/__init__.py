@@ -2,7 +2,24 @@
 Utils for Fyuze Core
 """
 
-from src.shared.utils.cache import Cache
-from src.shared.utils.retry import async_retry, retry
-from src.shared.utils.rate_limiter import RateLimiter
+from src.shared.utils.cache import Cache, SWRCache
+from src.shared.utils.latency import LatencyTracker, provider_latency
+from src.shared.utils.retry import (
+    RetryBudget,
+    RetryPolicy,
+    async_retry,
+    retry,
+    retry_call,
+    retry_policy,
+    retry_stats,
+)
+from src.shared.utils.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    rate_limit_stats,
+    rate_limited,
+    rate_limiter,
+)
+from src.shared.utils.single_flight import SingleFlight
+from src.shared.utils.tokens import count_tokens, load_token_encoder
 from src.shared.utils.logging import get_logger, FyuzeLogger
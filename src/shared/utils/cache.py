@@ -1,5 +1,8 @@
+import threading
 import time
-from typing import Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
 
 
 class Cache:
@@ -70,3 +73,173 @@ class Cache:
         expired_keys = [k for k, (_, expiry) in self._cache.items() if now >= expiry]
         for key in expired_keys:
             del self._cache[key]
+
+
+class SWRCache:
+    """
+    Thread-safe LRU cache with TTL and stale-while-revalidate.
+
+    An entry is *fresh* for ``ttl`` seconds after it was computed and is then
+    served *stale* for up to ``stale_ttl`` more seconds while a single
+    background refresh recomputes it. Past that window the entry is expired
+    and the caller computes the value inline. At most ``max_entries`` entries
+    are kept; the least recently used one is evicted first.
+
+    Args:
+        ttl (float): Seconds an entry is fresh. Defaults to 900.
+        stale_ttl (float): Extra seconds a stale entry may be served while it
+            is refreshed. Defaults to 3600.
+        max_entries (int): LRU size bound. Defaults to 256.
+        refresh_workers (int): Threads used for background refreshes. Defaults to 2.
+
+    Example:
+        >>> cache = SWRCache(ttl=60, stale_ttl=300, max_entries=100)
+        >>> cache.get_or_compute("fitness|london", lambda: expensive_search())
+        >>> cache.stats()
+        {'hits': 0, 'stale_hits': 0, 'misses': 1, ...}
+    """
+
+    def __init__(
+        self,
+        ttl: float = 900,
+        stale_ttl: float = 3600,
+        max_entries: int = 256,
+        refresh_workers: int = 2,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix="swr-refresh"
+        )
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+        self._fallback_hits = 0
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached value for ``key``, computing it when missing or expired.
+
+        Args:
+            key: Cache key.
+            compute: Zero-argument callable producing the value.
+            cacheable: Optional predicate; values for which it returns False
+                are returned but not stored (e.g. empty results).
+
+        Returns:
+            The cached or freshly computed value.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, computed_at = entry
+                age = now - computed_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._executor.submit(self._refresh, key, compute, cacheable)
+                    return value
+                # Expired entries stay until replaced, for peek()
+            self._misses += 1
+
+        value = compute()
+        self._store(key, value, cacheable)
+        return value
+
+    def _refresh(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]],
+    ) -> None:
+        try:
+            value = compute()
+        except Exception:
+            with self._lock:
+                self._refresh_failures += 1
+            return
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+        with self._lock:
+            self._refreshes += 1
+        self._store(key, value, cacheable)
+
+    def _store(
+        self,
+        key: Hashable,
+        value: Any,
+        cacheable: Optional[Callable[[Any], bool]],
+    ) -> None:
+        if cacheable is not None and not cacheable(value):
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def peek(self, key: Hashable) -> Any:
+        """
+        The stored value for ``key`` whatever its age (expired included), or None.
+
+        Used as a last resort when recomputing is impossible, e.g. while a
+        provider's circuit breaker is open.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._fallback_hits += 1
+            return entry[0]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss counters for TTL tuning."""
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "stale_seconds": self.stale_ttl,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "hit_ratio": (
+                    (self._hits + self._stale_hits) / lookups if lookups else 0.0
+                ),
+                "evictions": self._evictions,
+                "refreshes": self._refreshes,
+                "refresh_failures": self._refresh_failures,
+                "fallback_hits": self._fallback_hits,
+            }
@@ -0,0 +1,179 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.shared.context import ContextThreadPoolExecutor
+from src.shared.utils.latency import LatencyTracker, provider_latency
+from src.shared.utils.logging import get_logger, FyuzeLogger
+
+DEFAULT_HEDGE_PERCENTILE = 90.0
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+DEFAULT_HEDGE_DELAY_SECONDS = 4.0
+DEFAULT_HEDGE_WORKERS = 16
+
+
+class HedgedCall:
+    """
+    Hedge a slow primary call with a secondary one.
+
+    The primary runs first; if it has not finished the primary's
+    ``percentile`` latency (``default_delay`` until ``min_samples`` calls were
+    seen) after it started running, or if it fails, the secondary is started
+    and the first successful result wins. Time the primary spends queued for
+    a worker does not count towards the threshold. Federated calls run both at once and return both results.
+    The losing call keeps running in the background.
+
+    Args:
+        primary (str): Label of the primary call.
+        secondary (str): Label of the secondary call.
+        latency (LatencyTracker): Network latencies of the primary.
+        percentile (float, optional): Hedge threshold. Defaults to
+            ``HEDGE_PERCENTILE`` or 90.
+        min_samples (int, optional): Samples needed before the percentile is
+            trusted. Defaults to ``HEDGE_MIN_SAMPLES`` or 20.
+        default_delay (float, optional): Threshold until then, in seconds.
+            Defaults to ``HEDGE_DEFAULT_DELAY_SECONDS`` or 4.
+        workers (int, optional): Threads shared by all hedged calls. Defaults
+            to ``HEDGE_WORKERS`` or 16.
+
+    Example:
+        >>> hedge = HedgedCall("exa", "google_cse", provider_latency("exa"))
+        >>> hedge.run(lambda: exa_profiles(q), lambda: cse_profiles(q))
+        [('exa', [...])]
+    """
+
+    def __init__(
+        self,
+        primary: str,
+        secondary: str,
+        latency: LatencyTracker,
+        percentile: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        default_delay: Optional[float] = None,
+        workers: Optional[int] = None,
+    ):
+        self._logger: FyuzeLogger = get_logger(__name__)
+        self._labels = (primary, secondary)
+        self._latency = latency
+        self._percentile = percentile or float(
+            os.getenv("HEDGE_PERCENTILE", DEFAULT_HEDGE_PERCENTILE)
+        )
+        self._min_samples = min_samples or int(
+            os.getenv("HEDGE_MIN_SAMPLES", DEFAULT_HEDGE_MIN_SAMPLES)
+        )
+        self._default_delay = default_delay or float(
+            os.getenv("HEDGE_DEFAULT_DELAY_SECONDS", DEFAULT_HEDGE_DELAY_SECONDS)
+        )
+        self._executor = ContextThreadPoolExecutor(
+            max_workers=workers or int(os.getenv("HEDGE_WORKERS", DEFAULT_HEDGE_WORKERS)),
+            thread_name_prefix=f"hedge-{primary}",
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "hedged": 0,
+            "primary_wins": 0,
+            "secondary_wins": 0,
+            "federated": 0,
+            "failed": 0,
+        }
+
+    def hedge_delay(self) -> float:
+        """Seconds the primary may take before the secondary is started."""
+        if len(self._latency) < self._min_samples:
+            return self._default_delay
+        return self._latency.percentile(self._percentile) or self._default_delay
+
+    def run(
+        self,
+        primary: Callable[[], Any],
+        secondary: Optional[Callable[[], Any]],
+        federated: bool = False,
+    ) -> List[Tuple[str, Any]]:
+        """
+        Run the call, hedged or federated.
+
+        Args:
+            primary: Zero-argument primary call.
+            secondary: Zero-argument secondary call, or None to run the
+                primary alone.
+            federated: Run both calls at once and return both results.
+
+        Returns:
+            ``(label, result)`` of the winning call (both calls when federated
+            and both succeed).
+
+        Raises:
+            Exception: The primary's error when every call failed.
+        """
+        self._count("calls")
+        if secondary is None:
+            return [(self._labels[0], primary())]
+
+        if federated:
+            self._count("federated")
+            futures: Dict[Future, str] = {
+                self._executor.submit(primary): self._labels[0],
+                self._executor.submit(secondary): self._labels[1],
+            }
+            return self._collect(futures, first_only=False)
+
+        started = threading.Event()
+
+        def run_primary() -> Any:
+            started.set()
+            return primary()
+
+        futures = {self._executor.submit(run_primary): self._labels[0]}
+        # The threshold is the primary's own latency, so queueing is not counted
+        started.wait()
+        done, _ = wait(futures, timeout=self.hedge_delay())
+        if done and next(iter(done)).exception() is None:
+            self._count("primary_wins")
+            return [(self._labels[0], next(iter(done)).result())]
+
+        self._count("hedged")
+        futures[self._executor.submit(secondary)] = self._labels[1]
+        return self._collect(futures, first_only=True)
+
+    def _collect(self, futures: Dict[Future, str], first_only: bool) -> List[Tuple[str, Any]]:
+        results: List[Tuple[str, Any]] = []
+        errors: Dict[str, BaseException] = {}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                label = futures[future]
+                if future.exception() is not None:
+                    errors[label] = future.exception()
+                    self._logger.warning(f"Hedged call {label} failed: {future.exception()}")
+                    continue
+                results.append((label, future.result()))
+                if first_only:
+                    self._count(
+                        "primary_wins" if label == self._labels[0] else "secondary_wins"
+                    )
+                    return results
+        if not results:
+            self._count("failed")
+            raise errors.get(self._labels[0]) or next(iter(errors.values()))
+        return results
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counts, hedge outcomes and the current hedge threshold."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["hedge_delay_ms"] = round(self.hedge_delay() * 1000, 1)
+        return stats
+
+
+# Google CSE as a second source of profile URLs, opt-in as it spends CSE quota:
+# "off" (the default) keeps discovery on Exa alone, "hedge" queries CSE only
+# when Exa is slower than its p90 (or fails), "federated" always queries both
+DISCOVERY_HEDGE_MODE = os.getenv("DISCOVERY_HEDGE_MODE", "off").lower()
+DISCOVERY_HEDGE = HedgedCall("exa", "google_cse", provider_latency("exa"))
@@ -0,0 +1,80 @@
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+
+class LatencyTracker:
+    """
+    Rolling window of call latencies with percentile lookups.
+
+    Args:
+        window (int): Most recent samples kept. Defaults to 200.
+
+    Example:
+        >>> tracker = LatencyTracker()
+        >>> for seconds in (0.8, 1.1, 0.9, 6.5):
+        ...     tracker.record(seconds)
+        >>> tracker.percentile(50)
+        0.9
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._count = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None without samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, min(len(samples), math.ceil(pct / 100 * len(samples))))
+        return samples[rank - 1]
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Sample count and p50/p90/p99 in milliseconds."""
+
+        def ms(pct: float) -> Optional[float]:
+            value = self.percentile(pct)
+            return round(value * 1000, 1) if value is not None else None
+
+        with self._lock:
+            count = self._count
+        return {"calls": count, "p50_ms": ms(50), "p90_ms": ms(90), "p99_ms": ms(99)}
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def provider_latency(provider: str) -> LatencyTracker:
+    """
+    Process-wide latency tracker of a provider's network calls.
+
+    Example:
+        >>> provider_latency("exa").record(1.4)
+        >>> provider_latency("exa").percentile(90)
+    """
+    with _trackers_lock:
+        tracker = _trackers.get(provider)
+        if tracker is None:
+            tracker = _trackers[provider] = LatencyTracker()
+        return tracker
+
+
+def provider_latency_stats() -> Dict[str, Dict[str, Optional[float]]]:
+    """Latency percentiles of every tracked provider."""
+    with _trackers_lock:
+        trackers = dict(_trackers)
+    return {name: tracker.stats() for name, tracker in trackers.items()}
@@ -1,9 +1,163 @@
+"""
+Thread-safe rate limiters for provider calls.
+
+:class:`TokenBucket` allows ``rate`` calls per second with bursts of
+``burst``; :class:`RateLimiter` allows ``max_calls`` per sliding
+``time_window``. Both reserve a permit under a short lock (a few arithmetic
+operations, O(1) per call) and wait outside of it, so waiting callers are
+served in arrival order without polling. ``acquire()`` blocks the thread,
+``await acquire_async()`` yields the event loop instead.
+
+:func:`rate_limiter` returns the limiter of a provider, built from
+``RATE_LIMIT_RPS_<PROVIDER>``, ``RATE_LIMIT_BURST_<PROVIDER>``,
+``RATE_LIMIT_WINDOW_CALLS_<PROVIDER>`` and
+``RATE_LIMIT_WINDOW_SECONDS_<PROVIDER>`` (0 disables a limit).
+"""
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from functools import wraps
+import os
+import threading
 import time
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# provider -> (calls per second, burst, calls per window, window seconds)
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int, int, float]] = {
+    "ensemble": (10.0, 20, 0, 0.0),
+    "exa": (5.0, 10, 0, 0.0),
+    "rapid": (5.0, 10, 0, 0.0),
+    # Custom Search JSON API: 100 queries per minute per user
+    "google_cse": (10.0, 10, 100, 60.0),
+    "groq": (0.0, 0, 1000, 60.0),
+}
+
+
+class _Limiter(ABC):
+    """Reservation-based limiter; subclasses define when the next permit frees up."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "waited": 0, "rejected": 0}
+        self._wait_seconds = 0.0
+        self._max_wait = 0.0
+
+    @abstractmethod
+    def _delay(self, now: float) -> float:
+        """Seconds from ``now`` until a permit is free (0.0 if one is free now)."""
+
+    @abstractmethod
+    def _take(self, at: float) -> None:
+        """Record a permit used at ``at`` (may lie in the future)."""
+
+    def _reserve(self, timeout: Optional[float]) -> Optional[float]:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._delay(now)
+            if timeout is not None and wait > timeout:
+                self._stats["rejected"] += 1
+                return None
+            self._take(now + wait)
+            self._stats["acquired"] += 1
+            if wait > 0:
+                self._stats["waited"] += 1
+                self._wait_seconds += wait
+                self._max_wait = max(self._max_wait, wait)
+            return wait
+
+    def can_proceed(self) -> bool:
+        """
+        Take a permit if one is free right now.
 
+        Returns:
+            bool: True if allowed, False if rate limit exceeded.
+        """
+        return self._reserve(timeout=0) is not None
 
-class RateLimiter:
+    def wait_time(self) -> float:
+        """
+        Get time to wait before the next allowed call.
+
+        Returns:
+            float: Seconds to wait (0.0 if allowed immediately).
+        """
+        with self._lock:
+            return self._delay(time.monotonic())
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a permit is free.
+
+        Args:
+            timeout: Longest wait in seconds; None waits as long as needed.
+
+        Returns:
+            bool: False, without waiting, when the wait would exceed ``timeout``.
+        """
+        wait = self._reserve(timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """Like :meth:`acquire`, waiting with ``asyncio.sleep``."""
+        wait = self._reserve(timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["wait_seconds"] = round(self._wait_seconds, 3)
+            stats["max_wait_ms"] = round(self._max_wait * 1000, 1)
+        return stats
+
+
+class TokenBucket(_Limiter):
     """
-    Simple rate limiter to restrict the number of operations within a time window.
+    Token-bucket rate limiter: ``rate`` calls per second, bursts of ``burst``.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (int): Bucket size; calls allowed at once after a quiet period.
+
+    Example:
+        >>> bucket = TokenBucket(rate=5, burst=10)
+        >>> bucket.acquire()  # returns at once while tokens are left
+        True
+    """
+
+    def __init__(self, rate: float, burst: int):
+        super().__init__()
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _delay(self, now: float) -> float:
+        self._refill(now)
+        # Tokens go negative while permits are reserved ahead of time
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def _take(self, at: float) -> None:
+        self._tokens -= 1
+
+
+class RateLimiter(_Limiter):
+    """
+    Sliding-window rate limiter: at most ``max_calls`` within any ``time_window``.
 
     Args:
         max_calls (int): Maximum allowed calls within the time window.
@@ -22,56 +176,111 @@ class RateLimiter:
     """
 
     def __init__(self, max_calls: int, time_window: float):
-        self.max_calls = max_calls
+        super().__init__()
+        self.max_calls = max(1, max_calls)
         self.time_window = time_window
-        self.calls = []
+        # Start times of the last max_calls calls (reserved ones may lie ahead)
+        self.calls: Deque[float] = deque(maxlen=self.max_calls)
 
-    def can_proceed(self) -> bool:
-        """
-        Check if operation can proceed within the rate limit.
+    def _delay(self, now: float) -> float:
+        if len(self.calls) < self.max_calls:
+            return 0.0
+        return max(0.0, self.calls[0] + self.time_window - now, self.calls[-1] - now)
 
-        Returns:
-            bool: True if allowed, False if rate limit exceeded.
+    def _take(self, at: float) -> None:
+        self.calls.append(at)
 
-        Example:
-            >>> limiter = RateLimiter(1, 2)
-            >>> limiter.can_proceed()
-            True
-            >>> limiter.can_proceed()
-            False
-        """
-        now = time.time()
-        # Remove old calls outside time window
-        self.calls = [
-            call_time for call_time in self.calls if now - call_time < self.time_window
-        ]
 
-        if len(self.calls) < self.max_calls:
-            self.calls.append(now)
-            return True
+class ProviderRateLimiter(_Limiter):
+    """
+    A provider's token bucket and sliding window, reserved together.
 
-        return False
+    Args:
+        provider (str): Provider name, for stats.
+        limits (list): The token bucket and/or sliding window to honour.
+    """
 
-    def wait_time(self) -> float:
-        """
-        Get time to wait before the next allowed call.
+    def __init__(self, provider: str, limits: List[_Limiter]):
+        super().__init__()
+        self.provider = provider
+        self._limits = limits
 
-        Returns:
-            float: Seconds to wait (0.0 if allowed immediately).
+    def _delay(self, now: float) -> float:
+        return max((limit._delay(now) for limit in self._limits), default=0.0)
+
+    def _take(self, at: float) -> None:
+        for limit in self._limits:
+            limit._take(at)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        for limit in self._limits:
+            if isinstance(limit, TokenBucket):
+                stats.update(rate=limit.rate, burst=limit.burst)
+            elif isinstance(limit, RateLimiter):
+                stats.update(window_calls=limit.max_calls, window_seconds=limit.time_window)
+        return stats
+
+
+_limiters: Dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def rate_limiter(provider: str) -> ProviderRateLimiter:
+    """
+    The rate limiter of a provider, created from the environment on first use.
+
+    Example:
+        >>> rate_limiter("exa").acquire()
+        True
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            suffix = provider.upper()
+            rate, burst, window_calls, window_seconds = DEFAULT_RATE_LIMITS.get(
+                provider, (0.0, 0, 0, 0.0)
+            )
+            rate = float(os.getenv(f"RATE_LIMIT_RPS_{suffix}", rate))
+            burst = int(os.getenv(f"RATE_LIMIT_BURST_{suffix}", burst or max(1, round(rate))))
+            window_calls = int(os.getenv(f"RATE_LIMIT_WINDOW_CALLS_{suffix}", window_calls))
+            window_seconds = float(
+                os.getenv(f"RATE_LIMIT_WINDOW_SECONDS_{suffix}", window_seconds)
+            )
+            limits: List[_Limiter] = []
+            if rate > 0:
+                limits.append(TokenBucket(rate, burst))
+            if window_calls > 0 and window_seconds > 0:
+                limits.append(RateLimiter(window_calls, window_seconds))
+            limiter = _limiters[provider] = ProviderRateLimiter(provider, limits)
+        return limiter
+
+
+def rate_limited(provider: str):
+    """
+    Decorator taking a permit of the provider's limiter before every call.
+
+    Place it below ``@retry`` so each attempt takes its own permit.
+
+    Example:
+        >>> @retry(provider="exa")
+        ... @rate_limited("exa")
+        ... def _search(self, query): ...
+    """
+
+    def decorator(func: Callable):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            rate_limiter(provider).acquire()
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
-        Example:
-            >>> limiter = RateLimiter(1, 1)
-            >>> limiter.can_proceed()
-            True
-            >>> limiter.wait_time()
-            0.0
-            >>> limiter.can_proceed()
-            False
-            >>> limiter.wait_time() >= 0
-            True
-        """
-        if not self.calls:
-            return 0.0
 
-        oldest_call = min(self.calls)
-        return max(0.0, self.time_window - (time.time() - oldest_call))
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-provider permits, waits and configured limits."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.stats() for provider, limiter in limiters.items()}
@@ -1,100 +1,429 @@
+"""
+Retry policies for provider calls.
+
+A :class:`RetryPolicy` decides which errors are retried (``retryable``), how
+many attempts a call gets and how long to wait between them: full jitter (a
+random wait between 0 and the exponential backoff delay) so callers failing
+together do not retry together, or the ``Retry-After`` of a 429/503 response
+when the provider sends one. Waits above ``max_delay`` are not waited out: the
+error is raised at once.
+
+Each provider has one policy (:func:`retry_policy`), configured from
+``RETRY_MAX_ATTEMPTS_<PROVIDER>``, ``RETRY_DELAY_<PROVIDER>`` and
+``RETRY_MAX_DELAY_<PROVIDER>``, and one :class:`RetryBudget`. The budget is a
+token bucket: every call deposits ``RETRY_BUDGET_RATIO`` of a token, every
+retry spends one. While a provider fails most calls the budget runs dry and
+errors are raised instead of retried, so retries add at most
+``RETRY_BUDGET_RATIO`` extra load instead of multiplying it.
+"""
+
 from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 from functools import wraps
+import os
+import random
+import re
+import threading
 import time
 import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+
+from src.shared.utils.logging import get_logger, FyuzeLogger
 
+_logger: FyuzeLogger = get_logger(__name__)
+
+DEFAULT_RETRY_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 1.0
+DEFAULT_RETRY_BACKOFF = 2.0
+DEFAULT_RETRY_MAX_DELAY = 30.0
+DEFAULT_RETRY_BUDGET_RATIO = 0.1
+DEFAULT_RETRY_BUDGET_MAX_TOKENS = 10.0
+
+# Statuses worth another attempt; other 4xx answers will not change
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# exa_py reports HTTP errors as ValueError("Request failed with status code N: ...")
+_STATUS_IN_MESSAGE = re.compile(r"status code (\d{3})")
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """
+    HTTP status of a provider error, if it carries one.
 
-def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
+    Reads ``requests``/``httpx`` errors (``error.response.status_code``),
+    ``googleapiclient`` errors (``error.resp.status``), errors with a
+    ``status_code`` attribute (Ensemble Data, Apify) and exa_py's messages.
     """
-    Retry decorator with exponential backoff for synchronous functions.
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status
+    resp = getattr(error, "resp", None)
+    status = getattr(resp, "status", None)
+    if status is not None:
+        try:
+            return int(status)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(error, ValueError):
+        match = _STATUS_IN_MESSAGE.search(str(error))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Seconds the provider asked to wait (``Retry-After`` header), if any.
+
+    Accepts both header forms: delay seconds and an HTTP date.
+    """
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers is None:
+            # httplib2 responses are dicts of lowercased headers
+            headers = getattr(error, "resp", None)
+        if headers is None:
+            return None
+        try:
+            value = headers.get("Retry-After") or headers.get("retry-after")
+        except AttributeError:
+            return None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Default retry predicate: rate limits, 5xx answers and transport errors.
+
+    Other HTTP errors (bad requests, auth, not found) and errors without a
+    status (configuration, parsing, programming errors) are not retried.
+    """
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUSES or status >= 500
+    # requests' ConnectionError/Timeout derive from OSError
+    return isinstance(error, (httpx.TransportError, TimeoutError, OSError))
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of calls.
+
+    Every call deposits ``ratio`` tokens (up to ``max_tokens``), every retry
+    spends one; a retry is refused while less than one token is left.
 
     Args:
-        max_attempts (int): Maximum number of retry attempts. Defaults to 3.
-        delay (float): Initial delay between retries in seconds. Defaults to 1.0.
-        backoff (float): Backoff multiplier for delay. Defaults to 2.0.
+        ratio (float): Tokens deposited per call, i.e. the share of calls that
+            may be retried in steady state.
+        max_tokens (float): Bucket size; the burst of retries allowed after a
+            quiet period.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "retry_after": 0, "denied": 0, "exhausted": 0}
+
+    def on_call(self) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        """Take one token for a retry; False when the budget is spent."""
+        with self._lock:
+            if self._tokens < 1:
+                self._stats["denied"] += 1
+                return False
+            self._tokens -= 1
+            self._stats["retries"] += 1
+            return True
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["tokens"] = round(self._tokens, 2)
+        return stats
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How one provider's calls are retried.
+
+    Attributes:
+        max_attempts (int): Attempts per call, the first one included.
+        delay (float): Backoff delay after the first attempt, in seconds.
+        backoff (float): Backoff multiplier per attempt.
+        max_delay (float): Upper bound of the backoff delay; a longer
+            ``Retry-After`` is not waited out.
+        retryable (Callable): Whether an error is worth another attempt.
+        budget (RetryBudget, optional): Shared budget the retries draw from;
+            None retries without limit.
+    """
+
+    max_attempts: int = DEFAULT_RETRY_MAX_ATTEMPTS
+    delay: float = DEFAULT_RETRY_DELAY
+    backoff: float = DEFAULT_RETRY_BACKOFF
+    max_delay: float = DEFAULT_RETRY_MAX_DELAY
+    retryable: Callable[[BaseException], bool] = is_retryable_error
+    budget: Optional[RetryBudget] = field(default=None, compare=False)
+
+    def next_delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """
+        Wait before attempt ``attempt + 1``, or None when the error is final.
+
+        Args:
+            attempt: Attempts made so far (1 after the first failure).
+            error: Error of the last attempt.
+        """
+        if attempt >= self.max_attempts or not self.retryable(error):
+            return None
+        requested = retry_after(error)
+        if requested is not None and requested > self.max_delay:
+            return None
+        if self.budget is not None:
+            if not self.budget.try_spend():
+                return None
+            if requested is not None:
+                self.budget.count("retry_after")
+        if requested is not None:
+            return requested
+        ceiling = min(self.max_delay, self.delay * self.backoff ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def on_call(self) -> None:
+        if self.budget is not None:
+            self.budget.on_call()
+
+    def on_exhausted(self) -> None:
+        if self.budget is not None:
+            self.budget.count("exhausted")
+
+
+_policies: Dict[str, RetryPolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def retry_policy(provider: str = "default") -> RetryPolicy:
+    """
+    The retry policy of a provider, created from the environment on first use.
+
+    Args:
+        provider: Provider name (``"ensemble"``, ``"rapid"``, ...); calls not
+            tied to a provider share ``"default"``.
+
+    Example:
+        >>> retry_policy("rapid").max_attempts
+        3
+    """
+    with _policies_lock:
+        policy = _policies.get(provider)
+        if policy is None:
+            suffix = provider.upper()
+            policy = _policies[provider] = RetryPolicy(
+                max_attempts=max(
+                    1,
+                    int(os.getenv(f"RETRY_MAX_ATTEMPTS_{suffix}", DEFAULT_RETRY_MAX_ATTEMPTS)),
+                ),
+                delay=float(os.getenv(f"RETRY_DELAY_{suffix}", DEFAULT_RETRY_DELAY)),
+                max_delay=float(os.getenv(f"RETRY_MAX_DELAY_{suffix}", DEFAULT_RETRY_MAX_DELAY)),
+                budget=RetryBudget(
+                    ratio=float(os.getenv("RETRY_BUDGET_RATIO", DEFAULT_RETRY_BUDGET_RATIO)),
+                    max_tokens=float(
+                        os.getenv("RETRY_BUDGET_MAX_TOKENS", DEFAULT_RETRY_BUDGET_MAX_TOKENS)
+                    ),
+                ),
+            )
+        return policy
+
+
+def retry_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-provider retry counts and remaining budget tokens."""
+    with _policies_lock:
+        policies = dict(_policies)
+    return {
+        provider: {
+            "max_attempts": policy.max_attempts,
+            **(policy.budget.stats() if policy.budget else {}),
+        }
+        for provider, policy in policies.items()
+    }
+
+
+def _resolve(
+    provider: Optional[str],
+    policy: Optional[RetryPolicy],
+    max_attempts: Optional[int],
+    delay: Optional[float],
+    backoff: Optional[float],
+) -> RetryPolicy:
+    resolved = policy or retry_policy(provider or "default")
+    overrides = {
+        name: value
+        for name, value in (
+            ("max_attempts", max_attempts),
+            ("delay", delay),
+            ("backoff", backoff),
+        )
+        if value is not None
+    }
+    return replace(resolved, **overrides) if overrides else resolved
+
+
+def _log_retry(name: str, attempt: int, wait: float, error: BaseException) -> None:
+    _logger.warning(
+        f"Retrying {name} in {wait:.2f}s after attempt {attempt}: {error}"
+    )
+
+
+def retry(
+    max_attempts: Optional[int] = None,
+    delay: Optional[float] = None,
+    backoff: Optional[float] = None,
+    provider: Optional[str] = None,
+    policy: Optional[RetryPolicy] = None,
+):
+    """
+    Retry decorator for synchronous functions, driven by a retry policy.
+
+    Args:
+        max_attempts (int, optional): Overrides the policy's attempts.
+        delay (float, optional): Overrides the policy's initial delay in seconds.
+        backoff (float, optional): Overrides the policy's backoff multiplier.
+        provider (str, optional): Provider whose policy and budget apply
+            (see :func:`retry_policy`). Defaults to ``"default"``.
+        policy (RetryPolicy, optional): Explicit policy instead of the
+            provider's.
 
     Example:
         >>> from retry import retry
-        >>> @retry(max_attempts=3, delay=1, backoff=2)
-        ... def flaky():
-        ...     print('Trying...')
-        ...     raise ValueError('Fail!')
-        >>> try:
-        ...     flaky()
-        ... except ValueError:
-        ...     print('Failed after retries')
+        >>> @retry(provider="rapid")
+        ... def fetch_snapshot(url):
+        ...     response = requests.get(url, timeout=30)
+        ...     response.raise_for_status()
+        ...     return response.json()
 
-    This will print 'Trying...' three times, then 'Failed after retries'.
+    A 429 with ``Retry-After: 2`` is retried after 2 seconds; a 404 is raised
+    at once.
     """
 
     def decorator(func: Callable):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            current_delay = delay
-            last_exception = None
-
-            for attempt in range(max_attempts):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    if attempt < max_attempts - 1:
-                        time.sleep(current_delay)
-                        current_delay *= backoff
-                    else:
-                        raise last_exception
-
-            raise last_exception
+            resolved = _resolve(provider, policy, max_attempts, delay, backoff)
+            return retry_call(lambda: func(*args, **kwargs), resolved, name=func.__qualname__)
 
         return wrapper
 
     return decorator
 
 
-def async_retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
+def retry_call(
+    fn: Callable[[], Any],
+    policy: Optional[RetryPolicy] = None,
+    on_retry: Optional[Callable[[int, Exception], None]] = None,
+    name: Optional[str] = None,
+) -> Any:
     """
-    Async retry decorator with exponential backoff for async functions.
+    Call ``fn`` until it succeeds or ``policy`` gives up on its error.
 
     Args:
-        max_attempts (int): Maximum number of retry attempts. Defaults to 3.
-        delay (float): Initial delay between retries in seconds. Defaults to 1.0.
-        backoff (float): Backoff multiplier for delay. Defaults to 2.0.
+        fn (Callable): Zero-argument call.
+        policy (RetryPolicy, optional): Defaults to the ``"default"`` policy.
+        on_retry (Callable, optional): Called with ``(attempt, error)`` before
+            each wait; retries are logged when omitted.
+        name (str, optional): Name of the call in retry logs.
+
+    Example:
+        >>> profile = retry_call(
+        ...     lambda: client.user_detailed_info(username="nike"),
+        ...     replace(retry_policy("ensemble"), retryable=is_transient),
+        ... )
+    """
+    policy = policy or retry_policy()
+    policy.on_call()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return fn()
+        except Exception as e:
+            wait = policy.next_delay(attempt, e)
+            if wait is None:
+                if attempt > 1:
+                    policy.on_exhausted()
+                raise
+            if on_retry is not None:
+                on_retry(attempt, e)
+            else:
+                _log_retry(name or getattr(fn, "__qualname__", "call"), attempt, wait, e)
+            time.sleep(wait)
+
+
+def async_retry(
+    max_attempts: Optional[int] = None,
+    delay: Optional[float] = None,
+    backoff: Optional[float] = None,
+    provider: Optional[str] = None,
+    policy: Optional[RetryPolicy] = None,
+):
+    """
+    Async retry decorator, driven by a retry policy (see :func:`retry`).
 
     Example:
         >>> import asyncio
         >>> from retry import async_retry
-        >>> @async_retry(max_attempts=2, delay=0.5, backoff=2)
-        ... async def async_flaky():
-        ...     print('Async trying...')
-        ...     raise RuntimeError('Async fail!')
-        >>> async def main():
-        ...     try:
-        ...         await async_flaky()
-        ...     except RuntimeError:
-        ...         print('Async failed after retries')
-        >>> asyncio.run(main())
-
-    This will print 'Async trying...' two times, then 'Async failed after retries'.
+        >>> @async_retry(provider="ensemble")
+        ... async def fetch_profile(username):
+        ...     return await client.instagram.user_detailed_info(username=username)
+        >>> asyncio.run(fetch_profile("nike"))
     """
 
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            current_delay = delay
-            last_exception = None
-
-            for attempt in range(max_attempts):
+            resolved = _resolve(provider, policy, max_attempts, delay, backoff)
+            resolved.on_call()
+            attempt = 0
+            while True:
+                attempt += 1
                 try:
                     return await func(*args, **kwargs)
                 except Exception as e:
-                    last_exception = e
-                    if attempt < max_attempts - 1:
-                        await asyncio.sleep(current_delay)
-                        current_delay *= backoff
-                    else:
-                        raise last_exception
-
-            raise last_exception
+                    wait = resolved.next_delay(attempt, e)
+                    if wait is None:
+                        if attempt > 1:
+                            resolved.on_exhausted()
+                        raise
+                    _log_retry(func.__qualname__, attempt, wait, e)
+                    await asyncio.sleep(wait)
 
         return wrapper
 
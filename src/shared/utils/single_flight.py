@@ -0,0 +1,137 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, Set, Tuple
+
+from src.shared.context import (
+    report_unavailable_providers,
+    share_unavailable_providers,
+)
+
+
+class Flight(Future):
+    """A call in flight, with the providers found unavailable while it ran."""
+
+    def __init__(self):
+        super().__init__()
+        self.unavailable_providers: Set[str] = set()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller for a key (the *leader*) does the work; callers that
+    arrive while it is in flight wait on the same future and receive the same
+    result or exception. Once the leader finishes the key is released, so
+    later calls run again (pair it with a cache to reuse finished results).
+
+    Providers found unavailable by the leader are reported to each waiting
+    caller's request as well, so their responses are flagged as degraded too.
+
+    Example:
+        >>> flights = SingleFlight()
+        >>> flights.do(("instagram", "fitness"), lambda: expensive_search())
+
+        Batch callers can claim several keys at once, do the work for the keys
+        they own and wait for the rest:
+
+        >>> owned, pending = flights.claim(["alice", "bob"])
+        >>> with flights.leading(owned):
+        ...     for key in owned:
+        ...         flights.resolve(key, crawl(key))
+        >>> others = {key: flights.wait(future) for key, future in pending.items()}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Flight] = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` unless a call for ``key`` is already in flight,
+        in which case wait for and return that call's result.
+        """
+        owned, pending = self.claim([key])
+        if pending:
+            return self.wait(pending[key])
+
+        try:
+            with self.leading(owned):
+                result = fn(*args, **kwargs)
+        except BaseException as exc:
+            self.fail(key, exc)
+            raise
+        self.resolve(key, result)
+        return result
+
+    @staticmethod
+    def leading(owned: Dict[Hashable, Flight]):
+        """Context manager for the leader's work on ``owned`` flights; collects
+        the providers found unavailable for the callers waiting on them."""
+        return share_unavailable_providers(
+            *(flight.unavailable_providers for flight in owned.values())
+        )
+
+    @staticmethod
+    def wait(flight: Flight) -> Any:
+        """Wait for another caller's flight and return its result (or raise its
+        exception), reporting the providers it found unavailable."""
+        try:
+            return flight.result()
+        finally:
+            report_unavailable_providers(flight.unavailable_providers)
+
+    def claim(
+        self, keys: Iterable[Hashable]
+    ) -> Tuple[Dict[Hashable, Flight], Dict[Hashable, Flight]]:
+        """
+        Claim leadership for each key that is not already in flight.
+
+        Returns:
+            ``(owned, pending)``: futures this caller must settle with
+            :meth:`resolve` / :meth:`fail`, and futures owned by other callers
+            to wait on.
+        """
+        owned: Dict[Hashable, Flight] = {}
+        pending: Dict[Hashable, Flight] = {}
+        with self._lock:
+            for key in keys:
+                if key in owned or key in pending:
+                    continue
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Flight()
+                    self._inflight[key] = future
+                    owned[key] = future
+                    self._executions += 1
+                else:
+                    pending[key] = future
+                    self._coalesced += 1
+        return owned, pending
+
+    def resolve(self, key: Hashable, value: Any) -> None:
+        """Publish the result for an owned key and release it."""
+        future = self._release(key)
+        if future is not None and not future.done():
+            future.set_result(value)
+
+    def fail(self, key: Hashable, exc: BaseException) -> None:
+        """Publish an exception for an owned key and release it."""
+        future = self._release(key)
+        if future is not None and not future.done():
+            future.set_exception(exc)
+
+    def _release(self, key: Hashable):
+        with self._lock:
+            return self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of executed versus coalesced calls."""
+        with self._lock:
+            return {
+                "in_flight": len(self._inflight),
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+            }
@@ -10,6 +10,7 @@ mongo_client = MongoClient(
 )
 database = mongo_client["agno"]
 collection = database["temp"]
+jobs_collection = database["jobs"]
 
 storage = MongoDbStorage(collection_name="Fyuze_Project", client=mongo_client)
 
@@ -0,0 +1,69 @@
+import json
+import threading
+from typing import Any, Optional
+
+from src.shared.utils.logging import get_logger, FyuzeLogger
+
+# Encoding used by the gpt-oss models served on Groq
+_ENCODING_NAME = "o200k_base"
+
+_logger: FyuzeLogger = get_logger(__name__)
+
+_encoder_lock = threading.Lock()
+_encoder: Any = None
+_encoder_loaded = False
+
+
+def _get_encoder() -> Optional[Any]:
+    """Load the tiktoken encoder once; None when tiktoken is unavailable."""
+    global _encoder, _encoder_loaded
+    if _encoder_loaded:
+        return _encoder
+    with _encoder_lock:
+        if not _encoder_loaded:
+            try:
+                import tiktoken
+
+                # Downloads the BPE file on first use unless it is in
+                # TIKTOKEN_CACHE_DIR (the Docker image fetches it at build time)
+                _encoder = tiktoken.get_encoding(_ENCODING_NAME)
+            except Exception as error:
+                # Not installed, or the encoding file cannot be downloaded
+                _logger.warning(
+                    f"tiktoken encoding {_ENCODING_NAME} unavailable, counting "
+                    f"~4 characters per token: {error}"
+                )
+                _encoder = None
+            _encoder_loaded = True
+    return _encoder
+
+
+def load_token_encoder() -> bool:
+    """
+    Load the token encoder now instead of on the first count.
+
+    Called at startup so the BPE file is never fetched inside a request.
+
+    Returns:
+        True when tiktoken is used, False when counts fall back to the heuristic.
+    """
+    return _get_encoder() is not None
+
+
+def count_tokens(value: Any) -> int:
+    """
+    Count the tokens of a string, or of any value serialized as JSON.
+
+    Uses tiktoken (pinned in requirements.txt) and falls back to the ~4
+    characters per token heuristic when its encoding cannot be loaded.
+
+    Example:
+        >>> count_tokens("hello world")
+        2
+        >>> count_tokens([{"username": "foo", "followers": 1200}])  # JSON-encoded
+    """
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return max(1, len(text) // 4) if text else 0
@@ -0,0 +1,219 @@
+"""
+Canonical profile URLs and usernames for every supported platform.
+
+Search providers return the same profile in many shapes
+(``instagram.com/nike``, ``https://www.instagram.com/Nike/?hl=en``,
+``m.instagram.com/nike?igshid=...``). :func:`parse_profile_url` reduces each
+of them to one :class:`ProfileHandle`: the platform, the lowercased handle and
+a canonical profile URL. Query strings (``igshid``, ``utm_*``, ``hl`` and
+other tracking parameters) and fragments are dropped; only Facebook's
+``profile.php?id=`` is read. It uses one precompiled host pattern and one
+precompiled path pattern per platform, with no ``urllib`` parsing.
+:func:`canonicalize_profiles` does the same for a batch and drops duplicate
+handles. Post, reel, video and navigation URLs are not profiles and yield
+None.
+
+``scripts/benchmark_url_canonicalizer.py`` checks the corpus of tricky URLs
+in ``scripts/profile_url_corpus.json`` and measures throughput.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+from src.shared.enums import Platform
+
+
+class ProfileHandle(NamedTuple):
+    """A profile reduced to its platform, handle and canonical URL."""
+
+    platform: Platform
+    username: str
+    url: str
+
+
+# Parsed URLs memoized by parse_profile_url
+URL_CACHE_SIZE = 65536
+
+_HOST = re.compile(
+    r"\s*(?:https?:)?(?://)?(?:[a-z0-9-]+\.)*?"
+    r"(instagram\.com|instagr\.am|tiktok\.com|youtube\.com|x\.com|twitter\.com"
+    r"|linkedin\.com|facebook\.com|fb\.com)(?::\d+)?(?=[/?#]|$)",
+    re.IGNORECASE,
+)
+
+_HOST_PLATFORM: Dict[str, Platform] = {
+    "instagram.com": Platform.INSTAGRAM,
+    "instagr.am": Platform.INSTAGRAM,
+    "tiktok.com": Platform.TIKTOK,
+    "youtube.com": Platform.YOUTUBE,
+    "x.com": Platform.X,
+    "twitter.com": Platform.X,
+    "linkedin.com": Platform.LINKEDIN,
+    "facebook.com": Platform.FACEBOOK,
+    "fb.com": Platform.FACEBOOK,
+}
+
+# Path patterns, matched right after the host. The handle is the first
+# non-empty group; YouTube channel ids keep their case (they are
+# case-sensitive), every other handle is lowercased.
+_END = r"/*(?=[?#]|$)"
+_PATHS: Dict[Platform, Pattern] = {
+    Platform.INSTAGRAM: re.compile(
+        r"/+(?:stories/+)?([A-Za-z0-9._]{1,30})(?:/+(?:reels|tagged|guides|followers|following)?)?"
+        + _END
+    ),
+    Platform.TIKTOK: re.compile(r"/+@([A-Za-z0-9._]{2,24})" + _END),
+    Platform.YOUTUBE: re.compile(
+        r"/+(?:@([A-Za-z0-9._-]{3,30})|(?:c|user)/+([A-Za-z0-9._-]{1,100})"
+        r"|channel/+(UC[A-Za-z0-9_-]{22}))"
+        r"(?:/+(?:featured|videos|shorts|streams|playlists|community|about))?" + _END
+    ),
+    Platform.X: re.compile(
+        r"/+(?:#!/+)?([A-Za-z0-9_]{1,15})(?:/+(?:with_replies|media|likes|highlights))?"
+        + _END
+    ),
+    Platform.LINKEDIN: re.compile(
+        r"/+in/+((?:[A-Za-z0-9_-]|%[0-9A-Fa-f]{2}){3,100})(?:/+[a-z]{2})?" + _END
+    ),
+    Platform.FACEBOOK: re.compile(
+        r"/+(?:profile\.php\?(?:[^#]*&)?id=(\d{5,20})(?=[&#]|$)"
+        r"|people/+[^/?#]+/+(\d{5,20})" + _END + r"|([A-Za-z0-9.]{2,50})" + _END + r")"
+    ),
+}
+
+# First path segments that are site sections, not usernames
+_RESERVED: Dict[Platform, frozenset] = {
+    Platform.INSTAGRAM: frozenset(
+        {
+            "p", "reel", "reels", "tv", "explore", "stories", "accounts",
+            "direct", "about", "developer", "legal", "web", "challenge",
+            "emails", "privacy", "terms", "session", "graphql", "api",
+        }
+    ),
+    Platform.X: frozenset(
+        {
+            "home", "search", "explore", "i", "intent", "share", "hashtag",
+            "settings", "login", "logout", "signup", "messages",
+            "notifications", "tos", "privacy", "compose", "about", "jobs",
+        }
+    ),
+    Platform.FACEBOOK: frozenset(
+        {
+            "pages", "groups", "events", "watch", "photo", "photos", "story",
+            "sharer", "share", "login", "marketplace", "hashtag", "people",
+            "gaming", "help", "policies", "privacy", "settings", "reel",
+            "video", "videos", "profile.php", "home.php", "permalink.php",
+        }
+    ),
+}
+
+_PROFILE_URL: Dict[Platform, str] = {
+    Platform.INSTAGRAM: "https://www.instagram.com/{}/",
+    Platform.TIKTOK: "https://www.tiktok.com/@{}",
+    Platform.X: "https://x.com/{}",
+    Platform.LINKEDIN: "https://www.linkedin.com/in/{}",
+    Platform.FACEBOOK: "https://www.facebook.com/{}",
+}
+
+
+def parse_profile_url(
+    url: str, platform: Optional[Platform] = None
+) -> Optional[ProfileHandle]:
+    """
+    Reduce a profile URL to its platform, handle and canonical URL.
+
+    Results are memoized per URL (the same profile URLs come back across the
+    queries of a search and across searches).
+
+    Args:
+        url: Profile URL in any common shape (scheme, ``www.``/``m.``
+            subdomain, trailing slash, query string and fragment optional).
+        platform: Expected platform; URLs of other platforms yield None.
+            Detected from the host when omitted.
+
+    Returns:
+        The profile handle, or None when the URL is not a profile URL.
+
+    Example:
+        >>> parse_profile_url("m.instagram.com/Nike?igshid=abc", Platform.INSTAGRAM)
+        ProfileHandle(platform=<Platform.INSTAGRAM: 'instagram'>, username='nike',
+                      url='https://www.instagram.com/nike/')
+    """
+    if not url:
+        return None
+    handle = _parse(url)
+    if handle is None or (platform is not None and handle.platform is not platform):
+        return None
+    return handle
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _parse(url: str) -> Optional[ProfileHandle]:
+    host = _HOST.match(url)
+    if host is None:
+        return None
+    platform = _HOST_PLATFORM[host.group(1).lower()]
+    match = _PATHS[platform].match(url, host.end())
+    if match is None:
+        return None
+    group = match.lastindex
+    username = match.group(group)
+    if platform is Platform.YOUTUBE:
+        if group == 3:
+            return ProfileHandle(
+                platform, username, f"https://www.youtube.com/channel/{username}"
+            )
+        username = username.lower()
+        prefix = "@" if group == 1 else ("c/" if "/c/" in match.group(0) else "user/")
+        return ProfileHandle(platform, username, f"https://www.youtube.com/{prefix}{username}")
+
+    username = username.lower()
+    if username in _RESERVED.get(platform, ()):
+        return None
+    if platform is Platform.FACEBOOK and username.isdigit():
+        return ProfileHandle(
+            platform, username, f"https://www.facebook.com/profile.php?id={username}"
+        )
+    return ProfileHandle(platform, username, _PROFILE_URL[platform].format(username))
+
+
+def extract_username(url: str, platform: Optional[Platform] = None) -> Optional[str]:
+    """
+    Handle of a profile URL, lowercased (YouTube channel ids keep their case).
+
+    Example:
+        >>> extract_username("https://www.instagram.com/nike", Platform.INSTAGRAM)
+        'nike'
+        >>> extract_username("https://www.instagram.com/p/C1a2b3/", Platform.INSTAGRAM)
+    """
+    handle = parse_profile_url(url, platform)
+    return handle.username if handle else None
+
+
+def canonicalize_profiles(
+    urls: Iterable[str], platform: Optional[Platform] = None
+) -> List[ProfileHandle]:
+    """
+    Canonicalize a batch of URLs, dropping non-profile URLs and repeated handles.
+
+    Args:
+        urls: URLs in ranking order.
+        platform: Expected platform (see :func:`parse_profile_url`).
+
+    Returns:
+        One handle per profile, in order of first appearance.
+    """
+    seen: Dict[Tuple[Platform, str], None] = {}
+    handles: List[ProfileHandle] = []
+    for url in urls:
+        handle = parse_profile_url(url, platform)
+        if handle is None:
+            continue
+        key = (handle.platform, handle.username)
+        if key in seen:
+            continue
+        seen[key] = None
+        handles.append(handle)
+    return handles
+
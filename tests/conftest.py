@@ -0,0 +1,61 @@
+import pytest
+
+from src.shared.adaptive_concurrency import AdaptiveConcurrencyLimit
+from src.shared.circuit_breaker import CircuitBreaker
+from src.shared.utils.hedging import HedgedCall
+from src.shared.utils.latency import LatencyTracker
+
+
+class ProviderError(Exception):
+    """A provider SDK error carrying the HTTP status, like httpx or Ensemble errors."""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@pytest.fixture
+def provider_error():
+    """The ``ProviderError`` class: ``provider_error(429, retry_after="3")``."""
+    return ProviderError
+
+
+@pytest.fixture
+def make_limit():
+    """Build an AIMD limit halving on overload, named "test"."""
+
+    def make(initial=4, min_limit=1, max_limit=8):
+        return AdaptiveConcurrencyLimit(
+            "test", initial=initial, min_limit=min_limit, max_limit=max_limit, decrease=0.5,
+            latency_factor=2.0,
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_breaker():
+    """Build a circuit breaker named "test" with short timings."""
+
+    def make(threshold=2, open_seconds=0.05, half_open_calls=1):
+        return CircuitBreaker(
+            "test",
+            failure_threshold=threshold,
+            open_seconds=open_seconds,
+            half_open_calls=half_open_calls,
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_hedge():
+    """Build a primary/secondary hedged call with a fixed default delay."""
+
+    def make(workers=4, delay=0.1):
+        return HedgedCall(
+            "primary", "secondary", LatencyTracker(), default_delay=delay, workers=workers
+        )
+
+    return make
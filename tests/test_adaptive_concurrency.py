@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+
+def _succeed(limit, latency=0.01):
+    limit.release(limit.acquire(), latency)
+
+
+def test_limit_grows_by_one_per_round_of_successes(make_limit):
+    limit = make_limit(initial=2)
+    for _ in range(2):
+        # Use the whole limit; each success adds 1/limit while it is in use
+        permits = [limit.acquire(), limit.acquire()]
+        for in_flight in permits:
+            limit.release(in_flight, 0.01)
+    assert limit.limit == 3
+    assert limit.stats()["increases"] == 1
+
+
+def test_limit_does_not_grow_while_mostly_unused(make_limit):
+    limit = make_limit(initial=4)
+    for _ in range(20):
+        # One request in flight out of four: the limit is not what bounds traffic
+        _succeed(limit)
+    assert limit.limit == 4
+
+
+def test_limit_stays_below_the_pool_size(make_limit):
+    limit = make_limit(initial=2, max_limit=3)
+    for _ in range(20):
+        in_flight = limit.acquire()
+        limit.release(in_flight + 2, 0.01)
+    assert limit.limit == 3
+
+
+def test_overload_halves_the_limit_once_per_cooldown(make_limit, provider_error):
+    limit = make_limit(initial=8)
+    for _ in range(3):
+        limit.release(limit.acquire(), 0.01, provider_error(429))
+    assert limit.limit == 4
+    assert limit.stats()["overloads"] == 3
+    assert limit.stats()["decreases"] == 1
+
+
+def test_limit_never_drops_below_the_minimum(make_limit, provider_error):
+    limit = make_limit(initial=2, min_limit=2)
+    limit.release(limit.acquire(), 0.01, provider_error(503))
+    assert limit.limit == 2
+
+
+def test_errors_that_are_not_overload_keep_the_limit(make_limit, provider_error):
+    limit = make_limit(initial=4)
+    limit.release(limit.acquire(), 0.01, provider_error(404))
+    assert limit.limit == 4
+    assert limit.stats()["overloads"] == 0
+
+
+def test_latency_far_above_the_baseline_counts_as_overload(make_limit):
+    limit = make_limit(initial=4)
+    for _ in range(10):
+        _succeed(limit, latency=0.01)
+    _succeed(limit, latency=1.0)
+    assert limit.limit == 2
+    assert limit.stats()["overloads"] == 1
+
+
+def test_permit_reports_the_outcome(make_limit, provider_error):
+    limit = make_limit(initial=4)
+    with pytest.raises(provider_error):
+        with limit.permit("search"):
+            raise provider_error(429)
+    assert limit.limit == 2
+    assert limit.stats()["in_flight"] == 0
+
+
+def test_requests_wait_while_the_limit_is_reached(make_limit):
+    limit = make_limit(initial=1, max_limit=1)
+    first = limit.acquire()
+    started = threading.Event()
+
+    def second():
+        limit.acquire()
+        started.set()
+
+    thread = threading.Thread(target=second)
+    thread.start()
+    assert not started.wait(0.05)
+    limit.release(first, 0.01)
+    assert started.wait(1)
+    thread.join(1)
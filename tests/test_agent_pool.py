@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.agent.agent_pool import AgentPool, AgentPoolExhaustedError
+
+
+def _blocking_pool(**kwargs):
+    """A one-instance pool and an event releasing the run that holds it."""
+    release = threading.Event()
+    pool = AgentPool(factory=object, size=1, **kwargs)
+    return pool, release
+
+
+def test_instances_are_built_lazily_and_reused():
+    built = []
+    pool = AgentPool(factory=lambda: built.append(object()) or built[-1], size=2)
+    assert built == []
+    first = pool.run(lambda agent: agent)
+    assert pool.run(lambda agent: agent) is first
+    assert len(built) == 1
+
+
+def test_run_cancelled_while_queued_leaves_the_queue():
+    pool, release = _blocking_pool(max_queue=1)
+    ran = []
+
+    async def scenario():
+        holder = asyncio.create_task(pool.run_async(lambda agent: release.wait(2)))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(pool.run_async(lambda agent: ran.append(1)))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["waiting"] == 1
+        # The client disconnects while its run is still queued
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await holder
+        # The queue has room again
+        await pool.run_async(lambda agent: None)
+
+    asyncio.run(scenario())
+    assert ran == []
+    assert pool.stats()["waiting"] == 0
+    pool.shutdown()
+
+
+def test_full_queue_rejects_new_runs():
+    pool, release = _blocking_pool(max_queue=1)
+
+    async def scenario():
+        holder = asyncio.create_task(pool.run_async(lambda agent: release.wait(2)))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(pool.run_async(lambda agent: None))
+        await asyncio.sleep(0.05)
+        with pytest.raises(AgentPoolExhaustedError):
+            await pool.run_async(lambda agent: None)
+        release.set()
+        await asyncio.gather(holder, queued)
+
+    asyncio.run(scenario())
+    assert pool.stats()["rejected"] == 1
+    pool.shutdown()
+
+
+def test_runs_queued_past_the_acquire_timeout_are_rejected():
+    pool, release = _blocking_pool(acquire_timeout=0.05)
+    ran = []
+
+    async def scenario():
+        holder = asyncio.create_task(pool.run_async(lambda agent: release.wait(0.2)))
+        await asyncio.sleep(0.02)
+        with pytest.raises(AgentPoolExhaustedError):
+            await pool.run_async(lambda agent: ran.append(1))
+        await holder
+
+    asyncio.run(scenario())
+    assert ran == []
+    assert pool.stats()["waiting"] == 0
+    pool.shutdown()
+
+
+def test_run_async_sees_the_callers_context():
+    from src.shared import context
+
+    pool = AgentPool(factory=object, size=1)
+
+    async def scenario():
+        token = context.set_request_context("u1", "s1")
+        try:
+            return await pool.run_async(lambda agent: context.session_id)
+        finally:
+            context.reset_request_context(token)
+
+    assert asyncio.run(scenario()) == "s1"
+    pool.shutdown()
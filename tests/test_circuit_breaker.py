@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from src.shared import context
+from src.shared.circuit_breaker import circuit_protected
+from src.shared.enums import CircuitState
+from src.shared.exceptions import CircuitOpenError
+from src.shared.utils.retry import RetryPolicy, retry
+
+
+@pytest.fixture
+def fail(provider_error):
+    """A provider call failing with the given status (503 by default)."""
+
+    def call(status_code=503):
+        raise provider_error(status_code)
+
+    return call
+
+
+@pytest.fixture
+def trip(fail, provider_error):
+    """Open a breaker with the default threshold of two failures."""
+
+    def trip_breaker(breaker, failures=2):
+        for _ in range(failures):
+            with pytest.raises(provider_error):
+                breaker.call(fail)
+
+    return trip_breaker
+
+
+def test_consecutive_failures_open_the_circuit(make_breaker, trip):
+    breaker = make_breaker()
+    trip(breaker)
+    assert breaker.state is CircuitState.OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+    assert error.value.provider == "test"
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_answers_that_are_not_failures_reset_the_count(make_breaker, fail, provider_error):
+    breaker = make_breaker()
+    with pytest.raises(provider_error):
+        breaker.call(fail)
+    # A 404 is an answer: the provider is up
+    with pytest.raises(provider_error):
+        breaker.call(fail, 404)
+    with pytest.raises(provider_error):
+        breaker.call(fail)
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_a_successful_trial_call_closes_the_circuit(make_breaker, trip):
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_a_failed_trial_call_opens_the_circuit_again(make_breaker, trip, fail, provider_error):
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    with pytest.raises(provider_error):
+        breaker.call(fail)
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.stats()["opened"] == 2
+
+
+def test_only_the_trial_calls_pass_while_half_open(make_breaker, trip):
+    breaker = make_breaker(half_open_calls=1)
+    trip(breaker)
+    time.sleep(0.06)
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_rejections_mark_the_provider_unavailable(make_breaker, trip):
+    breaker = make_breaker()
+    trip(breaker)
+    with context.track_unavailable_providers() as unavailable:
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: None)
+    assert unavailable == {"test"}
+
+
+def test_an_open_circuit_is_not_retried(monkeypatch, fail):
+    monkeypatch.setenv("CIRCUIT_FAILURE_THRESHOLD_TEST_NOT_RETRIED", "3")
+    calls = []
+
+    @retry(policy=RetryPolicy(max_attempts=5, delay=0.001))
+    @circuit_protected("test_not_retried")
+    def request():
+        calls.append(1)
+        fail()
+
+    # The third failure opens the circuit; the rejected fourth attempt ends the call
+    with pytest.raises(CircuitOpenError):
+        request()
+    assert len(calls) == 3
@@ -0,0 +1,103 @@
+import dataclasses
+
+import httpx
+import pytest
+from ensembledata.api import EDError
+
+from src.shared.enums import FailureKind
+from src.shared.exceptions import CircuitOpenError, ProviderItemError
+from src.shared.services import ensemble_service as ensemble_module
+from src.shared.services.ensemble_service import EnsembleService, classify_ensemble_error
+
+
+@pytest.mark.parametrize(
+    "status, kind",
+    [
+        (404, FailureKind.NOT_FOUND),
+        (473, FailureKind.NOT_FOUND),
+        (471, FailureKind.PRIVATE),
+        (472, FailureKind.PRIVATE),
+        (429, FailureKind.RATE_LIMITED),
+        (422, FailureKind.PERMANENT),
+        (491, FailureKind.PERMANENT),
+        # 520 is a restricted post, not a server error
+        (520, FailureKind.PERMANENT),
+        (500, FailureKind.TRANSIENT),
+        (503, FailureKind.TRANSIENT),
+        (400, FailureKind.PERMANENT),
+    ],
+)
+def test_ensemble_statuses_are_classified(status, kind):
+    assert classify_ensemble_error(EDError(status, "detail", 0)) is kind
+
+
+def test_only_rate_limits_and_transient_errors_are_retried():
+    retryable = ensemble_module.ENSEMBLE_RETRY_POLICY.retryable
+    assert retryable(EDError(429, "Too many requests", 0))
+    assert retryable(EDError(502, "Bad gateway", 0))
+    assert retryable(httpx.ReadTimeout("timed out"))
+    assert not retryable(EDError(473, "User not found", 0))
+    assert not retryable(EDError(471, "Private account", 0))
+    assert not retryable(CircuitOpenError("ensemble", 30))
+    assert not retryable(KeyError("data"))
+
+
+def test_item_errors_and_open_circuits_keep_their_kind():
+    assert classify_ensemble_error(
+        ProviderItemError("no accounts", FailureKind.NOT_FOUND)
+    ) is FailureKind.NOT_FOUND
+    assert classify_ensemble_error(CircuitOpenError("ensemble", 30)) is FailureKind.UNAVAILABLE
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(
+        ensemble_module,
+        "ENSEMBLE_RETRY_POLICY",
+        dataclasses.replace(
+            ensemble_module.ENSEMBLE_RETRY_POLICY, max_attempts=3, delay=0.001, budget=None
+        ),
+    )
+    return EnsembleService()
+
+
+def test_failed_items_do_not_sink_the_batch(service):
+    errors = {
+        "ghost": [EDError(473, "User not found", 0)],
+        "hidden": [EDError(471, "Private account", 0)],
+        "flaky": [EDError(503, "Unavailable", 0)],
+        "down": [EDError(500, "Error", 0)] * 3,
+    }
+    calls = []
+
+    def request(username):
+        calls.append(username)
+        if errors.get(username):
+            raise errors[username].pop(0)
+        return username.upper()
+
+    streamed = []
+    batch = service._fetch_batch(
+        "profile", ["nike", "ghost", "hidden", "flaky", "down"], request, 2, streamed.append
+    )
+
+    assert sorted(batch.successes) == ["FLAKY", "NIKE"]
+    assert sorted(streamed) == ["FLAKY", "NIKE"]
+    assert batch.failed_items(FailureKind.NOT_FOUND) == ["ghost"]
+    assert batch.failed_items(FailureKind.PRIVATE) == ["hidden"]
+    assert batch.failed_items(FailureKind.TRANSIENT) == ["down"]
+    # Permanent failures are asked once; transient ones until the attempts run out
+    attempts = {failure.item: failure.attempts for failure in batch.failures}
+    assert attempts == {"ghost": 1, "hidden": 1, "down": 3}
+    assert calls.count("flaky") == 2
+    assert calls.count("nike") == 1
+
+
+def test_an_open_circuit_fails_items_as_unavailable(service):
+    def request(username):
+        raise CircuitOpenError("ensemble", 30)
+
+    batch = service._fetch_batch("profile", ["nike", "adidas"], request, None)
+    assert batch.successes == []
+    assert sorted(batch.failed_items(FailureKind.UNAVAILABLE)) == ["adidas", "nike"]
+    assert all(failure.attempts == 1 for failure in batch.failures)
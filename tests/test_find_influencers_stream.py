@@ -0,0 +1,160 @@
+"""
+``/find-influencers/stream`` with the agent run replaced by fakes.
+"""
+
+import asyncio
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+import fastapi_app
+from src.agent.agent_pool import AgentPool, AgentPoolExhaustedError
+from src.shared import context
+from src.shared.exceptions import CircuitOpenError
+from src.shared.models.sys_models import FyuzeModel
+
+REQUEST = {"message": "food creators in Beirut", "user_id": "u1", "session_id": "s1"}
+
+
+def _card(username):
+    return {"platform": "instagram", "username": username, "data": {"username": username.lower()}}
+
+
+def _events(body):
+    """Parse SSE frames into (event, data) pairs, skipping keep-alive comments."""
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines() if not line.startswith(":"))
+        if lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _stream(monkeypatch, run):
+    monkeypatch.setattr(fastapi_app, "run_agent_stream_async", run)
+    response = TestClient(fastapi_app.app).post("/find-influencers/stream", json=REQUEST)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return _events(response.text)
+
+
+def test_events_arrive_in_order_and_end_with_done(monkeypatch):
+    def work():
+        # Emitted from a worker thread, like the agent's tool calls
+        context.emit_event("tool_started", {"tool": "search_insta_influencers"})
+        context.emit_event("influencer", _card("Chef"))
+        context.emit_event("influencer", _card("chef"))
+        context.emit_event("tool_completed", {"tool": "search_insta_influencers"})
+
+    async def run(message, user_id, session_id):
+        context.emit_event("token", {"text": "Looking"})
+        await asyncio.to_thread(work)
+        context.emit_event("token", {"text": " done"})
+        return FyuzeModel(text="Here are the creators I found.")
+
+    events = _stream(monkeypatch, run)
+    assert [event for event, _ in events] == [
+        "token",
+        "tool_started",
+        "influencer",
+        "tool_completed",
+        "token",
+        "done",
+    ]
+    done = events[-1][1]
+    assert done["text"] == "Here are the creators I found."
+    assert done["degraded"] is False
+
+
+def test_an_outage_sends_provider_unavailable_and_a_degraded_done(monkeypatch):
+    async def run(message, user_id, session_id):
+        context.emit_event("influencer", _card("chef"))
+        context.mark_provider_unavailable("ensemble")
+        raise CircuitOpenError("ensemble", 30)
+
+    events = _stream(monkeypatch, run)
+    assert [event for event, _ in events] == ["influencer", "provider_unavailable", "done"]
+    assert events[1][1] == {"provider": "ensemble"}
+    done = events[-1][1]
+    assert done["degraded"] is True
+    assert done["unavailable_providers"] == ["ensemble"]
+    assert done["influencers_found"] == [{"username": "chef"}]
+
+
+def test_failures_end_with_an_error_event(monkeypatch):
+    async def failing_run(message, user_id, session_id):
+        raise ValueError("bad model output")
+
+    events = _stream(monkeypatch, failing_run)
+    assert events[-1][0] == "error"
+    assert events[-1][1]["status_code"] == 500
+
+    async def busy_run(message, user_id, session_id):
+        raise AgentPoolExhaustedError("Agent pool exhausted")
+
+    events = _stream(monkeypatch, busy_run)
+    assert events == [("error", {"status_code": 503, "detail": "Agent pool exhausted"})]
+
+
+def test_disconnect_cancels_a_run_still_queued_for_an_agent(monkeypatch):
+    pool = AgentPool(factory=object, size=1)
+    release = threading.Event()
+    ran = []
+
+    async def run(message, user_id, session_id):
+        context.emit_event("token", {"text": "Queued"})
+        return await pool.run_async(lambda agent: ran.append(1))
+
+    monkeypatch.setattr(fastapi_app, "run_agent_stream_async", run)
+    body = json.dumps(REQUEST).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/find-influencers/stream",
+        "raw_path": b"/find-influencers/stream",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("testclient", 123),
+        "server": ("testserver", 80),
+    }
+
+    async def scenario():
+        # Hold the pool's only agent so the streamed run waits in the queue
+        holder = asyncio.create_task(pool.run_async(lambda agent: release.wait(2)))
+        await asyncio.sleep(0.05)
+        first_frame = asyncio.Event()
+        requested = False
+        frames = []
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # The client goes away once the first event arrives
+            await first_frame.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                frames.append(message["body"].decode())
+                first_frame.set()
+
+        await asyncio.wait_for(fastapi_app.app(scope, receive, send), 2)
+        await asyncio.sleep(0.05)
+        waiting = pool.stats()["waiting"]
+        release.set()
+        await holder
+        return frames, waiting
+
+    frames, waiting = asyncio.run(scenario())
+    assert _events("".join(frames)) == [("token", {"text": "Queued"})]
+    # The cancelled run left the queue and never got an agent
+    assert waiting == 0
+    assert ran == []
+    pool.shutdown()
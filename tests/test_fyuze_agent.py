@@ -0,0 +1,13 @@
+from src.agent import fyuze_agent as module
+
+
+def test_shared_agent_is_built_on_first_access(monkeypatch):
+    built = []
+    monkeypatch.setattr(module, "_shared_agent", None)
+    monkeypatch.setattr(module, "build_fyuze_agent", lambda: built.append(object()) or built[-1])
+
+    assert built == []
+    agent = module.fyuze_agent
+    assert built == [agent]
+    assert module.get_fyuze_agent() is agent
+    assert len(built) == 1
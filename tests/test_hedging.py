@@ -0,0 +1,43 @@
+import threading
+import time
+
+
+def test_fast_primary_is_not_hedged(make_hedge):
+    secondary_calls = []
+    hedge = make_hedge()
+    result = hedge.run(lambda: "fast", lambda: secondary_calls.append(1))
+    assert result == [("primary", "fast")]
+    assert secondary_calls == []
+
+
+def test_slow_primary_is_hedged_and_the_secondary_wins(make_hedge):
+    hedge = make_hedge()
+    result = hedge.run(lambda: time.sleep(1) or "slow", lambda: "hedged")
+    assert result == [("secondary", "hedged")]
+    assert hedge.stats()["secondary_wins"] == 1
+
+
+def test_failed_primary_falls_back_to_the_secondary(make_hedge):
+    def fail():
+        raise RuntimeError("down")
+
+    assert make_hedge().run(fail, lambda: "hedged") == [("secondary", "hedged")]
+
+
+def test_queueing_for_a_worker_does_not_count_towards_the_delay(make_hedge):
+    hedge = make_hedge(workers=1, delay=0.2)
+    release = threading.Event()
+    # Occupy the only worker for longer than the hedge delay
+    blocker = hedge._executor.submit(lambda: release.wait(5))
+    threading.Timer(0.3, release.set).start()
+
+    secondary_calls = []
+    result = hedge.run(lambda: "queued", lambda: secondary_calls.append(1))
+    assert result == [("primary", "queued")]
+    assert secondary_calls == []
+    blocker.result()
+
+
+def test_federated_calls_return_both_results(make_hedge):
+    result = make_hedge().run(lambda: "a", lambda: "b", federated=True)
+    assert sorted(result) == [("primary", "a"), ("secondary", "b")]
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from src.agent import intent_router
+from src.agent.intent_router import is_small_talk, route_message
+from src.shared.enums import ChatRoute
+
+
+@pytest.fixture(autouse=True)
+def no_classifier(monkeypatch):
+    monkeypatch.setattr(intent_router, "FAST_PATH_ROUTER", True)
+    monkeypatch.setattr(intent_router, "_classify_with_model", lambda *args: None)
+
+
+@pytest.mark.parametrize("reply", ["ok", "great", "fine", "k", "thanks!"])
+def test_short_answer_to_clarifying_question_goes_to_agent(reply):
+    route, decided_by = route_message(
+        reply, last_reply="Should I search Dubai food creators?", awaiting_answer=True
+    )
+    assert (route, decided_by) == (ChatRoute.DISCOVERY, "rule")
+
+
+def test_small_talk_without_pending_question():
+    assert route_message("hey there!") == (ChatRoute.SMALL_TALK, "rule")
+    assert route_message("ok thanks") == (ChatRoute.SMALL_TALK, "rule")
+
+
+def test_discovery_vocabulary_beats_greeting():
+    assert route_message("hi, find me tiktok creators") == (ChatRoute.DISCOVERY, "rule")
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["how's it going?", "good morning fyuze :)", "thank you so much", "heyyy", "hahaha"],
+)
+def test_pleasantries_are_small_talk(message):
+    assert route_message(message) == (ChatRoute.SMALL_TALK, "rule")
+
+
+@pytest.mark.parametrize("message", ["hey, any vegan chefs?", "hi 2", "!!!"])
+def test_other_short_messages_are_not_small_talk(message):
+    assert not is_small_talk(message)
+
+
+def test_long_repetitive_messages_are_decided_quickly():
+    message = "thank you " * 20 + "x"
+    started = time.perf_counter()
+    assert route_message(message) == (ChatRoute.DISCOVERY, "rule")
+    assert not is_small_talk("thank you " * 500 + "x")
+    assert time.perf_counter() - started < 0.5
@@ -0,0 +1,31 @@
+from src.modules.job_runner import JobRunner
+from src.modules.job_runner.job_runner import MAX_PARTIAL_RESULTS
+from src.shared.context import emit_event
+
+
+def _emit_cards(params):
+    for i in range(params["cards"]):
+        emit_event("influencer", {"platform": "instagram", "username": f"user{i}"})
+    if params.get("fail"):
+        raise RuntimeError("provider down")
+    return {"found": params["cards"]}
+
+
+def test_partial_results_are_capped_and_kept_on_failure():
+    runner = JobRunner(handlers={"discover": _emit_cards}, workers=1)
+    job = runner.submit("discover", {"cards": MAX_PARTIAL_RESULTS + 50, "fail": True})
+    job = runner.wait(job["job_id"], timeout=5)
+    assert job["status"] == "failed"
+    assert len(job["partial_results"]) == MAX_PARTIAL_RESULTS
+    assert job["partial_results"][0]["username"] == "user0"
+    runner.shutdown()
+
+
+def test_partial_results_are_cleared_once_the_job_succeeds():
+    runner = JobRunner(handlers={"discover": _emit_cards}, workers=1)
+    job = runner.submit("discover", {"cards": 3})
+    job = runner.wait(job["job_id"], timeout=5)
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"found": 3}
+    assert job["partial_results"] == []
+    runner.shutdown()
@@ -0,0 +1,54 @@
+import threading
+import time
+
+from agno.exceptions import AgentRunException
+from agno.tools.function import Function, FunctionCall
+
+from src.agent.parallel_tools import ParallelToolGroq, _agent_exception_messages
+from src.shared.enums import Platform
+from src.shared.tool_registry import record_tool_result, tool_result_registry
+
+
+def _call(fn, call_id: str) -> FunctionCall:
+    function = Function.from_callable(fn)
+    function.process_entrypoint()
+    return FunctionCall(function=function, arguments={}, call_id=call_id)
+
+
+def test_timed_out_call_records_nothing_after_the_turn():
+    finished = threading.Event()
+
+    def fast_tool() -> str:
+        record_tool_result("fast_tool", Platform.INSTAGRAM, ["fast_user"])
+        return "fast"
+
+    def slow_tool() -> str:
+        time.sleep(0.3)
+        record_tool_result("slow_tool", Platform.INSTAGRAM, ["late_user"])
+        finished.set()
+        return "slow"
+
+    model = ParallelToolGroq(id="test", tool_timeouts={"slow_tool": 0.05})
+    results = []
+    with tool_result_registry() as registry:
+        list(
+            model.run_function_calls(
+                [_call(fast_tool, "1"), _call(slow_tool, "2")], results
+            )
+        )
+        assert finished.wait(2)
+    assert [record.usernames for record in registry.records] == [["fast_user"]]
+    assert [message.tool_call_error for message in results] == [False, True]
+
+
+def test_agent_exception_messages():
+    exc = AgentRunException(
+        "stop", user_message="retry with a city", messages=[{"role": "user", "content": "x"}]
+    )
+    exc.stop_execution = True
+    messages = _agent_exception_messages(exc)
+    assert [(m.role, m.content) for m in messages] == [
+        ("user", "retry with a city"),
+        ("user", "x"),
+    ]
+    assert all(m.stop_after_tool_call for m in messages)
@@ -0,0 +1,35 @@
+import pytest
+
+from src.core.prefetch import is_clarifying_question
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        "Love it! Which city should I focus on? 😊",
+        "Should I search Instagram, TikTok or both?",
+        "Got it. Do you have a follower range or budget in mind?",
+        "Nice! What's your brand about, so I can match the right niche?",
+    ],
+)
+def test_questions_asking_for_search_parameters(reply):
+    assert is_clarifying_question(reply, [])
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        "Here you go! Anything else I can help you with?",
+        "Hey! How's your day going? 😊",
+        "Who doesn't love a good burger?",
+        "These creators fit well. How does that sound?",
+        "I found a few options for you.",
+        "",
+    ],
+)
+def test_closing_rhetorical_and_plain_replies(reply):
+    assert not is_clarifying_question(reply, [])
+
+
+def test_replies_with_results_are_not_questions():
+    assert not is_clarifying_question("Want more creators in Dubai?", ["foodie.lb"])
@@ -0,0 +1,105 @@
+"""
+Calls through the search engine core actually runs (``src.protected.search_engine``),
+with the providers replaced by fakes.
+"""
+
+import pytest
+from exa_py.api import Result, SearchResponse
+
+from src.protected.search_engine import SearchEngine
+from src.shared.enums import Platform
+from src.shared.models import EnsembleTiktokAccount
+
+
+class FakeExa:
+    """Every query finds the same two profiles, plus a non-profile page."""
+
+    def __init__(self):
+        self.queries = []
+
+    def search(self, query):
+        self.queries.append(query)
+        return SearchResponse(
+            results=[
+                Result(url="https://www.instagram.com/beirut.eats/", id="1"),
+                Result(url="https://instagram.com/mezze_queen", id="2"),
+                Result(url="https://www.instagram.com/p/C0ffee/", id="3"),
+            ],
+            autoprompt_string=None,
+            resolved_search_type=None,
+            auto_date=None,
+        )
+
+
+class FakeEnsemble:
+    def __init__(self):
+        self.queries = []
+
+    def search_tiktok(self, keywords, period, max_results_per_keyword, parallel):
+        self.queries.extend(keywords)
+        return [
+            EnsembleTiktokAccount(uid=str(i), unique_id=f"creator{i}", nickname="")
+            for i in range(3)
+        ]
+
+
+class FakeCSE:
+    def __init__(self):
+        self.calls = []
+
+    def search(self, query, gl=None, pages=1):
+        self.calls.append((query, gl, pages))
+        return [{"title": "Mezze", "link": "https://example.com", "snippet": "food"}]
+
+
+@pytest.fixture
+def engine():
+    engine = SearchEngine()
+    engine._exa_service = FakeExa()
+    engine._ensemble_service = FakeEnsemble()
+    engine._cse_service = FakeCSE()
+    return engine
+
+
+def test_instagram_search_streams_and_ranks_profiles(engine):
+    streamed = []
+    results = engine.search(
+        topic="food",
+        location="Beirut, Lebanon",
+        keywords=[],
+        platform=Platform.INSTAGRAM,
+        max_results=2,
+        on_results=streamed.append,
+    )
+    assert [result.url for result, _ in results] == [
+        "https://www.instagram.com/beirut.eats/",
+        "https://instagram.com/mezze_queen",
+    ]
+    # Each query's valid profiles are streamed before ranking; posts are dropped
+    assert streamed and all("/p/" not in result.url for result in streamed[0])
+
+
+def test_relaxed_search_runs(engine):
+    results = engine.search_relaxed(
+        topic="food",
+        location="Beirut, Lebanon",
+        keywords=[],
+        platform=Platform.INSTAGRAM,
+        max_results=2,
+    )
+    assert len(results) == 2
+
+
+def test_tiktok_search_merges_accounts_across_queries(engine):
+    accounts = engine.search_tiktok_accounts(
+        topic="food", location="Beirut, Lebanon", keywords=[], target_results=3
+    )
+    assert {account.unique_id for account in accounts} == {"creator0", "creator1", "creator2"}
+    planned = engine.plan_queries("food", "Beirut, Lebanon", [], Platform.TIKTOK)
+    assert set(engine._ensemble_service.queries) <= set(planned)
+
+
+def test_basic_search_passes_the_page_count(engine):
+    result = engine.basic_search("food restaurants Beirut", "lb", 3)
+    assert result.success
+    assert engine._cse_service.calls == [("food restaurants Beirut", "lb", 3)]
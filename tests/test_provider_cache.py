@@ -0,0 +1,80 @@
+import pickle
+import sqlite3
+
+from exa_py.api import Result, SearchResponse
+
+from src.shared.models import EnsembleTiktokAccount
+from src.shared.provider_cache import ProviderCache, SQLiteCacheBackend
+from src.shared.services.ensemble_service import KEYWORD_SEARCH_CODEC
+from src.shared.services.exa_service import SEARCH_RESPONSE_CODEC
+
+AWEME = {
+    "aweme_id": "7",
+    "desc": "mezze tour",
+    "create_time": 1700000000,
+    "statistics": {"digg_count": 120, "comment_count": 4, "share_count": 2},
+    "author": {"uid": "1", "unique_id": "foodie", "nickname": "Foodie", "follower_count": 1000},
+}
+
+
+def _fetch_twice(path, compute, **kwargs):
+    """Store through one cache, read back through a fresh one (disk tier only)."""
+    ProviderCache(SQLiteCacheBackend(path)).fetch("p", "op", {"q": 1}, compute, **kwargs)
+    return ProviderCache(SQLiteCacheBackend(path)).fetch(
+        "p", "op", {"q": 1}, lambda: "recomputed", **kwargs
+    )
+
+
+def test_exa_response_round_trips_through_json(tmp_path):
+    response = SearchResponse(
+        results=[Result(url="https://instagram.com/foodie", id="1", title="Foodie")],
+        autoprompt_string=None,
+        resolved_search_type="neural",
+        auto_date=None,
+    )
+    cached = _fetch_twice(tmp_path / "cache.db", lambda: response, codec=SEARCH_RESPONSE_CODEC)
+    assert cached.results[0].url == "https://instagram.com/foodie"
+    assert cached.resolved_search_type == "neural"
+
+
+def test_tiktok_accounts_round_trip_through_json(tmp_path):
+    account = EnsembleTiktokAccount.from_dict(AWEME["author"], [AWEME])
+    keyword, accounts = _fetch_twice(
+        tmp_path / "cache.db", lambda: ("mezze", [account]), codec=KEYWORD_SEARCH_CODEC
+    )
+    assert keyword == "mezze"
+    assert accounts[0].to_dict() == account.to_dict()
+
+
+def test_uncacheable_responses_are_recomputed(tmp_path):
+    calls = []
+
+    def empty_search():
+        calls.append(1)
+        return SearchResponse([], None, None, None)
+
+    for _ in range(2):
+        ProviderCache(SQLiteCacheBackend(tmp_path / "cache.db")).fetch(
+            "exa",
+            "search",
+            {"query": "nobody"},
+            empty_search,
+            cacheable=lambda response: bool(response.results),
+            codec=SEARCH_RESPONSE_CODEC,
+        )
+    assert len(calls) == 2
+
+
+def test_pickled_entries_are_never_loaded(tmp_path):
+    path = tmp_path / "cache.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE provider_cache (key TEXT, provider TEXT, value BLOB, expires_at REAL)")
+    conn.execute(
+        "INSERT INTO provider_cache VALUES (?, 'p', ?, 1e12)", ("k", pickle.dumps({"a": 1}))
+    )
+    conn.commit()
+    conn.close()
+
+    assert _fetch_twice(path, lambda: {"fresh": True}) == {"fresh": True}
+    tables = sqlite3.connect(path).execute("SELECT name FROM sqlite_master WHERE type='table'")
+    assert "provider_cache" not in {row[0] for row in tables}
@@ -0,0 +1,87 @@
+import threading
+import time
+
+from src.shared import adaptive_concurrency
+from src.shared.adaptive_concurrency import AdaptiveConcurrencyLimit
+from src.shared.provider_scheduler import ProviderScheduler
+
+
+def _scheduler(monkeypatch, workers=1):
+    monkeypatch.setenv("PROVIDER_WORKERS_TEST", str(workers))
+    return ProviderScheduler()
+
+
+def test_calls_from_the_same_providers_pool_run_inline(monkeypatch):
+    scheduler = _scheduler(monkeypatch, workers=1)
+
+    def outer():
+        # The only worker waits on a nested call: queued, it would never run
+        inner = scheduler.submit("test", threading.current_thread)
+        return threading.current_thread(), inner.result(timeout=1)
+
+    outer_thread, inner_thread = scheduler.submit("test", outer).result(timeout=2)
+    assert inner_thread is outer_thread
+    stats = scheduler.stats()["providers"]["test"]
+    assert stats["inline"] == 1
+    assert stats["submitted"] == 1
+
+
+def test_inline_calls_report_their_errors_through_the_future(monkeypatch):
+    scheduler = _scheduler(monkeypatch, workers=1)
+
+    def outer():
+        return scheduler.submit("test", lambda: 1 / 0).exception()
+
+    assert isinstance(scheduler.submit("test", outer).result(timeout=2), ZeroDivisionError)
+
+
+def test_calls_to_another_provider_are_queued(monkeypatch):
+    scheduler = _scheduler(monkeypatch, workers=1)
+    monkeypatch.setenv("PROVIDER_WORKERS_OTHER", "1")
+
+    def outer():
+        return scheduler.submit("other", threading.current_thread).result(timeout=1)
+
+    assert scheduler.submit("test", outer).result(timeout=2).name.startswith("provider-other")
+    assert scheduler.stats()["providers"]["test"]["inline"] == 0
+
+
+def _peak_in_flight(scheduler, items, **kwargs):
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def call(item):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return item
+
+    results = [future.result() for _, future in scheduler.map_unordered("test", call, items, **kwargs)]
+    assert sorted(results) == sorted(items)
+    return peak
+
+
+def test_map_unordered_follows_the_adaptive_limit(monkeypatch):
+    scheduler = _scheduler(monkeypatch, workers=8)
+    limit = AdaptiveConcurrencyLimit("test", initial=2, min_limit=1, max_limit=8)
+    monkeypatch.setitem(adaptive_concurrency._limits, "test", limit)
+
+    assert _peak_in_flight(scheduler, list(range(8))) == 2
+
+    # A halved limit is picked up by the next batch
+    limit.release(limit.acquire(), 0.01, TimeoutError())
+    assert limit.limit == 1
+    assert _peak_in_flight(scheduler, list(range(4))) == 1
+
+
+def test_max_in_flight_overrides_the_adaptive_limit(monkeypatch):
+    scheduler = _scheduler(monkeypatch, workers=8)
+    limit = AdaptiveConcurrencyLimit("test", initial=1, min_limit=1, max_limit=8)
+    monkeypatch.setitem(adaptive_concurrency._limits, "test", limit)
+
+    assert _peak_in_flight(scheduler, list(range(8)), max_in_flight=3) == 3
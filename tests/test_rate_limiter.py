@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import pytest
+
+from src.shared.utils import RateLimiter, TokenBucket
+from src.shared.utils.rate_limiter import ProviderRateLimiter, _Limiter
+
+
+def test_limiter_subclasses_must_define_delay_and_take():
+    class Incomplete(_Limiter):
+        def _delay(self, now):
+            return 0.0
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_token_bucket_allows_a_burst_then_spaces_calls():
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.can_proceed() for _ in range(4)] == [True, True, True, False]
+    assert 0 < bucket.wait_time() <= 0.1
+    assert bucket.stats()["rejected"] == 1
+
+
+def test_token_bucket_reservations_are_served_in_order():
+    bucket = TokenBucket(rate=20, burst=1)
+    started = time.monotonic()
+    for _ in range(3):
+        assert bucket.acquire()
+    # The second and third calls wait one token each
+    assert time.monotonic() - started >= 0.09
+    assert bucket.stats()["waited"] == 2
+
+
+def test_acquire_gives_up_when_the_wait_exceeds_the_timeout():
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.acquire()
+    assert not bucket.acquire(timeout=0.1)
+
+
+def test_sliding_window_limits_calls_per_window():
+    limiter = RateLimiter(max_calls=2, time_window=0.2)
+    assert [limiter.can_proceed() for _ in range(3)] == [True, True, False]
+    time.sleep(0.21)
+    assert limiter.can_proceed()
+
+
+def test_provider_limiter_honours_the_stricter_limit():
+    limiter = ProviderRateLimiter(
+        "test", [TokenBucket(rate=100, burst=100), RateLimiter(max_calls=1, time_window=10)]
+    )
+    assert limiter.can_proceed()
+    assert not limiter.can_proceed()
+    assert limiter.stats()["window_calls"] == 1
+
+
+def test_acquire_async_waits_without_blocking_the_loop():
+    bucket = TokenBucket(rate=20, burst=1)
+
+    async def run():
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(bucket.acquire_async(), bucket.acquire_async(), ticker())
+        return ticks
+
+    assert len(asyncio.run(run())) == 3
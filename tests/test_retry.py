@@ -0,0 +1,112 @@
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from src.shared.utils.retry import (
+    RetryBudget,
+    RetryPolicy,
+    async_retry,
+    error_status,
+    is_retryable_error,
+    retry,
+    retry_after,
+    retry_call,
+)
+
+
+def _flaky(failures):
+    """A call failing with each error of ``failures`` in turn, then returning "ok"."""
+    errors = list(failures)
+    calls = []
+
+    def call():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return call, calls
+
+
+def test_rate_limits_server_errors_and_transport_errors_are_retried(provider_error):
+    assert is_retryable_error(provider_error(429))
+    assert is_retryable_error(provider_error(503))
+    assert is_retryable_error(httpx.ConnectTimeout("timed out"))
+    assert not is_retryable_error(provider_error(404))
+    assert not is_retryable_error(ValueError("bad payload"))
+
+
+def test_status_is_read_from_exa_messages():
+    assert error_status(ValueError("Request failed with status code 502: upstream")) == 502
+
+
+def test_retry_after_accepts_seconds_and_http_dates(provider_error):
+    assert retry_after(provider_error(429, retry_after="3")) == 3.0
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 <= retry_after(provider_error(503, retry_after=format_datetime(when))) <= 30
+
+
+def test_transient_errors_are_retried_until_success(provider_error):
+    call, calls = _flaky([provider_error(500), provider_error(429)])
+    policy = RetryPolicy(max_attempts=3, delay=0.001)
+    assert retry_call(call, policy) == "ok"
+    assert len(calls) == 3
+
+
+def test_permanent_errors_are_raised_at_once(provider_error):
+    call, calls = _flaky([provider_error(404)])
+    with pytest.raises(provider_error):
+        retry_call(call, RetryPolicy(max_attempts=3, delay=0.001))
+    assert len(calls) == 1
+
+
+def test_retry_after_longer_than_max_delay_is_not_waited_out(provider_error):
+    call, calls = _flaky([provider_error(429, retry_after=60)])
+    with pytest.raises(provider_error):
+        retry_call(call, RetryPolicy(max_attempts=3, delay=0.001, max_delay=1))
+    assert len(calls) == 1
+
+
+def test_backoff_is_jittered_below_the_exponential_ceiling(provider_error):
+    policy = RetryPolicy(max_attempts=5, delay=1, backoff=2, max_delay=3)
+    waits = [policy.next_delay(3, provider_error(500)) for _ in range(50)]
+    assert all(0 <= wait <= 3 for wait in waits)
+    assert len(set(waits)) > 1
+
+
+def test_budget_stops_retries_once_spent(provider_error):
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+    policy = RetryPolicy(max_attempts=3, delay=0.001, budget=budget)
+
+    call, calls = _flaky([provider_error(500), provider_error(500)])
+    with pytest.raises(provider_error):
+        retry_call(call, policy)
+    # One token for the first retry; the second is denied
+    assert len(calls) == 2
+    assert budget.stats()["denied"] == 1
+
+    # Each call deposits half a token: two more calls buy one retry
+    budget.on_call()
+    call, calls = _flaky([provider_error(500)])
+    assert retry_call(call, policy) == "ok"
+    assert len(calls) == 2
+
+
+def test_decorators_use_the_policy(provider_error):
+    sync_call, sync_calls = _flaky([provider_error(502)])
+    policy = RetryPolicy(max_attempts=2, delay=0.001)
+    assert retry(policy=policy)(sync_call)() == "ok"
+    assert len(sync_calls) == 2
+
+    errors = [provider_error(502)]
+
+    @async_retry(policy=policy)
+    async def async_call():
+        if errors:
+            raise errors.pop()
+        return "ok"
+
+    assert asyncio.run(async_call()) == "ok"
@@ -0,0 +1,84 @@
+"""
+The search engine as core imports it (``src.protected.search_engine``).
+
+The compiled bundle in ``dist/protected/search_engine`` is loaded when it
+exists (CI builds it before the tests), so these tests fail when it is
+older than ``src/modules/search_engine`` or when core calls the engine with
+arguments it does not take.
+"""
+
+import ast
+import inspect
+from pathlib import Path
+
+from src.protected.search_engine import SearchEngine
+from src.shared.enums import Platform
+
+ENGINE_SOURCE = (
+    Path(__file__).resolve().parents[1]
+    / "src"
+    / "modules"
+    / "search_engine"
+    / "search_engine.py"
+)
+
+
+def _bind(method, *args, **kwargs) -> None:
+    """Raise TypeError, like the call would, if ``method`` rejects the arguments."""
+    inspect.signature(method).bind(None, *args, **kwargs)
+
+
+def _source_signatures():
+    tree = ast.parse(ENGINE_SOURCE.read_text())
+    engine = next(
+        node
+        for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == "SearchEngine"
+    )
+    return {
+        node.name: [arg.arg for arg in node.args.args + node.args.kwonlyargs]
+        for node in engine.body
+        if isinstance(node, ast.FunctionDef)
+    }
+
+
+def test_loaded_engine_matches_its_source():
+    for name, params in _source_signatures().items():
+        assert hasattr(SearchEngine, name), f"SearchEngine.{name} missing: rebuild the bundle"
+        assert list(inspect.signature(getattr(SearchEngine, name)).parameters) == params, (
+            f"SearchEngine.{name} differs from its source: rebuild the bundle"
+        )
+
+
+def test_instagram_search_calls():
+    for method in (SearchEngine.search, SearchEngine.search_relaxed):
+        _bind(
+            method,
+            topic="food",
+            location="Tripoli, Lebanon",
+            keywords=[],
+            platform=Platform.INSTAGRAM,
+            max_results=10,
+            on_results=lambda results: None,
+        )
+
+
+def test_tiktok_search_calls():
+    _bind(
+        SearchEngine.search_tiktok_accounts,
+        topic="food",
+        location="Tripoli, Lebanon",
+        keywords=[],
+        target_results=10,
+    )
+
+
+def test_batch_search_calls():
+    _bind(SearchEngine.plan_queries, "food", "Tripoli, Lebanon", [], Platform.TIKTOK)
+    _bind(SearchEngine.search_tiktok_query, "food creators Tripoli")
+    _bind(SearchEngine.search_single_query, "food creators Tripoli", Platform.INSTAGRAM)
+    _bind(SearchEngine.rank_results, [])
+
+
+def test_basic_search_call():
+    _bind(SearchEngine.basic_search, "food restaurants Tripoli", "lb", 3)
@@ -0,0 +1,88 @@
+import copy
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.shared import session_summary
+from src.shared.session_summary import (
+    SUMMARY_FIELD,
+    load_session_summary,
+    update_session_summary,
+)
+
+
+class SessionCollection:
+    """The slice of a Mongo collection the session summary uses."""
+
+    def __init__(self):
+        self.docs = {}
+        self.lock = threading.Lock()
+
+    def find_one(self, query, projection=None):
+        with self.lock:
+            return copy.deepcopy(self.docs.get(query["session_id"]))
+
+    def update_one(self, query, update, upsert=False):
+        with self.lock:
+            doc = self.docs.get(query["session_id"])
+            if doc is None:
+                if not upsert:
+                    return SimpleNamespace(matched_count=0)
+                doc = self.docs[query["session_id"]] = {"session_id": query["session_id"]}
+                doc.update(update.get("$setOnInsert", {}))
+            key = f"{SUMMARY_FIELD}.version"
+            if key in query:
+                version = (doc.get(SUMMARY_FIELD) or {}).get("version")
+                expected = query[key]
+                allowed = expected["$in"] if isinstance(expected, dict) else [expected]
+                if version not in allowed:
+                    return SimpleNamespace(matched_count=0)
+            doc.update(copy.deepcopy(update.get("$set", {})))
+            return SimpleNamespace(matched_count=1)
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = SessionCollection()
+    monkeypatch.setattr(session_summary, "_session_collection", lambda: collection)
+    return collection
+
+
+def test_stale_summary_is_reloaded_instead_of_overwriting(collection):
+    # Two turns of one session load the same summary...
+    first = load_session_summary("s1")
+    second = load_session_summary("s1")
+
+    update_session_summary("s1", lambda s: s.add_turn("gyms in Dubai", "a", []), summary=first)
+    saved = update_session_summary(
+        "s1", lambda s: s.add_turn("cafes in Beirut", "b", []), summary=second
+    )
+
+    # ...and both turns end up in the stored summary
+    stored = load_session_summary("s1")
+    assert [t["request"] for t in stored.recent_turns] == ["gyms in Dubai", "cafes in Beirut"]
+    assert stored.turns == 2 and stored.version == 2
+    assert saved.recent_turns == stored.recent_turns
+
+
+def test_concurrent_updates_are_all_kept(collection):
+    threads = [
+        threading.Thread(
+            target=update_session_summary,
+            args=("s2", lambda s, i=i: s.add_turn(f"request {i}", "", [])),
+        )
+        for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert load_session_summary("s2").turns == 4
+
+
+def test_summary_without_version_field_is_upgraded(collection):
+    collection.docs["s3"] = {"session_id": "s3", SUMMARY_FIELD: {"turns": 3}}
+    update_session_summary("s3", lambda s: s.add_turn("more", "", []))
+    assert collection.docs["s3"][SUMMARY_FIELD]["turns"] == 4
+    assert collection.docs["s3"][SUMMARY_FIELD]["version"] == 1
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from src.shared.utils import SingleFlight
+
+
+def _run_concurrently(flights, key, fn, callers):
+    results = []
+    errors = []
+
+    def call():
+        try:
+            results.append(flights.do(key, fn))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def _wait_for_joiners(flights, count):
+    deadline = time.monotonic() + 2
+    while flights.stats()["coalesced"] < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def search():
+        calls.append(1)
+        release.wait(2)
+        return ["alice"]
+
+    threads, results, errors = _run_concurrently(flights, "fitness", search, 5)
+    _wait_for_joiners(flights, 4)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert calls == [1]
+    assert results == [["alice"]] * 5
+    assert errors == []
+    assert flights.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+def test_joiners_receive_the_leaders_exception():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def search():
+        release.wait(2)
+        raise RuntimeError("provider down")
+
+    threads, results, errors = _run_concurrently(flights, "fitness", search, 3)
+    _wait_for_joiners(flights, 2)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert results == []
+    assert [str(error) for error in errors] == ["provider down"] * 3
+
+
+def test_finished_keys_run_again():
+    flights = SingleFlight()
+    calls = []
+    for _ in range(2):
+        flights.do("fitness", lambda: calls.append(1))
+    assert len(calls) == 2
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_batch_claims_split_owned_and_pending_keys():
+    flights = SingleFlight()
+    first_owned, first_pending = flights.claim(["alice", "bob", "alice"])
+    assert set(first_owned) == {"alice", "bob"}
+    assert first_pending == {}
+
+    owned, pending = flights.claim(["bob", "carol"])
+    assert set(owned) == {"carol"}
+    assert set(pending) == {"bob"}
+
+    flights.resolve("bob", {"username": "bob"})
+    flights.fail("alice", RuntimeError("private"))
+    flights.resolve("carol", None)
+    assert flights.wait(pending["bob"]) == {"username": "bob"}
+    with pytest.raises(RuntimeError):
+        flights.wait(first_owned["alice"])
+    assert flights.stats()["in_flight"] == 0
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from src.shared.utils import SWRCache
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_fresh_entries_are_served_without_recomputing():
+    cache = SWRCache(ttl=60, stale_ttl=60)
+    calls = []
+    compute = lambda: calls.append(1) or ["alice"]
+    assert cache.get_or_compute("k", compute) == ["alice"]
+    assert cache.get_or_compute("k", compute) == ["alice"]
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_stale_entries_are_served_while_one_refresh_runs():
+    cache = SWRCache(ttl=0.05, stale_ttl=60)
+    cache.get_or_compute("k", lambda: "old")
+    time.sleep(0.06)
+
+    release = threading.Event()
+    refreshes = []
+
+    def refresh():
+        refreshes.append(1)
+        release.wait(2)
+        return "new"
+
+    assert cache.get_or_compute("k", refresh) == "old"
+    assert cache.get_or_compute("k", refresh) == "old"
+    release.set()
+    assert _wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert len(refreshes) == 1
+    assert cache.get_or_compute("k", refresh) == "new"
+
+
+def test_failed_refresh_keeps_the_stale_entry():
+    cache = SWRCache(ttl=0.05, stale_ttl=60)
+    cache.get_or_compute("k", lambda: "old")
+    time.sleep(0.06)
+
+    def fail():
+        raise RuntimeError("provider down")
+
+    assert cache.get_or_compute("k", fail) == "old"
+    assert _wait_for(lambda: cache.stats()["refresh_failures"] == 1)
+    assert cache.peek("k") == "old"
+
+
+def test_uncacheable_values_are_not_stored():
+    cache = SWRCache(ttl=60, stale_ttl=60)
+    assert cache.get_or_compute("k", lambda: [], cacheable=bool) == []
+    assert cache.peek("k") is None
+
+
+def test_expired_entries_stay_available_to_peek():
+    cache = SWRCache(ttl=0.01, stale_ttl=0.01)
+    cache.get_or_compute("k", lambda: "old")
+    time.sleep(0.03)
+    assert cache.get_or_compute("k", lambda: [], cacheable=bool) == []
+    assert cache.peek("k") == "old"
+    assert cache.stats()["fallback_hits"] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = SWRCache(ttl=60, stale_ttl=60, max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+    assert cache.peek("b") is None
+    assert cache.peek("a") == 1
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,29 @@
+from src.shared.enums import Platform
+from src.shared.tool_registry import ToolResultRegistry
+
+
+def _registry() -> ToolResultRegistry:
+    registry = ToolResultRegistry()
+    registry.record("search_insta_influencers", Platform.INSTAGRAM, ["@foodie.lb", "chef_rami"])
+    registry.record("search_tiktok_influencers", Platform.TIKTOK, ["tripolieats"])
+    return registry
+
+
+def test_reports_only_mentioned_handles():
+    assert _registry().resolve("Try @chef_rami, he posts daily.") == (
+        ["chef_rami"],
+        Platform.INSTAGRAM,
+    )
+
+
+def test_mentions_across_platforms_are_combined():
+    usernames, platform = _registry().resolve("@foodie.lb and @tripolieats fit best.")
+    assert usernames == ["foodie.lb", "tripolieats"]
+    assert platform is Platform.COMBINED_PLATFORMS
+
+
+def test_reply_naming_no_handle_reports_none():
+    registry = _registry()
+    assert registry.resolve("None of these creators match your budget.") == ([], None)
+    assert registry.resolve("Which city should I focus on?") == ([], None)
+    assert registry.resolve(None) == ([], None)
@@ -0,0 +1,112 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+import fastapi_app
+from src.core import search_influencers as search_module
+from src.shared import context
+from src.shared.enums import Platform
+from src.shared.exceptions import CircuitOpenError
+from src.shared.utils import SingleFlight
+
+
+def test_joiners_see_the_providers_the_leader_found_unavailable():
+    flights = SingleFlight()
+    leader_running = threading.Event()
+    release = threading.Event()
+
+    def search():
+        leader_running.set()
+        context.mark_provider_unavailable("exa")
+        release.wait(5)
+        return []
+
+    def leader():
+        with context.track_unavailable_providers():
+            flights.do("fitness", search)
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    leader_running.wait(5)
+
+    joined = {}
+
+    def joiner():
+        with context.track_unavailable_providers() as unavailable:
+            flights.do("fitness", lambda: ["not run"])
+            joined["unavailable"] = set(unavailable)
+
+    join_thread = threading.Thread(target=joiner)
+    join_thread.start()
+    while flights.stats()["coalesced"] == 0:
+        time.sleep(0.001)
+    release.set()
+    thread.join(5)
+    join_thread.join(5)
+
+    assert joined["unavailable"] == {"exa"}
+
+
+def test_nested_trackers_share_the_request_set():
+    with context.track_unavailable_providers() as outer:
+        with context.track_unavailable_providers() as inner:
+            context.mark_provider_unavailable("ensemble")
+    assert inner is outer
+    assert outer == {"ensemble"}
+
+
+def test_empty_search_during_an_outage_returns_the_expired_entry(monkeypatch):
+    key = search_module.search_cache_key(Platform.TIKTOK, "food", "Beirut", [], 5)
+    search_module.SEARCH_CACHE._entries[key] = ([{"unique_id": "cached"}], -1e9)
+
+    def search_down(**kwargs):
+        context.mark_provider_unavailable("ensemble")
+        return [], []
+
+    monkeypatch.setattr(search_module, "search_tiktok_influencers", search_down)
+    results, unavailable = search_module.search_influencers_cached(
+        Platform.TIKTOK, "food", "Beirut", [], 5
+    )
+    assert results == [{"unique_id": "cached"}]
+    assert unavailable == ["ensemble"]
+    search_module.SEARCH_CACHE.invalidate(key)
+
+
+def test_search_endpoint_flags_an_open_circuit_as_degraded(monkeypatch):
+    def search_rejected(**kwargs):
+        raise CircuitOpenError("ensemble", 30)
+
+    monkeypatch.setattr(search_module, "search_tiktok_influencers", search_rejected)
+    response = TestClient(fastapi_app.app).post(
+        "/search_tiktok_influencers",
+        json={"topic": "open circuit", "location": "Beirut", "keywords": [], "search_results": 5},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "platform_data": [],
+        "degraded": True,
+        "unavailable_providers": ["ensemble"],
+    }
+
+
+def test_degraded_answer_keeps_the_profiles_found_before_the_failure(monkeypatch):
+    async def failing_run(message, user_id, session_id):
+        context.emit_event(
+            "influencer", {"platform": "instagram", "username": "Chef", "data": {"username": "chef"}}
+        )
+        context.emit_event(
+            "influencer", {"platform": "instagram", "username": "chef", "data": {"username": "chef"}}
+        )
+        raise CircuitOpenError("ensemble", 30)
+
+    monkeypatch.setattr(fastapi_app, "run_agent_async", failing_run)
+    response = TestClient(fastapi_app.app).post(
+        "/find-influencers",
+        json={"message": "food creators", "user_id": "u1", "session_id": "s1"},
+    )
+    body = response.json()
+    assert response.status_code == 200
+    assert body["degraded"] is True
+    assert body["unavailable_providers"] == ["ensemble"]
+    assert body["influencers_found"] == [{"username": "chef"}]